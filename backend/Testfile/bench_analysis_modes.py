@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+# Run in a scratch directory: the pipeline writes output/, data/ and all_report_message.txt,
+# which are tracked sample files in the repo
+SCRATCH_DIR = tempfile.mkdtemp(prefix="bench_analysis_modes_")
+os.environ.setdefault("TRADINGAGENTS_OUTPUT_DIR", os.path.join(SCRATCH_DIR, "output"))
+os.chdir(SCRATCH_DIR)
+
+# Offline defaults: a throwaway SQLite history DB and a key for the (fake) Typhoon client
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.gettempdir()}/bench_analysis_modes.db")
+os.environ.setdefault("TYPHOON_API_KEY", "fake")
+
+from api.main import AnalysisRequest, run_analysis_stream
+from database.database import init_db
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.utils.http_clients import close_http_clients
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+
+# Latency targets per tier (seconds, whole run_analysis_stream incl. summaries/translation)
+# at realistic LLM latency (fake_llm time_scale 1: ~400 ms to first token, ~60 tokens/s).
+# With --time-scale s the targets are scaled by s.
+#   quick    - screening a watchlist: answer while the user waits
+#   standard - today's pipeline
+#   deep     - one more bull/bear and risk round (deep_extra_rounds)
+LATENCY_TARGETS = {
+    "quick": {"first_content": 10, "total": 45},
+    "standard": {"first_content": 10, "total": 240},
+    "deep": {"first_content": 10, "total": 330},
+}
+
+
+class RecordingWebSocket:
+    """Stands in for the client: notes when each message type first arrives."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.messages = []
+
+    async def send_json(self, payload):
+        self.messages.append((time.perf_counter() - self.start, payload.get("type")))
+
+    async def send_text(self, text):
+        self.messages.append((time.perf_counter() - self.start, "text"))
+
+
+async def one_analysis(mode: str, ticker: str, date: str, depth: int) -> dict:
+    ws = RecordingWebSocket()
+    request = AnalysisRequest(
+        ticker=ticker,
+        analysis_date=date,
+        analysts=ANALYSTS,
+        research_depth=depth,
+        llm_provider="fake",
+        backend_url="",
+        shallow_thinker="fake-quick",
+        deep_thinker="fake-deep",
+        force_refresh=True,
+        mode=mode,
+    )
+    await run_analysis_stream(ws, request)
+    types = [t for _, t in ws.messages]
+    return {
+        "total": time.perf_counter() - ws.start,
+        "first_content": next((at for at, t in ws.messages if t in ("token", "report")), None),
+        "decision": next((at for at, t in ws.messages if t == "complete"), None),
+        "reports": types.count("report"),
+        "translations": types.count("thai_report"),
+        "errors": types.count("error"),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Latency of the quick / standard / deep analysis modes (fake LLM)")
+    parser.add_argument("--modes", nargs="+", default=list(LATENCY_TARGETS), choices=list(LATENCY_TARGETS))
+    parser.add_argument("--ticker", default="AAPL")
+    parser.add_argument("--date", default="2025-01-10")
+    parser.add_argument("--depth", type=int, default=1, help="debate rounds (research_depth)")
+    parser.add_argument("--time-scale", type=float, default=0.2, help="fake LLM delay multiplier (1 = realistic)")
+    args = parser.parse_args()
+
+    DEFAULT_CONFIG["fake_llm"] = {**DEFAULT_CONFIG["fake_llm"], "time_scale": args.time_scale}
+    # Measure the pipeline, not the caches
+    DEFAULT_CONFIG.update(run_cache=False, stage_cache=False, llm_cache="off")
+    await init_db()
+
+    # First run builds the graph / loads the embedding model; keep it out of the numbers
+    print("🔥 Warm-up analysis...")
+    await one_analysis("quick", args.ticker, args.date, args.depth)
+
+    rows = {}
+    for mode in args.modes:
+        print(f"⏱️ {mode}...")
+        rows[mode] = await one_analysis(mode, args.ticker, args.date, args.depth)
+    await close_http_clients()
+
+    print(f"\n{args.ticker} {args.date}, depth {args.depth}, time_scale {args.time_scale}")
+    print(f"{'mode':<9} {'first content':>13} {'total s':>8} {'target s':>9} {'reports':>8} {'thai':>5}  ok")
+    for mode, row in rows.items():
+        target = LATENCY_TARGETS[mode]["total"] * args.time_scale
+        first = row["first_content"]
+        ok = "✅" if row["total"] <= target and not row["errors"] else "❌"
+        print(f"{mode:<9} {first if first is not None else float('nan'):>13.1f} {row['total']:>8.1f} "
+              f"{target:>9.1f} {row['reports']:>8} {row['translations']:>5}  {ok}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+import os
+import sys
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from tradingagents.agents.utils.debate_compaction import compact_history, count_tokens
+
+ROUNDS = 5
+TURN_WORDS = 180  # debaters are asked for ~150 words, models usually overshoot a bit
+BUDGET = 1500
+KEEP_LAST = 2
+SPEAKERS = ["Risky Analyst", "Safe Analyst", "Neutral Analyst"]
+
+# Prompt parts that do not depend on the history (system prompt + trader plan + 4 reports)
+FIXED_PROMPT_TOKENS = 3000
+
+
+def make_turn(speaker: str, i: int) -> str:
+    sentences = []
+    words = 0
+    n = 0
+    while words < TURN_WORDS:
+        sentence = (
+            f"Point {n} of turn {i} argues that the position sizing and the stop level "
+            f"should reflect the latest volatility reading and the upcoming earnings risk."
+        )
+        sentences.append(sentence)
+        words += len(sentence.split())
+        n += 1
+    return f"{speaker}: " + " ".join(sentences)
+
+
+def main():
+    history = ""
+    totals = {"full": 0, "compacted": 0}
+    print(f"{'turn':>4} {'speaker':<16} {'full prompt':>12} {'compacted':>10}")
+    for i in range(ROUNDS * len(SPEAKERS)):
+        speaker = SPEAKERS[i % len(SPEAKERS)]
+        full = FIXED_PROMPT_TOKENS + count_tokens(history)
+        compacted = FIXED_PROMPT_TOKENS + count_tokens(compact_history(history, BUDGET, KEEP_LAST))
+        totals["full"] += full
+        totals["compacted"] += compacted
+        print(f"{i + 1:>4} {speaker:<16} {full:>12,} {compacted:>10,}")
+        history = history + "\n" + make_turn(speaker, i)
+
+    saved = 1 - totals["compacted"] / totals["full"]
+    print(f"\nTotal prompt tokens over {ROUNDS} rounds: {totals['full']:,} -> {totals['compacted']:,} ({saved:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
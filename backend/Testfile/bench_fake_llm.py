@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+# Run in a scratch directory: the pipeline writes output/, data/ and all_report_message.txt,
+# which are tracked sample files in the repo
+SCRATCH_DIR = tempfile.mkdtemp(prefix="bench_fake_llm_")
+os.environ.setdefault("TRADINGAGENTS_OUTPUT_DIR", os.path.join(SCRATCH_DIR, "output"))
+os.chdir(SCRATCH_DIR)
+
+# Offline defaults: a throwaway SQLite history DB and a key for the (fake) Typhoon client
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.gettempdir()}/bench_fake_llm.db")
+os.environ.setdefault("TYPHOON_API_KEY", "fake")
+
+from api.main import AnalysisRequest, run_analysis_stream
+from database.database import init_db
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.utils.http_clients import close_http_clients
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+
+
+class RecordingWebSocket:
+    """Stands in for the client: counts messages and notes when the first/last arrive."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.messages = []
+
+    async def send_json(self, payload):
+        self.messages.append((time.perf_counter() - self.start, payload.get("type")))
+
+    async def send_text(self, text):
+        self.messages.append((time.perf_counter() - self.start, "text"))
+
+
+async def one_analysis(ticker: str, date: str, depth: int) -> dict:
+    ws = RecordingWebSocket()
+    request = AnalysisRequest(
+        ticker=ticker,
+        analysis_date=date,
+        analysts=ANALYSTS,
+        research_depth=depth,
+        llm_provider="fake",
+        backend_url="",
+        shallow_thinker="fake-quick",
+        deep_thinker="fake-deep",
+        force_refresh=True,
+    )
+    await run_analysis_stream(ws, request)
+    types = [t for _, t in ws.messages]
+    return {
+        "seconds": time.perf_counter() - ws.start,
+        "messages": len(ws.messages),
+        "reports": types.count("report"),
+        "errors": types.count("error"),
+        "tokens": types.count("token"),
+        "first_report": next((at for at, t in ws.messages if t == "report"), None),
+        "first_content": next((at for at, t in ws.messages if t in ("token", "report")), None),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="End-to-end run_analysis_stream throughput with the fake LLM provider")
+    parser.add_argument("--ticker", default="AAPL")
+    parser.add_argument("--date", default="2025-01-10")
+    parser.add_argument("--concurrency", type=int, default=4, help="analyses running at once")
+    parser.add_argument("--analyses", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=1, help="debate rounds")
+    parser.add_argument("--time-scale", type=float, default=0.1, help="fake LLM delay multiplier (1 = realistic)")
+    args = parser.parse_args()
+
+    DEFAULT_CONFIG["fake_llm"] = {**DEFAULT_CONFIG["fake_llm"], "time_scale": args.time_scale}
+    # Measure the pipeline, not the caches
+    DEFAULT_CONFIG.update(run_cache=False, stage_cache=False, llm_cache="off")
+    await init_db()
+
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def limited():
+        async with sem:
+            return await one_analysis(args.ticker, args.date, args.depth)
+
+    # First run builds the graph / loads the embedding model; keep it out of the numbers
+    print("🔥 Warm-up analysis...")
+    await one_analysis(args.ticker, args.date, args.depth)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited() for _ in range(args.analyses)))
+    elapsed = time.perf_counter() - start
+    await close_http_clients()
+
+    seconds = [r["seconds"] for r in results]
+    first = [r["first_report"] for r in results if r["first_report"] is not None]
+    print(f"\n{args.analyses} analyses, concurrency {args.concurrency}, time_scale {args.time_scale}")
+    print(f"  throughput        : {args.analyses / elapsed * 60:.1f} analyses/min ({elapsed:.1f}s total)")
+    print(f"  per analysis      : median {statistics.median(seconds):.1f}s, max {max(seconds):.1f}s")
+    content = [r["first_content"] for r in results if r["first_content"] is not None]
+    if first:
+        print(f"  first report after: median {statistics.median(first):.1f}s")
+    if content:
+        print(f"  first content after: median {statistics.median(content):.1f}s (token or report)")
+    print(f"  websocket messages: {sum(r['messages'] for r in results)} "
+          f"({sum(r['reports'] for r in results)} reports, {sum(r['tokens'] for r in results)} token batches, "
+          f"{sum(r['errors'] for r in results)} errors)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
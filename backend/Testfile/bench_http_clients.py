@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from tradingagents.utils.http_clients import (
+    HTTP2_AVAILABLE, _PoolStats, close_http_clients, http_client, http_client_stats, new_http_client
+)
+
+# Typhoon calls of one analysis: 12 summarizers + the translated report sections
+SUMMARIZER_CALLS = 12
+TRANSLATION_CALLS = 12
+CONCURRENCY = 4  # translation_service.MAX_CONCURRENT_REQUESTS
+DEFAULT_URL = "https://api.opentyphoon.ai/v1/models"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        body = b'{"data": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_local_server() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1/models"
+
+
+async def run_calls(get, n: int):
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with sem:
+            await get()
+
+    await asyncio.gather(*(one() for _ in range(n)))
+
+
+async def per_call_clients(url: str, n: int) -> dict:
+    """Before: a new client (= new connection) for every call."""
+    stats = _PoolStats()
+
+    async def get():
+        async with new_http_client(event_hooks={"request": [stats.on_request]}) as client:
+            await client.get(url)
+
+    start = time.perf_counter()
+    await run_calls(get, n)
+    return {**stats.to_dict(), "total_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+async def shared_client(url: str, n: int) -> dict:
+    """After: every call goes through the shared keep-alive pool."""
+    base_url = url.rsplit("/", 1)[0]
+    client = http_client(base_url)
+
+    async def get():
+        await client.get(url)
+
+    start = time.perf_counter()
+    await run_calls(get, n)
+    total_ms = round((time.perf_counter() - start) * 1000, 1)
+    stats = http_client_stats()[base_url]
+    await close_http_clients()
+    return {**stats, "total_ms": total_ms}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Handshakes per analysis: per-call clients vs the shared pool")
+    parser.add_argument("--url", default=DEFAULT_URL, help="endpoint to call (default: Typhoon /models)")
+    parser.add_argument("--local", action="store_true", help="use a local keep-alive HTTP server (no network, no TLS)")
+    parser.add_argument("--analyses", type=int, default=1)
+    args = parser.parse_args()
+
+    url = start_local_server() if args.local else args.url
+    n = (SUMMARIZER_CALLS + TRANSLATION_CALLS) * args.analyses
+    print(f"{n} calls to {url} (concurrency {CONCURRENCY}, HTTP/2 {'available' if HTTP2_AVAILABLE else 'not installed'})")
+
+    before = await per_call_clients(url, n)
+    after = await shared_client(url, n)
+    print(f"{'':<18} {'connections':>11} {'handshake ms':>13} {'total ms':>9}")
+    for name, row in (("per-call clients", before), ("shared pool", after)):
+        print(f"{name:<18} {row['connections_opened']:>11} {row['handshake_ms']:>13,.1f} {row['total_ms']:>9,.1f}")
+    saved = before["handshake_ms"] - after["handshake_ms"]
+    print(f"\nHandshake time saved: {saved:,.1f} ms per {args.analyses} analysis(es) "
+          f"({before['connections_opened'] - after['connections_opened']} fewer connections)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
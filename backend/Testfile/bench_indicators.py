@@ -0,0 +1,93 @@
+import subprocess
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from tradingagents.dataflows import core_calculator
+
+N_TICKERS = 200
+N_DAYS = 250  # ~1 year of daily bars, same window the market analyst loads
+
+
+def make_frame(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, N_DAYS)))
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.003, N_DAYS)),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(10_000, 1_000_000, N_DAYS).astype(float),
+    }, index=pd.date_range("2024-01-01", periods=N_DAYS))
+
+
+def import_time(module: str) -> float:
+    code = f"import time; t=time.perf_counter(); import {module}; print(time.perf_counter()-t)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=os.getcwd())
+    if out.returncode != 0:
+        return float("nan")
+    return float(out.stdout.strip())
+
+
+def run_numpy(frames):
+    for df in frames:
+        core_calculator.calculate_sma(df, 50)
+        core_calculator.calculate_sma(df, 200)
+        core_calculator.calculate_ema(df, 10)
+        core_calculator.calculate_rsi(df, 14)
+        core_calculator.calculate_macd(df)
+        core_calculator.calculate_bollinger_bands(df)
+        core_calculator.calculate_atr(df)
+        core_calculator.calculate_vwma(df)
+
+
+def run_pandas_ta(frames):
+    import pandas_ta as ta
+    for df in frames:
+        ta.sma(df["Close"], length=50)
+        ta.sma(df["Close"], length=200)
+        ta.ema(df["Close"], length=10)
+        ta.rsi(df["Close"], length=14)
+        ta.macd(df["Close"])
+        ta.bbands(df["Close"], length=20, std=2)
+        ta.atr(df["High"], df["Low"], df["Close"], length=14)
+        ta.vwma(df["Close"], df["Volume"], length=20)
+
+
+def bench(fn, frames) -> float:
+    fn(frames[:5])  # warm-up
+    start = time.perf_counter()
+    fn(frames)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    frames = [make_frame(i) for i in range(N_TICKERS)]
+
+    print("⏱️  Import time (fresh interpreter)")
+    print(f"   core_calculator (NumPy): {import_time('tradingagents.dataflows.core_calculator'):.3f}s")
+    print(f"   pandas_ta:               {import_time('pandas_ta'):.3f}s")
+
+    print(f"\n📈 Throughput: {N_TICKERS} tickers x {N_DAYS} bars, 8 indicator families")
+    numpy_s = bench(run_numpy, frames)
+    print(f"   NumPy kernels: {numpy_s:.3f}s ({N_TICKERS / numpy_s:.0f} tickers/s)")
+
+    try:
+        ta_s = bench(run_pandas_ta, frames)
+        print(f"   pandas_ta:     {ta_s:.3f}s ({N_TICKERS / ta_s:.0f} tickers/s)")
+        print(f"   Speed-up:      {ta_s / numpy_s:.1f}x")
+
+        worst = {}
+        for df in frames[:20]:
+            for name, diff in core_calculator.verify_against_pandas_ta(df).items():
+                if diff is not None:
+                    worst[name] = max(worst.get(name, 0.0), diff)
+        print(f"\n✅ Max abs difference vs pandas_ta: {max(worst.values()):.2e}")
+    except ImportError:
+        print("   pandas_ta not installed, skipping comparison")
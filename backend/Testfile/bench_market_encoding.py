@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from tradingagents.agents.utils.debate_compaction import count_tokens
+from tradingagents.agents.utils.market_encoding import compact_market_context, raw_market_context
+from tradingagents.dataflows.core_calculator import process_indicators_from_csv
+
+N_DAYS = 250  # ~1 year of daily bars, same window the Data Prefetch node loads
+# Price scales seen in practice: penny stock, SET stock (baht), US large cap, high-priced index/stock
+START_PRICES = {"PENNY": 0.85, "SET": 35.25, "US": 150.0, "HIGH": 3200.0}
+REPORT_FIELDS = ("market_overview", "market_sentiment")
+INDICATORS = ("close_50_sma", "close_10_ema", "macd", "macds", "macdh", "rsi", "boll", "boll_ub", "boll_lb", "atr", "vwma")
+
+
+def make_csv(start_price: float, seed: int) -> str:
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.02, N_DAYS)))
+    df = pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.003, N_DAYS)),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(10_000, 50_000_000, N_DAYS).astype(float),
+    }, index=pd.date_range("2024-01-01", periods=N_DAYS, freq="B", name="Date"))
+    return "# Stock data\n" + df.to_csv()
+
+
+def check_snapshot(csv_text: str, compact: str):
+    """Every indicator the report may cite is in the compact context, equal to the raw value after rounding."""
+    indicators, _ = process_indicators_from_csv(csv_text)
+    snapshot_line = next(line for line in compact.splitlines() if line.startswith("TECHNICAL INDICATORS"))
+    values = dict(item.split("=") for item in snapshot_line.split(": ", 1)[1].split(", "))
+    for name in INDICATORS:
+        assert name in values, f"{name} missing from compact context"
+        raw, encoded = float(indicators[name]), float(values[name])
+        decimals = len(values[name].partition(".")[2])
+        assert abs(raw - encoded) <= 0.5 * 10 ** -decimals + 1e-9, (name, raw, encoded)
+
+
+async def compare_reports(csv_text: str):
+    """Run the Market Analyst on both encodings with the configured quick LLM and diff the report fields."""
+    from tradingagents.agents.analysts.market_analyst import create_market_analyst
+    from tradingagents.dataflows.config import set_config
+    from tradingagents.default_config import DEFAULT_CONFIG
+    from tradingagents.graph.trading_graph import create_llms
+
+    _, quick_llm = create_llms(dict(DEFAULT_CONFIG, llm_cache="off"))
+    node = create_market_analyst(quick_llm)
+    state = {
+        "trade_date": "2024-12-13",
+        "company_of_interest": "TEST",
+        "messages": [("human", "TEST")],
+        "prefetched_data": {"stock_data": csv_text},
+    }
+    reports = {}
+    for encoding in ("raw", "compact"):
+        set_config({"market_data_encoding": encoding})
+        reports[encoding] = json.loads((await node(state, config={}))["market_report"])
+    for field in REPORT_FIELDS:
+        same = reports["raw"].get(field) == reports["compact"].get(field)
+        print(f"  {field}: {'same' if same else 'DIFFERENT'} raw={reports['raw'].get(field)} compact={reports['compact'].get(field)}")
+
+
+def main():
+    totals = {"raw": 0, "compact": 0}
+    print(f"{'series':<8} {'raw tokens':>10} {'compact':>8} {'saved':>6}")
+    for i, (name, price) in enumerate(START_PRICES.items()):
+        csv_text = make_csv(price, i)
+        raw = count_tokens(raw_market_context(csv_text))
+        compact_text = compact_market_context(csv_text)
+        compact = count_tokens(compact_text)
+        check_snapshot(csv_text, compact_text)
+        totals["raw"] += raw
+        totals["compact"] += compact
+        print(f"{name:<8} {raw:>10,} {compact:>8,} {1 - compact / raw:>6.0%}")
+    print(f"\nMarket Analyst data context: {totals['raw']:,} -> {totals['compact']:,} tokens "
+          f"({1 - totals['compact'] / totals['raw']:.0%} less); latest indicator values identical after rounding")
+
+    # Needs API keys: python Testfile/bench_market_encoding.py --llm
+    if "--llm" in sys.argv:
+        print("\nReport fields, raw vs compact context:")
+        asyncio.run(compare_reports(make_csv(START_PRICES["US"], 2)))
+
+
+if __name__ == "__main__":
+    main()
@@ -45,7 +45,7 @@ async def test_node():
     }
     
     try:
-        result = await node_func(state)
+        result = await node_func(state, config={})
         print("\n✅ Node execution successful!")
         print(f"Report: {result['sentiment_report']}")
     except Exception as e:
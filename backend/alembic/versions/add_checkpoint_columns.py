@@ -0,0 +1,30 @@
+"""Add LangGraph checkpoint columns to execution_history
+
+Revision ID: add_checkpoint_columns
+Revises: add_thai_columns
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_checkpoint_columns'
+down_revision: Union[str, None] = 'add_thai_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('execution_history', sa.Column('checkpoint_thread_id', sa.String(), nullable=True))
+    op.add_column('execution_history', sa.Column('checkpoint_id', sa.String(), nullable=True))
+    op.add_column('execution_history', sa.Column('checkpoint_next', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('execution_history', 'checkpoint_next')
+    op.drop_column('execution_history', 'checkpoint_id')
+    op.drop_column('execution_history', 'checkpoint_thread_id')
@@ -0,0 +1,50 @@
+"""Add execution_metrics (per-node LLM telemetry of an execution)
+
+Revision ID: add_execution_metrics
+Revises: add_run_cache_columns
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_execution_metrics'
+down_revision: Union[str, None] = 'add_run_cache_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('execution_metrics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('execution_id', sa.Integer(), nullable=True),
+    sa.Column('node', sa.String(), nullable=True),
+    sa.Column('runs', sa.Integer(), nullable=True),
+    sa.Column('wall_ms', sa.Float(), nullable=True),
+    sa.Column('llm_calls', sa.Integer(), nullable=True),
+    sa.Column('cached_calls', sa.Integer(), nullable=True),
+    sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+    sa.Column('completion_tokens', sa.Integer(), nullable=True),
+    sa.Column('llm_latency_ms', sa.Float(), nullable=True),
+    sa.Column('ttft_ms', sa.Float(), nullable=True),
+    sa.Column('retries', sa.Integer(), nullable=True),
+    sa.Column('errors', sa.Integer(), nullable=True),
+    sa.Column('history_tokens', sa.Integer(), nullable=True),
+    sa.Column('history_prompt_tokens', sa.Integer(), nullable=True),
+    sa.Column('calls', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['execution_id'], ['execution_history.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_execution_metrics_id'), 'execution_metrics', ['id'], unique=False)
+    op.create_index(op.f('ix_execution_metrics_execution_id'), 'execution_metrics', ['execution_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_execution_metrics_execution_id'), table_name='execution_metrics')
+    op.drop_index(op.f('ix_execution_metrics_id'), table_name='execution_metrics')
+    op.drop_table('execution_metrics')
@@ -0,0 +1,30 @@
+"""Add run cache key and decision to execution_history
+
+Revision ID: add_run_cache_columns
+Revises: add_checkpoint_columns
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_run_cache_columns'
+down_revision: Union[str, None] = 'add_checkpoint_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('execution_history', sa.Column('cache_key', sa.String(length=64), nullable=True))
+    op.add_column('execution_history', sa.Column('decision', sa.String(), nullable=True))
+    op.create_index(op.f('ix_execution_history_cache_key'), 'execution_history', ['cache_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_execution_history_cache_key'), table_name='execution_history')
+    op.drop_column('execution_history', 'decision')
+    op.drop_column('execution_history', 'cache_key')
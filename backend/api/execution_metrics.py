@@ -0,0 +1,59 @@
+"""
+Per-node LLM telemetry of an execution (tokens, latency, time to first token,
+retries), collected by tradingagents.utils.telemetry during the run and stored
+in the execution_metrics table, one row per node.
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy import select
+
+from database.database import AsyncSessionLocal
+from database.models import ExecutionMetric
+from tradingagents.utils.telemetry import RunTelemetry
+
+logger = logging.getLogger(__name__)
+
+_SUMMED = ("runs", "wall_ms", "llm_calls", "cached_calls", "prompt_tokens",
+           "completion_tokens", "llm_latency_ms", "retries", "errors",
+           "history_tokens", "history_prompt_tokens")
+
+
+async def save_execution_metrics(execution_id: int, telemetry: RunTelemetry):
+    """Add this run's per-node metrics to the execution (a resumed run adds to its earlier rows)."""
+    rows = telemetry.per_node()
+    if not rows:
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            res = await db.execute(select(ExecutionMetric).where(ExecutionMetric.execution_id == execution_id))
+            existing = {m.node: m for m in res.scalars().all()}
+            for row in rows:
+                metric = existing.get(row["node"])
+                if metric is None:
+                    db.add(ExecutionMetric(execution_id=execution_id, **row))
+                    continue
+                # Average time to first token weighted by the calls on each side
+                if row["ttft_ms"] is not None:
+                    old_calls = metric.llm_calls if metric.ttft_ms is not None else 0
+                    metric.ttft_ms = (
+                        (metric.ttft_ms or 0) * old_calls + row["ttft_ms"] * row["llm_calls"]
+                    ) / max(1, old_calls + row["llm_calls"])
+                for field in _SUMMED:
+                    setattr(metric, field, (getattr(metric, field) or 0) + row[field])
+                metric.calls = (metric.calls or []) + row["calls"]
+            await db.commit()
+        logger.info(f"📊 Saved metrics for {len(rows)} nodes of execution {execution_id}")
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to store metrics for execution {execution_id}: {e}")
+
+
+def summarize_metrics(metrics: List[ExecutionMetric]) -> Dict[str, Any]:
+    """Totals plus the per-node rows, slowest first."""
+    nodes = sorted((m.to_dict() for m in metrics), key=lambda m: max(m["wall_ms"] or 0, m["llm_latency_ms"] or 0), reverse=True)
+    totals = {field: sum(n[field] or 0 for n in nodes) for field in _SUMMED if field != "runs"}
+    totals["wall_ms"] = round(totals["wall_ms"], 1)
+    totals["llm_latency_ms"] = round(totals["llm_latency_ms"], 1)
+    totals["total_tokens"] = totals["prompt_tokens"] + totals["completion_tokens"]
+    return {"totals": totals, "nodes": nodes}
@@ -6,11 +6,13 @@ from sqlalchemy.orm import selectinload
 from typing import List
 
 from database.database import get_db
-from database.models import ExecutionHistory
+from database.models import ExecutionHistory, ExecutionMetric
 from database.schemas import (
     ExecutionHistoryCreate,
-    ExecutionHistoryResponse
+    ExecutionHistoryResponse,
+    ExecutionMetricsResponse
 )
+from api.execution_metrics import summarize_metrics
 
 router = APIRouter(
     prefix="/api/history",
@@ -67,4 +69,21 @@ async def get_history_by_id(
     if history is None:
         raise HTTPException(status_code=404, detail="History not found")
 
-    return history
\ No newline at end of file
+    return history
+
+
+# =========================
+# Get LLM metrics of a history (tokens, latency, retries per node)
+# =========================
+@router.get("/{history_id}/metrics", response_model=ExecutionMetricsResponse)
+async def get_history_metrics(
+    history_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    history = await db.get(ExecutionHistory, history_id)
+    if history is None:
+        raise HTTPException(status_code=404, detail="History not found")
+
+    stmt = select(ExecutionMetric).where(ExecutionMetric.execution_id == history_id)
+    result = await db.execute(stmt)
+    return {"execution_id": history_id, **summarize_metrics(result.scalars().all())}
@@ -0,0 +1,352 @@
+"""
+Intraday collector behind /quote.
+
+Hot symbols keep a fixed-size ring buffer of 5-minute bars that a background
+task refreshes with ONE batched yfinance download per poll. RSI, VWAP and EMA
+are updated incrementally as bars close, so serving a quote is a memory read.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class RingBuffer:
+    """Fixed-capacity OHLCV bar buffer backed by preallocated NumPy arrays."""
+
+    def __init__(self, capacity: int = 400):
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.int64)
+        self.session = np.zeros(capacity, dtype=np.int64)
+        self.data = {f: np.zeros(capacity, dtype=np.float64) for f in BAR_FIELDS}
+        self._next = 0  # slot the next append writes to
+        self.size = 0
+
+    def _write(self, slot: int, ts: int, session: int, bar: Dict[str, float]):
+        self.ts[slot] = ts
+        self.session[slot] = session
+        for f in BAR_FIELDS:
+            self.data[f][slot] = bar[f]
+
+    def append(self, ts: int, session: int, bar: Dict[str, float]):
+        self._write(self._next, ts, session, bar)
+        self._next = (self._next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def replace_last(self, ts: int, session: int, bar: Dict[str, float]):
+        self._write((self._next - 1) % self.capacity, ts, session, bar)
+
+    @property
+    def _last_slot(self) -> int:
+        return (self._next - 1) % self.capacity
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        return int(self.ts[self._last_slot]) if self.size else None
+
+    @property
+    def last_session(self) -> Optional[int]:
+        return int(self.session[self._last_slot]) if self.size else None
+
+    def last_bar(self) -> Dict[str, float]:
+        return {f: float(self.data[f][self._last_slot]) for f in BAR_FIELDS}
+
+    def view(self, field: str, n: Optional[int] = None) -> np.ndarray:
+        """Chronological copy of the newest `n` values (all if None)."""
+        n = self.size if n is None else min(n, self.size)
+        if n == 0:
+            return np.empty(0)
+        idx = (np.arange(self._next - n, self._next)) % self.capacity
+        source = {"ts": self.ts, "session": self.session}.get(field)
+        if source is None:
+            source = self.data[field]
+        return source[idx]
+
+
+class LiveIndicators:
+    """
+    Streaming RSI (Wilder), session VWAP and EMA (SMA-seeded), matching the
+    NumPy kernels. `commit` folds a closed bar into the state; `preview` applies
+    the still-forming bar to a copy so partial bars never pollute the state.
+    """
+
+    def __init__(self, rsi_period: int = 14, ema_period: int = 20):
+        self.rsi_period = rsi_period
+        self.ema_period = ema_period
+        self.state = {
+            "prev_close": None, "avg_gain": None, "avg_loss": None,
+            "ema": None, "ema_count": 0, "ema_sum": 0.0,
+            "session": None, "cum_pv": 0.0, "cum_volume": 0.0,
+        }
+
+    def _advance(self, state: dict, session: int, bar: Dict[str, float]) -> dict:
+        s = dict(state)
+        close = bar["close"]
+
+        # RSI: Wilder average of gains/losses, seeded by the first change
+        if s["prev_close"] is not None:
+            change = close - s["prev_close"]
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            if s["avg_gain"] is None:
+                s["avg_gain"], s["avg_loss"] = gain, loss
+            else:
+                s["avg_gain"] += (gain - s["avg_gain"]) / self.rsi_period
+                s["avg_loss"] += (loss - s["avg_loss"]) / self.rsi_period
+        s["prev_close"] = close
+
+        # EMA: plain average for the first `ema_period` bars, then recursive
+        if s["ema"] is None:
+            s["ema_count"] += 1
+            s["ema_sum"] += close
+            if s["ema_count"] == self.ema_period:
+                s["ema"] = s["ema_sum"] / self.ema_period
+        else:
+            s["ema"] += 2.0 / (self.ema_period + 1) * (close - s["ema"])
+
+        # VWAP resets every session
+        if s["session"] != session:
+            s["session"], s["cum_pv"], s["cum_volume"] = session, 0.0, 0.0
+        typical = (bar["high"] + bar["low"] + close) / 3.0
+        s["cum_pv"] += typical * bar["volume"]
+        s["cum_volume"] += bar["volume"]
+        return s
+
+    def commit(self, session: int, bar: Dict[str, float]):
+        self.state = self._advance(self.state, session, bar)
+
+    def preview(self, session: int, bar: Dict[str, float]) -> Dict[str, Optional[float]]:
+        s = self._advance(self.state, session, bar)
+        rsi = None
+        if s["avg_gain"] is not None and (s["avg_gain"] + s["avg_loss"]) > 0:
+            rsi = 100.0 * s["avg_gain"] / (s["avg_gain"] + s["avg_loss"])
+        vwap = s["cum_pv"] / s["cum_volume"] if s["cum_volume"] > 0 else None
+        return {
+            "rsi": round(rsi, 2) if rsi is not None else None,
+            "vwap": round(vwap, 4) if vwap is not None else None,
+            f"ema_{self.ema_period}": round(s["ema"], 4) if s["ema"] is not None else None,
+        }
+
+
+class SymbolFeed:
+    def __init__(self, symbol: str, capacity: int):
+        self.symbol = symbol
+        self.bars = RingBuffer(capacity)
+        self.indicators = LiveIndicators()
+        self.info: dict = {}
+        self.info_fetched_at = 0.0
+        self.last_request = time.monotonic()
+
+    def ingest(self, frame: pd.DataFrame):
+        """Fold downloaded bars in; the newest buffered bar may still be forming."""
+        for stamp, row in frame.iterrows():
+            ts = int(stamp.timestamp())
+            session = stamp.year * 10000 + stamp.month * 100 + stamp.day
+            bar = {f: float(row[f.capitalize()]) for f in BAR_FIELDS}
+            if any(np.isnan(v) for v in bar.values()):
+                continue
+            last_ts = self.bars.last_ts
+            if last_ts is None:
+                self.bars.append(ts, session, bar)
+            elif ts == last_ts:
+                self.bars.replace_last(ts, session, bar)
+            elif ts > last_ts:
+                # The previous bar is now closed -> commit it before moving on
+                self.indicators.commit(self.bars.last_session, self.bars.last_bar())
+                self.bars.append(ts, session, bar)
+
+    def session_closes(self) -> np.ndarray:
+        """Closes of the latest session only (the warm-up days are not part of the sparkline)."""
+        return self.bars.view("close")[self.bars.view("session") == self.bars.last_session]
+
+    def quote(self, sparkline_points: int = 50) -> Optional[dict]:
+        if self.bars.size == 0:
+            return None
+        last_bar = self.bars.last_bar()
+        live = self.indicators.preview(self.bars.last_session, last_bar)
+
+        info = self.info
+        closes = self.bars.view("close")
+        current_price = closes[-1]
+        previous_close = info.get("previousClose")
+        if not previous_close and len(closes) > 1:
+            previous_close = closes[-2]
+        if not previous_close:
+            previous_close = current_price
+        change = current_price - previous_close
+
+        return {
+            "symbol": self.symbol,
+            "shortName": info.get("shortName", self.symbol),
+            "price": round(float(current_price), 2),
+            "change": round(float(change), 2),
+            "percentChange": round(float(change / previous_close * 100), 2),
+            "volume": info.get("volume", float(last_bar["volume"])),
+            "sector": info.get("sector", "Unknown"),
+            "logo_url": info.get("logo_url", ""),
+            "website": info.get("website", ""),
+            "sparkline": self.session_closes()[-sparkline_points:].tolist(),
+            "indicators": live,
+            "updated_at": int(self.bars.last_ts),
+        }
+
+
+def _logo_from_info(info: dict) -> str:
+    logo_url = info.get("logo_url", "")
+    if not logo_url and info.get("website"):
+        try:
+            from urllib.parse import urlparse
+            domain = urlparse(info.get("website")).netloc
+            if domain.startswith("www."):
+                domain = domain[4:]
+            if domain:
+                logo_url = f"https://logo.clearbit.com/{domain}"
+        except Exception:
+            pass
+    return logo_url
+
+
+class IntradayCollector:
+    """Background poller for subscribed symbols; idle symbols are dropped after `idle_ttl` seconds."""
+
+    def __init__(
+        self,
+        interval: str = "5m",
+        poll_seconds: float = 60.0,
+        capacity: int = 400,
+        idle_ttl: float = 1800.0,
+        info_ttl: float = 3600.0,
+    ):
+        self.interval = interval
+        self.poll_seconds = poll_seconds
+        self.capacity = capacity
+        self.idle_ttl = idle_ttl
+        self.info_ttl = info_ttl
+        self.feeds: Dict[str, SymbolFeed] = {}
+        self._task: Optional[asyncio.Task] = None
+        # symbol -> backfill in progress; concurrent subscribers await the same task
+        self._subscribing: Dict[str, asyncio.Task] = {}
+        self.vendor_calls = 0
+
+    # ---------- vendor I/O (runs in worker threads) ----------
+    def _download(self, symbols: List[str], period: str) -> Dict[str, pd.DataFrame]:
+        import yfinance as yf
+
+        self.vendor_calls += 1
+        raw = yf.download(
+            symbols, period=period, interval=self.interval,
+            group_by="ticker", auto_adjust=False, threads=True, progress=False,
+        )
+        frames = {}
+        for symbol in symbols:
+            try:
+                df = raw[symbol] if isinstance(raw.columns, pd.MultiIndex) else raw
+                df = df[["Open", "High", "Low", "Close", "Volume"]].dropna(subset=["Close"])
+                if not df.empty:
+                    frames[symbol] = df
+            except KeyError:
+                continue
+        return frames
+
+    def _fetch_info(self, symbol: str) -> dict:
+        import yfinance as yf
+
+        self.vendor_calls += 1
+        try:
+            info = yf.Ticker(symbol).info or {}
+        except Exception:
+            info = {}
+        info["logo_url"] = _logo_from_info(info)
+        return info
+
+    # ---------- subscription ----------
+    async def subscribe(self, symbol: str) -> Optional[SymbolFeed]:
+        """Backfill a symbol and keep it hot. Returns None if no intraday data exists."""
+        symbol = symbol.upper()
+        if symbol in self.feeds:
+            return self.feeds[symbol]
+
+        task = self._subscribing.get(symbol)
+        if task is None:
+            task = asyncio.create_task(self._backfill(symbol))
+            self._subscribing[symbol] = task
+            task.add_done_callback(lambda _: self._subscribing.pop(symbol, None))
+        # shield: one caller going away must not cancel the backfill the others wait for
+        return await asyncio.shield(task)
+
+    async def _backfill(self, symbol: str) -> Optional[SymbolFeed]:
+        # 5 days of bars warms up RSI/EMA before today's session
+        frames, info = await asyncio.gather(
+            asyncio.to_thread(self._download, [symbol], "5d"),
+            asyncio.to_thread(self._fetch_info, symbol),
+        )
+        if symbol not in frames:
+            return None
+        feed = SymbolFeed(symbol, self.capacity)
+        feed.ingest(frames[symbol])
+        feed.info, feed.info_fetched_at = info, time.monotonic()
+        self.feeds[symbol] = feed
+        logger.info(f"📡 Intraday collector subscribed {symbol} ({feed.bars.size} bars)")
+        return feed
+
+    def get_quote(self, symbol: str) -> Optional[dict]:
+        feed = self.feeds.get(symbol.upper())
+        if feed is None:
+            return None
+        feed.last_request = time.monotonic()
+        return feed.quote()
+
+    # ---------- background loop ----------
+    async def poll_once(self):
+        now = time.monotonic()
+        for symbol in [s for s, f in self.feeds.items() if now - f.last_request > self.idle_ttl]:
+            logger.info(f"💤 Intraday collector dropping idle symbol {symbol}")
+            self.feeds.pop(symbol, None)
+
+        symbols = list(self.feeds)
+        if not symbols:
+            return
+        frames = await asyncio.to_thread(self._download, symbols, "1d")
+        for symbol, frame in frames.items():
+            feed = self.feeds.get(symbol)
+            if feed is not None:
+                feed.ingest(frame)
+
+        stale_info = [s for s in symbols if s in self.feeds and now - self.feeds[s].info_fetched_at > self.info_ttl]
+        for symbol in stale_info:
+            info = await asyncio.to_thread(self._fetch_info, symbol)
+            if symbol in self.feeds:
+                self.feeds[symbol].info, self.feeds[symbol].info_fetched_at = info, time.monotonic()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Intraday poll failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+intraday_collector = IntradayCollector()
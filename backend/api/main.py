@@ -8,9 +8,10 @@ import os
 import datetime
 import logging
 import importlib.metadata
+import uuid
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Literal, Optional
+from contextlib import asynccontextmanager, AsyncExitStack
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -30,11 +31,30 @@ load_dotenv()
 from database.database import AsyncSessionLocal
 from database.models import ExecutionHistory, ReportResult
 from sqlalchemy import select
+from api.run_cache import (
+    run_cache_key,
+    find_cached_run,
+    replay_cached_run,
+    record_decision,
+    TITLE_TO_FULL_KEY,
+    TITLE_TO_SUM_KEY,
+)
+from api.execution_metrics import save_execution_metrics
+from api.token_stream import TokenBatcher
 
 try:
     import yfinance as yf
     from tradingagents.graph.trading_graph import TradingAgentsGraph
+    from tradingagents.graph.graph_pool import GraphPool
+    from tradingagents.graph.propagation import StateAccumulator
+    from tradingagents.utils.llm_cache import open_llm_cache
+    from tradingagents.utils.rate_limiter import rate_limiter_stats
+    from tradingagents.utils.http_clients import open_http_clients, close_http_clients, http_client_stats
+    from tradingagents.utils.single_flight import single_flight_stats
+    from tradingagents.utils.telemetry import RunTelemetry, telemetry_scope
     from tradingagents.default_config import DEFAULT_CONFIG
+    from tradingagents.dataflows.config import config_scope
+    from tradingagents.graph.checkpointing import open_checkpointer, thread_id_for_execution, describe_checkpoint
     from cli.models import AnalystType
     logger.info("Successfully imported TradingAgents modules and yfinance")
 except ImportError as e:
@@ -44,6 +64,8 @@ except ImportError as e:
 # Get the project root directory (parent of api directory)
 PROJECT_ROOT = Path(__file__).parent.parent
 WEB_DIR = PROJECT_ROOT / "web"
+# Summary / full report files of the latest run (benchmarks point this at a scratch directory)
+OUTPUT_DIR = Path(os.getenv("TRADINGAGENTS_OUTPUT_DIR") or PROJECT_ROOT / "output")
 
 logger.info(f"Project root: {PROJECT_ROOT}")
 logger.info(f"Web directory: {WEB_DIR} (exists: {WEB_DIR.exists()})")
@@ -51,6 +73,9 @@ logger.info(f"Web directory: {WEB_DIR} (exists: {WEB_DIR.exists()})")
 # Active WebSocket connections
 active_connections: List[WebSocket] = []
 
+# ♻️ LLM clients, memories and compiled graphs shared by every analysis request
+graph_pool = GraphPool(max_graphs=DEFAULT_CONFIG.get("graph_pool_size", 8))
+
 
 
 
@@ -67,6 +92,15 @@ class AnalysisRequest(BaseModel):
     deep_thinker: str
     report_length: Optional[str] = "summary"
     user_id: Optional[int] = 1 # Default for mockup
+    resume_execution_id: Optional[int] = None  # continue an interrupted run from its last checkpoint
+    force_refresh: bool = False  # ignore the whole-run cache and run the graph again
+    # Latency tier: "quick" = analysts + one decision (no debates, summaries, translation),
+    # "standard" = full pipeline, "deep" = more debate rounds (see ANALYSIS_MODES)
+    mode: Literal["quick", "standard", "deep"] = "standard"
+
+
+# Sections a quick screen produces (analyst reports + the Quick Decision)
+QUICK_REPORT_KEYS = {"market_report", "sentiment_report", "news_report", "fundamentals_report", "final_trade_decision"}
 
 
 def extract_content_string(content):
@@ -100,9 +134,64 @@ async def send_update(websocket: WebSocket, update_type: str, data: Dict[str, An
         print(f"Error sending update: {e}")
 
 
+async def _checkpoint_fields(graph, thread_id: Optional[str]) -> Dict[str, Any]:
+    """ExecutionHistory columns describing where a thread's last checkpoint stands."""
+    if graph is None or graph.checkpointer is None or not thread_id:
+        return {}
+    try:
+        info = describe_checkpoint(await graph.get_checkpoint(thread_id))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read checkpoint for {thread_id}: {e}")
+        return {"checkpoint_thread_id": thread_id}
+    if not info:
+        return {"checkpoint_thread_id": thread_id}
+    return {
+        "checkpoint_thread_id": thread_id,
+        "checkpoint_id": info["checkpoint_id"],
+        # empty -> the graph reached END, nothing left to resume
+        "checkpoint_next": ", ".join(info["next"]) or None,
+    }
+
+
+async def _load_resumable_execution(graph, request: AnalysisRequest):
+    """
+    Look up the execution to resume. Returns (execution_id, thread_id, resume_point);
+    resume_point is None when there is nothing to continue and the run starts fresh.
+    """
+    if graph.checkpointer is None:
+        logger.warning("⚠️ Resume requested but checkpointing is disabled")
+        return None, None, None
+    try:
+        async with AsyncSessionLocal() as db:
+            db_history = await db.get(ExecutionHistory, request.resume_execution_id)
+            if db_history is None or db_history.ticker != request.ticker or db_history.status == "success":
+                logger.warning(f"⚠️ Execution {request.resume_execution_id} cannot be resumed")
+                return None, None, None
+            thread_id = db_history.checkpoint_thread_id or thread_id_for_execution(db_history.id)
+            resume_point = await graph.get_resume_point(thread_id)
+            if resume_point is None:
+                return None, None, None
+            db_history.status = "executing"
+            db_history.error_message = None
+            await db.commit()
+            logger.info(f"⏯️ Resuming execution {db_history.id} before {resume_point['next']}")
+            return db_history.id, thread_id, resume_point
+    except Exception as e:
+        logger.error(f"❌ Failed to load execution {request.resume_execution_id} for resume: {e}")
+        return None, None, None
+
+
 async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
     """Run the trading analysis and stream updates via WebSocket."""
+    execution_id = None
+    graph = None
+    thread_id = None
+    # Keeps the checkpoint store (e.g. the SQLite connection) open for the whole run
+    checkpoint_stack = AsyncExitStack()
+    # 📊 Tokens / latency / retries of every LLM call in this run, stored per node at the end
+    telemetry = RunTelemetry()
     try:
+        checkpoint_stack.enter_context(telemetry_scope(telemetry))
         # Create config
         config = DEFAULT_CONFIG.copy()
         config["max_debate_rounds"] = request.research_depth
@@ -111,6 +200,8 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
         config["deep_think_llm"] = request.deep_thinker
         config["backend_url"] = request.backend_url
         config["llm_provider"] = request.llm_provider.lower()
+        config["analysis_mode"] = request.mode
+        quick = request.mode == "quick"
 
         # Validate analysts list before using
         if request.analysts is None:
@@ -121,12 +212,35 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
             await send_update(websocket, "error", {"message": "Analysts must be a non-empty list"})
             return
 
-        # Initialize the graph
-        graph = TradingAgentsGraph(
-            request.analysts,
-            config=config,
-            debug=True
-        )
+        # 🔄 Refresh: call every model again and overwrite the stored LLM responses and stage outputs
+        if request.force_refresh:
+            config["llm_cache"] = "record_only"
+            config["stage_cache_refresh"] = True
+
+        # ⚡ Whole-run cache: same request + config -> replay the stored run from the database
+        cache_key = run_cache_key(request, config)
+        if config.get("run_cache", True) and not request.force_refresh and not request.resume_execution_id:
+            cached_run = await find_cached_run(cache_key, config.get("run_cache_max_age_hours"))
+            if cached_run is not None:
+                await replay_cached_run(websocket, cached_run, send_update)
+                return
+
+        # This request's config for everything it runs (agents, vendors, caches), without
+        # touching the process-wide config other requests read
+        checkpoint_stack.enter_context(config_scope(config))
+
+        # Initialize the graph (from the pool: no new clients / memories / compile per request)
+        if config.get("graph_pool", True):
+            graph = await graph_pool.acquire(request.analysts, config, debug=True)
+        else:
+            graph = TradingAgentsGraph(
+                request.analysts,
+                config=config,
+                debug=True
+            )
+        checkpointer = await checkpoint_stack.enter_async_context(open_checkpointer(config))
+        if checkpointer is not None:
+            graph.attach_checkpointer(checkpointer)
 
         # Create result directory
         results_base = Path(config.get("results_dir", "./results"))
@@ -142,31 +256,44 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
         init_agent_state = graph.propagator.create_initial_state(
             request.ticker, request.analysis_date
         )
-        args = graph.propagator.get_graph_args()
 
-        # 📊 1. Create ExecutionHistory record IMMEDIATELY
-        execution_id = None
-        try:
-            logger.info("🔌 Attempting to connect to database...")
-            async with AsyncSessionLocal() as db:
-                logger.info("✅ Database connection established")
-                db_history = ExecutionHistory(
-                    ticker=request.ticker,
-                    analysis_date=request.analysis_date,
-                    status="executing",
-                    error_message=None
-                )
-                db.add(db_history)
-                await db.commit()
-                await db.refresh(db_history)
-                execution_id = db_history.id
-                logger.info(f"💾 Created initial history record ID: {execution_id}")
-        except Exception as db_init_err:
-            logger.error(f"❌ Failed to create initial history record: {db_init_err}")
-            import traceback
-            traceback.print_exc()
-            # Non-fatal for analysis itself, but history won't work
-            pass
+        # ⏯️ Resume an interrupted execution from its last completed node
+        resume_point = None
+        if request.resume_execution_id:
+            execution_id, thread_id, resume_point = await _load_resumable_execution(graph, request)
+
+        # 📊 1. Create ExecutionHistory record IMMEDIATELY (a resumed run reuses its record)
+        if execution_id is None:
+            try:
+                logger.info("🔌 Attempting to connect to database...")
+                async with AsyncSessionLocal() as db:
+                    logger.info("✅ Database connection established")
+                    db_history = ExecutionHistory(
+                        ticker=request.ticker,
+                        analysis_date=request.analysis_date,
+                        status="executing",
+                        error_message=None,
+                        cache_key=cache_key,
+                    )
+                    db.add(db_history)
+                    await db.commit()
+                    await db.refresh(db_history)
+                    execution_id = db_history.id
+                    if graph.checkpointer is not None:
+                        db_history.checkpoint_thread_id = thread_id_for_execution(execution_id)
+                        await db.commit()
+                    logger.info(f"💾 Created initial history record ID: {execution_id}")
+            except Exception as db_init_err:
+                logger.error(f"❌ Failed to create initial history record: {db_init_err}")
+                import traceback
+                traceback.print_exc()
+                # Non-fatal for analysis itself, but history won't work
+                pass
+
+        if thread_id is None and graph.checkpointer is not None:
+            # Without a history row the run is still checkpointed, just not resumable via the API
+            thread_id = thread_id_for_execution(execution_id) if execution_id else f"adhoc-{uuid.uuid4().hex}"
+        args = graph.propagator.get_graph_args(thread_id=thread_id)
 
         # Initialize agent statuses
         agent_status = {
@@ -184,12 +311,36 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
             "Portfolio Manager": "pending",
         }
 
+        if quick:
+            # ⚡ Quick screen: only the analysts and one decision node run
+            agent_status = {
+                name: status for name, status in agent_status.items()
+                if name.endswith(" Analyst") and name.split()[0] in ("Market", "Social", "News", "Fundamentals")
+            }
+            agent_status["Portfolio Manager"] = "pending"
+
+        # Analysts fan out concurrently, so they all start at once
+        if config.get("parallel_analysts", True):
+            for analyst in request.analysts:
+                agent_status[f"{analyst.capitalize()} Analyst"] = "in_progress"
+
         # Send initial status
         await send_update(websocket, "status", {
             "message": f"Starting analysis for {request.ticker} on {request.analysis_date}",
-            "agents": agent_status
+            "agents": agent_status,
+            "execution_id": execution_id,
         })
 
+        if resume_point:
+            # None input -> LangGraph continues from the saved checkpoint; the first
+            # streamed chunk replays the saved state so finished reports are re-sent
+            init_agent_state = None
+            await send_update(websocket, "status", {
+                "message": f"Resuming from checkpoint (next: {', '.join(resume_point['next'])})",
+                "agents": agent_status,
+                "execution_id": execution_id,
+            })
+
         # Track report sections
         report_sections = {
             "market_report": None,
@@ -201,12 +352,49 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
             "final_trade_decision": None,
         }
 
-        # Stream the analysis
-        trace = []
-        buffered_reports = []  # Buffer for reports
+        # Stream the analysis as per-node deltas folded into one running state;
+        # events are only sent for the keys a node actually changed
+        state = StateAccumulator(init_agent_state)
+        replayed = []
+        if resume_point:
+            # The saved state is the starting point; re-send its finished reports once
+            snapshot = await graph.get_checkpoint(thread_id)
+            state = StateAccumulator(snapshot.values)
+            replayed.append(dict(snapshot.values))
+
+        # ⌨️ LLM tokens of the running agents, sent as batched `token` events (api/token_stream.py)
+        stream_tokens = config.get("stream_tokens", True)
+        if stream_tokens:
+            args["stream_mode"] = ["updates", "messages"]
+        tokens = TokenBatcher(
+            lambda update_type, data: send_update(websocket, update_type, data),
+            config.get("token_flush_ms", 100) / 1000,
+        )
+
+        async def state_deltas():
+            for changed in replayed:
+                yield changed
+            async for item in graph.graph.astream(init_agent_state, **args):
+                if stream_tokens:
+                    mode, update = item
+                    if mode == "messages":
+                        message, metadata = update
+                        tokens.add(metadata.get("langgraph_node", ""), message)
+                        continue
+                    # The node finished: its last tokens go out before its report
+                    for node in update:
+                        await tokens.flush(node)
+                else:
+                    update = item
+                changed = state.apply(update)
+                if changed:
+                    yield changed
+
+        tokens.start()
+        checkpoint_stack.push_async_callback(tokens.stop)
 
-        async for chunk in graph.graph.astream(init_agent_state, **args):
-            if len(chunk.get("messages", [])) > 0:
+        async for chunk in state_deltas():
+            if chunk.get("messages"):
                 # Get the last message from the chunk
                 last_message = chunk["messages"][-1]
 
@@ -239,269 +427,257 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                             "args": tool_args
                         })
 
-                # Update agent statuses and reports based on chunk content
-                # Analyst Team Reports
-                if "market_report" in chunk and chunk["market_report"]:
-                    report_sections["market_report"] = chunk["market_report"]
-                    agent_status["Market Analyst"] = "completed"
-                    # Save report
-                    with open(report_dir / "market_report.md", "w", encoding="utf-8") as f:
-                        f.write(chunk["market_report"])
-                    
-                    # Buffer report instead of sending
-                    buffered_reports.append({
-                        "section": "market_report",
-                        "label": "Market Analysis",
-                        "content": chunk["market_report"]
-                    })
-                    
-                    if request.analysts and "social" in request.analysts:
-                        agent_status["Social Analyst"] = "in_progress"
-                    await send_update(websocket, "status", {"agents": agent_status})
-
-                if "sentiment_report" in chunk and chunk["sentiment_report"]:
-                    report_sections["sentiment_report"] = chunk["sentiment_report"]
-                    agent_status["Social Analyst"] = "completed"
-                    # Save report
-                    with open(report_dir / "sentiment_report.md", "w", encoding="utf-8") as f:
-                        f.write(chunk["sentiment_report"])
-                    
-                    buffered_reports.append({
-                        "section": "sentiment_report",
-                        "label": "Social Sentiment",
-                        "content": chunk["sentiment_report"]
-                    })
-                    
-                    if request.analysts and "news" in request.analysts:
-                        agent_status["News Analyst"] = "in_progress"
-                    await send_update(websocket, "status", {"agents": agent_status})
+            # Update agent statuses and reports based on chunk content
+            # Analyst Team Reports
+            if "market_report" in chunk and chunk["market_report"]:
+                report_sections["market_report"] = chunk["market_report"]
+                agent_status["Market Analyst"] = "completed"
+                # Save report
+                with open(report_dir / "market_report.md", "w", encoding="utf-8") as f:
+                    f.write(chunk["market_report"])
+                
+                # Send the finished section right away
+                await send_update(websocket, "report", {
+                    "section": "market_report",
+                    "label": "Market Analysis",
+                    "content": chunk["market_report"]
+                })
+                
+                if request.analysts and "social" in request.analysts:
+                    agent_status["Social Analyst"] = "in_progress"
+                await send_update(websocket, "status", {"agents": agent_status})
+
+            if "sentiment_report" in chunk and chunk["sentiment_report"]:
+                report_sections["sentiment_report"] = chunk["sentiment_report"]
+                agent_status["Social Analyst"] = "completed"
+                # Save report
+                with open(report_dir / "sentiment_report.md", "w", encoding="utf-8") as f:
+                    f.write(chunk["sentiment_report"])
+                
+                await send_update(websocket, "report", {
+                    "section": "sentiment_report",
+                    "label": "Social Sentiment",
+                    "content": chunk["sentiment_report"]
+                })
+                
+                if request.analysts and "news" in request.analysts:
+                    agent_status["News Analyst"] = "in_progress"
+                await send_update(websocket, "status", {"agents": agent_status})
+
+            if "news_report" in chunk and chunk["news_report"]:
+                report_sections["news_report"] = chunk["news_report"]
+                agent_status["News Analyst"] = "completed"
+                # Save report
+                with open(report_dir / "news_report.md", "w", encoding="utf-8") as f:
+                    f.write(chunk["news_report"])
+                
+                await send_update(websocket, "report", {
+                    "section": "news_report",
+                    "label": "News Analysis",
+                    "content": chunk["news_report"]
+                })
+                
+                if request.analysts and "fundamentals" in request.analysts:
+                    agent_status["Fundamentals Analyst"] = "in_progress"
+                await send_update(websocket, "status", {"agents": agent_status})
+
+            if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
+                report_sections["fundamentals_report"] = chunk["fundamentals_report"]
+                agent_status["Fundamentals Analyst"] = "completed"
+                # Save report
+                with open(report_dir / "fundamentals_report.md", "w", encoding="utf-8") as f:
+                    f.write(chunk["fundamentals_report"])
+                
+                await send_update(websocket, "report", {
+                    "section": "fundamentals_report",
+                    "label": "Fundamentals Review",
+                    "content": chunk["fundamentals_report"]
+                })
+                
+                # Start research team
+                if not quick:
+                    agent_status["Bull Researcher"] = "in_progress"
+                    agent_status["Bear Researcher"] = "in_progress"
+                    agent_status["Research Manager"] = "in_progress"
+                await send_update(websocket, "status", {"agents": agent_status})
 
-                if "news_report" in chunk and chunk["news_report"]:
-                    report_sections["news_report"] = chunk["news_report"]
-                    agent_status["News Analyst"] = "completed"
-                    # Save report
-                    with open(report_dir / "news_report.md", "w", encoding="utf-8") as f:
-                        f.write(chunk["news_report"])
-                    
-                    buffered_reports.append({
-                        "section": "news_report",
-                        "label": "News Analysis",
-                        "content": chunk["news_report"]
-                    })
-                    
-                    if request.analysts and "fundamentals" in request.analysts:
-                        agent_status["Fundamentals Analyst"] = "in_progress"
-                    await send_update(websocket, "status", {"agents": agent_status})
+            # Research Team - Handle Investment Debate State
+            if "investment_debate_state" in chunk and chunk["investment_debate_state"] is not None:
+                debate_state = chunk["investment_debate_state"]
+                
+                # Safety check: ensure debate_state is a dict
+                if not isinstance(debate_state, dict):
+                    debate_state = {}
 
-                if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
-                    report_sections["fundamentals_report"] = chunk["fundamentals_report"]
-                    agent_status["Fundamentals Analyst"] = "completed"
-                    # Save report
-                    with open(report_dir / "fundamentals_report.md", "w", encoding="utf-8") as f:
-                        f.write(chunk["fundamentals_report"])
-                    
-                    buffered_reports.append({
-                        "section": "fundamentals_report",
-                        "label": "Fundamentals Review",
-                        "content": chunk["fundamentals_report"]
-                    })
-                    
-                    # Start research team
+                # Update Bull Researcher status and report
+                if debate_state and "bull_history" in debate_state and debate_state.get("bull_history"):
                     agent_status["Bull Researcher"] = "in_progress"
                     agent_status["Bear Researcher"] = "in_progress"
                     agent_status["Research Manager"] = "in_progress"
                     await send_update(websocket, "status", {"agents": agent_status})
-
-                # Research Team - Handle Investment Debate State
-                if "investment_debate_state" in chunk and chunk["investment_debate_state"] is not None:
-                    debate_state = chunk["investment_debate_state"]
                     
-                    # Safety check: ensure debate_state is a dict
-                    if not isinstance(debate_state, dict):
-                        debate_state = {}
-
-                    # Update Bull Researcher status and report
-                    if debate_state and "bull_history" in debate_state and debate_state.get("bull_history"):
-                        agent_status["Bull Researcher"] = "in_progress"
-                        agent_status["Bear Researcher"] = "in_progress"
-                        agent_status["Research Manager"] = "in_progress"
-                        await send_update(websocket, "status", {"agents": agent_status})
-                        
-                        # Extract latest bull response
-                        bull_responses = debate_state["bull_history"].split("\n")
-                        latest_bull = bull_responses[-1] if bull_responses else ""
-                        if latest_bull:
-                            await send_update(websocket, "message", {
-                                "type": "Reasoning",
-                                "content": latest_bull
-                            })
-                            
-                            # Update research report with bull's latest analysis
-                            current_plan = report_sections.get("investment_plan") or ""
-                            if "Bull Researcher Analysis" not in current_plan:
-                                report_sections["investment_plan"] = f"### Bull Researcher Analysis\n{latest_bull}"
-                            else:
-                                # Update existing bull section
-                                parts = current_plan.split("### Bear Researcher Analysis")
-                                report_sections["investment_plan"] = f"{parts[0].split('### Bull Researcher Analysis')[0]}### Bull Researcher Analysis\n{latest_bull}" + (f"\n\n### Bear Researcher Analysis{parts[1]}" if len(parts) > 1 else "")
-                            
-                            # We don't buffer intermediate partial updates for investment plan, 
-                            # we wait for the final decision or just update internally.
-                            # BUT the frontend might expect updates to see "what's happening".
-                            # However, "Report" sections usually are static text. 
-                            # Let's buffer the LATEST version of investment plan only when it's final?
-                            # The original code sent 'report' updates here.
-                            # If we want "show only when finished", we should probably suppress these interim report updates
-                            # and only send the final consolidated one.
-
-                    # Update Bear Researcher status and report
-                    if debate_state and "bear_history" in debate_state and debate_state.get("bear_history"):
-                        agent_status["Bull Researcher"] = "in_progress"
-                        agent_status["Bear Researcher"] = "in_progress"
-                        agent_status["Research Manager"] = "in_progress"
-                        await send_update(websocket, "status", {"agents": agent_status})
-                        
-                        # Extract latest bear response
-                        bear_responses = debate_state["bear_history"].split("\n")
-                        latest_bear = bear_responses[-1] if bear_responses else ""
-                        if latest_bear:
-                            await send_update(websocket, "message", {
-                                "type": "Reasoning",
-                                "content": latest_bear
-                            })
-                            
-                            # Update research report with bear's latest analysis
-                            current_plan = report_sections.get("investment_plan") or ""
-                            if "Bear Researcher Analysis" not in current_plan:
-                                report_sections["investment_plan"] = f"{current_plan}\n\n### Bear Researcher Analysis\n{latest_bear}"
-                            else:
-                                # Update existing bear section
-                                parts = current_plan.split("### Bear Researcher Analysis")
-                                report_sections["investment_plan"] = parts[0] + f"\n\n### Bear Researcher Analysis\n{latest_bear}"
-                            
-                            # Suppress interim report update
-
-                    # Update Research Manager status and final decision
-                    if debate_state and "judge_decision" in debate_state and debate_state.get("judge_decision"):
-                        agent_status["Bull Researcher"] = "completed"
-                        agent_status["Bear Researcher"] = "completed"
-                        agent_status["Research Manager"] = "completed"
+                    # Extract latest bull response
+                    bull_responses = debate_state["bull_history"].split("\n")
+                    latest_bull = bull_responses[-1] if bull_responses else ""
+                    if latest_bull:
+                        await send_update(websocket, "message", {
+                            "type": "Reasoning",
+                            "content": latest_bull
+                        })
                         
-                        # Append judge decision to investment plan
+                        # Update research report with bull's latest analysis
                         current_plan = report_sections.get("investment_plan") or ""
-                        report_sections["investment_plan"] = f"{current_plan}\n\n### Research Manager Decision\n{debate_state['judge_decision']}"
-                        
-                        # Save report
-                        with open(report_dir / "investment_plan.md", "w", encoding="utf-8") as f:
-                            f.write(report_sections["investment_plan"])
-                        
-                        buffered_reports.append({
-                            "section": "investment_plan",
-                            "label": "Research Team Decision",
-                            "content": report_sections["investment_plan"]
-                        })
+                        if "Bull Researcher Analysis" not in current_plan:
+                            report_sections["investment_plan"] = f"### Bull Researcher Analysis\n{latest_bull}"
+                        else:
+                            # Update existing bull section
+                            parts = current_plan.split("### Bear Researcher Analysis")
+                            report_sections["investment_plan"] = f"{parts[0].split('### Bull Researcher Analysis')[0]}### Bull Researcher Analysis\n{latest_bull}" + (f"\n\n### Bear Researcher Analysis{parts[1]}" if len(parts) > 1 else "")
                         
+                        # No interim report here: the debate text already streams as `token`
+                        # events, the consolidated investment plan is sent with the judge decision
+
+                # Update Bear Researcher status and report
+                if debate_state and "bear_history" in debate_state and debate_state.get("bear_history"):
+                    agent_status["Bull Researcher"] = "in_progress"
+                    agent_status["Bear Researcher"] = "in_progress"
+                    agent_status["Research Manager"] = "in_progress"
+                    await send_update(websocket, "status", {"agents": agent_status})
+                    
+                    # Extract latest bear response
+                    bear_responses = debate_state["bear_history"].split("\n")
+                    latest_bear = bear_responses[-1] if bear_responses else ""
+                    if latest_bear:
                         await send_update(websocket, "message", {
                             "type": "Reasoning",
-                            "content": f"Research Manager: {debate_state['judge_decision']}"
+                            "content": latest_bear
                         })
                         
-                        agent_status["Trader"] = "in_progress"
-                        await send_update(websocket, "status", {"agents": agent_status})
+                        # Update research report with bear's latest analysis
+                        current_plan = report_sections.get("investment_plan") or ""
+                        if "Bear Researcher Analysis" not in current_plan:
+                            report_sections["investment_plan"] = f"{current_plan}\n\n### Bear Researcher Analysis\n{latest_bear}"
+                        else:
+                            # Update existing bear section
+                            parts = current_plan.split("### Bear Researcher Analysis")
+                            report_sections["investment_plan"] = parts[0] + f"\n\n### Bear Researcher Analysis\n{latest_bear}"
+                        
+                        # Suppress interim report update
 
-                # Trading Team
-                if "trader_investment_plan" in chunk and chunk["trader_investment_plan"]:
-                    report_sections["trader_investment_plan"] = chunk["trader_investment_plan"]
-                    agent_status["Trader"] = "completed"
+                # Update Research Manager status and final decision
+                if debate_state and "judge_decision" in debate_state and debate_state.get("judge_decision"):
+                    agent_status["Bull Researcher"] = "completed"
+                    agent_status["Bear Researcher"] = "completed"
+                    agent_status["Research Manager"] = "completed"
+                    
+                    # Append judge decision to investment plan
+                    current_plan = report_sections.get("investment_plan") or ""
+                    report_sections["investment_plan"] = f"{current_plan}\n\n### Research Manager Decision\n{debate_state['judge_decision']}"
+                    
                     # Save report
-                    with open(report_dir / "trader_investment_plan.md", "w", encoding="utf-8") as f:
-                        f.write(chunk["trader_investment_plan"])
+                    with open(report_dir / "investment_plan.md", "w", encoding="utf-8") as f:
+                        f.write(report_sections["investment_plan"])
                     
-                    buffered_reports.append({
-                        "section": "trader_investment_plan",
-                        "label": "Trader Investment Plan",
-                        "content": chunk["trader_investment_plan"]
+                    await send_update(websocket, "report", {
+                        "section": "investment_plan",
+                        "label": "Research Team Decision",
+                        "content": report_sections["investment_plan"]
                     })
                     
-                    agent_status["Risky Analyst"] = "in_progress"
+                    await send_update(websocket, "message", {
+                        "type": "Reasoning",
+                        "content": f"Research Manager: {debate_state['judge_decision']}"
+                    })
+                    
+                    agent_status["Trader"] = "in_progress"
                     await send_update(websocket, "status", {"agents": agent_status})
 
-                # Risk Management Team
-                if "risk_debate_state" in chunk and chunk["risk_debate_state"] is not None:
-                    risk_state = chunk["risk_debate_state"]
-                    
-                    # Safety check: ensure risk_state is a dict
-                    if not isinstance(risk_state, dict):
-                        risk_state = {}
+            # Trading Team
+            if "trader_investment_plan" in chunk and chunk["trader_investment_plan"]:
+                report_sections["trader_investment_plan"] = chunk["trader_investment_plan"]
+                agent_status["Trader"] = "completed"
+                # Save report
+                with open(report_dir / "trader_investment_plan.md", "w", encoding="utf-8") as f:
+                    f.write(chunk["trader_investment_plan"])
+                
+                await send_update(websocket, "report", {
+                    "section": "trader_investment_plan",
+                    "label": "Trader Investment Plan",
+                    "content": chunk["trader_investment_plan"]
+                })
+                
+                agent_status["Risky Analyst"] = "in_progress"
+                await send_update(websocket, "status", {"agents": agent_status})
 
-                    if risk_state and "current_risky_response" in risk_state and risk_state.get("current_risky_response"):
-                        agent_status["Risky Analyst"] = "in_progress"
-                        await send_update(websocket, "status", {"agents": agent_status})
-                        await send_update(websocket, "message", {
-                            "type": "Reasoning",
-                            "content": f"Risky Analyst: {risk_state['current_risky_response']}"
-                        })
+            # Risk Management Team
+            if "risk_debate_state" in chunk and chunk["risk_debate_state"] is not None:
+                risk_state = chunk["risk_debate_state"]
+                
+                # Safety check: ensure risk_state is a dict
+                if not isinstance(risk_state, dict):
+                    risk_state = {}
 
-                    if risk_state and "current_safe_response" in risk_state and risk_state.get("current_safe_response"):
-                        agent_status["Safe Analyst"] = "in_progress"
-                        await send_update(websocket, "status", {"agents": agent_status})
-                        await send_update(websocket, "message", {
-                            "type": "Reasoning",
-                            "content": f"Safe Analyst: {risk_state['current_safe_response']}"
-                        })
+                if risk_state and "current_risky_response" in risk_state and risk_state.get("current_risky_response"):
+                    agent_status["Risky Analyst"] = "in_progress"
+                    await send_update(websocket, "status", {"agents": agent_status})
+                    await send_update(websocket, "message", {
+                        "type": "Reasoning",
+                        "content": f"Risky Analyst: {risk_state['current_risky_response']}"
+                    })
 
-                    if risk_state and "current_neutral_response" in risk_state and risk_state.get("current_neutral_response"):
-                        agent_status["Neutral Analyst"] = "in_progress"
-                        await send_update(websocket, "status", {"agents": agent_status})
-                        await send_update(websocket, "message", {
-                            "type": "Reasoning",
-                            "content": f"Neutral Analyst: {risk_state['current_neutral_response']}"
-                        })
+                if risk_state and "current_safe_response" in risk_state and risk_state.get("current_safe_response"):
+                    agent_status["Safe Analyst"] = "in_progress"
+                    await send_update(websocket, "status", {"agents": agent_status})
+                    await send_update(websocket, "message", {
+                        "type": "Reasoning",
+                        "content": f"Safe Analyst: {risk_state['current_safe_response']}"
+                    })
+
+                if risk_state and "current_neutral_response" in risk_state and risk_state.get("current_neutral_response"):
+                    agent_status["Neutral Analyst"] = "in_progress"
+                    await send_update(websocket, "status", {"agents": agent_status})
+                    await send_update(websocket, "message", {
+                        "type": "Reasoning",
+                        "content": f"Neutral Analyst: {risk_state['current_neutral_response']}"
+                    })
 
-                    if risk_state and "judge_decision" in risk_state and risk_state.get("judge_decision"):
+                if risk_state and "judge_decision" in risk_state and risk_state.get("judge_decision"):
+                    if not quick:
                         agent_status["Risky Analyst"] = "completed"
                         agent_status["Safe Analyst"] = "completed"
                         agent_status["Neutral Analyst"] = "completed"
-                        agent_status["Portfolio Manager"] = "completed"
-                        
-                        # Build final decision report with all risk analysis
-                        current_decision = report_sections.get("final_trade_decision") or ""
-                        if "Portfolio Manager Decision" not in current_decision:
-                            report_sections["final_trade_decision"] = f"{current_decision}\n\n### Portfolio Manager Decision\n{risk_state['judge_decision']}"
-                        else:
-                            # Update existing decision
-                            parts = current_decision.split("### Portfolio Manager Decision")
-                            report_sections["final_trade_decision"] = parts[0] + f"\n\n### Portfolio Manager Decision\n{risk_state['judge_decision']}"
-                        
-                        # Save report
-                        with open(report_dir / "final_trade_decision.md", "w", encoding="utf-8") as f:
-                            f.write(report_sections["final_trade_decision"])
-                        
-                        buffered_reports.append({
-                            "section": "final_trade_decision",
-                            "label": "Portfolio Management Decision",
-                            "content": report_sections["final_trade_decision"]
-                        })
-                        
-                        await send_update(websocket, "message", {
-                            "type": "Reasoning",
-                            "content": f"Portfolio Manager: {risk_state['judge_decision']}"
-                        })
-                        
-                        await send_update(websocket, "status", {"agents": agent_status})
-
-            trace.append(chunk)
+                    agent_status["Portfolio Manager"] = "completed"
+                    
+                    # Build final decision report with all risk analysis
+                    current_decision = report_sections.get("final_trade_decision") or ""
+                    if "Portfolio Manager Decision" not in current_decision:
+                        report_sections["final_trade_decision"] = f"{current_decision}\n\n### Portfolio Manager Decision\n{risk_state['judge_decision']}"
+                    else:
+                        # Update existing decision
+                        parts = current_decision.split("### Portfolio Manager Decision")
+                        report_sections["final_trade_decision"] = parts[0] + f"\n\n### Portfolio Manager Decision\n{risk_state['judge_decision']}"
+                    
+                    # Save report
+                    with open(report_dir / "final_trade_decision.md", "w", encoding="utf-8") as f:
+                        f.write(report_sections["final_trade_decision"])
+                    
+                    await send_update(websocket, "report", {
+                        "section": "final_trade_decision",
+                        "label": "Portfolio Management Decision",
+                        "content": report_sections["final_trade_decision"]
+                    })
+                    
+                    await send_update(websocket, "message", {
+                        "type": "Reasoning",
+                        "content": f"Portfolio Manager: {risk_state['judge_decision']}"
+                    })
+                    
+                    await send_update(websocket, "status", {"agents": agent_status})
 
-        # Send all buffered reports now
-        for report in buffered_reports:
-            await send_update(websocket, "report", report)
-            await asyncio.sleep(0.05)
+        await tokens.stop()
 
-        # Get final state by merging all trace chunks (each chunk only contains incremental changes)
-        final_state_graph = {}
-        for chunk in trace:
-            if isinstance(chunk, dict):
-                final_state_graph.update(chunk)
+        # Final state = the running merged state
+        final_state_graph = dict(state.state)
         
         # Also include the accumulated report_sections which were collected during streaming
         final_state_graph.update(report_sections)
@@ -526,8 +702,8 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                 create_summarizer_trader
             )
 
-            # Create summarizers
-            summarizers = {
+            # Create summarizers (none for a quick screen: nothing to summarize but the decision)
+            summarizers = {} if quick else {
                 "Summarize_fundamentals_report": create_summarizer_fundamental(),
                 "Summarize_market_report": create_summarizer_market(),
                 "Summarize_social_report": create_summarizer_social(),
@@ -543,7 +719,7 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
             }
 
             # Prepare directories
-            output_dir = PROJECT_ROOT / "output"
+            output_dir = OUTPUT_DIR
             sum_dir = output_dir / "sum"
             full_dir = output_dir / "full"
             sum_dir.mkdir(parents=True, exist_ok=True)
@@ -760,7 +936,7 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
             full_translation_tasks = []
             for key, title in full_report_keys:
                 content = final_state_graph.get(key)
-                if content:
+                if content and not quick:
                     full_translation_tasks.append(
                         translate_single_report(key, title, content, "full")
                     )
@@ -860,12 +1036,19 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                 ("Summarize_final_trade_decision_report", "sum_final_decision.txt", "final_decision.json", "final_trade_decision"),
             ]
 
+            if quick:
+                # Quick screen: only the analyst reports and the decision exist
+                file_mappings = [m for m in file_mappings if m[3] in QUICK_REPORT_KEYS]
+
+            # Output files of THIS run; the others in output/ are left over from earlier runs
+            written_files = set()
             for sum_key, sum_file, full_file, full_key in file_mappings:
                 # Write Summary (English)
                 sum_content = final_state_graph.get(sum_key)
                 if sum_content:
                     with open(sum_dir / sum_file, 'w', encoding='utf-8') as f:
                         f.write(str(sum_content))
+                    written_files.add(sum_file)
                 
                 # Write Summary (Thai) - _th version
                 if sum_key in summary_translations and summary_translations[sum_key].get("content_th"):
@@ -883,6 +1066,7 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                 # Write Full (English)
                 full_content = final_state_graph.get(full_key)
                 if full_content:
+                    written_files.add(full_file)
                     with open(full_dir / full_file, 'w', encoding='utf-8') as f:
                         # If the content is a dict or list, dump as JSON. If string, write as is (or check ext)
                         if full_file.endswith(".json") and not isinstance(full_content, str):
@@ -968,6 +1152,8 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                         
                         if db_history:
                             db_history.status = "success"
+                            for field, value in (await _checkpoint_fields(graph, thread_id)).items():
+                                setattr(db_history, field, value)
                             
                             # Log the paths we're looking at
                             logger.info(f"📂 sum_dir path: {sum_dir}")
@@ -1020,7 +1206,7 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                             # Read summary reports
                             for filename, report_type, title in sum_files:
                                 filepath = sum_dir / filename
-                                if filepath.exists():
+                                if filename in written_files and filepath.exists():
                                     try:
                                         with open(filepath, 'r', encoding='utf-8') as f:
                                             content = f.read()
@@ -1038,7 +1224,7 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                             # Read full reports
                             for filename, report_type, title in full_files:
                                 filepath = full_dir / filename
-                                if filepath.exists():
+                                if filename in written_files and filepath.exists():
                                     try:
                                         with open(filepath, 'r', encoding='utf-8') as f:
                                             raw_content = f.read()
@@ -1067,36 +1253,9 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                             logger.info(f"🇹🇭 Using pre-translated content: {len(full_translations)} full, {len(summary_translations)} summary")
                             
                             # Map titles to translation keys
-                            title_to_full_key = {
-                                "Fundamentals Review": "fundamentals_report",
-                                "Market Analysis": "market_report",
-                                "Social Sentiment": "sentiment_report",
-                                "News Analysis": "news_report",
-                                "Research Team Decision": "investment_debate_state",
-                                "Trader Plan": "trader_investment_plan",
-                                "Portfolio Management Decision": "risk_debate_state",
-                                "Bull Case": "investment_debate_state",
-                                "Bear Case": "investment_debate_state",
-                                "Risk: Conservative": "risk_debate_state",
-                                "Risk: Aggressive": "risk_debate_state",
-                                "Risk: Neutral": "risk_debate_state",
-                            }
-                            
-                            title_to_sum_key = {
-                                "Fundamentals Review": "Summarize_fundamentals_report",
-                                "Market Analysis": "Summarize_market_report",
-                                "Social Sentiment": "Summarize_social_report",
-                                "News Analysis": "Summarize_news_report",
-                                "Bull Case": "bull_researcher_summarizer",
-                                "Bear Case": "bear_researcher_summarizer",
-                                "Risk: Conservative": "Summarize_conservative_report",
-                                "Risk: Aggressive": "Summarize_aggressive_report",
-                                "Risk: Neutral": "Summarize_neutral_report",
-                                "Trader Plan": "trader_summarizer",
-                                "Research Team Decision": "Summarize_investment_plan_report",
-                                "Portfolio Management Decision": "Summarize_final_trade_decision_report",
-                            }
-                            
+                            title_to_full_key = TITLE_TO_FULL_KEY
+                            title_to_sum_key = TITLE_TO_SUM_KEY
+
                             # Create ReportResult objects with Thai translations from pre-processed data
                             reports_to_add = []
                             for report in reports_data:
@@ -1151,7 +1310,9 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
             traceback.print_exc()
 
         
-        decision = graph.process_signal(final_state_graph.get("final_trade_decision", ""))
+        decision = await graph.aprocess_signal(final_state_graph.get("final_trade_decision", ""))
+        if execution_id:
+            await record_decision(execution_id, decision)
 
         # Prepare final state to send to frontend (include summaries)
         frontend_final_state = {
@@ -1196,6 +1357,8 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                     db_history = res.scalar_one_or_none()
                     if db_history:
                         db_history.status = "cancelled"
+                        for field, value in (await _checkpoint_fields(graph, thread_id)).items():
+                            setattr(db_history, field, value)
                         db_history.error_message = "Analysis was cancelled by user"
                         await db.commit()
                         logger.info(f"💾 Updated history {execution_id} with cancelled status.")
@@ -1214,6 +1377,8 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                     db_history = res.scalar_one_or_none()
                     if db_history:
                         db_history.status = "error"
+                        for field, value in (await _checkpoint_fields(graph, thread_id)).items():
+                            setattr(db_history, field, value)
                         db_history.error_message = str(e)
                         await db.commit()
                         logger.info(f"💾 Updated history {execution_id} with error status.")
@@ -1221,13 +1386,23 @@ async def run_analysis_stream(websocket: WebSocket, request: AnalysisRequest):
                 logger.error(f"❌ Failed to update history status on error: {db_update_err}")
 
         await send_update(websocket, "error", {
-            "message": str(e)
+            "message": str(e),
+            # Clients can retry with resume_execution_id to skip completed nodes
+            "execution_id": execution_id,
+            "resumable": graph is not None and graph.checkpointer is not None and execution_id is not None,
         })
         raise
 
+    finally:
+        if execution_id:
+            await save_execution_metrics(execution_id, telemetry)
+        await checkpoint_stack.aclose()
+
 from api.history_router import router as history_router
 from api.report_router import router as report_router
 from api.translation_router import router as translation_router
+from api.screener_router import router as screener_router, shutdown_screener_pool
+from api.intraday import intraday_collector
 # ↑ path ต้องตรงจริง ๆ
 
 # Create FastAPI app
@@ -1246,9 +1421,31 @@ async def startup_event():
         # Don't print full traceback - just log the warning
         # The server can still function without the database for basic features
 
+    # Background intraday poller that keeps /quote symbols hot in memory
+    intraday_collector.start()
+
+    # 🔌 Shared keep-alive clients for Typhoon (summarizers + translation)
+    await open_http_clients(DEFAULT_CONFIG)
+
+    # 🔥 Build the default graph now so the first analysis does not pay for it
+    if DEFAULT_CONFIG.get("graph_pool") and DEFAULT_CONFIG.get("graph_pool_warmup"):
+        try:
+            await graph_pool.warm_up(
+                ["market", "social", "news", "fundamentals"], DEFAULT_CONFIG.copy()
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Graph pool warm-up failed (graphs will be built on first use): {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await intraday_collector.stop()
+    shutdown_screener_pool()
+    await close_http_clients()
+
 app.include_router(history_router)
 app.include_router(report_router)
 app.include_router(translation_router)
+app.include_router(screener_router)
 
 # Configure CORS
 app.add_middleware(
@@ -1341,9 +1538,15 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
+    llm_cache = open_llm_cache(DEFAULT_CONFIG)
     return {
         "status": "ok",
         "connections": len(active_connections),
+        "graph_pool": graph_pool.stats(),
+        "llm_cache": llm_cache.stats() if llm_cache is not None else None,
+        "rate_limits": rate_limiter_stats(),
+        "http_clients": http_client_stats(),
+        "single_flight": single_flight_stats(),
         "project_root": str(PROJECT_ROOT),
         "web_dir_exists": WEB_DIR.exists()
     }
@@ -1711,6 +1914,20 @@ async def get_telegram_status():
 @app.get("/quote/{ticker}")
 async def get_quote(ticker: str):
     """Fetch real-time quote data for a ticker."""
+    # Hot symbols are served straight from the intraday ring buffer
+    quote = intraday_collector.get_quote(ticker)
+    if quote is not None:
+        return quote
+
+    # Cold symbol: backfill once, after which the collector keeps it updated
+    try:
+        if await intraday_collector.subscribe(ticker) is not None:
+            quote = intraday_collector.get_quote(ticker)
+            if quote is not None:
+                return quote
+    except Exception as e:
+        logger.warning(f"⚠️ Intraday subscribe failed for {ticker}, falling back to direct fetch: {e}")
+
     try:
         t = yf.Ticker(ticker)
         
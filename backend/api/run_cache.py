@@ -0,0 +1,236 @@
+"""
+Whole-run result cache.
+
+A run is identified by a SHA-256 of the AnalysisRequest fields that change the
+output plus the effective graph config. A successful run stores that key on its
+ExecutionHistory row; an identical request later replays the stored reports and
+Thai translations over the WebSocket instead of running the graph again.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from database.database import AsyncSessionLocal
+from database.models import ExecutionHistory
+
+logger = logging.getLogger(__name__)
+
+# Bump when the report format changes so old runs stop matching
+CACHE_VERSION = 1
+
+# Request fields that do not change the analysis output
+_REQUEST_FIELDS_IGNORED = {"user_id", "force_refresh", "resume_execution_id"}
+
+# Config entries that are deployment paths / infrastructure, not analysis inputs
+_CONFIG_FIELDS_IGNORED = {
+    "project_dir", "results_dir", "data_dir", "data_cache_dir",
+    "checkpoint_backend", "checkpoint_db_path", "checkpoint_postgres_url",
+    "run_cache", "run_cache_max_age_hours", "stage_cache", "stage_cache_path",
+    "stage_cache_max_age_hours", "stage_cache_max_entries", "stage_cache_refresh",
+    "graph_pool", "graph_pool_size", "graph_pool_warmup",
+    "llm_cache", "llm_cache_backend", "llm_cache_path",
+    "llm_cache_max_age_hours", "llm_cache_max_entries",
+    "rate_limit", "rate_limits", "http_pool", "single_flight",
+    "stream_tokens", "token_flush_ms",
+}
+
+# Stored report title -> state key of its translation (see run_analysis_stream)
+TITLE_TO_FULL_KEY = {
+    "Fundamentals Review": "fundamentals_report",
+    "Market Analysis": "market_report",
+    "Social Sentiment": "sentiment_report",
+    "News Analysis": "news_report",
+    "Research Team Decision": "investment_debate_state",
+    "Trader Plan": "trader_investment_plan",
+    "Portfolio Management Decision": "risk_debate_state",
+    "Bull Case": "investment_debate_state",
+    "Bear Case": "investment_debate_state",
+    "Risk: Conservative": "risk_debate_state",
+    "Risk: Aggressive": "risk_debate_state",
+    "Risk: Neutral": "risk_debate_state",
+}
+
+TITLE_TO_SUM_KEY = {
+    "Fundamentals Review": "Summarize_fundamentals_report",
+    "Market Analysis": "Summarize_market_report",
+    "Social Sentiment": "Summarize_social_report",
+    "News Analysis": "Summarize_news_report",
+    "Bull Case": "bull_researcher_summarizer",
+    "Bear Case": "bear_researcher_summarizer",
+    "Risk: Conservative": "Summarize_conservative_report",
+    "Risk: Aggressive": "Summarize_aggressive_report",
+    "Risk: Neutral": "Summarize_neutral_report",
+    "Trader Plan": "trader_summarizer",
+    "Research Team Decision": "Summarize_investment_plan_report",
+    "Portfolio Management Decision": "Summarize_final_trade_decision_report",
+}
+
+# Live "report" events: (section, label, stored full report title)
+REPORT_EVENTS = [
+    ("market_report", "Market Analysis", "Market Analysis"),
+    ("sentiment_report", "Social Sentiment", "Social Sentiment"),
+    ("news_report", "News Analysis", "News Analysis"),
+    ("fundamentals_report", "Fundamentals Review", "Fundamentals Review"),
+    ("investment_plan", "Research Team Decision", "Research Team Decision"),
+    ("trader_investment_plan", "Trader Investment Plan", "Trader Plan"),
+    ("final_trade_decision", "Portfolio Management Decision", "Portfolio Management Decision"),
+]
+
+# "complete" event final_state key -> stored full report title
+# (investment_plan / final_trade_decision carry the debate state dicts, as in a live run)
+FINAL_STATE_FULL_TITLES = {
+    "market_report": "Market Analysis",
+    "sentiment_report": "Social Sentiment",
+    "news_report": "News Analysis",
+    "fundamentals_report": "Fundamentals Review",
+    "investment_plan": "Bull Case",
+    "trader_investment_plan": "Trader Plan",
+    "final_trade_decision": "Risk: Conservative",
+}
+
+REPLAY_AGENTS = [
+    "Market Analyst", "Social Analyst", "News Analyst", "Fundamentals Analyst",
+    "Bull Researcher", "Bear Researcher", "Research Manager", "Trader",
+    "Risky Analyst", "Neutral Analyst", "Safe Analyst", "Portfolio Manager",
+]
+
+
+def run_cache_key(request, config: Dict[str, Any]) -> str:
+    """Content address of a run: normalized request fields + effective config."""
+    fields = {k: v for k, v in request.model_dump().items() if k not in _REQUEST_FIELDS_IGNORED}
+    fields["ticker"] = str(fields.get("ticker", "")).upper()
+    fields["llm_provider"] = str(fields.get("llm_provider", "")).lower()
+    if config.get("parallel_analysts", True):
+        # Fan-out runs do not depend on the order analysts were picked in
+        fields["analysts"] = sorted(fields.get("analysts") or [])
+
+    payload = {
+        "version": CACHE_VERSION,
+        "request": fields,
+        "config": {k: v for k, v in config.items() if k not in _CONFIG_FIELDS_IGNORED},
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+async def find_cached_run(cache_key: str, max_age_hours: Optional[float] = None) -> Optional[ExecutionHistory]:
+    """Newest successful run with this key (reports loaded), or None."""
+    try:
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(ExecutionHistory)
+                .options(selectinload(ExecutionHistory.reports))
+                .where(ExecutionHistory.cache_key == cache_key)
+                .where(ExecutionHistory.status == "success")
+                .where(ExecutionHistory.decision.is_not(None))
+                .order_by(ExecutionHistory.timestamp.desc())
+                .limit(1)
+            )
+            if max_age_hours:
+                cutoff = datetime.datetime.utcnow() - datetime.timedelta(hours=max_age_hours)
+                stmt = stmt.where(ExecutionHistory.timestamp >= cutoff)
+            res = await db.execute(stmt)
+            return res.scalar_one_or_none()
+    except Exception as e:
+        logger.warning(f"⚠️ Run cache lookup failed: {e}")
+        return None
+
+
+async def record_decision(execution_id: int, decision: str):
+    """Store the processed signal; a run only becomes a cache hit once it has one."""
+    try:
+        async with AsyncSessionLocal() as db:
+            db_history = await db.get(ExecutionHistory, execution_id)
+            if db_history:
+                db_history.decision = decision
+                await db.commit()
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to store decision for execution {execution_id}: {e}")
+
+
+def _unwrap(content):
+    # Text reports are stored as {"text": ...}; JSON reports as the parsed object
+    if isinstance(content, dict) and set(content) == {"text"}:
+        return content["text"]
+    return content
+
+
+def build_replay(history: ExecutionHistory) -> Dict[str, Any]:
+    """Rebuild the WebSocket payloads of a finished run from its stored reports."""
+    full = {r.title: r for r in history.reports if r.report_type == "full_report"}
+    summary = {r.title: r for r in history.reports if r.report_type == "sum_report"}
+
+    reports = [
+        {"section": section, "label": label, "content": _unwrap(full[title].content)}
+        for section, label, title in REPORT_EVENTS
+        if title in full and full[title].content
+    ]
+
+    thai_reports = []
+    seen = set()
+    for title, report in full.items():
+        key = TITLE_TO_FULL_KEY.get(title)
+        if key and key not in seen and report.content_th:
+            seen.add(key)
+            thai_reports.append({
+                "section": key,
+                "report_type": "full",
+                "label": report.title_th or title,
+                "content": report.content_th,
+            })
+    for title, report in summary.items():
+        key = TITLE_TO_SUM_KEY.get(title)
+        if key and report.content_th:
+            thai_reports.append({
+                "section": key,
+                "report_type": "summary",
+                "label": report.title_th or title,
+                "content": report.content_th,
+            })
+
+    final_state = {
+        key: _unwrap(full[title].content) if title in full else None
+        for key, title in FINAL_STATE_FULL_TITLES.items()
+    }
+    for title, key in TITLE_TO_SUM_KEY.items():
+        final_state[key] = _unwrap(summary[title].content) if title in summary else None
+
+    return {
+        "reports": reports,
+        "thai_reports": thai_reports,
+        "final_state": final_state,
+        "decision": history.decision,
+    }
+
+
+async def replay_cached_run(
+    websocket,
+    history: ExecutionHistory,
+    send_update: Callable[[Any, str, Dict[str, Any]], Awaitable[None]],
+):
+    """Stream a stored run to the client in the same event order as a live run."""
+    replay = build_replay(history)
+    logger.info(f"⚡ Run cache hit: replaying execution {history.id} ({len(replay['reports'])} reports)")
+
+    await send_update(websocket, "status", {
+        "message": f"Loaded cached analysis for {history.ticker} on {history.analysis_date}",
+        "agents": {name: "completed" for name in REPLAY_AGENTS},
+        "execution_id": history.id,
+        "cached": True,
+    })
+    for report in replay["reports"]:
+        await send_update(websocket, "report", report)
+    for report in replay["thai_reports"]:
+        await send_update(websocket, "thai_report", report)
+    await send_update(websocket, "complete", {
+        "decision": replay["decision"],
+        "final_state": replay["final_state"],
+        "cached": True,
+        "execution_id": history.id,
+    })
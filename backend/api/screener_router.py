@@ -0,0 +1,129 @@
+# api/screener_router.py
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException
+
+from api.stock_data import get_tickers_by_market
+from tradingagents.dataflows.price_store import (
+    INTRADAY_REFRESH_SECONDS,
+    current_trading_day,
+    get_price_store,
+)
+from tradingagents.dataflows.screener import RULES, parse_rules, screen_chunk
+
+router = APIRouter(
+    prefix="/api/screener",
+    tags=["screener"]
+)
+
+# Symbols per process-pool task; small enough to spread across workers,
+# large enough that pickling overhead stays negligible
+CHUNK_SIZE = 16
+
+_pool: Optional[ProcessPoolExecutor] = None
+# (market, trading_day, rules) -> (response, expires_at). Scans over closed bars
+# are kept for the day (expires_at None); scans during the session hold partial
+# bars and expire with the price store's intraday refresh.
+_results_cache: Dict[Tuple[str, str, Tuple[str, ...]], Tuple[dict, Optional[float]]] = {}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=max(1, min(4, (os.cpu_count() or 2) - 1)))
+    return _pool
+
+
+def shutdown_screener_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+# =========================
+# Available rules
+# =========================
+@router.get("/rules")
+async def list_rules():
+    return [{"name": name, "description": desc} for name, desc in RULES.items()]
+
+
+# =========================
+# Screen a market
+# =========================
+@router.get("")
+@router.get("/")
+async def screen_market(market: str, rules: str = "", refresh: bool = False):
+    market = market.upper()
+    tickers = get_tickers_by_market(market)
+    if not tickers:
+        raise HTTPException(status_code=404, detail=f"Unknown market: {market}")
+
+    try:
+        rule_names = parse_rules(rules)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    trading_day = current_trading_day(market).isoformat()
+    cache_key = (market, trading_day, tuple(sorted(rule_names)))
+    if not refresh and cache_key in _results_cache:
+        response, expires_at = _results_cache[cache_key]
+        if expires_at is None or time.time() < expires_at:
+            return {**response, "cached": True}
+
+    started = time.perf_counter()
+    names = {t["symbol"].upper(): t["name"] for t in tickers}
+
+    # Price store does blocking I/O (disk / one batched download) -> worker thread
+    store = get_price_store()
+    frames = await asyncio.to_thread(store.get_many, list(names), market)
+    final = all(store.is_final(symbol, market) for symbol in frames)
+
+    payload = [
+        (
+            symbol,
+            df["High"].to_numpy(),
+            df["Low"].to_numpy(),
+            df["Close"].to_numpy(),
+            df["Volume"].to_numpy(),
+        )
+        for symbol, df in frames.items()
+        if len(df) > 1
+    ]
+    chunks = [payload[i:i + CHUNK_SIZE] for i in range(0, len(payload), CHUNK_SIZE)]
+
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    chunk_results = await asyncio.gather(
+        *(loop.run_in_executor(pool, screen_chunk, chunk, rule_names) for chunk in chunks)
+    )
+
+    results = []
+    for chunk in chunk_results:
+        for item in chunk:
+            item["name"] = names.get(item["symbol"], item["symbol"])
+            results.append(item)
+    # Most rule hits first, then alphabetical
+    results.sort(key=lambda r: (-len(r["hits"]), r["symbol"]))
+
+    response = {
+        "market": market,
+        "trading_day": trading_day,
+        "final": final,
+        "rules": rule_names,
+        "count": len(results),
+        "missing": sorted(set(names) - set(frames)),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "results": results,
+    }
+    _results_cache[cache_key] = (response, None if final else time.time() + INTRADAY_REFRESH_SECONDS)
+    # Drop this market's entries from previous trading days
+    for key in [k for k in _results_cache if k[0] == market and k[1] != trading_day]:
+        _results_cache.pop(key, None)
+
+    return {**response, "cached": False}
@@ -0,0 +1,99 @@
+"""
+Token-level streaming of agent output to the WebSocket.
+
+run_analysis_stream streams the graph with stream_mode ["updates", "messages"]:
+"updates" carries each node's state delta (reports, statuses), "messages"
+carries the LLM tokens of the node that is running. Sending one WebSocket
+message per token would flood the client, so TokenBatcher collects the text
+per node and sends it as one `token` event per node every `interval` seconds; a
+node's remaining text is flushed as soon as the node finishes, before its report.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from langchain_core.messages import AIMessage
+
+logger = logging.getLogger(__name__)
+
+# Graph node -> agent name used in the status updates
+NODE_TO_AGENT = {"Risk Judge": "Portfolio Manager", "Quick Decision": "Portfolio Manager"}
+
+
+def message_text(message: Any) -> str:
+    """Text of an AI message chunk; tool results, prompts and tool-call-only chunks give ''."""
+    if not isinstance(message, AIMessage):
+        return ""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+            if not isinstance(part, dict) or part.get("type") == "text"
+        )
+    return ""
+
+
+class TokenBatcher:
+    """Collects streamed text per node and sends it every `interval` seconds (and on flush())."""
+
+    def __init__(self, send: Callable[[str, Dict[str, Any]], Awaitable[None]], interval: float = 0.1):
+        self.send = send
+        self.interval = interval
+        self._pending: Dict[str, str] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.events = 0
+
+    def add(self, node: str, message: Any):
+        text = message_text(message)
+        if text:
+            self._pending[node] = self._pending.get(node, "") + text
+
+    async def flush(self, node: Optional[str] = None):
+        """Send what is pending (for one node, or all), e.g. before that node's report goes out."""
+        async with self._lock:
+            nodes = [node] if node is not None else list(self._pending)
+            for name in nodes:
+                text = self._pending.pop(name, "")
+                if text:
+                    self.events += 1
+                    await self.send("token", {
+                        "node": name,
+                        "agent": NODE_TO_AGENT.get(name, name),
+                        "content": text,
+                    })
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️ Token flush failed: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the timer and send what is left (safe to call twice)."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await self.flush()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
@@ -8,6 +8,8 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import httpx
 
+from tradingagents.utils.http_clients import TYPHOON_BASE_URL, http_client
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/translate", tags=["Translation"])
@@ -102,48 +104,48 @@ async def translate_single(request: TranslationRequest):
     )
     
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                TYPHOON_API_URL,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {api_key}"
-                },
-                json={
-                    "model": TYPHOON_MODEL,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a professional translator. Translate accurately and naturally."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "max_tokens": 8192,
-                    "temperature": 0.3,  # Lower temperature for more consistent translation
-                    "top_p": 0.95,
-                }
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Typhoon API error: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Translation API error: {response.text}"
-                )
-            
-            result = response.json()
-            translated_text = result["choices"][0]["message"]["content"].strip()
-            
-            return TranslationResponse(
-                original=request.text,
-                translated=translated_text,
-                source_lang=request.source_lang,
-                target_lang=request.target_lang
+        client = http_client(TYPHOON_BASE_URL)
+        response = await client.post(
+            TYPHOON_API_URL,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}"
+            },
+            json={
+                "model": TYPHOON_MODEL,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are a professional translator. Translate accurately and naturally."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "max_tokens": 8192,
+                "temperature": 0.3,  # Lower temperature for more consistent translation
+                "top_p": 0.95,
+            }
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"Typhoon API error: {response.status_code} - {response.text}")
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Translation API error: {response.text}"
             )
-            
+        
+        result = response.json()
+        translated_text = result["choices"][0]["message"]["content"].strip()
+        
+        return TranslationResponse(
+            original=request.text,
+            translated=translated_text,
+            source_lang=request.source_lang,
+            target_lang=request.target_lang
+        )
+        
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Translation request timed out")
     except Exception as e:
@@ -179,52 +181,52 @@ async def translate_batch(request: BatchTranslationRequest):
         )
         
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    TYPHOON_API_URL,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {api_key}"
-                    },
-                    json={
-                        "model": TYPHOON_MODEL,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a professional translator. Translate accurately and naturally."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "max_tokens": 8192,
-                        "temperature": 0.3,
-                        "top_p": 0.95,
-                    }
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Typhoon API error: {response.status_code}")
-                    # On error, keep original text
-                    translations.append(TranslationResponse(
-                        original=text,
-                        translated=text,  # Keep original on error
-                        source_lang=request.source_lang,
-                        target_lang=request.target_lang
-                    ))
-                    continue
-                
-                result = response.json()
-                translated_text = result["choices"][0]["message"]["content"].strip()
-                
+            client = http_client(TYPHOON_BASE_URL)
+            response = await client.post(
+                TYPHOON_API_URL,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {api_key}"
+                },
+                json={
+                    "model": TYPHOON_MODEL,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a professional translator. Translate accurately and naturally."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "max_tokens": 8192,
+                    "temperature": 0.3,
+                    "top_p": 0.95,
+                }
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Typhoon API error: {response.status_code}")
+                # On error, keep original text
                 translations.append(TranslationResponse(
                     original=text,
-                    translated=translated_text,
+                    translated=text,  # Keep original on error
                     source_lang=request.source_lang,
                     target_lang=request.target_lang
                 ))
-                
+                continue
+            
+            result = response.json()
+            translated_text = result["choices"][0]["message"]["content"].strip()
+            
+            translations.append(TranslationResponse(
+                original=text,
+                translated=translated_text,
+                source_lang=request.source_lang,
+                target_lang=request.target_lang
+            ))
+            
         except Exception as e:
             logger.error(f"Translation error for text: {str(e)}")
             # On error, keep original text
@@ -4,9 +4,14 @@ Called during report generation to translate content.
 """
 import logging
 import os
+import time
 from typing import Dict, Any, Optional
 import httpx
 
+from tradingagents.utils.http_clients import TYPHOON_BASE_URL, http_client
+from tradingagents.utils.rate_limiter import rate_limit_llm_call
+from tradingagents.utils.telemetry import record_llm_call
+
 logger = logging.getLogger(__name__)
 
 # Typhoon API Configuration
@@ -37,10 +42,24 @@ def get_thai_title(english_title: str) -> str:
 
 # Rate Limit Configuration
 # Limit based on Typhoon API: 5 RPS. We use 4 for safety margin.
+# (requests per minute are paced by the shared "typhoon" limiter, see DEFAULT_CONFIG["rate_limits"])
 MAX_CONCURRENT_REQUESTS = 4
 import asyncio
 _typhoon_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
+
+@rate_limit_llm_call("typhoon")
+async def _post_chat_completion(client: httpx.AsyncClient, api_key: str, **payload) -> httpx.Response:
+    """POST one chat completion; waits for its turn in the Typhoon rate limiter first."""
+    return await client.post(
+        TYPHOON_API_URL,
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        },
+        json=payload,
+    )
+
 async def translate_text(text: str, context: str = "financial analysis") -> str:
     """
     Translate a single text from English to Thai using Typhoon API with Rate Limiting.
@@ -70,6 +89,21 @@ Text to translate:
 
 Provide ONLY the translated text, no explanations or additional content."""
     
+    # 📊 One telemetry entry per translation (retries included)
+    start = time.perf_counter()
+
+    def record(attempt: int, usage: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        usage = usage or {}
+        record_llm_call(
+            "Translation",
+            TYPHOON_MODEL,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            latency_ms=(time.perf_counter() - start) * 1000,
+            retries=attempt,
+            error=error,
+        )
+
     # Acquire semaphore to respect concurrency limit
     async with _typhoon_semaphore:
         max_retries = 3
@@ -77,58 +111,53 @@ Provide ONLY the translated text, no explanations or additional content."""
         
         for attempt in range(max_retries):
             try:
-                # Add small delay to enforce RPS limits
-                await asyncio.sleep(0.25) 
-                
-                async with httpx.AsyncClient(timeout=120.0) as client:
-                    response = await client.post(
-                        TYPHOON_API_URL,
-                        headers={
-                            "Content-Type": "application/json",
-                            "Authorization": f"Bearer {api_key}"
+                # 🔌 Shared keep-alive pool: no new TCP/TLS handshake per string
+                client = http_client(TYPHOON_BASE_URL)
+                response = await _post_chat_completion(
+                    client,
+                    api_key,
+                    model=TYPHOON_MODEL,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a professional translator. Translate accurately and naturally."
                         },
-                        json={
-                            "model": TYPHOON_MODEL,
-                            "messages": [
-                                {
-                                    "role": "system",
-                                    "content": "You are a professional translator. Translate accurately and naturally."
-                                },
-                                {
-                                    "role": "user",
-                                    "content": prompt
-                                }
-                            ],
-                            "max_tokens": 8192,
-                            "temperature": 0.3,
-                            "top_p": 0.95,
+                        {
+                            "role": "user",
+                            "content": prompt
                         }
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        translated_text = result["choices"][0]["message"]["content"].strip()
-                        return translated_text
+                    ],
+                    max_tokens=8192,
+                    temperature=0.3,
+                    top_p=0.95,
+                )
+                
+                if response.status_code == 200:
+                    result = response.json()
+                    translated_text = result["choices"][0]["message"]["content"].strip()
+                    record(attempt, usage=result.get("usage"))
+                    return translated_text
+                
+                # Handle Rate Limits (429) specifically
+                elif response.status_code == 429:
+                    wait_time = base_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s
+                    logger.warning(f"⚠️ Rate limit hit (429). Retrying in {wait_time}s... (Attempt {attempt+1}/{max_retries})")
+                    await asyncio.sleep(wait_time)
+                    continue
                     
-                    # Handle Rate Limits (429) specifically
-                    elif response.status_code == 429:
-                        wait_time = base_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s
-                        logger.warning(f"⚠️ Rate limit hit (429). Retrying in {wait_time}s... (Attempt {attempt+1}/{max_retries})")
-                        await asyncio.sleep(wait_time)
-                        continue
-                        
-                    # Handle Server Errors (5xx)
-                    elif response.status_code >= 500:
-                        wait_time = base_delay * (2 ** attempt)
-                        logger.warning(f"⚠️ Typhoon Server Error ({response.status_code}). Retrying in {wait_time}s... (Attempt {attempt+1}/{max_retries})")
-                        await asyncio.sleep(wait_time)
-                        continue
-                        
-                    else:
-                        logger.error(f"Typhoon API error: {response.status_code}")
-                        # Client errors (4xx except 429) usually shouldn't be retried, but for now break
-                        return text
+                # Handle Server Errors (5xx)
+                elif response.status_code >= 500:
+                    wait_time = base_delay * (2 ** attempt)
+                    logger.warning(f"⚠️ Typhoon Server Error ({response.status_code}). Retrying in {wait_time}s... (Attempt {attempt+1}/{max_retries})")
+                    await asyncio.sleep(wait_time)
+                    continue
                     
+                else:
+                    logger.error(f"Typhoon API error: {response.status_code}")
+                    # Client errors (4xx except 429) usually shouldn't be retried, but for now break
+                    record(attempt, error=f"HTTP {response.status_code}")
+                    return text
+                
             except (httpx.TimeoutException, httpx.ConnectError) as e:
                 wait_time = base_delay * (2 ** attempt)
                 logger.warning(f"⚠️ Connection/Timeout error: {e}. Retrying in {wait_time}s... (Attempt {attempt+1}/{max_retries})")
@@ -137,10 +166,12 @@ Provide ONLY the translated text, no explanations or additional content."""
                 
             except Exception as e:
                 logger.error(f"Translation error: {str(e)}")
+                record(attempt, error=str(e))
                 return text
         
         # If all retries failed
         logger.error(f"❌ All {max_retries} translation attempts failed for text. Returning original.")
+        record(max_retries - 1, error="all retries failed")
         return text
 
 
@@ -1,4 +1,5 @@
 import os
+import asyncio
 from typing import Optional
 import datetime
 import requests
@@ -27,6 +28,7 @@ from rich.align import Align
 from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.propagation import StateAccumulator
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
 from cli.utils import *
@@ -758,6 +760,26 @@ def extract_content_string(content):
 #     else:
 #         console.print("[yellow]Telegram not configured. Skipping sending report.[/yellow]")
 
+def iterate_async(async_iterable):
+    """Drive an async iterator (e.g. graph.astream) from synchronous CLI code.
+
+    All graph nodes are async, so the CLI streams with astream on a private
+    event loop while keeping its synchronous Rich display loop.
+    """
+    loop = asyncio.new_event_loop()
+    iterator = async_iterable.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        if hasattr(iterator, "aclose"):
+            loop.run_until_complete(iterator.aclose())
+        loop.close()
+
+
 def run_analysis():
     # First get all user selections
     selections = get_user_selections()
@@ -868,10 +890,11 @@ def run_analysis():
         )
         args = graph.propagator.get_graph_args()
 
-        # Stream the analysis
-        trace = []
-        for chunk in graph.graph.stream(init_agent_state, **args):
-            if len(chunk["messages"]) > 0:
+        # Stream the analysis: fold each node's delta into one running state
+        state = StateAccumulator(init_agent_state)
+        for update in iterate_async(graph.graph.astream(init_agent_state, **args)):
+            chunk = state.apply(update)
+            if chunk.get("messages"):
                 # Get the last message from the chunk
                 last_message = chunk["messages"][-1]
 
@@ -897,211 +920,209 @@ def run_analysis():
                         else:
                             message_buffer.add_tool_call(tool_call.name, tool_call.args)
 
-                # Update reports and agent status based on chunk content
-                # Analyst Team Reports
-                if "market_report" in chunk and chunk["market_report"]:
-                    message_buffer.update_report_section(
-                        "market_report", chunk["market_report"]
-                    )
-                    message_buffer.update_agent_status("Market Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "social" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "Social Analyst", "in_progress"
-                        )
-
-                if "sentiment_report" in chunk and chunk["sentiment_report"]:
-                    message_buffer.update_report_section(
-                        "sentiment_report", chunk["sentiment_report"]
+            # Update reports and agent status based on chunk content
+            # Analyst Team Reports
+            if "market_report" in chunk and chunk["market_report"]:
+                message_buffer.update_report_section(
+                    "market_report", chunk["market_report"]
+                )
+                message_buffer.update_agent_status("Market Analyst", "completed")
+                # Set next analyst to in_progress
+                if "social" in selections["analysts"]:
+                    message_buffer.update_agent_status(
+                        "Social Analyst", "in_progress"
                     )
-                    message_buffer.update_agent_status("Social Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "news" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "News Analyst", "in_progress"
-                        )
 
-                if "news_report" in chunk and chunk["news_report"]:
-                    message_buffer.update_report_section(
-                        "news_report", chunk["news_report"]
+            if "sentiment_report" in chunk and chunk["sentiment_report"]:
+                message_buffer.update_report_section(
+                    "sentiment_report", chunk["sentiment_report"]
+                )
+                message_buffer.update_agent_status("Social Analyst", "completed")
+                # Set next analyst to in_progress
+                if "news" in selections["analysts"]:
+                    message_buffer.update_agent_status(
+                        "News Analyst", "in_progress"
                     )
-                    message_buffer.update_agent_status("News Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "fundamentals" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "Fundamentals Analyst", "in_progress"
-                        )
 
-                if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
-                    message_buffer.update_report_section(
-                        "fundamentals_report", chunk["fundamentals_report"]
-                    )
+            if "news_report" in chunk and chunk["news_report"]:
+                message_buffer.update_report_section(
+                    "news_report", chunk["news_report"]
+                )
+                message_buffer.update_agent_status("News Analyst", "completed")
+                # Set next analyst to in_progress
+                if "fundamentals" in selections["analysts"]:
                     message_buffer.update_agent_status(
-                        "Fundamentals Analyst", "completed"
+                        "Fundamentals Analyst", "in_progress"
                     )
-                    # Set all research team members to in_progress
-                    update_research_team_status("in_progress")
 
-                # Research Team - Handle Investment Debate State
-                if (
-                    "investment_debate_state" in chunk
-                    and chunk["investment_debate_state"]
-                ):
-                    debate_state = chunk["investment_debate_state"]
-
-                    # Update Bull Researcher status and report
-                    if "bull_history" in debate_state and debate_state["bull_history"]:
-                        # Keep all research team members in progress
-                        update_research_team_status("in_progress")
-                        # Extract latest bull response
-                        bull_responses = debate_state["bull_history"].split("\n")
-                        latest_bull = bull_responses[-1] if bull_responses else ""
-                        if latest_bull:
-                            message_buffer.add_message("Reasoning", latest_bull)
-                            # Update research report with bull's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"### Bull Researcher Analysis\n{latest_bull}",
-                            )
-
-                    # Update Bear Researcher status and report
-                    if "bear_history" in debate_state and debate_state["bear_history"]:
-                        # Keep all research team members in progress
-                        update_research_team_status("in_progress")
-                        # Extract latest bear response
-                        bear_responses = debate_state["bear_history"].split("\n")
-                        latest_bear = bear_responses[-1] if bear_responses else ""
-                        if latest_bear:
-                            message_buffer.add_message("Reasoning", latest_bear)
-                            # Update research report with bear's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
-                            )
-
-                    # Update Research Manager status and final decision
-                    if (
-                        "judge_decision" in debate_state
-                        and debate_state["judge_decision"]
-                    ):
-                        # Keep all research team members in progress until final decision
-                        update_research_team_status("in_progress")
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Research Manager: {debate_state['judge_decision']}",
-                        )
-                        # Update research report with final decision
+            if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
+                message_buffer.update_report_section(
+                    "fundamentals_report", chunk["fundamentals_report"]
+                )
+                message_buffer.update_agent_status(
+                    "Fundamentals Analyst", "completed"
+                )
+                # Set all research team members to in_progress
+                update_research_team_status("in_progress")
+
+            # Research Team - Handle Investment Debate State
+            if (
+                "investment_debate_state" in chunk
+                and chunk["investment_debate_state"]
+            ):
+                debate_state = chunk["investment_debate_state"]
+
+                # Update Bull Researcher status and report
+                if "bull_history" in debate_state and debate_state["bull_history"]:
+                    # Keep all research team members in progress
+                    update_research_team_status("in_progress")
+                    # Extract latest bull response
+                    bull_responses = debate_state["bull_history"].split("\n")
+                    latest_bull = bull_responses[-1] if bull_responses else ""
+                    if latest_bull:
+                        message_buffer.add_message("Reasoning", latest_bull)
+                        # Update research report with bull's latest analysis
                         message_buffer.update_report_section(
                             "investment_plan",
-                            f"{message_buffer.report_sections['investment_plan']}\n\n### Research Manager Decision\n{debate_state['judge_decision']}",
+                            f"### Bull Researcher Analysis\n{latest_bull}",
                         )
-                        # Mark all research team members as completed
-                        update_research_team_status("completed")
-                        # Set first risk analyst to in_progress
-                        message_buffer.update_agent_status(
-                            "Risky Analyst", "in_progress"
+
+                # Update Bear Researcher status and report
+                if "bear_history" in debate_state and debate_state["bear_history"]:
+                    # Keep all research team members in progress
+                    update_research_team_status("in_progress")
+                    # Extract latest bear response
+                    bear_responses = debate_state["bear_history"].split("\n")
+                    latest_bear = bear_responses[-1] if bear_responses else ""
+                    if latest_bear:
+                        message_buffer.add_message("Reasoning", latest_bear)
+                        # Update research report with bear's latest analysis
+                        message_buffer.update_report_section(
+                            "investment_plan",
+                            f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
                         )
 
-                # Trading Team
+                # Update Research Manager status and final decision
                 if (
-                    "trader_investment_plan" in chunk
-                    and chunk["trader_investment_plan"]
+                    "judge_decision" in debate_state
+                    and debate_state["judge_decision"]
                 ):
+                    # Keep all research team members in progress until final decision
+                    update_research_team_status("in_progress")
+                    message_buffer.add_message(
+                        "Reasoning",
+                        f"Research Manager: {debate_state['judge_decision']}",
+                    )
+                    # Update research report with final decision
                     message_buffer.update_report_section(
-                        "trader_investment_plan", chunk["trader_investment_plan"]
+                        "investment_plan",
+                        f"{message_buffer.report_sections['investment_plan']}\n\n### Research Manager Decision\n{debate_state['judge_decision']}",
                     )
+                    # Mark all research team members as completed
+                    update_research_team_status("completed")
                     # Set first risk analyst to in_progress
-                    message_buffer.update_agent_status("Risky Analyst", "in_progress")
-
-                # Risk Management Team - Handle Risk Debate State
-                if "risk_debate_state" in chunk and chunk["risk_debate_state"]:
-                    risk_state = chunk["risk_debate_state"]
-
-                    # Update Risky Analyst status and report
-                    if (
-                        "current_risky_response" in risk_state
-                        and risk_state["current_risky_response"]
-                    ):
-                        message_buffer.update_agent_status(
-                            "Risky Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Risky Analyst: {risk_state['current_risky_response']}",
-                        )
-                        # Update risk report with risky analyst's latest analysis only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Risky Analyst Analysis\n{risk_state['current_risky_response']}",
-                        )
+                    message_buffer.update_agent_status(
+                        "Risky Analyst", "in_progress"
+                    )
 
-                    # Update Safe Analyst status and report
-                    if (
-                        "current_safe_response" in risk_state
-                        and risk_state["current_safe_response"]
-                    ):
-                        message_buffer.update_agent_status(
-                            "Safe Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Safe Analyst: {risk_state['current_safe_response']}",
-                        )
-                        # Update risk report with safe analyst's latest analysis only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Safe Analyst Analysis\n{risk_state['current_safe_response']}",
-                        )
+            # Trading Team
+            if (
+                "trader_investment_plan" in chunk
+                and chunk["trader_investment_plan"]
+            ):
+                message_buffer.update_report_section(
+                    "trader_investment_plan", chunk["trader_investment_plan"]
+                )
+                # Set first risk analyst to in_progress
+                message_buffer.update_agent_status("Risky Analyst", "in_progress")
 
-                    # Update Neutral Analyst status and report
-                    if (
-                        "current_neutral_response" in risk_state
-                        and risk_state["current_neutral_response"]
-                    ):
-                        message_buffer.update_agent_status(
-                            "Neutral Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Neutral Analyst: {risk_state['current_neutral_response']}",
-                        )
-                        # Update risk report with neutral analyst's latest analysis only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Neutral Analyst Analysis\n{risk_state['current_neutral_response']}",
-                        )
+            # Risk Management Team - Handle Risk Debate State
+            if "risk_debate_state" in chunk and chunk["risk_debate_state"]:
+                risk_state = chunk["risk_debate_state"]
 
-                    # Update Portfolio Manager status and final decision
-                    if "judge_decision" in risk_state and risk_state["judge_decision"]:
-                        message_buffer.update_agent_status(
-                            "Portfolio Manager", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Portfolio Manager: {risk_state['judge_decision']}",
-                        )
-                        # Update risk report with final decision only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Portfolio Manager Decision\n{risk_state['judge_decision']}",
-                        )
-                        # Mark risk analysts as completed
-                        message_buffer.update_agent_status("Risky Analyst", "completed")
-                        message_buffer.update_agent_status("Safe Analyst", "completed")
-                        message_buffer.update_agent_status(
-                            "Neutral Analyst", "completed"
-                        )
-                        message_buffer.update_agent_status(
-                            "Portfolio Manager", "completed"
-                        )
+                # Update Risky Analyst status and report
+                if (
+                    "current_risky_response" in risk_state
+                    and risk_state["current_risky_response"]
+                ):
+                    message_buffer.update_agent_status(
+                        "Risky Analyst", "in_progress"
+                    )
+                    message_buffer.add_message(
+                        "Reasoning",
+                        f"Risky Analyst: {risk_state['current_risky_response']}",
+                    )
+                    # Update risk report with risky analyst's latest analysis only
+                    message_buffer.update_report_section(
+                        "final_trade_decision",
+                        f"### Risky Analyst Analysis\n{risk_state['current_risky_response']}",
+                    )
 
-                # Update the display
-                update_display(layout)
+                # Update Safe Analyst status and report
+                if (
+                    "current_safe_response" in risk_state
+                    and risk_state["current_safe_response"]
+                ):
+                    message_buffer.update_agent_status(
+                        "Safe Analyst", "in_progress"
+                    )
+                    message_buffer.add_message(
+                        "Reasoning",
+                        f"Safe Analyst: {risk_state['current_safe_response']}",
+                    )
+                    # Update risk report with safe analyst's latest analysis only
+                    message_buffer.update_report_section(
+                        "final_trade_decision",
+                        f"### Safe Analyst Analysis\n{risk_state['current_safe_response']}",
+                    )
 
-            trace.append(chunk)
+                # Update Neutral Analyst status and report
+                if (
+                    "current_neutral_response" in risk_state
+                    and risk_state["current_neutral_response"]
+                ):
+                    message_buffer.update_agent_status(
+                        "Neutral Analyst", "in_progress"
+                    )
+                    message_buffer.add_message(
+                        "Reasoning",
+                        f"Neutral Analyst: {risk_state['current_neutral_response']}",
+                    )
+                    # Update risk report with neutral analyst's latest analysis only
+                    message_buffer.update_report_section(
+                        "final_trade_decision",
+                        f"### Neutral Analyst Analysis\n{risk_state['current_neutral_response']}",
+                    )
+
+                # Update Portfolio Manager status and final decision
+                if "judge_decision" in risk_state and risk_state["judge_decision"]:
+                    message_buffer.update_agent_status(
+                        "Portfolio Manager", "in_progress"
+                    )
+                    message_buffer.add_message(
+                        "Reasoning",
+                        f"Portfolio Manager: {risk_state['judge_decision']}",
+                    )
+                    # Update risk report with final decision only
+                    message_buffer.update_report_section(
+                        "final_trade_decision",
+                        f"### Portfolio Manager Decision\n{risk_state['judge_decision']}",
+                    )
+                    # Mark risk analysts as completed
+                    message_buffer.update_agent_status("Risky Analyst", "completed")
+                    message_buffer.update_agent_status("Safe Analyst", "completed")
+                    message_buffer.update_agent_status(
+                        "Neutral Analyst", "completed"
+                    )
+                    message_buffer.update_agent_status(
+                        "Portfolio Manager", "completed"
+                    )
+
+            # Update the display
+            update_display(layout)
 
         # Get final state and decision
-        final_state = trace[-1]
+        final_state = state.state
         decision = graph.process_signal(final_state["final_trade_decision"])
 
         # Update all agent statuses to completed
@@ -1133,5 +1154,116 @@ def analyze():
     run_analysis()
 
 
+@app.command()
+def backtest(
+    ticker: str = typer.Argument(..., help="Ticker to step through the date range"),
+    start_date: str = typer.Option(..., "--start", help="First trade date (YYYY-MM-DD)"),
+    end_date: str = typer.Option(..., "--end", help="Last trade date (YYYY-MM-DD)"),
+    analysts: str = typer.Option("market,news,fundamentals", help="Comma separated analysts"),
+    step_days: int = typer.Option(5, help="Trading days between decisions"),
+    holding_days: int = typer.Option(5, help="Trading days each decision is held"),
+    mode: str = typer.Option("auto", help="Cassette mode: auto, record or replay"),
+    cassette: Optional[str] = typer.Option(None, help="Cassette file (default under results_dir/backtest)"),
+    research_depth: int = typer.Option(1, help="Debate rounds"),
+    llm_provider: str = typer.Option(DEFAULT_CONFIG["llm_provider"]),
+    backend_url: str = typer.Option(DEFAULT_CONFIG["backend_url"]),
+    shallow_thinker: str = typer.Option(DEFAULT_CONFIG["quick_think_llm"]),
+    deep_thinker: str = typer.Option(DEFAULT_CONFIG["deep_think_llm"]),
+    no_reflect: bool = typer.Option(False, help="Do not feed realized returns into the memories"),
+):
+    """Backtest one ticker over historical dates with point-in-time data and record/replay."""
+    from tradingagents.backtest import BacktestRunner
+
+    config = DEFAULT_CONFIG.copy()
+    config["max_debate_rounds"] = research_depth
+    config["max_risk_discuss_rounds"] = research_depth
+    config["quick_think_llm"] = shallow_thinker
+    config["deep_think_llm"] = deep_thinker
+    config["backend_url"] = backend_url
+    config["llm_provider"] = llm_provider.lower()
+
+    runner = BacktestRunner(
+        ticker,
+        start_date,
+        end_date,
+        selected_analysts=[a.strip() for a in analysts.split(",") if a.strip()],
+        config=config,
+        step_days=step_days,
+        holding_days=holding_days,
+        cassette_path=cassette,
+        mode=mode,
+        reflect=not no_reflect,
+    )
+    summary = asyncio.run(runner.run())
+
+    table = Table(title=f"Backtest {ticker.upper()}", box=box.SIMPLE)
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    for key, value in summary.items():
+        table.add_row(key, str(value))
+    console.print(table)
+
+
+def _batch_pairs(tickers: str, dates: str, pairs_file: Optional[str]):
+    """(ticker, date) pairs from a "TICKER,YYYY-MM-DD" per-line file, or tickers x dates."""
+    if pairs_file:
+        pairs = []
+        with open(pairs_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    ticker, trade_date = [part.strip() for part in line.split(",")[:2]]
+                    pairs.append((ticker.upper(), trade_date))
+        return pairs
+    ticker_list = [t.strip().upper() for t in tickers.split(",") if t.strip()]
+    date_list = [d.strip() for d in dates.split(",") if d.strip()]
+    return [(ticker, trade_date) for trade_date in date_list for ticker in ticker_list]
+
+
+@app.command()
+def batch(
+    tickers: str = typer.Option("", help="Comma separated tickers, e.g. AAPL,MSFT,NVDA"),
+    dates: str = typer.Option(datetime.date.today().strftime("%Y-%m-%d"), help="Comma separated analysis dates"),
+    pairs_file: Optional[str] = typer.Option(None, help='File with one "TICKER,YYYY-MM-DD" per line (overrides --tickers/--dates)'),
+    analysts: str = typer.Option("market,social,news,fundamentals", help="Comma separated analysts"),
+    research_depth: int = typer.Option(1, help="Debate rounds"),
+    llm_provider: str = typer.Option(DEFAULT_CONFIG["llm_provider"]),
+    backend_url: str = typer.Option(DEFAULT_CONFIG["backend_url"]),
+    shallow_thinker: str = typer.Option(DEFAULT_CONFIG["quick_think_llm"]),
+    deep_thinker: str = typer.Option(DEFAULT_CONFIG["deep_think_llm"]),
+    concurrency: int = typer.Option(4, help="Graphs running at the same time"),
+    output: str = typer.Option("", help="JSONL file, one line per finished run"),
+):
+    """Run the analysis for many tickers/dates (e.g. a nightly watchlist sweep)."""
+    pairs = _batch_pairs(tickers, dates, pairs_file)
+    if not pairs:
+        console.print("[red]No tickers given (use --tickers or --pairs-file)[/red]")
+        raise typer.Exit(1)
+
+    config = DEFAULT_CONFIG.copy()
+    config["max_debate_rounds"] = research_depth
+    config["max_risk_discuss_rounds"] = research_depth
+    config["quick_think_llm"] = shallow_thinker
+    config["deep_think_llm"] = deep_thinker
+    config["backend_url"] = backend_url
+    config["llm_provider"] = llm_provider.lower()
+
+    output = output or str(
+        Path(config["results_dir"]) / "batch" / f"batch_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    )
+    graph = TradingAgentsGraph(
+        [a.strip() for a in analysts.split(",") if a.strip()], config=config, debug=False
+    )
+    console.print(f"[bold]Batch: {len(pairs)} runs, concurrency {concurrency} -> {output}[/bold]")
+    report = asyncio.run(graph.propagate_many(pairs, max_concurrency=concurrency, output_path=output))
+
+    table = Table(title="Batch throughput", box=box.SIMPLE)
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    for key, value in report.items():
+        table.add_row(key, str(value))
+    console.print(table)
+
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -1,6 +1,6 @@
 # database/models.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, JSON, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, JSON, DateTime, Text, ForeignKey, Float
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -13,9 +13,19 @@ class ExecutionHistory(Base):
     analysis_date = Column(String)
     status = Column(String)  # success / error
     error_message = Column(Text, nullable=True)
+
+    # LangGraph checkpoint of the run, so an interrupted analysis can be resumed
+    checkpoint_thread_id = Column(String, nullable=True)
+    checkpoint_id = Column(String, nullable=True)
+    checkpoint_next = Column(String, nullable=True)  # node(s) the run would continue with
+
+    # Whole-run cache: identical requests (same key) replay this run's reports
+    cache_key = Column(String(64), nullable=True, index=True)
+    decision = Column(String, nullable=True)  # BUY / SELL / HOLD
     
     # Relationship to reports
     reports = relationship("ReportResult", back_populates="execution", cascade="all, delete-orphan")
+    metrics = relationship("ExecutionMetric", back_populates="execution", cascade="all, delete-orphan")
     
     def to_dict(self):
         return {
@@ -25,6 +35,11 @@ class ExecutionHistory(Base):
             "analysis_date": self.analysis_date,
             "status": self.status,
             "error_message": self.error_message,
+            "checkpoint_thread_id": self.checkpoint_thread_id,
+            "checkpoint_id": self.checkpoint_id,
+            "checkpoint_next": self.checkpoint_next,
+            "cache_key": self.cache_key,
+            "decision": self.decision,
             "reports": [report.to_dict() for report in self.reports]
         }
 
@@ -55,3 +70,49 @@ class ReportResult(Base):
             "created_at": self.created_at.isoformat()
         }
 
+
+class ExecutionMetric(Base):
+    """LLM telemetry of one node in one execution (see tradingagents/utils/telemetry.py)."""
+    __tablename__ = "execution_metrics"
+
+    id = Column(Integer, primary_key=True, index=True)
+    execution_id = Column(Integer, ForeignKey("execution_history.id"), index=True)
+    node = Column(String)  # graph node, summarizer or "Translation"
+    runs = Column(Integer, default=0)
+    wall_ms = Column(Float, default=0.0)
+    llm_calls = Column(Integer, default=0)
+    cached_calls = Column(Integer, default=0)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    llm_latency_ms = Column(Float, default=0.0)
+    ttft_ms = Column(Float, nullable=True)  # average time to first token (whole response for non-streamed calls)
+    retries = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+    # Debators: debate history tokens vs. tokens of it in the prompt after compaction (summed over turns)
+    history_tokens = Column(Integer, default=0)
+    history_prompt_tokens = Column(Integer, default=0)
+    calls = Column(JSON, nullable=True)  # every LLM call: model, tokens, latency, ttft, retries
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    execution = relationship("ExecutionHistory", back_populates="metrics")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "execution_id": self.execution_id,
+            "node": self.node,
+            "runs": self.runs,
+            "wall_ms": self.wall_ms,
+            "llm_calls": self.llm_calls,
+            "cached_calls": self.cached_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "llm_latency_ms": self.llm_latency_ms,
+            "ttft_ms": self.ttft_ms,
+            "retries": self.retries,
+            "errors": self.errors,
+            "history_tokens": self.history_tokens,
+            "history_prompt_tokens": self.history_prompt_tokens,
+            "calls": self.calls,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -47,7 +47,39 @@ class ExecutionHistoryCreate(ExecutionHistoryBase):
 class ExecutionHistoryResponse(ExecutionHistoryBase):
     id: int
     timestamp: datetime
+    checkpoint_thread_id: Optional[str] = None
+    checkpoint_id: Optional[str] = None
+    checkpoint_next: Optional[str] = None
+    cache_key: Optional[str] = None
+    decision: Optional[str] = None
     reports: List[ReportResultResponse] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# =========================
+# ExecutionMetric Schemas
+# =========================
+
+class ExecutionMetricResponse(BaseModel):
+    node: str
+    runs: int = 0
+    wall_ms: float = 0.0
+    llm_calls: int = 0
+    cached_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_latency_ms: float = 0.0
+    ttft_ms: Optional[float] = None
+    retries: int = 0
+    errors: int = 0
+    history_tokens: Optional[int] = 0
+    history_prompt_tokens: Optional[int] = 0
+    calls: List[Any] = []
+
+
+class ExecutionMetricsResponse(BaseModel):
+    execution_id: int
+    totals: dict
+    nodes: List[ExecutionMetricResponse] = []
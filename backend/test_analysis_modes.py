@@ -0,0 +1,141 @@
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from tradingagents.agents.utils import data_prefetch
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph import trading_graph
+from tradingagents.graph.trading_graph import MEMORY_NAMES, TradingAgentsGraph
+from tradingagents.utils.fake_llm import FakeChatModel
+from tradingagents.utils.llm_cache import current_llm_node
+
+DEBATE_NODES = {
+    "Bull Researcher", "Bear Researcher", "Research Manager", "Trader",
+    "Risky Analyst", "Safe Analyst", "Neutral Analyst", "Risk Judge",
+}
+
+
+class EmptyMemory:
+    """No past situations to recall (the embedding model is not needed)."""
+
+    def get_memories(self, current_situation, n_matches=1):
+        return []
+
+
+async def fetch_stock_data(ticker, current_date):
+    return f"# Stock data for {ticker} up to {current_date}\n"
+
+
+def make_graph(mode, **overrides):
+    config = DEFAULT_CONFIG.copy()
+    config.update({
+        "llm_provider": "fake",
+        "deep_think_llm": "fake-deep",
+        "quick_think_llm": "fake-quick",
+        "backend_url": None,
+        "llm_cache": "off",
+        "stage_cache": False,
+        "checkpoint_backend": "off",
+        "analysis_mode": mode,
+        "debate_mode": "sequential",
+        # Fixed round counts: no ending early on converged stances
+        "debate_early_stop": False,
+        "max_debate_rounds": 1,
+        "max_risk_discuss_rounds": 1,
+        "deep_extra_rounds": 1,
+        "fake_llm": {**DEFAULT_CONFIG["fake_llm"], "time_scale": 0},
+        **overrides,
+    })
+    return TradingAgentsGraph(["market"], config=config, memories={name: EmptyMemory() for name in MEMORY_NAMES})
+
+
+class TestAnalysisModes(unittest.TestCase):
+    def setUp(self):
+        # Runs write eval_results/ under the working directory
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp.name)
+
+        patch = mock.patch.dict(data_prefetch.PREFETCHERS, {"market": ("stock_data", fetch_stock_data)})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        # Record which node made each model call
+        self.calls = []
+        plan = FakeChatModel.plan
+
+        def recording(model, messages):
+            self.calls.append(current_llm_node())
+            return plan(model, messages)
+
+        patch = mock.patch.object(FakeChatModel, "plan", recording)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def run_graph(self, graph):
+        return asyncio.run(graph._run_graph("AAPL", "2025-01-10"))
+
+    def test_unknown_mode(self):
+        with self.assertRaisesRegex(ValueError, "turbo"):
+            make_graph("turbo")
+
+    def test_quick_goes_from_the_analysts_to_one_decision(self):
+        graph = make_graph("quick")
+        drawn = graph.graph.get_graph()
+        nodes = set(drawn.nodes)
+        self.assertIn("Quick Decision", nodes)
+        self.assertFalse(nodes & DEBATE_NODES)
+        self.assertFalse({"Investment Debate Round", "Risk Debate Round"} & nodes)
+
+        edges = {(e.source, e.target) for e in drawn.edges}
+        self.assertIn(("Quick Decision", "__end__"), edges)
+        # Every path into the decision comes from the analysts
+        self.assertEqual({s for s, t in edges if t == "Quick Decision"}, {"Analyst Join"})
+
+    def test_quick_run_skips_debates_and_summaries(self):
+        graph = make_graph("quick")
+        # Typhoon summarizers must not be created in quick mode
+        with mock.patch.object(trading_graph, "create_summarizer_market", side_effect=AssertionError("summarized")):
+            final_state, decision = asyncio.run(graph.propagate("AAPL", "2025-01-10"))
+
+        # The only call outside the graph is reading the BUY/SELL/HOLD signal
+        self.assertEqual(set(self.calls), {"Market Analyst", "Quick Decision", "Signal Processing"})
+        self.assertTrue(final_state["market_report"])
+        self.assertTrue(final_state["final_trade_decision"])
+        self.assertEqual(final_state["investment_debate_state"]["count"], 0)
+        self.assertEqual(final_state["risk_debate_state"]["count"], 0)
+        self.assertIn(decision, ("BUY", "SELL", "HOLD"))
+
+    def test_deep_adds_extra_debate_rounds(self):
+        standard = make_graph("standard")
+        deep = make_graph("deep", deep_extra_rounds=2)
+        self.assertEqual(standard.conditional_logic.max_debate_rounds, 1)
+        self.assertEqual(deep.conditional_logic.max_debate_rounds, 3)
+        self.assertEqual(deep.conditional_logic.max_risk_discuss_rounds, 3)
+        # Quick and standard never add rounds
+        quick = make_graph("quick", deep_extra_rounds=2)
+        self.assertEqual(quick.conditional_logic.max_debate_rounds, 1)
+
+        standard_state = self.run_graph(standard)
+        self.assertEqual(standard_state["investment_debate_state"]["count"], 2)
+        self.assertEqual(standard_state["risk_debate_state"]["count"], 3)
+
+        self.calls.clear()
+        deep_state = self.run_graph(deep)
+        self.assertEqual(deep_state["investment_debate_state"]["count"], 6)
+        self.assertEqual(deep_state["risk_debate_state"]["count"], 9)
+        self.assertEqual(self.calls.count("Bull Researcher"), 3)
+        self.assertEqual(self.calls.count("Risky Analyst"), 3)
+        self.assertTrue(deep_state["final_trade_decision"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.checkpointing import _postgres_url, open_checkpointer, thread_id_for_execution
+from tradingagents.graph.trading_graph import MEMORY_NAMES, TradingAgentsGraph
+from tradingagents.utils.fake_llm import FakeChatModel
+from tradingagents.utils.llm_cache import current_llm_node
+
+
+class FlakyMemory:
+    """No past situations to recall; the first lookup fails like an unreachable vector store."""
+
+    def __init__(self):
+        self.failed = False
+
+    def get_memories(self, current_situation, n_matches=1):
+        if not self.failed:
+            self.failed = True
+            raise RuntimeError("vector store unavailable")
+        return []
+
+
+def opened(config):
+    async def main():
+        async with open_checkpointer(config) as saver:
+            return saver
+
+    return asyncio.run(main())
+
+
+class TestOpenCheckpointer(unittest.TestCase):
+    def test_off(self):
+        self.assertIsNone(opened({"checkpoint_backend": None}))
+        self.assertIsNone(opened({"checkpoint_backend": "off"}))
+        self.assertIsNone(opened({}))
+
+    def test_memory(self):
+        self.assertIsInstance(opened({"checkpoint_backend": "Memory"}), InMemorySaver)
+
+    @unittest.skipUnless(importlib.util.find_spec("langgraph.checkpoint.sqlite"), "langgraph-checkpoint-sqlite is not installed")
+    def test_sqlite_file_in_data_cache_dir(self):
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        with tempfile.TemporaryDirectory() as tmp:
+            data_cache_dir = os.path.join(tmp, "data_cache")
+            saver = opened({"checkpoint_backend": "sqlite", "data_cache_dir": data_cache_dir})
+            self.assertIsInstance(saver, AsyncSqliteSaver)
+            self.assertTrue(os.path.exists(os.path.join(data_cache_dir, "checkpoints.sqlite")))
+
+            path = os.path.join(tmp, "other", "runs.sqlite")
+            opened({"checkpoint_backend": "sqlite", "data_cache_dir": data_cache_dir, "checkpoint_db_path": path})
+            self.assertTrue(os.path.exists(path))
+
+    @unittest.skipIf(importlib.util.find_spec("langgraph.checkpoint.postgres"), "needs a Postgres server when installed")
+    def test_postgres_without_the_package(self):
+        self.assertIsNone(opened({"checkpoint_backend": "postgres"}))
+
+    def test_postgres_url(self):
+        config = {"checkpoint_postgres_url": "postgresql+asyncpg://user:pw@db:5432/trading"}
+        self.assertEqual(_postgres_url(config), "postgresql://user:pw@db:5432/trading")
+        self.assertEqual(thread_id_for_execution(12), "execution-12")
+
+
+class TestResume(unittest.TestCase):
+    def setUp(self):
+        config = DEFAULT_CONFIG.copy()
+        config.update({
+            "llm_provider": "fake",
+            "deep_think_llm": "fake-deep",
+            "quick_think_llm": "fake-quick",
+            "backend_url": None,
+            "llm_cache": "off",
+            "stage_cache": False,
+            "analysis_mode": "quick",
+            "checkpoint_backend": "memory",
+            "fake_llm": {**DEFAULT_CONFIG["fake_llm"], "time_scale": 0},
+        })
+        self.graph = TradingAgentsGraph(
+            ["market"], config=config, memories={name: FlakyMemory() for name in MEMORY_NAMES}
+        )
+        self.graph.attach_checkpointer(opened(config))
+        self.thread_id = thread_id_for_execution(1)
+
+    def run_graph(self, resume=False):
+        # Market data handed in up front, so the Data Prefetch node fetches nothing
+        prefetched = {"stock_data": "", "errors": {}, "timings": {}}
+        return asyncio.run(
+            self.graph._run_graph("AAPL", "2025-01-10", thread_id=self.thread_id, resume=resume, prefetched_data=prefetched)
+        )
+
+    def test_resumed_run_skips_completed_nodes(self):
+        plan = FakeChatModel.plan
+        calls = []
+
+        def recording(model, messages):
+            calls.append(current_llm_node())
+            return plan(model, messages)
+
+        with mock.patch.object(FakeChatModel, "plan", recording):
+            # Quick Decision fails before its model call, after the Market Analyst finished
+            with self.assertRaises(RuntimeError):
+                self.run_graph()
+            self.assertEqual(calls, ["Market Analyst"])
+
+            point = asyncio.run(self.graph.get_resume_point(self.thread_id))
+            self.assertEqual(point["thread_id"], self.thread_id)
+            self.assertEqual(point["next"], ["Quick Decision"])
+            self.assertTrue(point["checkpoint_id"])
+
+            final_state = self.run_graph(resume=True)
+
+        # Only the node that failed runs again
+        self.assertEqual(calls, ["Market Analyst", "Quick Decision"])
+        self.assertTrue(final_state["market_report"])
+        self.assertTrue(final_state["final_trade_decision"])
+        # A finished thread has nothing left to resume
+        self.assertIsNone(asyncio.run(self.graph.get_resume_point(self.thread_id)))
+
+
+if __name__ == '__main__':
+    unittest.main()
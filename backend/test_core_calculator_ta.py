@@ -11,9 +11,15 @@ sys.path.append(os.path.join(os.getcwd(), 'backend'))
 from tradingagents.dataflows.core_calculator import (
     calculate_sma, calculate_ema, calculate_rsi, calculate_macd,
     calculate_bollinger_bands, calculate_atr, calculate_vwma,
-    process_indicators_from_csv
+    process_indicators_from_csv, verify_against_pandas_ta
 )
 
+try:
+    import pandas_ta  # noqa: F401 - optional, verification only
+    HAS_PANDAS_TA = True
+except ImportError:
+    HAS_PANDAS_TA = False
+
 class TestCoreCalculatorTA(unittest.TestCase):
     def setUp(self):
         # Create a sample DataFrame
@@ -84,5 +90,34 @@ class TestCoreCalculatorTA(unittest.TestCase):
         self.assertIn("rsi", indicators)
         self.assertIn("macd", indicators)
 
+    def test_short_history_returns_none(self):
+        # Same contract as pandas_ta: not enough rows -> None, not a NaN series
+        self.assertIsNone(calculate_sma(self.df, period=200))
+        self.assertIsNone(calculate_atr(self.df.iloc[:10]))
+
+    def test_matches_pandas_reference(self):
+        close = self.df["Close"]
+        sma = calculate_sma(self.df, period=10)
+        np.testing.assert_allclose(sma, close.rolling(10).mean(), equal_nan=True)
+
+        ub, lb = calculate_bollinger_bands(self.df)
+        mid = close.rolling(20).mean()
+        std = close.rolling(20).std(ddof=0)
+        np.testing.assert_allclose(ub, mid + 2 * std, equal_nan=True)
+        np.testing.assert_allclose(lb, mid - 2 * std, equal_nan=True)
+
+        # Wilder RSI = ewm(alpha=1/n, adjust=False) of gains / losses
+        delta = close.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+        expected_rsi = 100 * gain / (gain + loss)
+        np.testing.assert_allclose(calculate_rsi(self.df, 14), expected_rsi, equal_nan=True)
+
+    @unittest.skipUnless(HAS_PANDAS_TA, "pandas_ta not installed")
+    def test_matches_pandas_ta(self):
+        for name, diff in verify_against_pandas_ta(self.df).items():
+            if diff is not None:
+                self.assertLess(diff, 1e-8, name)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,84 @@
+
+import os
+import sys
+import unittest
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from tradingagents.agents.utils.debate_compaction import (
+    compact_for_prompt, compact_history, count_tokens, split_turns, summarize_turn
+)
+from tradingagents.dataflows.config import config_scope
+from tradingagents.utils.telemetry import RunTelemetry, telemetry_scope
+
+
+def make_history(turns: int, sentences: int = 12) -> str:
+    speakers = ["Bull Analyst", "Bear Analyst"]
+    return "\n".join(
+        f"{speakers[i % 2]}: " + " ".join(
+            f"Turn {i} point {j} is about revenue growth and margins." for j in range(sentences)
+        )
+        for i in range(turns)
+    )
+
+
+class TestDebateCompaction(unittest.TestCase):
+    def test_split_turns(self):
+        history = "\nBull Analyst: up\nmore lines\nBear Analyst: down"
+        self.assertEqual(split_turns(history), ["Bull Analyst: up\nmore lines", "Bear Analyst: down"])
+        self.assertEqual(split_turns(""), [])
+
+    def test_history_within_budget_is_unchanged(self):
+        history = make_history(2, sentences=2)
+        self.assertIs(compact_history(history, budget_tokens=10_000), history)
+
+    def test_keeps_last_turns_verbatim_within_budget(self):
+        history = make_history(8)
+        turns = split_turns(history)
+        budget = count_tokens("\n".join(turns[-2:])) + 200
+        compacted = compact_history(history, budget_tokens=budget, keep_last=2)
+
+        self.assertTrue(compacted.startswith("[Summary of earlier turns]"))
+        self.assertTrue(compacted.endswith("\n".join(turns[-2:])))
+        self.assertLess(count_tokens(compacted), count_tokens(history))
+        # Every older turn still has a summary line under its speaker
+        self.assertEqual(compacted.count("\n- "), 6)
+
+    def test_oldest_turns_dropped_when_budget_is_too_small(self):
+        history = make_history(10)
+        turns = split_turns(history)
+        budget = count_tokens(turns[-1]) + 60
+        compacted = compact_history(history, budget_tokens=budget, keep_last=1)
+        self.assertIn("earliest turns omitted]", compacted)
+        self.assertNotIn("Turn 0 point", compacted)
+        self.assertIn("Turn 8 point 0", compacted)
+
+    def test_summarize_turn_keeps_speaker_and_leading_sentences(self):
+        summary = summarize_turn("Bear Analyst: First point. Second point. Third point.", max_tokens=6)
+        self.assertTrue(summary.startswith("Bear Analyst: First point."))
+        self.assertNotIn("Third", summary)
+
+    def test_compact_for_prompt_records_telemetry(self):
+        history = make_history(8)
+        telemetry = RunTelemetry()
+        with telemetry_scope(telemetry), config_scope({
+            "debate_compaction": True, "debate_history_budget_tokens": 300, "debate_keep_last_turns": 2
+        }):
+            compacted = compact_for_prompt(history, "Bull Researcher")
+        full_tokens, prompt_tokens = telemetry.node_history["Bull Researcher"]
+        self.assertEqual(full_tokens, count_tokens(history))
+        self.assertEqual(prompt_tokens, count_tokens(compacted))
+        self.assertLess(prompt_tokens, full_tokens)
+
+    def test_compaction_off_returns_full_history(self):
+        history = make_history(8)
+        telemetry = RunTelemetry()
+        with telemetry_scope(telemetry), config_scope({"debate_compaction": False, "debate_history_budget_tokens": 300}):
+            self.assertIs(compact_for_prompt(history, "Bear Researcher"), history)
+        full_tokens, prompt_tokens = telemetry.node_history["Bear Researcher"]
+        self.assertEqual(full_tokens, prompt_tokens)
+
+
+if __name__ == '__main__':
+    unittest.main()
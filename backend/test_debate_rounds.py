@@ -0,0 +1,128 @@
+
+import asyncio
+import os
+import sys
+import unittest
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from tradingagents.agents.utils.debate_rounds import create_invest_debate_round, create_risk_debate_round
+
+
+def stub_speaker(name, state_key, history_key, response_key=None, stance="HOLD", delay=0.0):
+    """
+    Stand-in for a researcher / debator node: answers with the text it was
+    shown, appends to its own history and records one stance, the way the
+    real nodes update their debate state. `seen` collects what it was shown.
+    """
+    seen = []
+
+    async def node(state, config):
+        debate_state = state[state_key]
+        shown = debate_state.get("current_response", "") if response_key is None else {
+            key: debate_state.get(key, "") for key in response_key
+        }
+        seen.append((shown, config))
+        await asyncio.sleep(delay)  # later speakers may finish first
+        argument = f"{name} Analyst: reply #{debate_state['count']}"
+        out = {
+            **debate_state,
+            history_key: debate_state.get(history_key, "") + "\n" + argument,
+            "count": debate_state["count"] + 1,
+            "stances": list(debate_state.get("stances") or []) + [{"speaker": name, "stance": stance, "confidence": 3}],
+        }
+        if response_key is None:
+            out["current_response"] = argument
+        else:
+            out[f"current_{name.lower()}_response"] = argument
+        return {state_key: out}
+
+    node.seen = seen
+    return node
+
+
+class TestInvestDebateRound(unittest.TestCase):
+    def setUp(self):
+        self.bull = stub_speaker("Bull", "investment_debate_state", "bull_history", stance="BUY", delay=0.02)
+        self.bear = stub_speaker("Bear", "investment_debate_state", "bear_history", stance="SELL")
+        self.round = create_invest_debate_round(self.bull, self.bear)
+        self.state = {"investment_debate_state": {
+            "history": "", "bull_history": "", "bear_history": "", "current_response": "",
+            "current_bull_response": "", "current_bear_response": "", "count": 0, "stances": [],
+        }}
+
+    def run_round(self, state, config=None):
+        out = asyncio.run(self.round(state, config=config or {}))
+        return {**state, **out}
+
+    def test_each_side_answers_the_other_sides_last_argument(self):
+        first = self.run_round(self.state, config={"tags": ["run-1"]})
+        self.assertEqual(self.bull.seen, [("", {"tags": ["run-1"]})])
+        self.assertEqual(self.bear.seen, [("", {"tags": ["run-1"]})])
+
+        self.run_round(first)
+        debate = first["investment_debate_state"]
+        self.assertEqual(self.bull.seen[1][0], debate["current_bear_response"])
+        self.assertEqual(self.bear.seen[1][0], debate["current_bull_response"])
+
+    def test_history_count_and_stances(self):
+        first = self.run_round(self.state)["investment_debate_state"]
+        # Bull first even though the bear finished earlier
+        self.assertEqual(first["history"], "\nBull Analyst: reply #0\nBear Analyst: reply #0")
+        self.assertEqual(first["current_response"], "Bear Analyst: reply #0")
+        self.assertEqual(first["bull_history"], "\nBull Analyst: reply #0")
+        self.assertEqual(first["bear_history"], "\nBear Analyst: reply #0")
+        self.assertEqual(first["count"], 2)
+        self.assertEqual([(s["speaker"], s["stance"]) for s in first["stances"]], [("Bull", "BUY"), ("Bear", "SELL")])
+
+        second = self.run_round({"investment_debate_state": first})["investment_debate_state"]
+        self.assertEqual(second["count"], 4)
+        self.assertEqual(
+            second["history"],
+            "\nBull Analyst: reply #0\nBear Analyst: reply #0\nBull Analyst: reply #2\nBear Analyst: reply #2",
+        )
+        self.assertEqual([s["speaker"] for s in second["stances"]], ["Bull", "Bear", "Bull", "Bear"])
+
+
+class TestRiskDebateRound(unittest.TestCase):
+    RESPONSES = ("current_risky_response", "current_safe_response", "current_neutral_response")
+
+    def setUp(self):
+        self.risky = stub_speaker("Risky", "risk_debate_state", "risky_history", self.RESPONSES, "BUY", delay=0.02)
+        self.safe = stub_speaker("Safe", "risk_debate_state", "safe_history", self.RESPONSES, "SELL", delay=0.01)
+        self.neutral = stub_speaker("Neutral", "risk_debate_state", "neutral_history", self.RESPONSES, "HOLD")
+        self.round = create_risk_debate_round(self.risky, self.safe, self.neutral)
+        self.state = {"risk_debate_state": {
+            "history": "", "risky_history": "", "safe_history": "", "neutral_history": "",
+            "latest_speaker": "", "current_risky_response": "", "current_safe_response": "",
+            "current_neutral_response": "", "count": 0, "stances": [],
+        }}
+
+    def run_round(self, state):
+        return {**state, **asyncio.run(self.round(state, config={}))}
+
+    def test_round_merges_in_speaking_order(self):
+        first = self.run_round(self.state)
+        debate = first["risk_debate_state"]
+        self.assertEqual(
+            debate["history"].split("\n"),
+            ["", "Risky Analyst: reply #0", "Safe Analyst: reply #0", "Neutral Analyst: reply #0"],
+        )
+        self.assertEqual(debate["count"], 3)
+        self.assertEqual(debate["latest_speaker"], "Neutral")
+        self.assertEqual(debate["safe_history"], "\nSafe Analyst: reply #0")
+        self.assertEqual([(s["speaker"], s["stance"]) for s in debate["stances"]],
+                         [("Risky", "BUY"), ("Safe", "SELL"), ("Neutral", "HOLD")])
+
+        # Next round: every debator sees all three of the previous round's arguments
+        second = self.run_round(first)["risk_debate_state"]
+        previous = {key: debate[key] for key in self.RESPONSES}
+        for node in (self.risky, self.safe, self.neutral):
+            self.assertEqual(node.seen[1][0], previous)
+        self.assertEqual(second["count"], 6)
+        self.assertEqual([s["speaker"] for s in second["stances"]], ["Risky", "Safe", "Neutral"] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
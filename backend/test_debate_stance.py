@@ -0,0 +1,112 @@
+
+import os
+import sys
+import unittest
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from tradingagents.agents.utils.debate_stance import (
+    STANCE_INSTRUCTION, debate_converged, parse_stance, record_stance, round_stances, stance_prompt
+)
+from tradingagents.dataflows.config import config_scope
+from tradingagents.graph.conditional_logic import ConditionalLogic
+
+
+def stance(speaker, value, confidence=3):
+    return {"speaker": speaker, "stance": value, "confidence": confidence}
+
+
+class TestParseStance(unittest.TestCase):
+    def test_strips_the_stance_line(self):
+        argument, parsed = parse_stance("Bull Analyst: growth is strong.\nSTANCE: BUY CONFIDENCE: 4")
+        self.assertEqual(argument, "Bull Analyst: growth is strong.")
+        self.assertEqual(parsed, {"stance": "BUY", "confidence": 4})
+
+    def test_markdown_and_case(self):
+        _, parsed = parse_stance("text\n**Stance:** hold, confidence: 2")
+        self.assertEqual(parsed, {"stance": "HOLD", "confidence": 2})
+
+    def test_missing_confidence(self):
+        _, parsed = parse_stance("text\nSTANCE: SELL")
+        self.assertEqual(parsed, {"stance": "SELL", "confidence": None})
+
+    def test_last_stance_line_wins(self):
+        argument, parsed = parse_stance("STANCE: BUY CONFIDENCE: 2\nOn reflection...\nSTANCE: SELL CONFIDENCE: 5")
+        self.assertEqual(parsed["stance"], "SELL")
+        self.assertIn("STANCE: BUY", argument)
+
+    def test_no_stance(self):
+        text = "I would BUY here, my stance is firm."
+        self.assertEqual(parse_stance(text), (text, None))
+        self.assertEqual(parse_stance(None), (None, None))
+
+    def test_record_stance_appends_to_a_copy(self):
+        debate_state = {"stances": [stance("Bear", "SELL")]}
+        argument, stances = record_stance(debate_state, "Bull", "up\nSTANCE: BUY CONFIDENCE: 4")
+        self.assertEqual(argument, "up")
+        self.assertEqual(stances, [stance("Bear", "SELL"), stance("Bull", "BUY", 4)])
+        self.assertEqual(len(debate_state["stances"]), 1)
+
+    def test_stance_prompt_follows_config(self):
+        with config_scope({"debate_early_stop": True}):
+            self.assertEqual(stance_prompt(), STANCE_INSTRUCTION)
+        with config_scope({"debate_early_stop": False}):
+            self.assertEqual(stance_prompt(), "")
+
+
+class TestDebateConverged(unittest.TestCase):
+    def test_needs_a_stance_from_every_speaker(self):
+        self.assertFalse(debate_converged([stance("Bull", "BUY")], ("Bull", "Bear")))
+        self.assertFalse(debate_converged([], ("Bull", "Bear")))
+
+    def test_all_agree(self):
+        self.assertTrue(debate_converged([stance("Bull", "BUY"), stance("Bear", "BUY")], ("Bull", "Bear")))
+
+    def test_first_round_disagreement_continues(self):
+        self.assertFalse(debate_converged([stance("Bull", "BUY"), stance("Bear", "SELL")], ("Bull", "Bear")))
+
+    def test_unchanged_positions_converge(self):
+        stances = [stance("Bull", "BUY", 4), stance("Bear", "SELL", 3)] * 2
+        self.assertTrue(debate_converged(stances, ("Bull", "Bear")))
+
+    def test_changed_confidence_continues(self):
+        stances = [stance("Bull", "BUY", 4), stance("Bear", "SELL", 3), stance("Bull", "BUY", 4), stance("Bear", "SELL", 2)]
+        self.assertFalse(debate_converged(stances, ("Bull", "Bear")))
+
+    def test_other_speakers_are_ignored(self):
+        stances = [stance("Bull", "BUY"), stance("Bear", "BUY"), stance("Risky", "SELL")]
+        self.assertTrue(debate_converged(stances, ("Bull", "Bear")))
+
+    def test_round_stances_take_each_speakers_own_entry(self):
+        debate_state = {"stances": [stance("Bull", "BUY")]}
+        bull_out = {"stances": [stance("Bull", "BUY"), stance("Bull", "HOLD")]}
+        bear_out = {"stances": [stance("Bull", "BUY"), stance("Bear", "SELL"), stance("Bull", "SELL")]}
+        self.assertEqual(
+            round_stances(debate_state, [(bull_out, "Bull"), (bear_out, "Bear")]),
+            [stance("Bull", "BUY"), stance("Bull", "HOLD"), stance("Bear", "SELL")],
+        )
+
+
+class TestEarlyStop(unittest.TestCase):
+    def state(self, count, stances, current_response="Bear Analyst: down"):
+        return {"investment_debate_state": {"count": count, "stances": stances, "current_response": current_response}}
+
+    def test_stops_at_a_round_boundary_once_converged(self):
+        logic = ConditionalLogic(max_debate_rounds=5, early_stop=True)
+        agree = [stance("Bull", "BUY"), stance("Bear", "BUY")]
+        self.assertEqual(logic.should_continue_debate(self.state(2, agree)), "Research Manager")
+        # Mid-round: the other side still gets its turn
+        self.assertEqual(
+            logic.should_continue_debate(self.state(3, agree + [stance("Bull", "BUY")], "Bull Analyst: up")),
+            "Bear Researcher",
+        )
+
+    def test_off_by_default(self):
+        logic = ConditionalLogic(max_debate_rounds=5)
+        agree = [stance("Bull", "BUY"), stance("Bear", "BUY")]
+        self.assertEqual(logic.should_continue_debate(self.state(2, agree)), "Bull Researcher")
+
+
+if __name__ == '__main__':
+    unittest.main()
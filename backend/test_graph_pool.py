@@ -0,0 +1,108 @@
+
+import asyncio
+import os
+import sys
+import unittest
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.graph_pool import GraphPool
+from tradingagents.graph.trading_graph import MEMORY_NAMES, _run_in_config_scope
+
+
+def fake_config(**overrides):
+    config = DEFAULT_CONFIG.copy()
+    config.update({
+        "llm_provider": "fake",
+        "deep_think_llm": "fake-deep",
+        "quick_think_llm": "fake-quick",
+        "backend_url": None,
+        "llm_cache": "off",
+        "stage_cache": False,
+        "fake_llm": {**DEFAULT_CONFIG["fake_llm"], "time_scale": 0},
+    })
+    config.update(overrides)
+    return config
+
+
+@_run_in_config_scope
+async def active_encoding(graph):
+    await asyncio.sleep(0.01)  # both runs are in flight at the same time
+    return get_config()["market_data_encoding"]
+
+
+class TestGraphPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = GraphPool(max_graphs=2)
+        # The tests only build and fork graphs, no agent reads its memory
+        self.pool._memories = {name: None for name in MEMORY_NAMES}
+
+    def test_concurrent_forks_keep_their_own_config(self):
+        raw = fake_config(market_data_encoding="raw")
+        compact = fake_config(market_data_encoding="compact")
+
+        async def main():
+            first, second = await asyncio.gather(
+                self.pool.acquire(["market"], raw), self.pool.acquire(["market"], compact)
+            )
+            return first, second, await asyncio.gather(active_encoding(first), active_encoding(second))
+
+        first, second, seen = asyncio.run(main())
+        # One template, built once
+        self.assertEqual((self.pool.misses, self.pool.hits), (1, 1))
+        self.assertIs(first.compiled_graph, second.compiled_graph)
+        self.assertIs(first.quick_thinking_llm, second.quick_thinking_llm)
+        self.assertIs(first.config, raw)
+        self.assertIs(second.config, compact)
+        self.assertEqual(seen, ["raw", "compact"])
+
+    def test_forks_do_not_share_a_checkpointer(self):
+        async def main():
+            return await asyncio.gather(*(self.pool.acquire(["market"], fake_config()) for _ in range(2)))
+
+        first, second = asyncio.run(main())
+        first.attach_checkpointer(InMemorySaver())
+        self.assertIsNone(second.checkpointer)
+        self.assertIs(second.graph, second.compiled_graph)
+        second.attach_checkpointer(InMemorySaver())
+        self.assertIsNot(first.checkpointer, second.checkpointer)
+        self.assertIs(first.graph.checkpointer, first.checkpointer)
+        self.assertIs(second.graph.checkpointer, second.checkpointer)
+        # The pooled template stays without one
+        self.assertIsNone(first.compiled_graph.checkpointer)
+        self.assertIsNone(asyncio.run(self.pool.acquire(["market"], fake_config())).checkpointer)
+
+    def test_least_recently_used_graph_is_evicted(self):
+        config = fake_config()
+
+        async def main():
+            market = await self.pool.acquire(["market"], config)
+            await self.pool.acquire(["news"], config)
+            await self.pool.acquire(["market"], config)  # market is now the most recent
+            await self.pool.acquire(["social"], config)
+            return market
+
+        market = asyncio.run(main())
+        self.assertEqual(
+            list(self.pool._graphs),
+            [GraphPool.graph_key(["market"], config), GraphPool.graph_key(["social"], config)],
+        )
+        self.assertEqual(self.pool.stats()["graphs"], 2)
+
+        # news has to be built again, market is still pooled
+        misses = self.pool.misses
+        self.assertIs(asyncio.run(self.pool.acquire(["market"], config)).compiled_graph, market.compiled_graph)
+        self.assertEqual(self.pool.misses, misses)
+        asyncio.run(self.pool.acquire(["news"], config))
+        self.assertEqual(self.pool.misses, misses + 1)
+        # LLM clients are shared by every graph with the same models
+        self.assertEqual(self.pool.stats()["llm_clients"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from api.intraday import LiveIndicators, RingBuffer, SymbolFeed
+from tradingagents.dataflows import indicator_kernels as kernels
+
+
+def make_bars(days: int = 3, bars_per_day: int = 78, seed: int = 0) -> pd.DataFrame:
+    """5-minute bars from 09:30 New York time, like a yfinance download."""
+    rng = np.random.default_rng(seed)
+    stamps = []
+    for day in pd.bdate_range("2025-01-06", periods=days):
+        start = pd.Timestamp(day.date()).tz_localize("America/New_York") + pd.Timedelta(hours=9, minutes=30)
+        stamps.extend(start + pd.Timedelta(minutes=5 * i) for i in range(bars_per_day))
+    n = len(stamps)
+    close = 150 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.0005, n)),
+        "High": close * 1.001,
+        "Low": close * 0.999,
+        "Close": close,
+        "Volume": rng.integers(1_000, 100_000, n).astype(float),
+    }, index=pd.DatetimeIndex(stamps))
+
+
+def bar(close: float, volume: float = 100.0) -> dict:
+    return {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": volume}
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_wraps_around_at_capacity(self):
+        ring = RingBuffer(capacity=5)
+        for i in range(8):
+            ring.append(i, 1, bar(100.0 + i))
+        self.assertEqual(ring.size, 5)
+        self.assertEqual(ring.view("close").tolist(), [103.0, 104.0, 105.0, 106.0, 107.0])
+        self.assertEqual(ring.view("ts", 2).tolist(), [6, 7])
+        self.assertEqual(ring.last_ts, 7)
+        self.assertEqual(ring.last_bar()["close"], 107.0)
+
+    def test_replace_last_overwrites_the_newest_slot_only(self):
+        ring = RingBuffer(capacity=3)
+        for i in range(4):
+            ring.append(i, 1, bar(100.0 + i))
+        ring.replace_last(3, 1, bar(99.0))
+        self.assertEqual(ring.view("close").tolist(), [101.0, 102.0, 99.0])
+        self.assertEqual(ring.size, 3)
+
+    def test_empty(self):
+        ring = RingBuffer(capacity=3)
+        self.assertIsNone(ring.last_ts)
+        self.assertEqual(ring.view("close").size, 0)
+
+
+class TestSymbolFeed(unittest.TestCase):
+    def assertMatchesKernels(self, feed: SymbolFeed, frame: pd.DataFrame):
+        live = feed.quote()["indicators"]
+        close = frame["Close"].to_numpy()
+        session = frame[frame.index.date == frame.index[-1].date()]
+        vwap = kernels.vwap(session["High"], session["Low"], session["Close"], session["Volume"])
+        self.assertAlmostEqual(live["rsi"], kernels.rsi(close, 14)[-1], places=2)
+        self.assertAlmostEqual(live["ema_20"], kernels.ema(close, 20)[-1], places=4)
+        self.assertAlmostEqual(live["vwap"], vwap[-1], places=4)
+
+    def test_streaming_indicators_match_the_numpy_kernels(self):
+        frame = make_bars(days=4)
+        feed = SymbolFeed("AAPL", capacity=400)
+        feed.ingest(frame.iloc[:200])
+        self.assertMatchesKernels(feed, frame.iloc[:200])
+
+        # Each poll delivers the session so far again plus the new bars; closed bars are committed once
+        feed.ingest(frame.iloc[150:260])
+        self.assertMatchesKernels(feed, frame.iloc[:260])
+
+    def test_indicators_survive_the_ring_wrapping(self):
+        frame = make_bars()
+        feed = SymbolFeed("AAPL", capacity=50)
+        feed.ingest(frame)
+        self.assertEqual(feed.bars.size, 50)
+        self.assertMatchesKernels(feed, frame)
+
+    def test_forming_bar_is_not_committed(self):
+        frame = make_bars(days=1)
+        feed = SymbolFeed("AAPL", capacity=400)
+        feed.ingest(frame)
+        committed = dict(feed.indicators.state)
+
+        # The last bar keeps forming: same timestamp, new price and volume
+        forming = frame.iloc[-1:].copy()
+        forming[["Close", "High"]] *= 1.01
+        forming["Volume"] += 5_000
+        feed.ingest(forming)
+        feed.ingest(forming)
+        self.assertEqual(feed.indicators.state, committed)
+        self.assertEqual(feed.bars.size, len(frame))
+        self.assertEqual(feed.quote()["price"], round(forming["Close"].iloc[-1], 2))
+
+        updated = pd.concat([frame.iloc[:-1], forming])
+        self.assertMatchesKernels(feed, updated)
+
+    def test_vwap_resets_each_session(self):
+        frame = make_bars(days=2)
+        feed = SymbolFeed("AAPL", capacity=400)
+        feed.ingest(frame)
+        vwap_all = kernels.vwap(frame["High"], frame["Low"], frame["Close"], frame["Volume"])[-1]
+        self.assertNotAlmostEqual(feed.quote()["indicators"]["vwap"], vwap_all, places=4)
+        self.assertMatchesKernels(feed, frame)
+        # The sparkline covers the latest session only
+        self.assertEqual(len(feed.session_closes()), 78)
+
+        # First bar of a new session: VWAP is that bar's typical price
+        indicators = LiveIndicators()
+        indicators.commit(20250106, bar(100.0, volume=1_000))
+        self.assertEqual(indicators.preview(20250107, bar(110.0))["vwap"], 110.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
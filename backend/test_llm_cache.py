@@ -0,0 +1,125 @@
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from langchain_core.load import dumps
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from tradingagents.utils.fake_llm import FakeChatModel
+from tradingagents.utils.llm_cache import LLMResponseCache, llm_node, normalize_prompt, open_llm_cache
+
+
+def messages(message_id: str):
+    return [SystemMessage(content="You are the Trader."), HumanMessage(content="Plan for AAPL", id=message_id)]
+
+
+class TestLLMCacheKey(unittest.TestCase):
+    def test_message_ids_stay_out_of_the_key(self):
+        self.assertEqual(normalize_prompt(dumps(messages("a"))), normalize_prompt(dumps(messages("b"))))
+
+    def test_content_is_part_of_the_key(self):
+        other = [SystemMessage(content="You are the Trader."), HumanMessage(content="Plan for MSFT")]
+        self.assertNotEqual(normalize_prompt(dumps(messages("a"))), normalize_prompt(dumps(other)))
+
+    def test_non_json_prompt_is_kept(self):
+        self.assertEqual(normalize_prompt("plain text"), "plain text")
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def cache(self, backend="sqlite", mode="read_through", **limits):
+        name = "llm_cache" if backend == "disk" else "llm_cache.sqlite"
+        return LLMResponseCache(os.path.join(self.tmp.name, name), backend=backend, mode=mode, **limits)
+
+    def age(self, cache, key, created_at):
+        store = cache._store
+        if cache.backend == "disk":
+            os.utime(store._file(key), (created_at, created_at))
+        else:
+            store._conn.execute("UPDATE llm_cache SET created_at = ? WHERE key = ?", (created_at, key))
+            store._conn.commit()
+
+    def model(self, cache):
+        return FakeChatModel(model="fake-quick", time_scale=0, cache=cache)
+
+    def test_read_through_serves_repeated_calls(self):
+        for backend in ("sqlite", "disk"):
+            with self.subTest(backend=backend):
+                cache = self.cache(backend)
+                with llm_node("Trader"):
+                    first = self.model(cache).invoke(messages("run-1"))
+                    second = self.model(cache).invoke(messages("run-2"))
+                self.assertEqual(first.content, second.content)
+                self.assertEqual(cache.stats(), {"mode": "read_through", "hits": {"Trader": 1}, "misses": {"Trader": 1}})
+
+    def test_model_parameters_are_part_of_the_key(self):
+        cache = self.cache()
+        self.model(cache).invoke(messages("a"))
+        FakeChatModel(model="fake-deep", time_scale=0, cache=cache).invoke(messages("a"))
+        self.assertEqual(sum(cache.stats()["hits"].values()), 0)
+
+    def test_record_only_refreshes_without_serving(self):
+        recorder = self.cache(mode="record_only")
+        self.model(recorder).invoke(messages("a"))
+        self.model(recorder).invoke(messages("a"))
+        self.assertEqual(recorder.stats()["hits"], {})
+        self.assertEqual(recorder.stats()["misses"], {"unknown": 2})
+
+        # What it recorded is served to a read-through cache on the same store
+        reader = self.cache()
+        self.model(reader).invoke(messages("b"))
+        self.assertEqual(reader.stats()["hits"], {"unknown": 1})
+
+    def test_raw_entries(self):
+        cache = self.cache()
+        self.assertIsNone(cache.get_raw("key"))
+        cache.put_raw("key", '{"id": "chatcmpl-1"}')
+        self.assertEqual(cache.get_raw("key"), '{"id": "chatcmpl-1"}')
+        cache.clear()
+        self.assertIsNone(cache.get_raw("key"))
+
+    def test_expired_entries_are_not_served(self):
+        for backend in ("sqlite", "disk"):
+            with self.subTest(backend=backend):
+                cache = self.cache(backend, max_age_hours=1)
+                cache.put_raw("old", "stale")
+                cache.put_raw("new", "fresh")
+                self.age(cache, "old", time.time() - 2 * 3600)
+                self.assertIsNone(cache.get_raw("old"))
+                self.assertEqual(cache.get_raw("new"), "fresh")
+                self.assertEqual(cache.prune(), 1)
+
+    def test_prune_keeps_newest_entries(self):
+        for backend in ("sqlite", "disk"):
+            with self.subTest(backend=backend):
+                cache = self.cache(backend, max_entries=2)
+                for i in range(4):
+                    cache.put_raw(f"k{i}", str(i))
+                    self.age(cache, f"k{i}", 1e9 + i)
+                self.assertEqual(cache.prune(), 2)
+                self.assertIsNone(cache.get_raw("k0"))
+                self.assertEqual(cache.get_raw("k3"), "3")
+
+    def test_open_llm_cache_modes(self):
+        config = {"data_cache_dir": self.tmp.name, "llm_cache_backend": "sqlite"}
+        self.assertIsNone(open_llm_cache({**config, "llm_cache": "off"}))
+        cache = open_llm_cache({**config, "llm_cache": "read_through"})
+        self.assertIs(cache, open_llm_cache({**config, "llm_cache": "read_through"}))
+        self.assertEqual(open_llm_cache({**config, "llm_cache": "record_only"}).mode, "record_only")
+        with self.assertRaises(ValueError):
+            LLMResponseCache(os.path.join(self.tmp.name, "x.sqlite"), mode="write_only")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from tradingagents.agents.utils.market_encoding import (
+    _decimals, _num, _volume, compact_market_context, market_context, raw_market_context
+)
+from tradingagents.dataflows.config import config_scope
+from tradingagents.dataflows.core_calculator import process_indicators_from_csv
+
+N_DAYS = 250
+
+
+def make_csv(start_price: float, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.02, N_DAYS)))
+    df = pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.003, N_DAYS)),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(10_000, 50_000_000, N_DAYS).astype(float),
+    }, index=pd.date_range("2024-01-01", periods=N_DAYS, freq="B", name="Date"))
+    return "# Stock data\n" + df.to_csv()
+
+
+def section(text: str, title: str):
+    """Data rows (header line excluded) of the section starting with `title`."""
+    lines = text.splitlines()
+    start = next(i for i, line in enumerate(lines) if line.startswith(title))
+    rows = []
+    for line in lines[start + 2:]:
+        if not line:
+            break
+        rows.append(line)
+    return rows
+
+
+class TestNumberFormatting(unittest.TestCase):
+    def test_decimals_follow_magnitude(self):
+        self.assertEqual(_decimals([0.85, 0.9]), 4)
+        self.assertEqual(_decimals([35.25]), 2)
+        self.assertEqual(_decimals([150.0]), 1)
+        self.assertEqual(_decimals([3200.0]), 0)
+        self.assertEqual(_decimals([]), 2)
+
+    def test_num_and_volume(self):
+        self.assertEqual(_num(1.234, 2), "1.23")
+        self.assertEqual(_num(1.2, 1, signed=True), "+1.2")
+        self.assertEqual(_num(-0.001, 2, signed=True), "0")
+        self.assertEqual(_num(float("nan"), 2), "")
+        self.assertEqual(_volume(12_345_678), "12.3M")
+        self.assertEqual(_volume(950), "950")
+
+
+class TestCompactMarketContext(unittest.TestCase):
+    def test_snapshot_matches_indicators_after_rounding(self):
+        for price in (0.85, 35.25, 150.0, 3200.0):
+            with self.subTest(price=price):
+                csv_text = make_csv(price)
+                indicators, _ = process_indicators_from_csv(csv_text)
+                compact = compact_market_context(csv_text)
+                snapshot = next(line for line in compact.splitlines() if line.startswith("TECHNICAL INDICATORS"))
+                values = dict(item.split("=") for item in snapshot.split(": ", 1)[1].split(", "))
+                for name, raw in indicators.items():
+                    if raw is None or not np.isfinite(raw):
+                        continue
+                    decimals = len(values[name].partition(".")[2])
+                    self.assertLessEqual(abs(raw - float(values[name])), 0.5 * 10 ** -decimals + 1e-9, name)
+
+    def test_layout(self):
+        compact = compact_market_context(make_csv(150.0), daily_rows=20, history_rows=100)
+        self.assertTrue(compact.startswith("STOCK PRICE DATA (2024-01-01 to "))
+        self.assertEqual(len(section(compact, "DAILY")), 20)
+        weekly = section(compact, "WEEKLY")
+        # The 80 older sessions in weekly rows: 16 full weeks, maybe split at the edges
+        self.assertTrue(16 <= len(weekly) <= 17, len(weekly))
+        self.assertEqual(len(weekly[0].split(",")), 10)
+
+    def test_smaller_than_raw(self):
+        csv_text = make_csv(150.0)
+        self.assertLess(len(compact_market_context(csv_text)), len(raw_market_context(csv_text)) / 2)
+
+    def test_error_without_price_data(self):
+        self.assertIn("Error calculating indicators", compact_market_context("Date,Open,High,Low,Close,Volume\n"))
+
+    def test_encoding_follows_config(self):
+        csv_text = make_csv(35.25)
+        with config_scope({"market_data_encoding": "raw"}):
+            self.assertEqual(market_context(csv_text), raw_market_context(csv_text))
+        with config_scope({"market_data_encoding": "compact"}):
+            self.assertEqual(market_context(csv_text), compact_market_context(csv_text))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+
+import json
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from tradingagents.backtest.point_in_time import filter_fundamentals, filter_text, parse_price_csv
+
+
+def epoch(date: str) -> int:
+    return int(datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+
+class TestFilterText(unittest.TestCase):
+    def test_drops_lines_dated_after_trade_date(self):
+        text = "\n".join([
+            "2025-01-08 Apple beats estimates",
+            "2025-01-11 Apple announces buyback",
+            "2025-01-20 Apple misses estimates",
+            "",
+            "Undated commentary",
+        ])
+        # The day after the decision is already the future
+        self.assertEqual(filter_text(text, "2025-01-10"), "2025-01-08 Apple beats estimates\n\nUndated commentary")
+        self.assertEqual(filter_text("2025-01-10 Apple guides up", "2025-01-10"), "2025-01-10 Apple guides up")
+
+    def test_body_lines_go_with_their_dated_header(self):
+        text = "\n".join([
+            "=== COMPANY NEWS ===",
+            "### Apple beats estimates (Reuters, 2025-01-08)",
+            "Revenue rose 8%.",
+            "",
+            "### Apple announces buyback (Reuters, 2025-01-11)",
+            "The board approved $110B.",
+            "Shares rose 4% after hours.",
+            "",
+            "Source: vendor feed",
+        ])
+        self.assertEqual(filter_text(text, "2025-01-10"), "\n".join([
+            "=== COMPANY NEWS ===",
+            "### Apple beats estimates (Reuters, 2025-01-08)",
+            "Revenue rose 8%.",
+            "",
+            "",
+            "Source: vendor feed",
+        ]))
+
+    def test_epoch_fields(self):
+        before = json.dumps({"headline": "old", "datetime": epoch("2025-01-05")})
+        same_day = json.dumps({"headline": "today", "datetime": epoch("2025-01-10") + 15 * 3600})
+        after = json.dumps({"headline": "new", "datetime": epoch("2025-01-11")})
+        self.assertEqual(filter_text(f"{before}\n{same_day}\n{after}", "2025-01-10"), f"{before}\n{same_day}")
+
+    def test_invalid_dates_and_empty_input(self):
+        self.assertEqual(filter_text("ref 2025-13-45", "2025-01-10"), "ref 2025-13-45")
+        self.assertEqual(filter_text(None, "2025-01-10"), "")
+
+
+class TestFilterFundamentals(unittest.TestCase):
+    def setUp(self):
+        self.payload = {
+            "ticker": "AAPL",
+            "raw": {"vendor": "dump"},
+            "available_years": ["2023", "2024"],
+            "final_payload": {
+                "overview": {"name": "Apple", "sector": "Technology", "market_cap": 3.5e12, "pe_ratio": 35},
+                "income_statement": {
+                    "2024-09-30": {"revenue": 391},
+                    "2023-09-30": {"revenue": 383},
+                },
+                "notes": "kept as is",
+            },
+        }
+
+    def test_only_statements_public_by_trade_date(self):
+        result = filter_fundamentals(self.payload, "2024-11-15")
+        statements = result["final_payload"]["income_statement"]
+        # 2024-09-30 is public from 2024-12-29 with the 90-day reporting lag
+        self.assertEqual(list(statements), ["2023-09-30"])
+        self.assertEqual(result["available_years"], ["2023"])
+        self.assertEqual(result["years_found"], 1)
+        self.assertEqual(result["as_of"], "2024-11-15")
+
+        later = filter_fundamentals(self.payload, "2025-01-10")
+        self.assertEqual(len(later["final_payload"]["income_statement"]), 2)
+
+    def test_drops_live_values_and_raw_dumps(self):
+        result = filter_fundamentals(self.payload, "2025-01-10")
+        self.assertEqual(result["final_payload"]["overview"], {"name": "Apple", "sector": "Technology"})
+        self.assertEqual(result["final_payload"]["notes"], "kept as is")
+        self.assertNotIn("raw", result)
+        self.assertEqual(result["ticker"], "AAPL")
+
+    def test_json_string_and_plain_text(self):
+        result = filter_fundamentals(json.dumps(self.payload), "2024-11-15")
+        self.assertEqual(list(result["final_payload"]["income_statement"]), ["2023-09-30"])
+        self.assertEqual(filter_fundamentals("2025-03-01 filing", "2025-01-10"), "")
+
+
+class TestParsePriceCsv(unittest.TestCase):
+    def test_header_lines_timezones_and_duplicates(self):
+        csv_text = "\n".join([
+            "# Stock data for AAPL",
+            "Date,Open,Close",
+            "2025-01-09 00:00:00-05:00,10,11",
+            "2025-01-08 00:00:00-05:00,9,10",
+            "2025-01-09 00:00:00-05:00,10,12",
+        ])
+        df = parse_price_csv(csv_text)
+        self.assertEqual([d.strftime("%Y-%m-%d") for d in df.index], ["2025-01-08", "2025-01-09"])
+        self.assertEqual(df.loc["2025-01-09", "Close"], 12)
+        self.assertEqual(df.index.name, "Date")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from tradingagents.agents.utils import data_prefetch
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.trading_graph import MEMORY_NAMES, TradingAgentsGraph
+
+
+class EmptyMemory:
+    """No past situations to recall (the embedding model is not needed)."""
+
+    def get_memories(self, current_situation, n_matches=1):
+        return []
+
+
+async def fetch_stock_data(ticker, current_date):
+    return f"# Stock data for {ticker} up to {current_date}\n"
+
+
+class TestPropagateMany(unittest.TestCase):
+    def setUp(self):
+        # Runs write eval_results/ under the working directory
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp.name)
+
+        config = DEFAULT_CONFIG.copy()
+        config.update({
+            "llm_provider": "fake",
+            "deep_think_llm": "fake-deep",
+            "quick_think_llm": "fake-quick",
+            "backend_url": None,
+            "llm_cache": "off",
+            "stage_cache": False,
+            "analysis_mode": "quick",
+            "fake_llm": {**DEFAULT_CONFIG["fake_llm"], "time_scale": 0},
+        })
+        self.graph = TradingAgentsGraph(
+            ["market"], config=config, memories={name: EmptyMemory() for name in MEMORY_NAMES}
+        )
+        patch = mock.patch.dict(data_prefetch.PREFETCHERS, {"market": ("stock_data", fetch_stock_data)})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        # Wrap the graph run to count overlapping runs and to fail one ticker
+        self.running = 0
+        self.max_running = 0
+        run_graph = TradingAgentsGraph._run_graph
+
+        async def counting_run_graph(graph, company_name, trade_date, **kwargs):
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(0.01)  # keep the runs in flight long enough to overlap
+                if company_name == "BROKEN":
+                    raise RuntimeError("graph failed")
+                return await run_graph(graph, company_name, trade_date, **kwargs)
+            finally:
+                self.running -= 1
+
+        patch = mock.patch.object(TradingAgentsGraph, "_run_graph", counting_run_graph)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_concurrency_failures_and_jsonl_output(self):
+        pairs = [("AAPL", "2025-01-10"), ("MSFT", "2025-01-10"), ("BROKEN", "2025-01-10"),
+                 ("NVDA", "2025-01-10"), ("AAPL", "2025-01-13")]
+        output_path = os.path.join(self.tmp.name, "batch", "results.jsonl")
+        sunk = []
+
+        async def on_result(result):
+            if result["ticker"] == "NVDA":
+                raise OSError("database down")
+            sunk.append(result["ticker"])
+
+        report = asyncio.run(self.graph.propagate_many(
+            pairs, max_concurrency=2, output_path=output_path, on_result=on_result
+        ))
+
+        self.assertEqual(self.max_running, 2)
+        self.assertEqual((report["runs"], report["succeeded"], report["failed"]), (5, 4, 1))
+        self.assertEqual(report["sink_errors"], 1)
+        self.assertEqual(sorted(sunk), ["AAPL", "AAPL", "BROKEN", "MSFT"])
+
+        with open(output_path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(sorted((r["ticker"], r["trade_date"]) for r in lines), sorted(pairs))
+        by_ticker = {r["ticker"]: r for r in lines}
+        self.assertEqual(by_ticker["BROKEN"]["status"], "error")
+        self.assertEqual(by_ticker["BROKEN"]["error"], "graph failed")
+        self.assertEqual(by_ticker["MSFT"]["status"], "success")
+        self.assertIn(by_ticker["MSFT"]["decision"], ("BUY", "SELL", "HOLD"))
+        self.assertTrue(by_ticker["MSFT"]["final_trade_decision"])
+
+    def test_failing_sync_sink_does_not_stop_the_batch(self):
+        def on_result(result):
+            raise ValueError("sink bug")
+
+        report = asyncio.run(self.graph.propagate_many(
+            [("AAPL", "2025-01-10"), ("MSFT", "2025-01-10")], max_concurrency=1, on_result=on_result
+        ))
+        self.assertEqual(self.max_running, 1)
+        self.assertEqual((report["succeeded"], report["sink_errors"]), (2, 2))
+        self.assertEqual(report["shared_fetches"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+
+import asyncio
+import os
+import sys
+import unittest
+import uuid
+from unittest import mock
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from tradingagents.default_config import DEFAULT_RATE_LIMITS, _env_rate_limits
+from tradingagents.utils.rate_limiter import LLMRateLimiter, _llm_run_id, get_rate_limiter
+
+
+def llm_result(total_tokens: int, **usage) -> LLMResult:
+    message = AIMessage(content="ok", usage_metadata={
+        "input_tokens": total_tokens, "output_tokens": 0, "total_tokens": total_tokens, **usage
+    })
+    return LLMResult(generations=[[ChatGeneration(message=message)]])
+
+
+class TestLLMRateLimiter(unittest.TestCase):
+    def test_fifo_waits_grow_with_the_queue(self):
+        limiter = LLMRateLimiter("test", requests_per_minute=2)
+        waits = [limiter.reserve(0) for _ in range(4)]
+        # Two requests fit the bucket, each later one queues 30 s behind the previous
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 30.0, delta=0.1)
+        self.assertAlmostEqual(waits[3], 60.0, delta=0.1)
+        self.assertEqual(limiter.stats()["requests"], 4)
+
+    def test_token_bucket(self):
+        limiter = LLMRateLimiter("test", tokens_per_minute=1000)
+        self.assertEqual(limiter.reserve(800), 0.0)
+        # 600 tokens short at 1000/60 tokens per second
+        self.assertAlmostEqual(limiter.reserve(800), 36.0, delta=0.1)
+
+    def test_non_blocking_acquire_when_busy(self):
+        limiter = LLMRateLimiter("test", requests_per_minute=1)
+        self.assertTrue(limiter.acquire(blocking=False))
+        self.assertFalse(limiter.acquire(blocking=False))
+        self.assertEqual(limiter.stats()["requests"], 1)
+
+    def test_reconcile_gives_back_unused_tokens(self):
+        limiter = LLMRateLimiter("test", tokens_per_minute=1000, estimated_tokens=500)
+        limiter.reserve(800)
+        limiter.reconcile(800, 100)
+        self.assertEqual(limiter.reserve(800), 0.0)
+        self.assertEqual(limiter.stats()["tokens_used"], 100)
+        # The running estimate moves towards real usage
+        self.assertEqual(limiter.estimated_tokens, 0.8 * 500 + 0.2 * 100)
+
+    def test_reconcile_charges_extra_tokens(self):
+        limiter = LLMRateLimiter("test", tokens_per_minute=1000)
+        limiter.reserve(100)
+        limiter.reconcile(100, 1000)
+        self.assertGreater(limiter.reserve(100), 5.0)
+
+    def test_settle_matches_reservations_by_run_id(self):
+        limiter = LLMRateLimiter("test", tokens_per_minute=10_000, estimated_tokens=1000)
+        first, second = uuid.uuid4(), uuid.uuid4()
+
+        async def acquire(run_id):
+            _llm_run_id.set(run_id)
+            await limiter.aacquire()
+
+        async def main():
+            await asyncio.gather(acquire(first), acquire(second))
+
+        asyncio.run(main())
+        self.assertEqual(limiter._outstanding, {first: 1000.0, second: 1000.0})
+
+        # The second call finishing first settles its own reservation, not the oldest
+        limiter.settle(second, 1500)
+        self.assertEqual(limiter._outstanding, {first: 1000.0})
+        self.assertEqual(limiter.stats()["tokens_used"], 1500)
+        limiter.settle(second, 1500)
+        self.assertEqual(limiter.stats()["tokens_used"], 1500)
+
+    def test_usage_handler(self):
+        limiter = LLMRateLimiter("test", tokens_per_minute=10_000, estimated_tokens=1000)
+        handler = limiter.usage_handler()
+        billed, follower = uuid.uuid4(), uuid.uuid4()
+        for run_id in (billed, follower):
+            handler.on_chat_model_start({}, [], run_id=run_id)
+            limiter.acquire()
+        level = limiter._tokens.level
+
+        # A zero-cost response (single-flight follower) gets its reservation back
+        handler.on_llm_end(llm_result(1000, total_cost=0), run_id=follower)
+        self.assertAlmostEqual(limiter._tokens.level, level + 1000, delta=1)
+        handler.on_llm_end(llm_result(400), run_id=billed)
+        self.assertEqual(limiter._outstanding, {})
+        self.assertEqual(limiter.stats()["tokens_used"], 400)
+
+    def test_limit_context_reconciles_reported_usage(self):
+        limiter = LLMRateLimiter("test", tokens_per_minute=1000)
+
+        async def main():
+            async with limiter.limit(900) as usage:
+                usage["tokens"] = 100
+            async with limiter.limit(900):
+                pass  # no usage reported: the estimate stays charged
+
+        asyncio.run(main())
+        self.assertEqual(limiter.stats()["tokens_used"], 100)
+        self.assertEqual(limiter.stats()["requests"], 2)
+
+
+class TestRateLimitConfig(unittest.TestCase):
+    def limits(self, value):
+        with mock.patch.dict(os.environ, {"TRADINGAGENTS_RATE_LIMITS": value}):
+            return _env_rate_limits(DEFAULT_RATE_LIMITS)
+
+    def test_defaults_without_overrides(self):
+        self.assertEqual(self.limits(""), DEFAULT_RATE_LIMITS)
+
+    def test_paid_tier_overrides(self):
+        limits = self.limits(
+            '{"google:gemini-2.5-flash": {"rpm": 1000, "tpm": 1000000}, '
+            '"google:gemini-2.5-flash-lite": null, "google": {"rpm": 2000}}'
+        )
+        self.assertEqual(limits["google:gemini-2.5-flash"], {"rpm": 1000, "tpm": 1000000})
+        self.assertEqual(limits["openai"], DEFAULT_RATE_LIMITS["openai"])
+        self.assertEqual(DEFAULT_RATE_LIMITS["google:gemini-2.5-flash"]["rpm"], 10)
+
+        config = {"rate_limit": True, "rate_limits": limits}
+        self.assertEqual(get_rate_limiter("google", "gemini-2.5-flash", config)._requests.capacity, 1000)
+        # The removed model falls back to the provider entry
+        self.assertEqual(get_rate_limiter("google", "gemini-2.5-flash-lite", config)._requests.capacity, 2000)
+
+    def test_bad_overrides(self):
+        with self.assertRaisesRegex(ValueError, "not valid JSON"):
+            self.limits("{rpm: 10}")
+        with self.assertRaisesRegex(ValueError, "JSON object"):
+            self.limits("[]")
+        with self.assertRaisesRegex(ValueError, "openai"):
+            self.limits('{"openai": 500}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+
+import asyncio
+import datetime
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from api import run_cache
+from api.main import AnalysisRequest
+from api.run_cache import build_replay, find_cached_run, replay_cached_run, run_cache_key
+from database.models import Base, ExecutionHistory, ReportResult
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+def make_request(**overrides):
+    fields = {
+        "ticker": "AAPL",
+        "analysis_date": "2025-01-10",
+        "analysts": ["market", "news"],
+        "research_depth": 1,
+        "llm_provider": "google",
+        "backend_url": "https://generativelanguage.googleapis.com/v1",
+        "shallow_thinker": "gemini-2.5-flash-lite",
+        "deep_thinker": "gemini-2.5-flash",
+    }
+    fields.update(overrides)
+    return AnalysisRequest(**fields)
+
+
+def report(title, content, report_type="full_report", content_th=None, title_th=None):
+    return ReportResult(report_type=report_type, title=title, content=content, content_th=content_th, title_th=title_th)
+
+
+class TestRunCacheKey(unittest.TestCase):
+    def setUp(self):
+        self.config = DEFAULT_CONFIG.copy()
+        self.key = run_cache_key(make_request(), self.config)
+
+    def test_stable(self):
+        self.assertEqual(self.key, run_cache_key(make_request(), DEFAULT_CONFIG.copy()))
+        self.assertEqual(len(self.key), 64)
+
+    def test_ignored_request_fields(self):
+        for field, value in (("user_id", 7), ("force_refresh", True), ("resume_execution_id", 12)):
+            with self.subTest(field=field):
+                self.assertEqual(self.key, run_cache_key(make_request(**{field: value}), self.config))
+
+    def test_ignored_config_fields(self):
+        for field in run_cache._CONFIG_FIELDS_IGNORED:
+            with self.subTest(field=field):
+                self.assertEqual(self.key, run_cache_key(make_request(), {**self.config, field: "changed"}))
+
+    def test_analysis_inputs_change_the_key(self):
+        changes = {
+            "ticker": "MSFT",
+            "analysis_date": "2025-01-11",
+            "analysts": ["market"],
+            "mode": "deep",
+            "shallow_thinker": "gemini-2.0-flash",
+            "deep_thinker": "gemini-2.5-pro",
+            "llm_provider": "openai",
+        }
+        for field, value in changes.items():
+            with self.subTest(field=field):
+                self.assertNotEqual(self.key, run_cache_key(make_request(**{field: value}), self.config))
+        self.assertNotEqual(self.key, run_cache_key(make_request(), {**self.config, "max_debate_rounds": 3}))
+
+    def test_normalized_fields(self):
+        self.assertEqual(self.key, run_cache_key(make_request(ticker="aapl", llm_provider="Google"), self.config))
+        # Fan-out runs ignore the order analysts were picked in, sequential runs do not
+        self.assertEqual(self.key, run_cache_key(make_request(analysts=["news", "market"]), self.config))
+        sequential = {**self.config, "parallel_analysts": False}
+        self.assertNotEqual(
+            run_cache_key(make_request(), sequential),
+            run_cache_key(make_request(analysts=["news", "market"]), sequential),
+        )
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite is not installed")
+class TestFindCachedRun(unittest.TestCase):
+    def setUp(self):
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+        from sqlalchemy.orm import sessionmaker
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(self.tmp.name, 'runs.db')}")
+        session = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.patch = mock.patch.object(run_cache, "AsyncSessionLocal", session)
+        self.patch.start()
+        self.now = datetime.datetime.utcnow()
+
+        async def setup():
+            async with self.engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with session() as db:
+                db.add_all([
+                    self.history_row(1, hours_ago=48, decision="BUY"),
+                    self.history_row(2, hours_ago=2, decision="SELL"),
+                    self.history_row(3, hours_ago=1, decision=None),  # finished without a processed signal
+                    self.history_row(4, hours_ago=1, status="error", decision="HOLD"),
+                    self.history_row(5, hours_ago=1, decision="HOLD", cache_key="b" * 64),
+                ])
+                await db.commit()
+
+        asyncio.run(setup())
+
+    def tearDown(self):
+        self.patch.stop()
+        asyncio.run(self.engine.dispose())
+        self.tmp.cleanup()
+
+    def history_row(self, run_id, hours_ago, decision, status="success", cache_key="a" * 64):
+        return ExecutionHistory(
+            id=run_id,
+            timestamp=self.now - datetime.timedelta(hours=hours_ago),
+            ticker="AAPL",
+            analysis_date="2025-01-10",
+            status=status,
+            cache_key=cache_key,
+            decision=decision,
+            reports=[report("Market Analysis", {"text": f"run {run_id}"})],
+        )
+
+    def test_newest_successful_run_with_a_decision(self):
+        history = asyncio.run(find_cached_run("a" * 64))
+        self.assertEqual(history.id, 2)
+        # Reports are loaded with the run
+        self.assertEqual(history.reports[0].content, {"text": "run 2"})
+
+    def test_max_age(self):
+        self.assertEqual(asyncio.run(find_cached_run("a" * 64, max_age_hours=24)).id, 2)
+        self.assertIsNone(asyncio.run(find_cached_run("a" * 64, max_age_hours=1)))
+
+    def test_unknown_key(self):
+        self.assertIsNone(asyncio.run(find_cached_run("c" * 64)))
+
+
+class TestBuildReplay(unittest.TestCase):
+    def setUp(self):
+        # Stored in the order the run finished them, not the order a live run streams them
+        self.history = ExecutionHistory(id=9, ticker="AAPL", analysis_date="2025-01-10", decision="BUY", reports=[
+            report("Portfolio Management Decision", {"text": "final"}, content_th="ตัดสินใจ", title_th="การตัดสินใจ"),
+            report("Trader Plan", {"text": "plan"}),
+            report("Fundamentals Review", {"revenue": 391}),
+            report("Market Analysis", {"text": "market"}, content_th="ตลาด"),
+            report("Bull Case", {"text": "bull"}),
+            report("Market Analysis", "สรุปตลาด", report_type="sum_report", content_th="สรุปตลาด"),
+        ])
+
+    def test_reports_follow_the_live_event_order(self):
+        replay = build_replay(self.history)
+        self.assertEqual(
+            [(r["section"], r["content"]) for r in replay["reports"]],
+            [
+                ("market_report", "market"),
+                ("fundamentals_report", {"revenue": 391}),
+                ("trader_investment_plan", "plan"),
+                ("final_trade_decision", "final"),
+            ],
+        )
+        self.assertEqual(
+            [(r["section"], r["report_type"], r["label"]) for r in replay["thai_reports"]],
+            [
+                ("risk_debate_state", "full", "การตัดสินใจ"),
+                ("market_report", "full", "Market Analysis"),
+                ("Summarize_market_report", "summary", "Market Analysis"),
+            ],
+        )
+        self.assertEqual(replay["final_state"]["investment_plan"], "bull")
+        self.assertEqual(replay["final_state"]["Summarize_market_report"], "สรุปตลาด")
+        self.assertIsNone(replay["final_state"]["news_report"])
+        self.assertEqual(replay["decision"], "BUY")
+
+    def test_replay_event_order(self):
+        events = []
+
+        async def send_update(websocket, event, data):
+            events.append((event, data))
+
+        asyncio.run(replay_cached_run(None, self.history, send_update))
+        self.assertEqual(
+            [event for event, _ in events],
+            ["status"] + ["report"] * 4 + ["thai_report"] * 3 + ["complete"],
+        )
+        self.assertTrue(events[0][1]["cached"])
+        self.assertEqual(events[-1][1]["decision"], "BUY")
+        self.assertEqual(events[-1][1]["execution_id"], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
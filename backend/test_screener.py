@@ -0,0 +1,244 @@
+
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from fastapi import HTTPException
+
+from api import screener_router
+from tradingagents.dataflows import price_store
+from tradingagents.dataflows.price_store import INTRADAY_REFRESH_SECONDS, PriceStore, current_trading_day, session_closed
+from tradingagents.dataflows.screener import RULES, parse_rules, screen_chunk, screen_symbol
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def make_prices(trend: float, days: int = 260, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(trend + rng.normal(0, 0.01, days)))
+    return pd.DataFrame({
+        "Open": close,
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 2_000_000, days).astype(float),
+    }, index=pd.bdate_range("2024-01-01", periods=days, name="Date"))
+
+
+class InMemoryPriceStore(PriceStore):
+    """PriceStore whose vendor is a dict of frames; counts the batched downloads."""
+
+    def __init__(self, frames, cache_dir):
+        super().__init__(cache_dir=cache_dir)
+        self.vendor = frames
+        self.downloads = []
+
+    def _download(self, symbols):
+        self.downloads.append(sorted(symbols))
+        return {s: self.vendor[s] for s in symbols if s in self.vendor}
+
+
+class TestParseRules(unittest.TestCase):
+    def test_empty_means_all_rules(self):
+        self.assertEqual(parse_rules(""), list(RULES))
+
+    def test_names_are_normalized_and_deduplicated(self):
+        self.assertEqual(parse_rules(" RSI_Oversold, golden_cross,,rsi_oversold "), ["rsi_oversold", "golden_cross"])
+
+    def test_unknown_rule(self):
+        with self.assertRaisesRegex(ValueError, "no_such_rule"):
+            parse_rules("rsi_oversold,no_such_rule")
+
+
+class TestScreenSymbol(unittest.TestCase):
+    def arrays(self, df):
+        return df["High"].to_numpy(), df["Low"].to_numpy(), df["Close"].to_numpy(), df["Volume"].to_numpy()
+
+    def test_uptrend_and_downtrend(self):
+        up = screen_symbol(*self.arrays(make_prices(0.01)), rules=list(RULES))
+        self.assertIn("above_sma200", up["hits"])
+        self.assertIn("rsi_overbought", up["hits"])
+        self.assertNotIn("below_sma200", up["hits"])
+        self.assertGreater(up["indicators"]["close"], up["indicators"]["close_200_sma"])
+
+        down = screen_symbol(*self.arrays(make_prices(-0.01)), rules=["below_sma200", "rsi_overbought"])
+        self.assertEqual(down["hits"], ["below_sma200"])
+
+    def test_volume_spike(self):
+        df = make_prices(0.0)
+        df.iloc[-1, df.columns.get_loc("Volume")] = 10_000_000
+        self.assertEqual(screen_symbol(*self.arrays(df), rules=["volume_spike"])["hits"], ["volume_spike"])
+
+    def test_short_history_has_no_long_indicators(self):
+        result = screen_symbol(*self.arrays(make_prices(0.01, days=30)), rules=["above_sma200", "golden_cross"])
+        self.assertIsNone(result["indicators"]["close_200_sma"])
+        self.assertEqual(result["hits"], [])
+
+    def test_chunk_reports_errors_per_symbol(self):
+        good = ("AAPL", *self.arrays(make_prices(0.0)))
+        bad = ("BROKEN", np.array([]), np.array([]), np.array([]), np.array([]))
+        results = screen_chunk([good, bad], ["above_sma200"])
+        self.assertEqual([r["symbol"] for r in results], ["AAPL", "BROKEN"])
+        self.assertNotIn("error", results[0])
+        self.assertEqual(results[1]["hits"], [])
+        self.assertIn("error", results[1])
+
+
+class TestTradingDay(unittest.TestCase):
+    def test_weekends_roll_back_to_friday(self):
+        saturday = datetime.datetime(2025, 1, 11, 12, 0, tzinfo=NEW_YORK)
+        self.assertEqual(current_trading_day("US", saturday), datetime.date(2025, 1, 10))
+        self.assertTrue(session_closed("US", saturday))
+
+    def test_session_closes_at_the_market_close(self):
+        self.assertFalse(session_closed("US", datetime.datetime(2025, 1, 10, 15, 59, tzinfo=NEW_YORK)))
+        self.assertTrue(session_closed("US", datetime.datetime(2025, 1, 10, 16, 0, tzinfo=NEW_YORK)))
+        # Thursday night in New York is already Friday morning in Bangkok, before the Thai close
+        bangkok_morning = datetime.datetime(2025, 1, 9, 22, 30, tzinfo=NEW_YORK)
+        self.assertEqual(current_trading_day("TH", bangkok_morning), datetime.date(2025, 1, 10))
+        self.assertFalse(session_closed("TH", bangkok_morning))
+        self.assertTrue(session_closed("US", bangkok_morning))
+
+
+class TestPriceStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.frames = {"AAPL": make_prices(0.01), "MSFT": make_prices(-0.01, seed=1)}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def store(self):
+        return InMemoryPriceStore(self.frames, self.tmp.name)
+
+    def test_one_batched_download_per_trading_day(self):
+        store = self.store()
+        with mock.patch.object(price_store, "session_closed", return_value=True):
+            self.assertEqual(set(store.get_many(["aapl", "msft", "NOPE"])), {"AAPL", "MSFT"})
+            store.get_many(["AAPL", "MSFT"])
+            store.get("MSFT")
+        # NOPE has no data, so it is asked for again; the others are cached for the day
+        self.assertEqual(store.downloads, [["AAPL", "MSFT", "NOPE"]])
+        self.assertTrue(store.is_final("AAPL"))
+
+        # The next trading day makes every symbol stale again
+        store._refreshed = {s: datetime.date(2000, 1, 3) for s in store._refreshed}
+        with mock.patch.object(price_store, "session_closed", return_value=True):
+            store.get_many(["AAPL", "MSFT"])
+        self.assertEqual(store.downloads[-1], ["AAPL", "MSFT"])
+
+    def test_partial_bars_expire_until_the_session_closes(self):
+        store = self.store()
+        now = time.time()
+        with mock.patch.object(price_store, "session_closed", return_value=False), \
+                mock.patch.object(price_store.time, "time", return_value=now):
+            store.get("AAPL")
+            store.get("AAPL")
+        self.assertEqual(len(store.downloads), 1)
+        self.assertFalse(store.is_final("AAPL"))
+
+        with mock.patch.object(price_store, "session_closed", return_value=True), \
+                mock.patch.object(price_store.time, "time", return_value=now + INTRADAY_REFRESH_SECONDS):
+            store.get("AAPL")
+        self.assertEqual(len(store.downloads), 2)
+        self.assertTrue(store.is_final("AAPL"))
+
+        with mock.patch.object(price_store.time, "time", return_value=now + 10 * INTRADAY_REFRESH_SECONDS):
+            store.get("AAPL")
+        self.assertEqual(len(store.downloads), 2)
+
+    def test_cache_survives_a_restart(self):
+        with mock.patch.object(price_store, "session_closed", return_value=True):
+            self.store().get("AAPL")
+            restarted = self.store()
+            df = restarted.get("AAPL")
+        self.assertEqual(restarted.downloads, [])
+        pd.testing.assert_frame_equal(df, self.frames["AAPL"])
+
+
+class TestScreenMarket(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        screener_router.shutdown_screener_pool()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # More symbols than one process-pool chunk
+        self.tickers = [{"symbol": f"T{i:02d}", "name": f"Ticker {i}"} for i in range(screener_router.CHUNK_SIZE + 4)]
+        frames = {t["symbol"]: make_prices(0.01 if i % 2 else -0.01, seed=i) for i, t in enumerate(self.tickers)}
+        frames.pop("T04")
+        self.store = InMemoryPriceStore(frames, self.tmp.name)
+        screener_router._results_cache.clear()
+        patches = [
+            mock.patch.object(screener_router, "get_price_store", return_value=self.store),
+            mock.patch.object(screener_router, "get_tickers_by_market", return_value=self.tickers),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        screener_router._results_cache.clear()
+        self.tmp.cleanup()
+
+    def screen(self, **kwargs):
+        return asyncio.run(screener_router.screen_market("us", **kwargs))
+
+    def test_results_from_the_process_pool(self):
+        with mock.patch.object(price_store, "session_closed", return_value=True):
+            response = self.screen(rules="above_sma200")
+        self.assertEqual(response["market"], "US")
+        self.assertEqual(response["count"], len(self.tickers) - 1)
+        self.assertEqual(response["missing"], ["T04"])
+        self.assertTrue(response["final"])
+        self.assertFalse(response["cached"])
+        # Uptrending (odd) tickers hit the rule and come first
+        hits = [r["symbol"] for r in response["results"] if r["hits"]]
+        self.assertEqual(hits, sorted(t["symbol"] for i, t in enumerate(self.tickers) if i % 2))
+        self.assertEqual(response["results"][0]["symbol"], hits[0])
+        self.assertEqual(response["results"][0]["name"], "Ticker 1")
+
+    def test_closed_session_results_are_cached_for_the_day(self):
+        with mock.patch.object(price_store, "session_closed", return_value=True):
+            first = self.screen(rules="rsi_overbought,above_sma200")
+            # Same rules in another order hit the same entry
+            second = self.screen(rules="above_sma200,rsi_overbought")
+            refreshed = self.screen(rules="above_sma200,rsi_overbought", refresh=True)
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["results"], first["results"])
+        self.assertFalse(refreshed["cached"])
+        # The rescan reads the price store; only the symbol without data is asked for again
+        self.assertEqual(self.store.downloads[1:], [["T04"]])
+
+    def test_in_session_results_expire(self):
+        now = time.time()
+        with mock.patch.object(price_store, "session_closed", return_value=False):
+            self.assertFalse(self.screen()["final"])
+            self.assertTrue(self.screen()["cached"])
+            with mock.patch.object(screener_router.time, "time", return_value=now + INTRADAY_REFRESH_SECONDS + 1):
+                self.assertFalse(self.screen()["cached"])
+
+    def test_bad_requests(self):
+        with self.assertRaises(HTTPException) as ctx:
+            self.screen(rules="no_such_rule")
+        self.assertEqual(ctx.exception.status_code, 400)
+        with mock.patch.object(screener_router, "get_tickers_by_market", return_value=[]):
+            with self.assertRaises(HTTPException) as ctx:
+                self.screen()
+        self.assertEqual(ctx.exception.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
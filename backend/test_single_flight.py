@@ -0,0 +1,159 @@
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from langchain_core.messages import HumanMessage
+
+from tradingagents.dataflows.config import config_scope
+from tradingagents.utils.fake_llm import FakeChatModel
+from tradingagents.utils.single_flight import SingleFlight, coalesce, enable_single_flight, single_flight
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.group = SingleFlight("test")
+        self.runs = 0
+
+    async def fetch(self, ticker, delay=0.05):
+        self.runs += 1
+        await asyncio.sleep(delay)
+        return {"ticker": ticker, "rows": [1, 2, 3]}
+
+    def test_concurrent_duplicates_share_one_call(self):
+        async def main():
+            return await asyncio.gather(*(self.group.ajoin("AAPL", self.fetch, "AAPL") for _ in range(3)))
+
+        results = asyncio.run(main())
+        self.assertEqual(self.runs, 1)
+        self.assertEqual([leader for _, leader in results], [True, False, False])
+        # Followers get their own copy of a mutable result
+        self.assertEqual(results[1][0], results[0][0])
+        self.assertIsNot(results[1][0], results[0][0])
+        self.assertEqual(self.group.stats(), {"calls": 3, "executed": 1, "coalesced": 2, "in_flight": 0})
+
+    def test_different_keys_and_later_calls_run_again(self):
+        async def main():
+            await asyncio.gather(self.group.ado("AAPL", self.fetch, "AAPL"), self.group.ado("MSFT", self.fetch, "MSFT"))
+            await self.group.ado("AAPL", self.fetch, "AAPL")
+
+        asyncio.run(main())
+        self.assertEqual(self.runs, 3)
+
+    def test_cancelled_waiter_does_not_cancel_the_others(self):
+        async def main():
+            leader = asyncio.ensure_future(self.group.ado("AAPL", self.fetch, "AAPL"))
+            follower = asyncio.ensure_future(self.group.ado("AAPL", self.fetch, "AAPL"))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower, leader.cancelled()
+
+        result, leader_cancelled = asyncio.run(main())
+        self.assertTrue(leader_cancelled)
+        self.assertEqual(result["ticker"], "AAPL")
+        self.assertEqual(self.runs, 1)
+
+    def test_call_is_cancelled_when_every_waiter_is(self):
+        state = {}
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+
+        async def main():
+            waiters = [asyncio.ensure_future(self.group.ado("AAPL", slow)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        self.assertTrue(state.get("cancelled"))
+        self.assertEqual(self.group.stats()["in_flight"], 0)
+
+    def test_errors_reach_every_waiter(self):
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("vendor down")
+
+        async def main():
+            return await asyncio.gather(
+                self.group.ado("AAPL", failing), self.group.ado("AAPL", failing), return_exceptions=True
+            )
+
+        results = asyncio.run(main())
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+
+class TestSyncSingleFlight(unittest.TestCase):
+    def test_threads_share_one_call(self):
+        group = SingleFlight("test-sync")
+        runs = []
+
+        def fetch():
+            runs.append(1)
+            time.sleep(0.1)
+            return ["row"]
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(group.do("AAPL", fetch))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(results, [["row"]] * 3)
+
+    def test_coalesce_can_be_turned_off(self):
+        runs = []
+
+        @coalesce("test-decorator")
+        async def fetch(ticker):
+            runs.append(ticker)
+            await asyncio.sleep(0.02)
+            return ticker
+
+        async def main():
+            return await asyncio.gather(fetch("AAPL"), fetch("AAPL"))
+
+        self.assertEqual(asyncio.run(main()), ["AAPL", "AAPL"])
+        self.assertEqual(len(runs), 1)
+        with config_scope({"single_flight": False}):
+            asyncio.run(main())
+        self.assertEqual(len(runs), 3)
+
+
+class TestSingleFlightChatModel(unittest.TestCase):
+    def test_identical_prompts_make_one_call(self):
+        llm = enable_single_flight(FakeChatModel(model="fake-quick", time_scale=0.05))
+        self.assertEqual(type(llm).__name__, "FakeChatModel")
+        before = single_flight("llm").stats()
+
+        async def main():
+            return await asyncio.gather(
+                llm.ainvoke([HumanMessage(content="Plan for AAPL", id="a")]),
+                llm.ainvoke([HumanMessage(content="Plan for AAPL", id="b")]),
+            )
+
+        first, second = asyncio.run(main())
+        after = single_flight("llm").stats()
+        self.assertEqual(after["executed"] - before["executed"], 1)
+        self.assertEqual(after["coalesced"] - before["coalesced"], 1)
+        self.assertEqual(first.content, second.content)
+        # The follower is marked free, like a cache hit
+        costs = sorted(m.usage_metadata.get("total_cost", -1) for m in (first, second))
+        self.assertEqual(costs, [-1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
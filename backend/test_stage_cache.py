@@ -0,0 +1,121 @@
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from tradingagents.agents.utils import debate_compaction, market_encoding
+from tradingagents.dataflows.config import config_scope
+from tradingagents.graph.stage_cache import StageCache
+
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = StageCache(os.path.join(self.tmp.name, "stage_cache.sqlite"))
+        self.state = {"company_of_interest": "AAPL", "trade_date": "2025-01-10", "market_report": "report"}
+
+    def tearDown(self):
+        self.cache._conn.close()
+        self.tmp.cleanup()
+
+    def key(self, state=None, helpers=()):
+        return self.cache.make_key("Bull Researcher", state or self.state, ["market_report"], helpers=helpers)
+
+    def test_round_trip_with_messages(self):
+        output = {"market_report": "text", "messages": [AIMessage(content="done", id="run-1")]}
+        self.assertTrue(self.cache.put("k", "Market Analyst", output))
+        cached = self.cache.get("k")
+        self.assertEqual(cached["market_report"], "text")
+        self.assertEqual(cached["messages"][0].content, "done")
+        # add_messages assigns a fresh id instead of reusing the old run's
+        self.assertIsNone(cached["messages"][0].id)
+
+    def test_tool_call_outputs_are_not_stored(self):
+        message = AIMessage(content="", tool_calls=[{"name": "get_news", "args": {}, "id": "call-1"}])
+        self.assertFalse(self.cache.put("k", "News Analyst", {"messages": [message]}))
+        self.assertIsNone(self.cache.get("k"))
+
+    def test_key_depends_on_inputs_only(self):
+        self.assertEqual(self.key(), self.key({**self.state, "news_report": "not an input"}))
+        self.assertNotEqual(self.key(), self.key({**self.state, "market_report": "changed"}))
+
+    def test_key_ignores_message_ids(self):
+        def state(message_id):
+            return {"messages": [HumanMessage(content="AAPL", id=message_id)]}
+
+        self.assertEqual(
+            self.cache.make_key("Market Analyst", state("a"), ["messages"]),
+            self.cache.make_key("Market Analyst", state("b"), ["messages"]),
+        )
+
+    def test_key_covers_helper_prompt_config(self):
+        with config_scope({"market_data_encoding": "compact"}):
+            compact = self.key(helpers=(market_encoding,))
+        with config_scope({"market_data_encoding": "raw"}):
+            raw = self.key(helpers=(market_encoding,))
+            # Config of helpers the stage does not use stays out of its key
+            self.assertEqual(self.key(), self.key(helpers=()))
+        self.assertNotEqual(compact, raw)
+
+        with config_scope({"debate_history_budget_tokens": 1500}):
+            budget_1500 = self.key(helpers=(debate_compaction,))
+        with config_scope({"debate_history_budget_tokens": 500}):
+            budget_500 = self.key(helpers=(debate_compaction,))
+        self.assertNotEqual(budget_1500, budget_500)
+
+    def test_expired_entries_are_not_served(self):
+        self.cache.put("k", "Trader", {"trader_investment_plan": "plan"})
+        self.cache.max_age_hours = 1
+        self.cache._conn.execute("UPDATE stage_cache SET created_at = ?", (time.time() - 2 * 3600,))
+        self.assertIsNone(self.cache.get("k"))
+        self.assertEqual(self.cache.prune(), 1)
+
+    def test_prune_keeps_newest_entries(self):
+        self.cache.max_entries = 2
+        for i in range(4):
+            self.cache.put(f"k{i}", "Trader", {"trader_investment_plan": str(i)})
+            self.cache._conn.execute("UPDATE stage_cache SET created_at = ? WHERE key = ?", (1e9 + i, f"k{i}"))
+        self.cache.max_age_hours = None
+        self.assertEqual(self.cache.prune(), 2)
+        self.assertIsNone(self.cache.get("k0"))
+        self.assertEqual(self.cache.get("k3"), {"trader_investment_plan": "3"})
+
+    def test_wrap_serves_hits_and_forwards_config(self):
+        calls = []
+
+        async def node(state, config):
+            calls.append(config)
+            return {"investment_plan": f"plan for {state['market_report']}"}
+
+        wrapped = self.cache.wrap("Research Manager", node, ["market_report"])
+        first = asyncio.run(wrapped(self.state, config={"tags": ["run-1"]}))
+        second = asyncio.run(wrapped(self.state, config={"tags": ["run-2"]}))
+        self.assertEqual(first, second)
+        self.assertEqual(calls, [{"tags": ["run-1"]}])
+        self.assertEqual(self.cache.stats(), {"hits": {"Research Manager": 1}, "misses": {"Research Manager": 1}})
+
+    def test_refresh_skips_reads_but_stores_fresh_output(self):
+        plans = iter(["old plan", "new plan"])
+
+        def node(state):
+            return {"investment_plan": next(plans)}
+
+        wrapped = self.cache.wrap("Research Manager", node, ["market_report"])
+        self.assertEqual(wrapped(self.state), {"investment_plan": "old plan"})
+        with config_scope({"stage_cache_refresh": True}):
+            self.assertEqual(wrapped(self.state), {"investment_plan": "new plan"})
+        # The next normal run gets the refreshed entry
+        self.assertEqual(wrapped(self.state), {"investment_plan": "new plan"})
+        self.assertEqual(self.cache.stats(), {"hits": {"Research Manager": 1}, "misses": {"Research Manager": 2}})
+
+
+if __name__ == '__main__':
+    unittest.main()
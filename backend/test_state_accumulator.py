@@ -0,0 +1,71 @@
+
+import os
+import sys
+import unittest
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, RemoveMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from tradingagents.graph.propagation import StateAccumulator
+
+
+class TestStateAccumulator(unittest.TestCase):
+    def setUp(self):
+        self.acc = StateAccumulator({
+            "company_of_interest": "AAPL",
+            "market_report": "",
+            "messages": [HumanMessage(content="AAPL", id="h1")],
+        })
+
+    def test_returns_only_changed_keys(self):
+        changed = self.acc.apply({"Market Analyst": {"market_report": "up", "company_of_interest": "AAPL"}})
+        self.assertEqual(changed, {"market_report": "up"})
+        self.assertEqual(self.acc.state["market_report"], "up")
+
+    def test_skips_non_dict_updates(self):
+        self.assertEqual(self.acc.apply({"Msg Clear": None, "__interrupt__": ()}), {})
+
+    def test_merges_updates_of_parallel_nodes(self):
+        changed = self.acc.apply({
+            "Market Analyst": {"market_report": "m"},
+            "News Analyst": {"news_report": "n"},
+        })
+        self.assertEqual(changed, {"market_report": "m", "news_report": "n"})
+
+    def test_appends_new_messages(self):
+        changed = self.acc.apply({"Market Analyst": {"messages": [AIMessage(content="report")]}})
+        self.assertEqual([m.content for m in changed["messages"]], ["report"])
+        self.assertEqual([m.content for m in self.acc.state["messages"]], ["AAPL", "report"])
+        # Messages without an id get one, like the graph's own reducer
+        self.assertIsNotNone(self.acc.state["messages"][-1].id)
+
+    def test_replaced_message_is_returned_not_the_last_one(self):
+        self.acc.apply({"Market Analyst": {"messages": [AIMessage(content="draft", id="a1")]}})
+        self.acc.apply({"tools_market": {"messages": [AIMessage(content="tool result", id="t1")]}})
+        changed = self.acc.apply({"Market Analyst": {"messages": [AIMessage(content="final", id="a1")]}})
+
+        self.assertEqual([(m.id, m.content) for m in changed["messages"]], [("a1", "final")])
+        self.assertEqual([m.content for m in self.acc.state["messages"]], ["AAPL", "final", "tool result"])
+
+    def test_message_chunks_and_tuples_are_normalized(self):
+        changed = self.acc.apply({"Trader": {"messages": [AIMessageChunk(content="chunk"), ("human", "hi")]}})
+        self.assertEqual([type(m).__name__ for m in changed["messages"]], ["AIMessage", "HumanMessage"])
+
+    def test_removals(self):
+        self.acc.apply({"Market Analyst": {"messages": [AIMessage(content="x", id="a1")]}})
+        changed = self.acc.apply({"Msg Clear": {"messages": [RemoveMessage(id="a1"), RemoveMessage(id="unknown")]}})
+        self.assertNotIn("messages", changed)
+        self.assertEqual([m.id for m in self.acc.state["messages"]], ["h1"])
+
+        changed = self.acc.apply({"Msg Clear": {"messages": [
+            RemoveMessage(id=REMOVE_ALL_MESSAGES), HumanMessage(content="Continue", id="h2")
+        ]}})
+        self.assertEqual([m.id for m in changed["messages"]], ["h2"])
+        self.assertEqual([m.id for m in self.acc.state["messages"]], ["h2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
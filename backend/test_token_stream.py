@@ -0,0 +1,94 @@
+
+import asyncio
+import os
+import sys
+import unittest
+
+# Add relevant paths
+sys.path.append(os.path.join(os.getcwd(), 'backend'))
+
+from langchain_core.messages import AIMessageChunk, HumanMessage, ToolMessage
+
+from api.token_stream import TokenBatcher, message_text
+
+
+def chunk(text):
+    return AIMessageChunk(content=text)
+
+
+class TestMessageText(unittest.TestCase):
+    def test_text_of_ai_chunks(self):
+        self.assertEqual(message_text(chunk("Revenue grew")), "Revenue grew")
+        content = [{"type": "text", "text": "Bullish "}, {"type": "tool_use", "id": "1", "name": "x", "input": {}}, "on AI"]
+        self.assertEqual(message_text(AIMessageChunk(content=content)), "Bullish on AI")
+
+    def test_everything_else_is_ignored(self):
+        tool_call_only = AIMessageChunk(content="", tool_call_chunks=[
+            {"name": "get_news", "args": '{"ticker": "AAPL"}', "id": "call-1", "index": 0}
+        ])
+        self.assertEqual(message_text(tool_call_only), "")
+        self.assertEqual(message_text(HumanMessage(content="Analyse AAPL")), "")
+        self.assertEqual(message_text(ToolMessage(content="csv rows", tool_call_id="call-1")), "")
+        self.assertEqual(message_text("raw string"), "")
+
+
+class TestTokenBatcher(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+
+    async def send(self, event, data):
+        self.sent.append((event, data["node"], data["agent"], data["content"]))
+
+    def test_batches_per_node_within_the_interval(self):
+        async def main():
+            async with TokenBatcher(self.send, interval=0.05) as batcher:
+                for text in ("Bull ", "case ", "holds"):
+                    batcher.add("Bull Researcher", chunk(text))
+                batcher.add("Bear Researcher", chunk("Too "))
+                batcher.add("Bull Researcher", ToolMessage(content="ignored", tool_call_id="1"))
+                await asyncio.sleep(0.08)  # one timer flush
+                batcher.add("Bear Researcher", chunk("expensive"))
+                self.assertEqual(len(self.sent), 2)
+            return batcher.events
+
+        events = asyncio.run(main())
+        self.assertEqual(self.sent, [
+            ("token", "Bull Researcher", "Bull Researcher", "Bull case holds"),
+            ("token", "Bear Researcher", "Bear Researcher", "Too "),
+            ("token", "Bear Researcher", "Bear Researcher", "expensive"),
+        ])
+        self.assertEqual(events, 3)
+
+    def test_flush_one_node_before_its_report(self):
+        async def main():
+            batcher = TokenBatcher(self.send, interval=10)
+            batcher.start()
+            batcher.add("Market Analyst", chunk("RSI is 71"))
+            batcher.add("Risk Judge", chunk("HOLD"))
+            await batcher.flush("Market Analyst")
+            # The report goes out after the node's last tokens
+            await self.send("report", {"node": "Market Analyst", "agent": "Market Analyst", "content": "report"})
+            self.assertEqual([e[0] for e in self.sent], ["token", "report"])
+            await batcher.stop()
+            await batcher.stop()  # safe to call twice
+
+        asyncio.run(main())
+        self.assertEqual(self.sent, [
+            ("token", "Market Analyst", "Market Analyst", "RSI is 71"),
+            ("report", "Market Analyst", "Market Analyst", "report"),
+            # stop() drains the rest; Risk Judge is reported as the Portfolio Manager
+            ("token", "Risk Judge", "Portfolio Manager", "HOLD"),
+        ])
+
+    def test_nothing_pending_sends_nothing(self):
+        async def main():
+            async with TokenBatcher(self.send, interval=0.01) as batcher:
+                batcher.add("Trader", chunk(""))
+                await asyncio.sleep(0.03)
+
+        asyncio.run(main())
+        self.assertEqual(self.sent, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 from .utils.agent_utils import create_msg_delete
+from .utils.data_prefetch import create_data_prefetcher, prefetch_data, PrefetchedData
+from .utils.debate_rounds import create_invest_debate_round, create_risk_debate_round
 from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
 from .utils.memory import FinancialSituationMemory
 
@@ -16,6 +18,7 @@ from .risk_mgmt.neutral_debator import create_neutral_debator
 
 from .managers.research_manager import create_research_manager
 from .managers.risk_manager import create_risk_manager
+from .managers.quick_decision import create_quick_decision
 
 from .trader.trader import create_trader
 from .summarize.analysts.fundamentals_sum import create_summarizer_fundamental
@@ -39,11 +42,17 @@ __all__ = [
     "FinancialSituationMemory",
     "AgentState",
     "create_msg_delete",
+    "create_data_prefetcher",
+    "prefetch_data",
+    "PrefetchedData",
+    "create_invest_debate_round",
+    "create_risk_debate_round",
     "InvestDebateState",
     "RiskDebateState",
     "create_bear_researcher",
     "create_bull_researcher",
     "create_research_manager",
+    "create_quick_decision",
     "create_fundamentals_analyst",
     "create_market_analyst",
     "create_neutral_debator",
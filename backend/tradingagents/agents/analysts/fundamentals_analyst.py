@@ -4,11 +4,7 @@ from typing import List
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import JsonOutputParser
-
-from tradingagents.agents.utils.fundamental_data_tools import (
-    get_all_fundamentals_batch
-)
-from tradingagents.dataflows.local_call import get_10years_fundamentals
+from langchain_core.runnables import RunnableConfig
 
 
 # ===================== PYDANTIC MODELS ======================
@@ -33,12 +29,12 @@ class FundamentalReport(BaseModel):
 def create_fundamentals_analyst(llm):
     parser = JsonOutputParser(pydantic_object=FundamentalReport)
 
-    async def fundamentals_analyst_node(state):
+    async def fundamentals_analyst_node(state, config: RunnableConfig):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
-        # ===================== PRE-FETCH DATA ======================
-        fundamentals_data = await get_10years_fundamentals(ticker)
+        # ===================== PREFETCHED DATA ======================
+        fundamentals_data = state.get("prefetched_data", {}).get("fundamentals") or "No fundamental data available."
 
         # ===================== SYSTEM MESSAGE ======================
         system_message = f"""
@@ -92,7 +88,7 @@ def create_fundamentals_analyst(llm):
 
         # Execute
         print("🤖 Fundamentals Analyst: Analyzing pre-fetched data...")
-        result = await chain.ainvoke(state["messages"])
+        result = await chain.ainvoke(state["messages"], config=config)
         
         print("Fundamentals Analysis Result:", result)
 
@@ -1,17 +1,12 @@
+import asyncio
 import json
 import re
 from typing import List, Literal
-from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import JsonOutputParser
-from tradingagents.dataflows.core_calculator import process_indicators_from_csv
-from tradingagents.dataflows.core_stock_price import get_stock_data
-from tradingagents.dataflows.core_calculator import (
-    process_indicators_from_csv, 
-    calculate_sma, calculate_ema, calculate_rsi, calculate_macd, 
-    calculate_bollinger_bands, calculate_atr, calculate_vwma
-)
+from langchain_core.runnables import RunnableConfig
+from tradingagents.agents.utils.market_encoding import market_context
 
 
 # ===================== PYDANTIC MODELS ======================
@@ -55,65 +50,27 @@ class MarketReport(BaseModel):
 def create_market_analyst(llm):
     parser = JsonOutputParser(pydantic_object=MarketReport)
 
-    def market_analyst_node(state):
+    async def market_analyst_node(state, config: RunnableConfig):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
-        
-        # Calculate date range
-        try:
-            curr_date_obj = datetime.strptime(current_date, "%Y-%m-%d")
-            start_date = (curr_date_obj - timedelta(days=365)).strftime("%Y-%m-%d")
-        except Exception:
-            start_date = "2024-01-01"
 
-        # ===================== PRE-FETCH DATA ======================
-        print(f"📊 Market Analyst: Pre-fetching data for {ticker}...")
-        try:
-            # 1. Fetch Stock Data
-            stock_data = get_stock_data(ticker, start_date, current_date)
-            
-            # 2. Calculate Indicators Locally (No API Call)
-            indicators, df = process_indicators_from_csv(stock_data)
-            
-            indicators_context = ""
-            if indicators and "error" not in indicators:
-                indicators_context = json.dumps(indicators, indent=2)
-                
-                # Add Historical Context (Last 5 Days)
-                if df is not None and not df.empty:
-                                        
-                    # Recalculate series for history
-                    df['SMA_50'] = calculate_sma(df, 50)
-                    # df['SMA_200'] = calculate_sma(df, 200)
-                    df['EMA_10'] = calculate_ema(df, 10)
-                    df['RSI'] = calculate_rsi(df, 14)
-                    macd, signal, hist = calculate_macd(df)
-                    df['MACD'] = macd
-                    df['MACD_S'] = signal
-                    df['MACD_H'] = hist
-                    ub, lb = calculate_bollinger_bands(df)
-                    df['BOLL_UB'] = ub
-                    df['BOLL_LB'] = lb
-                    df['ATR'] = calculate_atr(df)
-                    df['VWMA'] = calculate_vwma(df)
-                    
-                    cols = ['Close', 'SMA_50', 'EMA_10', 'RSI', 'MACD','MACD_S','MACD_H','BOLL_UB','BOLL_LB','ATR','VWMA']
-                    history_str = df[cols].tail(100).to_string()
-                    indicators_context += f"\n\nRECENT HISTORICAL DATA :\n{history_str}"
-                    print(history_str)
-            else:
-                 indicators_context = f"Error calculating indicators: {indicators.get('error')}"
+        # ===================== PREFETCHED DATA ======================
+        # Indicator math is CPU-bound pandas/NumPy work -> keep it off the event loop
+        def build_data_context():
+            print(f"📊 Market Analyst: Building context for {ticker}...")
+            try:
+                # 1. Stock Data (fetched by the Data Prefetch node)
+                stock_data = state.get("prefetched_data", {}).get("stock_data") or ""
 
-            data_context = f"""
-            STOCK PRICE DATA (Last 1 Year - CSV Format):
-            {stock_data[-2000:] if len(stock_data) > 2000 else stock_data} 
-            
-            TECHNICAL INDICATORS (Current & History):
-            {indicators_context}
-            """
-        except Exception as e:
-            print(f"⚠️ Data pre-fetch failed: {e}")
-            data_context = f"Error fetching data: {e}"
+                # 2. Indicators calculated locally (No API Call), encoded compactly
+                #    (weekly + recent daily rows, see utils/market_encoding.py)
+                data_context = market_context(stock_data)
+            except Exception as e:
+                print(f"⚠️ Building market context failed: {e}")
+                data_context = f"Error preparing data: {e}"
+            return data_context
+
+        data_context = await asyncio.to_thread(build_data_context)
 
         # ===================== SYSTEM MESSAGE ======================
         system_message = f"""
@@ -153,7 +110,7 @@ OUTPUT FORMAT:
 
         # Execute
         print("🤖 Market Analyst: Analyzing pre-fetched data...")
-        result = chain.invoke(state["messages"])
+        result = await chain.ainvoke(state["messages"], config=config)
         
         # ========== PARSE WITH ROBUST ERROR HANDLING ==========
         report_dict = None
@@ -1,12 +1,10 @@
 import json
 import re
 from typing import List, Literal
-from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import JsonOutputParser
-
-from tradingagents.agents.utils.agent_utils import get_all_news_batch
+from langchain_core.runnables import RunnableConfig
 
 
 # ===================== PYDANTIC MODELS ======================
@@ -32,19 +30,12 @@ class NewsReport(BaseModel):
 def create_news_analyst(llm):
     parser = JsonOutputParser(pydantic_object=NewsReport)
 
-    async def news_analyst_node(state):
+    async def news_analyst_node(state, config: RunnableConfig):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
-        # Calculate 7 days lookback
-        try:
-            curr_date_obj = datetime.strptime(current_date, "%Y-%m-%d")
-            start_date = (curr_date_obj - timedelta(days=7)).strftime("%Y-%m-%d")
-        except Exception:
-            start_date = "2024-01-01"
-
-        # ===================== PRE-FETCH DATA ======================
-        news_data = await get_all_news_batch(ticker, start_date, current_date)
+        # ===================== PREFETCHED DATA ======================
+        news_data = state.get("prefetched_data", {}).get("news") or "No news data available."
 
         # ===================== SYSTEM MESSAGE ======================
         system_message = f"""
@@ -92,7 +83,7 @@ Return ONLY the JSON object, no markdown code blocks.
         chain = prompt | llm
 
         # Execute
-        result = await chain.ainvoke(state["messages"])
+        result = await chain.ainvoke(state["messages"], config=config)
         
         print("News Analysis Result:", result)
 
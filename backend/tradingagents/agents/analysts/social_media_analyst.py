@@ -1,3 +1,4 @@
+import asyncio
 import json
 import re
 from typing import List, Literal
@@ -5,8 +6,7 @@ from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import JsonOutputParser
-
-from tradingagents.agents.utils.agent_utils import get_news, get_social
+from langchain_core.runnables import RunnableConfig
 
 
 # ===================== PYDANTIC MODELS ======================
@@ -26,7 +26,7 @@ class SocialMediaReport(BaseModel):
 def create_social_media_analyst(llm):
     parser = JsonOutputParser(pydantic_object=SocialMediaReport)
 
-    async def social_media_analyst_node(state):
+    async def social_media_analyst_node(state, config: RunnableConfig):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
@@ -37,8 +37,7 @@ def create_social_media_analyst(llm):
         except Exception:
             start_date = "2024-01-01"
 
-        print(f"💬 Social Analyst: Fetching data for {ticker}...")
-        social_data = await get_social(ticker)
+        social_data = state.get("prefetched_data", {}).get("social") or "No social media data available."
 
         # ===================== SYSTEM MESSAGE ======================
         system_message = f"""
@@ -96,7 +95,7 @@ def create_social_media_analyst(llm):
         chain = prompt | llm
 
         # Execute
-        result = chain.invoke(state["messages"])
+        result = await chain.ainvoke(state["messages"], config=config)
         
         print("Social Media Analysis Result:", result)
 
@@ -0,0 +1,120 @@
+import asyncio
+import json
+from typing import Literal
+from pydantic import BaseModel, Field
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableConfig
+
+
+class QuickDecisionOutput(BaseModel):
+    recommendation: Literal["BUY", "SELL", "HOLD"] = Field(description="The final decision")
+    reasoning: str = Field(description="The strongest evidence for and against, weighed in a few sentences")
+    refined_trader_plan: str = Field(description="Entry, Stop Loss, Position Size and the key risk to monitor")
+
+
+def create_quick_decision(llm, memory):
+    """
+    Quick screen (analysis mode "quick"): one node reads the analyst reports and
+    decides, in place of the bull/bear debate, research manager, trader and risk
+    debate. Writes the same keys as the Risk Judge, so the API and signal
+    processing handle it like a full run.
+    """
+    async def quick_decision_node(state, config: RunnableConfig) -> dict:
+        company_name = state["company_of_interest"]
+        market_research_report = state.get("market_report", "")
+        sentiment_report = state.get("sentiment_report", "")
+        news_report = state.get("news_report", "")
+        fundamentals_report = state.get("fundamentals_report", "")
+        risk_debate_state = state["risk_debate_state"]
+
+        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+        past_memories = await asyncio.to_thread(memory.get_memories, curr_situation, n_matches=2)
+
+        past_memory_str = ""
+        if past_memories:
+            for i, rec in enumerate(past_memories, 1):
+                past_memory_str += rec["recommendation"] + "\n\n"
+
+        parser = JsonOutputParser(pydantic_object=QuickDecisionOutput)
+
+        base_prompt = """You are the Portfolio Manager making a quick screening decision on {company_name}. There is no debate this time: weigh the analyst reports yourself, arguing briefly for and against, and commit to Buy, Sell, or Hold. Choose Hold only if strongly justified by specific evidence, not as a fallback.
+
+                Learn from past mistakes: {past_memory_str}
+
+                ---
+
+                **Market Report:** {market_report}
+
+                **Social Sentiment Report:** {sentiment_report}
+
+                **News Report:** {news_report}
+
+                **Fundamentals Report:** {fundamentals_report}
+
+                ---
+
+                Be concise and decisive."""
+
+        final_prompt_str = base_prompt + "\n\nIMPORTANT: Your response must be in strict JSON format based on the following schema:\n{format_instructions}"
+
+        prompt_template = PromptTemplate(
+            template=final_prompt_str,
+            input_variables=["company_name", "past_memory_str", "market_report", "sentiment_report", "news_report", "fundamentals_report"],
+            partial_variables={"format_instructions": parser.get_format_instructions()}
+        )
+
+        chain = prompt_template | llm | parser
+
+        try:
+            parsed_result = await chain.ainvoke({
+                "company_name": company_name,
+                "past_memory_str": past_memory_str,
+                "market_report": market_research_report,
+                "sentiment_report": sentiment_report,
+                "news_report": news_report,
+                "fundamentals_report": fundamentals_report,
+            }, config=config)
+            final_output_str = json.dumps(parsed_result, indent=4, ensure_ascii=False)
+
+        except Exception as e:
+            print(f"⚠️ Quick Decision Parsing Error: {e}")
+            # Fallback กรณี Parse ไม่ผ่าน ให้สร้าง JSON structure เปล่าๆ กันโปรแกรมพัง
+            fallback = {
+                "recommendation": "HOLD (Parsing Error)",
+                "reasoning": f"Failed to parse output. Raw error: {str(e)}",
+                "refined_trader_plan": ""
+            }
+            final_output_str = json.dumps(fallback, indent=4)
+
+        # No debate ran: empty histories keep the state shape of a full run (logging, reflection)
+        new_risk_debate_state = {
+            "judge_decision": final_output_str,
+            "history": risk_debate_state.get("history", ""),
+            "risky_history": "",
+            "safe_history": "",
+            "neutral_history": "",
+            "latest_speaker": "Judge",
+            "current_risky_response": "",
+            "current_safe_response": "",
+            "current_neutral_response": "",
+            "count": risk_debate_state.get("count", 0),
+        }
+        new_investment_debate_state = {
+            "judge_decision": "",
+            "history": "",
+            "bear_history": "",
+            "bull_history": "",
+            "current_response": "",
+            "count": 0,
+        }
+
+        return {
+            "investment_debate_state": new_investment_debate_state,
+            "risk_debate_state": new_risk_debate_state,
+            "investment_plan": "",
+            "trader_investment_plan": "",
+            "final_trade_decision": final_output_str,
+        }
+
+    return quick_decision_node
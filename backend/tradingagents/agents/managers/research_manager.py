@@ -1,9 +1,11 @@
+import asyncio
 import time
 import json
+from langchain_core.runnables import RunnableConfig
 
 
 def create_research_manager(llm, memory):
-    def research_manager_node(state) -> dict:
+    async def research_manager_node(state, config: RunnableConfig) -> dict:
         history = state["investment_debate_state"].get("history", "")
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
@@ -13,7 +15,7 @@ def create_research_manager(llm, memory):
         investment_debate_state = state["investment_debate_state"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = await asyncio.to_thread(memory.get_memories, curr_situation, n_matches=2)
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -43,10 +45,10 @@ def create_research_manager(llm, memory):
         Focus only on the core insights and the decision logic. No fluff, no formatting structure.
         """
         
-        response = llm.invoke([
+        response = await llm.ainvoke([
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt}
-        ])
+        ], config=config)
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -1,9 +1,11 @@
+import asyncio
 import time
 import json
 from typing import Literal
 from pydantic import BaseModel, Field
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableConfig
 
 class RiskManagerOutput(BaseModel):
     recommendation: Literal["BUY", "SELL", "HOLD"] = Field(description="The final decision")
@@ -11,7 +13,7 @@ class RiskManagerOutput(BaseModel):
     refined_trader_plan: str = Field(description="The final approved execution plan (Entry, Stop Loss, Position Size, etc.)")
 
 def create_risk_manager(llm, memory):
-    def risk_manager_node(state) -> dict:
+    async def risk_manager_node(state, config: RunnableConfig) -> dict:
 
         company_name = state["company_of_interest"]
 
@@ -25,7 +27,7 @@ def create_risk_manager(llm, memory):
         trader_plan = state["investment_plan"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = await asyncio.to_thread(memory.get_memories, curr_situation, n_matches=2)
 
         past_memory_str = ""
         if past_memories:
@@ -66,11 +68,11 @@ def create_risk_manager(llm, memory):
 
         try:
             # Invoke Chain
-            parsed_result = chain.invoke({
+            parsed_result = await chain.ainvoke({
                 "trader_plan": trader_plan,
                 "history": history,
                 "past_memory_str": past_memory_str
-            })
+            }, config=config)
             
             # แปลง Dict กลับเป็น JSON String เพื่อเก็บลง State (ตาม Logic เดิมที่ระบบอื่นอาจจะรอรับ String)
             final_output_str = json.dumps(parsed_result, indent=4, ensure_ascii=False)
@@ -1,12 +1,18 @@
+import asyncio
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
 import time
 import json
 
+from tradingagents.agents.utils.debate_compaction import compact_for_prompt
+from tradingagents.agents.utils.debate_stance import record_stance, stance_prompt
+
 
 def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
+    async def bull_node(state, config: RunnableConfig) -> dict:
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
+        prompt_history = compact_for_prompt(history, "Bull Researcher")
         bull_history = investment_debate_state.get("bull_history", "")
 
         current_response = investment_debate_state.get("current_response", "")
@@ -16,7 +22,7 @@ def create_bull_researcher(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = await asyncio.to_thread(memory.get_memories, curr_situation, n_matches=2)
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -41,7 +47,7 @@ def create_bull_researcher(llm, memory):
         Fundamentals: {fundamentals_report}
 
         DEBATE CONTEXT
-        History: {history}
+        History: {prompt_history}
         Last Bear Argument: {current_response}
 
         PAST MISTAKES TO AVOID
@@ -58,12 +64,14 @@ def create_bull_researcher(llm, memory):
         State clearly why the stock is a strong investment opportunity right now.
         """
 
-        response = llm.invoke([
+        response = await llm.ainvoke([
             {"role": "system", "content": system_message},
-            {"role": "user", "content": user_message}
-        ])
+            {"role": "user", "content": user_message + stance_prompt()}
+        ], config=config)
 
-        argument = f"Bull Analyst: {response.content}"
+        # The STANCE line is kept out of the argument and stored for the early-stop check
+        text, stances = record_stance(investment_debate_state, "Bull", response.content)
+        argument = f"Bull Analyst: {text}"
 
         new_investment_debate_state = {
             "history": history + "\n" + argument,
@@ -71,6 +79,7 @@ def create_bull_researcher(llm, memory):
             "bear_history": investment_debate_state.get("bear_history", ""),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
+            "stances": stances,
         }
 
         return {"investment_debate_state": new_investment_debate_state}
@@ -1,11 +1,17 @@
+import asyncio
 import time
 import json
 
+from tradingagents.agents.utils.debate_compaction import compact_for_prompt
+from tradingagents.agents.utils.debate_stance import record_stance, stance_prompt
+from langchain_core.runnables import RunnableConfig
+
 
 def create_risky_debator(llm):
-    def risky_node(state) -> dict:
+    async def risky_node(state, config: RunnableConfig) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
+        prompt_history = compact_for_prompt(history, "Risky Analyst")
         risky_history = risk_debate_state.get("risky_history", "")
 
         current_safe_response = risk_debate_state.get("current_safe_response", "")
@@ -42,7 +48,7 @@ def create_risky_debator(llm):
         Fundamentals: {fundamentals_report}
 
         DEBATE CONTEXT
-        History: {history}
+        History: {prompt_history}
         Conservative Argument: {current_safe_response}
         Neutral Argument: {current_neutral_response}
 
@@ -53,12 +59,14 @@ def create_risky_debator(llm):
         4. Maintain a "Fortune favors the bold" tone throughout.
         """
 
-        response = llm.invoke([
+        response = await llm.ainvoke([
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ])
+            {"role": "user", "content": user_prompt + stance_prompt()}
+        ], config=config)
 
-        argument = f"Risky Analyst: {response.content}"
+        # The STANCE line is kept out of the argument and stored for the early-stop check
+        text, stances = record_stance(risk_debate_state, "Risky", response.content)
+        argument = f"Risky Analyst: {text}"
 
         new_risk_debate_state = {
             "history": history + "\n" + argument,
@@ -72,6 +80,7 @@ def create_risky_debator(llm):
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            "stances": stances,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
@@ -1,12 +1,18 @@
+import asyncio
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
 import time
 import json
 
+from tradingagents.agents.utils.debate_compaction import compact_for_prompt
+from tradingagents.agents.utils.debate_stance import record_stance, stance_prompt
+
 
 def create_safe_debator(llm):
-    def safe_node(state) -> dict:
+    async def safe_node(state, config: RunnableConfig) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
+        prompt_history = compact_for_prompt(history, "Safe Analyst")
         safe_history = risk_debate_state.get("safe_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
@@ -42,7 +48,7 @@ def create_safe_debator(llm):
         Fundamentals: {fundamentals_report}
 
         DEBATE CONTEXT
-        History: {history}
+        History: {prompt_history}
         Risky Argument: {current_risky_response}
         Neutral Argument: {current_neutral_response}
 
@@ -52,12 +58,14 @@ def create_safe_debator(llm):
         3. Conclude with **Protective Measures**, demanding a reduced Position Size or a tighter Stop Loss to ensure survival.
         """
 
-        response = llm.invoke([
+        response = await llm.ainvoke([
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ])
+            {"role": "user", "content": user_prompt + stance_prompt()}
+        ], config=config)
 
-        argument = f"Safe Analyst: {response.content}"
+        # The STANCE line is kept out of the argument and stored for the early-stop check
+        text, stances = record_stance(risk_debate_state, "Safe", response.content)
+        argument = f"Safe Analyst: {text}"
 
         new_risk_debate_state = {
             "history": history + "\n" + argument,
@@ -73,6 +81,7 @@ def create_safe_debator(llm):
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            "stances": stances,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
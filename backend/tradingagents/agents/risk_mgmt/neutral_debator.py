@@ -1,11 +1,17 @@
+import asyncio
 import time
 import json
 
+from tradingagents.agents.utils.debate_compaction import compact_for_prompt
+from tradingagents.agents.utils.debate_stance import record_stance, stance_prompt
+from langchain_core.runnables import RunnableConfig
+
 
 def create_neutral_debator(llm):
-    def neutral_node(state) -> dict:
+    async def neutral_node(state, config: RunnableConfig) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
+        prompt_history = compact_for_prompt(history, "Neutral Analyst")
         neutral_history = risk_debate_state.get("neutral_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
@@ -41,7 +47,7 @@ def create_neutral_debator(llm):
         Fundamentals: {fundamentals_report}
 
         DEBATE CONTEXT
-        History: {history}
+        History: {prompt_history}
         Risky Argument: {current_risky_response}
         Safe Argument: {current_safe_response}
 
@@ -51,12 +57,14 @@ def create_neutral_debator(llm):
         3. Conclude with a **Strategic Compromise**, proposing specific modifications (e.g., "Enter, but with half the position size" or "Wait for confirmation").
         """
         
-        response = llm.invoke([
+        response = await llm.ainvoke([
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ])
+            {"role": "user", "content": user_prompt + stance_prompt()}
+        ], config=config)
 
-        argument = f"Neutral Analyst: {response.content}"
+        # The STANCE line is kept out of the argument and stored for the early-stop check
+        text, stances = record_stance(risk_debate_state, "Neutral", response.content)
+        argument = f"Neutral Analyst: {text}"
 
         new_risk_debate_state = {
             "history": history + "\n" + argument,
@@ -70,6 +78,7 @@ def create_neutral_debator(llm):
             "current_safe_response": risk_debate_state.get("current_safe_response", ""),
             "current_neutral_response": argument,
             "count": risk_debate_state["count"] + 1,
+            "stances": stances,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
@@ -1,11 +1,5 @@
-import openai, os
-from openai import AsyncOpenAI
-
-# ควรสร้าง Client นอกฟังก์ชัน หรือใช้ Singleton เพื่อไม่ให้สร้าง connection ใหม่ทุกครั้งที่เรียก
-client = AsyncOpenAI(
-    api_key=os.getenv("TYPHOON_API_KEY"),
-    base_url="https://api.opentyphoon.ai/v1"
-)
+from tradingagents.utils.http_clients import typhoon_client
+from tradingagents.utils.llm_cache import cached_chat_completion
 
 def create_summarizer_news():
     async def news_summarizer(state) -> dict:
@@ -40,7 +34,7 @@ def create_summarizer_news():
         4. Conclude with the primary **Implication** for the stock/market (e.g., "Expect volatility ahead of the ruling").
         """
         try:
-            response = await client.chat.completions.create(
+            response = await cached_chat_completion(typhoon_client(), "news_summarizer",
                 model="typhoon-v2.1-12b-instruct",
                 messages=[
                     {"role": "system", "content": system_prompt},
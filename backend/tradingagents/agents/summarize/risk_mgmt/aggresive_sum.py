@@ -1,11 +1,5 @@
-import openai, os
-from openai import AsyncOpenAI
-
-# ควรสร้าง Client นอกฟังก์ชัน หรือใช้ Singleton เพื่อไม่ให้สร้าง connection ใหม่ทุกครั้งที่เรียก
-client = AsyncOpenAI(
-    api_key=os.getenv("TYPHOON_API_KEY"),
-    base_url="https://api.opentyphoon.ai/v1"
-)
+from tradingagents.utils.http_clients import typhoon_client
+from tradingagents.utils.llm_cache import cached_chat_completion
 
 def create_summarizer_aggressive():
     async def aggressive_node_summarizer(state) -> dict: # async def
@@ -41,7 +35,7 @@ def create_summarizer_aggressive():
         """
         
         try:
-            response = await client.chat.completions.create( # await
+            response = await cached_chat_completion(typhoon_client(), "aggressive_node_summarizer",  # await
                 model="typhoon-v2.1-12b-instruct",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -1,11 +1,5 @@
-import openai, os
-from openai import AsyncOpenAI
-
-# ควรสร้าง Client นอกฟังก์ชัน หรือใช้ Singleton เพื่อไม่ให้สร้าง connection ใหม่ทุกครั้งที่เรียก
-client = AsyncOpenAI(
-    api_key=os.getenv("TYPHOON_API_KEY"),
-    base_url="https://api.opentyphoon.ai/v1"
-)
+from tradingagents.utils.http_clients import typhoon_client
+from tradingagents.utils.llm_cache import cached_chat_completion
 
 def create_summarizer_conservative():
     async def conservative_node_summarizer(state) -> dict:
@@ -40,7 +34,7 @@ def create_summarizer_conservative():
         4. Conclude with a **Protective Recommendation** (e.g., "Prioritize cash and await better risk-reward").
         """
         try:
-            response = await client.chat.completions.create(
+            response = await cached_chat_completion(typhoon_client(), "conservative_node_summarizer",
                 model="typhoon-v2.1-12b-instruct",
                 messages=[
                     {"role": "system", "content": system_prompt},
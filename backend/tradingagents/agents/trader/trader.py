@@ -1,8 +1,10 @@
+import asyncio
 import functools
 import json
 from pydantic import BaseModel, Field
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableConfig
 
 # 1. กำหนดโครงสร้างข้อมูลที่ต้องการด้วย Pydantic (Schema Definition)
 class PlanValidation(BaseModel):
@@ -26,7 +28,7 @@ class TraderDecision(BaseModel):
 # --- Function หลัก ---
 
 def create_trader(llm, memory):
-    def trader_node(state, name):
+    async def trader_node(state, config: RunnableConfig, name):
         company_name = state.get("company_of_interest", "Unknown Company")
         investment_plan = state.get("investment_plan", "N/A")
         
@@ -38,7 +40,7 @@ def create_trader(llm, memory):
 
         # 2. ค้นหา Memory
         curr_situation = f"{market_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = await asyncio.to_thread(memory.get_memories, curr_situation, n_matches=2)
 
         past_memory_str = ""
         if past_memories:
@@ -93,7 +95,7 @@ def create_trader(llm, memory):
 
         try:
             # เรียกใช้งาน Chain
-            parsed_result = chain.invoke({
+            parsed_result = await chain.ainvoke({
                 "company_name": company_name,
                 "market_report": market_report,
                 "sentiment_report": sentiment_report,
@@ -101,7 +103,7 @@ def create_trader(llm, memory):
                 "fundamentals_report": fundamentals_report,
                 "investment_plan": investment_plan,
                 "past_memory_str": past_memory_str
-            })
+            }, config=config)
 
             # แปลง Dict กลับเป็น JSON String เพื่อเก็บลง State (ตาม Logic เดิม)
             trader_plan_content = json.dumps(parsed_result, indent=4, ensure_ascii=False)
@@ -5,6 +5,7 @@ from langchain_openai import ChatOpenAI
 from tradingagents.agents import *
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import END, StateGraph, START, MessagesState
+from tradingagents.agents.utils.data_prefetch import PrefetchedData
 
 
 # Researcher team state
@@ -17,8 +18,13 @@ class InvestDebateState(TypedDict):
     ]  # Bullish Conversation history
     history: Annotated[str, "Conversation history"]  # Conversation history
     current_response: Annotated[str, "Latest response"]  # Last response
+    # parallel debate mode: each side's argument from the previous round
+    current_bull_response: Annotated[str, "Latest response by the bull researcher"]
+    current_bear_response: Annotated[str, "Latest response by the bear researcher"]
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    # {"speaker", "stance", "confidence"} per turn, for the early-stop check (debate_stance.py)
+    stances: Annotated[list, "Structured stance of every turn"]
 
 
 # Risk management team state
@@ -45,6 +51,7 @@ class RiskDebateState(TypedDict):
     ]  # Last response
     judge_decision: Annotated[str, "Judge's decision"]
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    stances: Annotated[list, "Structured stance of every turn"]
 
 
 class AgentState(MessagesState):
@@ -53,6 +60,9 @@ class AgentState(MessagesState):
 
     sender: Annotated[str, "Agent that sent this message"]
 
+    # vendor data fetched concurrently by the Data Prefetch node
+    prefetched_data: Annotated[PrefetchedData, "Raw vendor data for the analysts"]
+
     # research step
     market_report: Annotated[str, "Report from the Market Analyst"]
     sentiment_report: Annotated[str, "Report from the Social Media Analyst"]
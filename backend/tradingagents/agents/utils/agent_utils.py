@@ -23,7 +23,18 @@ from tradingagents.agents.utils.news_data_tools import (
     get_all_news_batch
 )
 
-def create_msg_delete():
+def create_msg_delete(deferred: bool = False):
+    """
+    deferred=True is used for parallel analyst branches: removing messages
+    concurrently would race on the same ids, so the branch clear is a no-op and
+    the "Analyst Join" barrier clears everything once.
+    """
+    def skip_delete(state):
+        return {}
+
+    if deferred:
+        return skip_delete
+
     def delete_messages(state):
         """Clear messages and add placeholder for Anthropic compatibility"""
         messages = state["messages"]
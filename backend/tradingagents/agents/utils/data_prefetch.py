@@ -0,0 +1,115 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+from typing_extensions import TypedDict
+
+from tradingagents.dataflows.core_stock_price import get_stock_data
+from tradingagents.dataflows.local_call import get_10years_fundamentals
+from tradingagents.agents.utils.news_data_tools import get_all_news_batch, fetch_social_data
+
+
+class PrefetchedData(TypedDict, total=False):
+    stock_data: str  # 1 year of OHLCV as CSV (market analyst)
+    news: str  # company + global news for the last 7 days (news analyst)
+    social: str  # social media posts (social analyst)
+    fundamentals: str  # up to 10 years of statements (fundamentals analyst)
+    errors: Dict[str, str]  # field -> error message for fetches that failed
+    timings: Dict[str, float]  # field -> seconds spent fetching
+
+
+def _lookback(current_date: str, days: int, fallback: str = "2024-01-01") -> str:
+    try:
+        return (datetime.strptime(current_date, "%Y-%m-%d") - timedelta(days=days)).strftime("%Y-%m-%d")
+    except Exception:
+        return fallback
+
+
+async def fetch_stock_data(ticker: str, current_date: str) -> str:
+    # get_stock_data compares several blocking vendors -> keep it off the event loop
+    return await asyncio.to_thread(get_stock_data, ticker, _lookback(current_date, 365), current_date)
+
+
+async def fetch_news(ticker: str, current_date: str) -> str:
+    return await get_all_news_batch(ticker, _lookback(current_date, 7), current_date)
+
+
+async def fetch_social(ticker: str, current_date: str) -> str:
+    return await fetch_social_data(ticker)
+
+
+async def fetch_fundamentals(ticker: str, current_date: str) -> str:
+    return await get_10years_fundamentals(ticker)
+
+
+# analyst type -> (PrefetchedData field, fetcher)
+PREFETCHERS = {
+    "market": ("stock_data", fetch_stock_data),
+    "news": ("news", fetch_news),
+    "social": ("social", fetch_social),
+    "fundamentals": ("fundamentals", fetch_fundamentals),
+}
+
+
+# Fetchers whose result does not depend on the trade date
+_DATE_INDEPENDENT = {"social", "fundamentals"}
+
+
+async def prefetch_data(selected_analysts, ticker: str, current_date: str, shared: Dict = None) -> PrefetchedData:
+    """
+    Run every selected analyst's vendor fetch concurrently.
+
+    shared: optional dict reused across runs (see TradingAgentsGraph.propagate_many);
+    identical fetches -- the same ticker/date, or the same ticker for the
+    date-independent ones -- are started once and awaited by every run.
+    """
+    jobs = [PREFETCHERS[a] for a in selected_analysts if a in PREFETCHERS]
+
+    async def timed(field, fetcher):
+        start = time.perf_counter()
+        try:
+            return field, await fetcher(ticker, current_date), None, time.perf_counter() - start
+        except Exception as e:
+            return field, f"Error fetching {field}: {e}", str(e), time.perf_counter() - start
+
+    def start_job(field, fetcher):
+        if shared is None:
+            return timed(field, fetcher)
+        analyst = next(a for a, (f, _) in PREFETCHERS.items() if f == field)
+        key = (field, ticker) if analyst in _DATE_INDEPENDENT else (field, ticker, current_date)
+        if key not in shared:
+            shared[key] = asyncio.ensure_future(timed(field, fetcher))
+        return shared[key]
+
+    results = await asyncio.gather(*(start_job(field, fetcher) for field, fetcher in jobs))
+
+    prefetched: PrefetchedData = {"errors": {}, "timings": {}}
+    for field, value, error, elapsed in results:
+        prefetched[field] = value if value is not None else ""
+        prefetched["timings"][field] = round(elapsed, 3)
+        if error:
+            prefetched["errors"][field] = error
+            print(f"⚠️ Prefetch {field} failed: {error}")
+    return prefetched
+
+
+def create_data_prefetcher(selected_analysts):
+    """Graph node that runs every selected analyst's vendor fetch concurrently."""
+    fields = [PREFETCHERS[a][0] for a in selected_analysts if a in PREFETCHERS]
+
+    async def data_prefetch_node(state):
+        # Batch runs prefetch ahead of the graph and pass the data in with the initial state
+        existing = state.get("prefetched_data") or {}
+        if fields and all(field in existing for field in fields):
+            print(f"📦 Using data prefetched ahead of the run for {state['company_of_interest']}")
+            return {}
+
+        ticker = state["company_of_interest"]
+        current_date = state["trade_date"]
+        print(f"📦 Prefetching data for {ticker} ({', '.join(fields)})...")
+        prefetched = await prefetch_data(selected_analysts, ticker, current_date)
+        print(f"✅ Prefetch done: {prefetched['timings']}")
+        return {"prefetched_data": prefetched}
+
+    return data_prefetch_node
@@ -0,0 +1,142 @@
+"""
+Token-budgeted compaction of debate histories for prompts.
+
+Debate state keeps the full transcript (reports and the UI need it), but the
+debaters only see a compacted view: the last N turns verbatim plus an
+extractive rolling summary of the older turns that fits a token budget. This
+keeps the per-turn prompt roughly constant instead of growing with every round.
+"""
+
+import re
+from typing import List
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.utils.telemetry import record_prompt_history
+
+# Config entries that change the prompt text (part of the stage cache key)
+PROMPT_CONFIG_KEYS = ("debate_compaction", "debate_history_budget_tokens", "debate_keep_last_turns")
+
+SPEAKERS = ("Bull Analyst", "Bear Analyst", "Risky Analyst", "Safe Analyst", "Neutral Analyst")
+_TURN_START = re.compile(r"^(?=(?:%s):)" % "|".join(re.escape(s) for s in SPEAKERS), re.M)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+MIN_TURN_TOKENS = 24  # shortest useful summary line for one turn
+
+_ENCODING = None
+_ENCODING_LOADED = False
+
+
+def _encoding():
+    # Loaded lazily: tiktoken may need to download its encoding file on first use
+    global _ENCODING, _ENCODING_LOADED
+    if not _ENCODING_LOADED:
+        _ENCODING_LOADED = True
+        try:
+            import tiktoken
+
+            _ENCODING = tiktoken.get_encoding("cl100k_base")
+        except Exception:  # tiktoken missing or its encoding file cannot be fetched
+            _ENCODING = None
+    return _ENCODING
+
+
+def count_tokens(text: str) -> int:
+    """cl100k token count when tiktoken is available, else the ~4 chars/token rule."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+def split_turns(history: str) -> List[str]:
+    """'Bull Analyst: ...\\nBear Analyst: ...' -> one string per speaker turn."""
+    turns = [t.strip() for t in _TURN_START.split(history or "")]
+    return [t for t in turns if t]
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens]).rstrip() + "..."
+    return text[: max_tokens * 4].rstrip() + "..."
+
+
+def summarize_turn(turn: str, max_tokens: int) -> str:
+    """Extractive summary: the speaker label plus its leading sentences within `max_tokens`."""
+    speaker, _, body = turn.partition(":")
+    body = " ".join(body.split())
+    summary = ""
+    for sentence in _SENTENCE_END.split(body):
+        candidate = f"{summary} {sentence}".strip()
+        if count_tokens(candidate) > max_tokens:
+            break
+        summary = candidate
+    if not summary:
+        summary = _truncate_to_tokens(body, max_tokens)
+    return f"{speaker}: {summary}"
+
+
+def compact_history(history: str, budget_tokens: int, keep_last: int = 2) -> str:
+    """
+    Return `history` unchanged if it fits `budget_tokens`; otherwise the last
+    `keep_last` turns verbatim plus a summary of the earlier turns that uses
+    whatever budget the recent turns leave; the oldest turns are dropped when
+    the budget cannot fit a line for each.
+    """
+    if count_tokens(history) <= budget_tokens:
+        return history
+    turns = split_turns(history)
+    if len(turns) <= keep_last:
+        return history
+
+    if keep_last:
+        older, recent = turns[:-keep_last], turns[-keep_last:]
+    else:
+        older, recent = turns, []
+    recent_text = "\n".join(recent)
+    remaining = max(budget_tokens - count_tokens(recent_text), 0)
+
+    # Too many old turns for even one short line each -> drop the oldest ones
+    max_lines = remaining // MIN_TURN_TOKENS
+    omitted = max(len(older) - max_lines, 0)
+    older = older[omitted:]
+
+    lines = [f"[{omitted} earliest turns omitted]"] if omitted else []
+    if older:
+        per_turn = max(remaining // len(older), MIN_TURN_TOKENS)
+        lines += [f"- {summarize_turn(turn, per_turn)}" for turn in older]
+    summary = "\n".join(lines)
+    return (
+        f"[Summary of earlier turns]\n{summary}\n"
+        f"[Most recent turns, verbatim]\n{recent_text}"
+    )
+
+
+def compact_for_prompt(history: str, speaker: str) -> str:
+    """
+    The debate history a debator puts in its prompt this turn.
+
+    With config["debate_compaction"] on, turns older than the last
+    `debate_keep_last_turns` are summarized so the history stays within
+    `debate_history_budget_tokens`; the state keeps the full transcript either
+    way. The history's size before/after goes to the run's telemetry under
+    `speaker` (execution_metrics history_tokens / history_prompt_tokens).
+    """
+    config = get_config()
+    if not config.get("debate_compaction", True):
+        compacted = history
+    else:
+        compacted = compact_history(
+            history,
+            config.get("debate_history_budget_tokens", 1500),
+            config.get("debate_keep_last_turns", 2),
+        )
+    full_tokens = count_tokens(history)
+    prompt_tokens = full_tokens if compacted is history else count_tokens(compacted)
+    record_prompt_history(speaker, full_tokens, prompt_tokens)
+    if compacted is not history:
+        print(f"🗜️ {speaker} history: {full_tokens:,} -> {prompt_tokens:,} tokens")
+    return compacted
@@ -0,0 +1,95 @@
+import asyncio
+
+from langchain_core.runnables import RunnableConfig
+
+from .debate_stance import round_stances
+
+
+def _argument(debate_state: dict, key: str) -> str:
+    return debate_state.get(key, "") or ""
+
+
+def create_invest_debate_round(bull_node, bear_node):
+    """
+    One bull/bear round as a single node: both researchers answer the previous
+    round concurrently, then their arguments are merged in bull -> bear order.
+    Each side sees the other side's last argument as `current_response`.
+    """
+
+    async def invest_debate_round_node(state, config: RunnableConfig) -> dict:
+        debate_state = state["investment_debate_state"]
+
+        def view(last_opponent_argument):
+            return {
+                **state,
+                "investment_debate_state": {**debate_state, "current_response": last_opponent_argument},
+            }
+
+        bull_out, bear_out = await asyncio.gather(
+            bull_node(view(_argument(debate_state, "current_bear_response")), config=config),
+            bear_node(view(_argument(debate_state, "current_bull_response")), config=config),
+        )
+        bull_argument = bull_out["investment_debate_state"]["current_response"]
+        bear_argument = bear_out["investment_debate_state"]["current_response"]
+
+        return {
+            "investment_debate_state": {
+                **debate_state,
+                "history": debate_state.get("history", "") + "\n" + bull_argument + "\n" + bear_argument,
+                "bull_history": bull_out["investment_debate_state"]["bull_history"],
+                "bear_history": bear_out["investment_debate_state"]["bear_history"],
+                "current_bull_response": bull_argument,
+                "current_bear_response": bear_argument,
+                # Bear speaks last in a sequential round, keep the same convention
+                "current_response": bear_argument,
+                "count": debate_state["count"] + 2,
+                "stances": round_stances(debate_state, [
+                    (bull_out["investment_debate_state"], "Bull"),
+                    (bear_out["investment_debate_state"], "Bear"),
+                ]),
+            }
+        }
+
+    return invest_debate_round_node
+
+
+def create_risk_debate_round(risky_node, safe_node, neutral_node):
+    """
+    One risky/safe/neutral round as a single node: all three debators answer
+    the previous round's responses concurrently, then the arguments are merged
+    into risk_debate_state in the usual risky -> safe -> neutral order.
+    """
+
+    async def risk_debate_round_node(state, config: RunnableConfig) -> dict:
+        debate_state = state["risk_debate_state"]
+
+        risky_out, safe_out, neutral_out = await asyncio.gather(
+            risky_node(state, config=config), safe_node(state, config=config), neutral_node(state, config=config)
+        )
+        risky_argument = risky_out["risk_debate_state"]["current_risky_response"]
+        safe_argument = safe_out["risk_debate_state"]["current_safe_response"]
+        neutral_argument = neutral_out["risk_debate_state"]["current_neutral_response"]
+
+        return {
+            "risk_debate_state": {
+                **debate_state,
+                "history": "\n".join(
+                    [debate_state.get("history", ""), risky_argument, safe_argument, neutral_argument]
+                ),
+                "risky_history": risky_out["risk_debate_state"]["risky_history"],
+                "safe_history": safe_out["risk_debate_state"]["safe_history"],
+                "neutral_history": neutral_out["risk_debate_state"]["neutral_history"],
+                "latest_speaker": "Neutral",
+                "current_risky_response": risky_argument,
+                "current_safe_response": safe_argument,
+                "current_neutral_response": neutral_argument,
+                "count": debate_state["count"] + 3,
+                "stances": round_stances(debate_state, [
+                    (risky_out["risk_debate_state"], "Risky"),
+                    (safe_out["risk_debate_state"], "Safe"),
+                    (neutral_out["risk_debate_state"], "Neutral"),
+                ]),
+            }
+        }
+
+    return risk_debate_round_node
@@ -0,0 +1,89 @@
+"""
+Debate stances: a one-line structured position each debator states after its
+argument, used to end a debate early once positions stop changing.
+
+With config["debate_early_stop"] on, every bull/bear and risky/safe/neutral
+turn ends with `STANCE: BUY|SELL|HOLD CONFIDENCE: 1-5`. The line is parsed
+and stripped from the argument (histories and reports read as before) and
+appended to the debate state's `stances` list. ConditionalLogic ends the
+debate at a round boundary when every speaker repeated its stance from the
+previous round, or all speakers already agree; rounds past that point rarely
+change the judge's decision but cost one LLM latency each.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from tradingagents.dataflows.config import get_config
+
+# Config entries that change the prompt text (part of the stage cache key)
+PROMPT_CONFIG_KEYS = ("debate_early_stop",)
+
+STANCE_INSTRUCTION = (
+    "\n\nFinally, on the last line, state your current recommendation after weighing the "
+    "other side's arguments, exactly in this format:\n"
+    "STANCE: <BUY, SELL or HOLD> CONFIDENCE: <1-5>"
+)
+
+_STANCE_RE = re.compile(
+    r"^\W*STANCE\W*(BUY|SELL|HOLD)\b(?:[^\n]*?CONFIDENCE\W*([1-5]))?[^\n]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def early_stop_enabled() -> bool:
+    return bool(get_config().get("debate_early_stop", False))
+
+
+def stance_prompt() -> str:
+    """The stance instruction to append to a debator prompt ('' when early stop is off)."""
+    return STANCE_INSTRUCTION if early_stop_enabled() else ""
+
+
+def parse_stance(text: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """(argument without the stance line, {"stance", "confidence"} or None if missing)."""
+    matches = list(_STANCE_RE.finditer(text or ""))
+    if not matches:
+        return text, None
+    last = matches[-1]
+    stance = {
+        "stance": last.group(1).upper(),
+        "confidence": int(last.group(2)) if last.group(2) else None,
+    }
+    argument = (text[:last.start()] + text[last.end():]).strip()
+    return argument, stance
+
+
+def record_stance(debate_state: Dict[str, Any], speaker: str, text: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """Parse `text`; return the argument and the debate's stances with this turn's stance added."""
+    stances = list(debate_state.get("stances") or [])
+    argument, stance = parse_stance(text)
+    if stance is not None:
+        stances.append({"speaker": speaker, **stance})
+    return argument, stances
+
+
+def round_stances(debate_state: Dict[str, Any], outputs: Iterable[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+    """Stances after a parallel round: each speaker's output adds at most its own newest entry."""
+    before = len(debate_state.get("stances") or [])
+    stances = list(debate_state.get("stances") or [])
+    for out_state, speaker in outputs:
+        added = (out_state.get("stances") or [])[before:]
+        stances.extend(s for s in added if s.get("speaker") == speaker)
+    return stances
+
+
+def debate_converged(stances: List[Dict[str, Any]], speakers: Iterable[str]) -> bool:
+    """
+    True once every speaker has stated a stance and either all agree in their
+    latest stances, or none changed stance (or confidence) since its previous one.
+    """
+    history: Dict[str, List[Tuple[str, Optional[int]]]] = {speaker: [] for speaker in speakers}
+    for entry in stances or []:
+        if entry.get("speaker") in history:
+            history[entry["speaker"]].append((entry.get("stance"), entry.get("confidence")))
+    if any(not turns for turns in history.values()):
+        return False
+    latest = {turns[-1][0] for turns in history.values()}
+    if len(latest) == 1:
+        return True
+    return all(len(turns) >= 2 and turns[-1] == turns[-2] for turns in history.values())
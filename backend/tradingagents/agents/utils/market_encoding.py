@@ -0,0 +1,180 @@
+"""
+Market Analyst data context: price history + technical indicators as prompt text.
+
+The original context (`raw_market_context`) pastes the tail of the CSV (cut
+mid-row) and a 100-row x 11-column indicator table in full float precision, so
+most of its tokens are digits. `compact_market_context` carries the same
+window with:
+- precision adapted to each series' magnitude (~4 significant digits)
+- moving averages / bands as deltas from the close instead of absolute prices
+- weekly OHLCV aggregates for the older rows, daily rows only for recent ones
+- a one-line snapshot of the latest indicator values and the 1-year range
+"""
+
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.core_calculator import (
+    process_indicators_from_csv,
+    calculate_sma, calculate_ema, calculate_rsi, calculate_macd,
+    calculate_bollinger_bands, calculate_atr, calculate_vwma
+)
+
+# Config entries that change the prompt text (part of the stage cache key)
+PROMPT_CONFIG_KEYS = ("market_data_encoding",)
+
+HISTORY_COLUMNS = ['Close', 'SMA_50', 'EMA_10', 'RSI', 'MACD', 'MACD_S', 'MACD_H', 'BOLL_UB', 'BOLL_LB', 'ATR', 'VWMA']
+
+
+def add_indicator_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Indicator series used for the history part of the context (in place)."""
+    df['SMA_50'] = calculate_sma(df, 50)
+    df['EMA_10'] = calculate_ema(df, 10)
+    df['RSI'] = calculate_rsi(df, 14)
+    macd, signal, hist = calculate_macd(df)
+    df['MACD'] = macd
+    df['MACD_S'] = signal
+    df['MACD_H'] = hist
+    ub, lb = calculate_bollinger_bands(df)
+    df['BOLL_UB'] = ub
+    df['BOLL_LB'] = lb
+    df['ATR'] = calculate_atr(df)
+    df['VWMA'] = calculate_vwma(df)
+    return df
+
+
+def raw_market_context(stock_data: str) -> str:
+    """The original context: CSV tail + full-precision indicator table."""
+    indicators, df = process_indicators_from_csv(stock_data)
+
+    indicators_context = ""
+    if indicators and "error" not in indicators:
+        indicators_context = json.dumps(indicators, indent=2)
+
+        if df is not None and not df.empty:
+            add_indicator_columns(df)
+            history_str = df[HISTORY_COLUMNS].tail(100).to_string()
+            indicators_context += f"\n\nRECENT HISTORICAL DATA :\n{history_str}"
+    else:
+        indicators_context = f"Error calculating indicators: {indicators.get('error')}"
+
+    return f"""
+                STOCK PRICE DATA (Last 1 Year - CSV Format):
+                {stock_data[-2000:] if len(stock_data) > 2000 else stock_data}
+
+                TECHNICAL INDICATORS (Current & History):
+                {indicators_context}
+                """
+
+
+def _decimals(values, significant: int = 4) -> int:
+    """Decimals giving ~`significant` digits for the typical magnitude of `values`."""
+    arr = np.abs(np.asarray(values, dtype=float))
+    arr = arr[np.isfinite(arr) & (arr > 0)]
+    if arr.size == 0:
+        return 2
+    magnitude = math.floor(math.log10(float(np.median(arr))))
+    return int(min(max(significant - 1 - magnitude, 0), 4))
+
+
+def _num(x, decimals: int, signed: bool = False) -> str:
+    if x is None or not np.isfinite(x):
+        return ""
+    text = f"{x:+.{decimals}f}" if signed else f"{x:.{decimals}f}"
+    return "0" if text.lstrip("+-") == f"{0:.{decimals}f}" else text
+
+
+def _volume(v) -> str:
+    if v is None or not np.isfinite(v):
+        return ""
+    for unit, size in (("B", 1e9), ("M", 1e6), ("K", 1e3)):
+        if abs(v) >= size:
+            return f"{v / size:.3g}{unit}"
+    return f"{v:.0f}"
+
+
+def compact_market_context(stock_data: str, daily_rows: int = 20, history_rows: int = 100) -> str:
+    """Same window as raw_market_context in a fraction of the tokens (see module docstring)."""
+    indicators, df = process_indicators_from_csv(stock_data)
+    if not indicators or "error" in indicators or df is None or df.empty:
+        error = (indicators or {}).get("error", "no price data")
+        return f"TECHNICAL INDICATORS: Error calculating indicators: {error}"
+
+    add_indicator_columns(df)
+    close = df["Close"]
+    last = df.index[-1]
+    price_dp = _decimals(close)
+    macd_dp = _decimals(df["MACD"].dropna())
+    has_volume = "Volume" in df.columns
+
+    # Latest values under the names the report has to use
+    snapshot = ", ".join(
+        f"{name}={_num(value, 0 if name == 'rsi' else (macd_dp if name.startswith('macd') else price_dp))}"
+        for name, value in indicators.items()
+        if value is not None and np.isfinite(value)
+    )
+    high_day, low_day = df["High"].idxmax(), df["Low"].idxmin()
+    year_return = close.iloc[-1] / close.iloc[0] - 1 if close.iloc[0] else 0.0
+    lines = [
+        f"STOCK PRICE DATA ({df.index[0]:%Y-%m-%d} to {last:%Y-%m-%d}, {len(df)} sessions):",
+        f"range: high {_num(df['High'].max(), price_dp)} ({high_day:%Y-%m-%d}), "
+        f"low {_num(df['Low'].min(), price_dp)} ({low_day:%Y-%m-%d}), change {year_return:+.1%}"
+        + (f", avg volume {_volume(df['Volume'].mean())}" if has_volume else ""),
+        "",
+        f"TECHNICAL INDICATORS (as of {last:%Y-%m-%d}): {snapshot}",
+    ]
+
+    window = df.tail(history_rows)
+    older, recent = window.iloc[:-daily_rows], window.tail(daily_rows)
+
+    if not older.empty:
+        weekly = older.resample("W-FRI").agg({
+            "Open": "first", "High": "max", "Low": "min", "Close": "last",
+            **({"Volume": "sum"} if has_volume else {}),
+            "RSI": "last", "MACD_H": "last", "SMA_50": "last",
+        }).dropna(subset=["Close"])
+        lines += [
+            "",
+            f"WEEKLY (week ending, {len(weekly)} weeks before the daily rows):",
+            "week,open,high,low,close,chg%,vol,rsi,macdh,sma50-close",
+        ]
+        prev_close = close.shift(1).loc[older.index[0]]
+        for day, row in weekly.iterrows():
+            change = (row["Close"] / prev_close - 1) * 100 if np.isfinite(prev_close) and prev_close else np.nan
+            prev_close = row["Close"]
+            lines.append(",".join([
+                f"{day:%m-%d}", _num(row["Open"], price_dp), _num(row["High"], price_dp),
+                _num(row["Low"], price_dp), _num(row["Close"], price_dp), _num(change, 1, signed=True),
+                _volume(row["Volume"]) if has_volume else "", _num(row["RSI"], 0),
+                _num(row["MACD_H"], macd_dp, signed=True), _num(row["SMA_50"] - row["Close"], price_dp, signed=True),
+            ]))
+
+    lines += [
+        "",
+        f"DAILY (last {len(recent)} sessions; chg = vs previous close, *-close columns = indicator minus close):",
+        "date,high,low,close,chg,vol,rsi,macd,macds,macdh,sma50-close,ema10-close,bollub-close,bolllb-close,vwma-close,atr",
+    ]
+    previous = close.shift(1)
+    for day, row in recent.iterrows():
+        c = row["Close"]
+        lines.append(",".join([
+            f"{day:%m-%d}", _num(row["High"], price_dp), _num(row["Low"], price_dp), _num(c, price_dp),
+            _num(c - previous.loc[day], price_dp, signed=True),
+            _volume(row["Volume"]) if has_volume else "", _num(row["RSI"], 0),
+            _num(row["MACD"], macd_dp), _num(row["MACD_S"], macd_dp), _num(row["MACD_H"], macd_dp, signed=True),
+            _num(row["SMA_50"] - c, price_dp, signed=True), _num(row["EMA_10"] - c, price_dp, signed=True),
+            _num(row["BOLL_UB"] - c, price_dp, signed=True), _num(row["BOLL_LB"] - c, price_dp, signed=True),
+            _num(row["VWMA"] - c, price_dp, signed=True), _num(row["ATR"], price_dp),
+        ]))
+    return "\n".join(lines)
+
+
+def market_context(stock_data: str) -> str:
+    """Data context for the Market Analyst per config["market_data_encoding"] ("compact" / "raw")."""
+    if get_config().get("market_data_encoding", "compact") == "raw":
+        return raw_market_context(stock_data)
+    return compact_market_context(stock_data)
@@ -121,8 +121,23 @@ from chromadb.config import Settings
 
 # --- เพิ่มส่วน Import ใหม่ ---
 from sentence_transformers import SentenceTransformer
+import threading
 # -------------------------
 
+_EMBEDDING_MODELS = {}
+_EMBEDDING_LOCK = threading.Lock()
+
+
+def get_embedding_model(model_name='all-MiniLM-L6-v2'):
+    """โหลด SentenceTransformer ครั้งเดียวต่อ process แล้วใช้ร่วมกันทุก memory"""
+    with _EMBEDDING_LOCK:
+        if model_name not in _EMBEDDING_MODELS:
+            print("Initializing Open Source Embedding model...")
+            _EMBEDDING_MODELS[model_name] = SentenceTransformer(model_name)
+            print("Embedding model initialized.")
+        return _EMBEDDING_MODELS[model_name]
+
+
 class FinancialSituationMemory:
     def __init__(self, name, config):
         
@@ -130,9 +145,8 @@ class FinancialSituationMemory:
         # 1. โหลด Embedding Model แบบ Open Source มาไว้ในหน่วยความจำ
         # 'all-MiniLM-L6-v2' เป็นโมเดลที่เล็ก เร็ว และมีคุณภาพดีมากสำหรับงานทั่วไป
         # ครั้งแรกที่รัน โค้ดจะดาวน์โหลดโมเดลนี้มาเก็บไว้ในเครื่องคุณโดยอัตโนมัติ
-        print("Initializing Open Source Embedding model...")
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        print("Embedding model initialized.")
+        # (ทั้ง 5 memories ใช้ model ตัวเดียวกัน ไม่ต้องโหลดซ้ำ)
+        self.embedding_model = get_embedding_model('all-MiniLM-L6-v2')
         # --- ส่วนแก้ไขสิ้นสุด ---
 
         # ส่วนของ ChromaDB ยังคงเดิม
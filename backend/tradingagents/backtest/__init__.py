@@ -0,0 +1,16 @@
+# TradingAgents/backtest/__init__.py
+
+from .cassette import Cassette, CassetteLLMCache, ReplayMissError
+from .point_in_time import filter_fundamentals, filter_text, parse_price_csv
+from .runner import BacktestRunner, position_for
+
+__all__ = [
+    "BacktestRunner",
+    "Cassette",
+    "CassetteLLMCache",
+    "ReplayMissError",
+    "filter_fundamentals",
+    "filter_text",
+    "parse_price_csv",
+    "position_for",
+]
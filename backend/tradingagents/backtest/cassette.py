@@ -0,0 +1,117 @@
+# TradingAgents/backtest/cassette.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from tradingagents.utils.llm_cache import normalize_prompt
+
+MODES = ("auto", "record", "replay")
+
+
+class ReplayMissError(RuntimeError):
+    """Replay mode needed a network/LLM call that was never recorded."""
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    SQLite record/replay store for one backtest: vendor data snapshots and
+    LLM responses.
+
+    mode:
+        "auto"   - replay what is recorded, call (and record) the rest
+        "record" - always call and overwrite the recording
+        "replay" - never call; a missing entry raises ReplayMissError
+    """
+
+    def __init__(self, path: str, mode: str = "auto"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode} (expected one of {MODES})")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "kind TEXT, key TEXT, created_at REAL, payload TEXT, PRIMARY KEY (kind, key))"
+        )
+        self._conn.commit()
+        self.stats = {"data_hits": 0, "data_misses": 0, "llm_hits": 0, "llm_misses": 0}
+
+    def get(self, kind: str, key: str) -> Optional[str]:
+        if self.mode == "record":
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM entries WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, kind: str, key: str, payload: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (kind, key, created_at, payload) VALUES (?, ?, ?, ?)",
+                (kind, key, time.time(), payload),
+            )
+            self._conn.commit()
+
+    async def data(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Recorded JSON value for `key`, or `await fetch()` (recorded) if allowed."""
+        payload = self.get("data", key)
+        if payload is not None:
+            self.stats["data_hits"] += 1
+            return json.loads(payload)
+        if self.mode == "replay":
+            raise ReplayMissError(f"No recorded data for {key}")
+        self.stats["data_misses"] += 1
+        value = await fetch()
+        self.put("data", key, json.dumps(value, ensure_ascii=False, default=str))
+        return value
+
+    def llm_cache(self) -> "CassetteLLMCache":
+        return CassetteLLMCache(self)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CassetteLLMCache(BaseCache):
+    """LangChain cache that records chat model generations into a Cassette
+    (set as `llm.cache`); keys ignore message ids."""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        return _digest(normalize_prompt(prompt), llm_string)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        payload = self.cassette.get("llm", self._key(prompt, llm_string))
+        if payload is not None:
+            self.cassette.stats["llm_hits"] += 1
+            return loads(payload, allowed_objects="core")
+        if self.cassette.mode == "replay":
+            raise ReplayMissError("No recorded LLM response for this prompt")
+        self.cassette.stats["llm_misses"] += 1
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        self.cassette.put("llm", self._key(prompt, llm_string), dumps(list(return_val)))
+
+    def clear(self, **kwargs: Any) -> None:
+        with self.cassette._lock:
+            self.cassette._conn.execute("DELETE FROM entries WHERE kind = 'llm'")
+            self.cassette._conn.commit()
@@ -0,0 +1,97 @@
+# TradingAgents/backtest/point_in_time.py
+
+import json
+import re
+from datetime import datetime, timedelta
+from io import StringIO
+from typing import Any, Dict
+
+import pandas as pd
+
+_ISO_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+_EPOCH_FIELD = re.compile(r'"(?:datetime|time|published|timestamp)"\s*:\s*(\d{10})\b')
+
+
+def parse_price_csv(csv_text: str) -> pd.DataFrame:
+    """get_stock_data output ("# ..." header lines + CSV) -> DataFrame indexed by date."""
+    body = "\n".join(line for line in str(csv_text).splitlines() if not line.startswith("#"))
+    df = pd.read_csv(StringIO(body))
+    date_col = next((c for c in df.columns if c.lower() in ("date", "datetime", "timestamp")), df.columns[0])
+    df[date_col] = pd.to_datetime(df[date_col], utc=True, errors="coerce").dt.tz_localize(None).dt.normalize()
+    df = df.dropna(subset=[date_col]).set_index(date_col).sort_index()
+    df.index.name = "Date"
+    return df[~df.index.duplicated(keep="last")]
+
+
+def filter_text(text: Any, trade_date: str) -> str:
+    """
+    Drop news items dated after `trade_date` (ISO dates or epoch-second
+    "datetime"/"published" fields). Vendors that ignore the requested window
+    (e.g. company news feeds that always return the latest items) can then
+    still be used in a backtest.
+
+    Filtering is per item: a dated line starts an item, and the undated lines
+    under it (summary, body) share its verdict up to the next dated line or
+    blank line. Undated text before any dated line, or after a blank line, is
+    kept; an item whose only date sits below its first lines loses just the
+    lines from the date on.
+    """
+    cutoff = datetime.strptime(trade_date, "%Y-%m-%d").date()
+    kept = []
+    dropping = False
+    for line in str(text or "").splitlines():
+        dates = [datetime.strptime(d, "%Y-%m-%d").date() for d in _ISO_DATE.findall(line) if _valid(d)]
+        dates += [datetime.utcfromtimestamp(int(ts)).date() for ts in _EPOCH_FIELD.findall(line)]
+        if dates:
+            dropping = max(dates) > cutoff
+        elif not line.strip():
+            dropping = False
+        if not dropping:
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def _valid(date_str: str) -> bool:
+    try:
+        datetime.strptime(date_str, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def filter_fundamentals(payload: Any, trade_date: str, reporting_lag_days: int = 90) -> Any:
+    """
+    Keep only statements that were published by `trade_date`: a period
+    ending on D is assumed public from D + reporting_lag_days. Live market
+    values (market cap, P/E) and the raw vendor dumps are dropped.
+    """
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            return filter_text(payload, trade_date)
+    if not isinstance(payload, dict):
+        return payload
+
+    cutoff = datetime.strptime(trade_date, "%Y-%m-%d") - timedelta(days=reporting_lag_days)
+
+    def public(period: str) -> bool:
+        return not _valid(period[:10]) or datetime.strptime(period[:10], "%Y-%m-%d") <= cutoff
+
+    result: Dict[str, Any] = {k: v for k, v in payload.items() if k not in ("raw", "final_payload", "available_years", "years_found")}
+    final_payload = payload.get("final_payload")
+    if isinstance(final_payload, dict):
+        filtered = {}
+        for section, statements in final_payload.items():
+            if section == "overview" and isinstance(statements, dict):
+                filtered[section] = {k: v for k, v in statements.items() if k in ("name", "currency", "sector", "industry", "country")}
+            elif isinstance(statements, dict):
+                filtered[section] = {period: values for period, values in statements.items() if public(period)}
+            else:
+                filtered[section] = statements
+        result["final_payload"] = filtered
+        years = sorted({p[:4] for s in filtered.values() if isinstance(s, dict) for p in s if _valid(p[:10])})
+        result["available_years"] = years
+        result["years_found"] = len(years)
+    result["as_of"] = trade_date
+    return result
@@ -0,0 +1,222 @@
+# TradingAgents/backtest/runner.py
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from tradingagents.agents.utils.data_prefetch import PREFETCHERS
+from tradingagents.dataflows.core_stock_price import get_stock_data
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.trading_graph import MEMORY_NAMES, TradingAgentsGraph, create_llms
+from tradingagents.agents.utils.memory import FinancialSituationMemory
+
+from .cassette import Cassette
+from .point_in_time import filter_fundamentals, filter_text, parse_price_csv
+
+# Processed signal -> position held from the decision close to the exit close
+POSITIONS = {"BUY": 1, "HOLD": 0, "SELL": -1}
+
+
+def position_for(decision: Any) -> int:
+    text = str(decision or "").upper()
+    for signal, position in POSITIONS.items():
+        if signal in text:
+            return position
+    return 0
+
+
+class BacktestRunner:
+    """
+    Step one ticker through a date range with point-in-time data.
+
+    For every trade date the graph sees only what was known on that day:
+    prices up to the date, news/social lines not dated after it, and
+    statements published by then (see point_in_time.py). The decision is
+    held for `holding_days` trading days; once that return is realized (on
+    or before a later trade date) it is fed to reflect_and_remember, so the
+    memories only ever contain hindsight that was available at the time.
+
+    Vendor data and LLM responses go through a Cassette, so re-running the
+    same backtest replays them without network or LLM calls. Memories start
+    empty on every run, which keeps the replayed prompts identical.
+    """
+
+    def __init__(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        selected_analysts: Optional[List[str]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        step_days: int = 5,
+        holding_days: int = 5,
+        cassette_path: Optional[str] = None,
+        mode: str = "auto",
+        output_path: Optional[str] = None,
+        reflect: bool = True,
+        reporting_lag_days: int = 90,
+    ):
+        self.ticker = ticker.upper()
+        self.start_date = start_date
+        self.end_date = end_date
+        self.selected_analysts = selected_analysts or ["market", "news", "fundamentals"]
+        self.step_days = max(1, step_days)
+        self.holding_days = max(1, holding_days)
+        self.reflect = reflect
+        self.reporting_lag_days = reporting_lag_days
+
+        self.config = (config or DEFAULT_CONFIG).copy()
+        # The cassette is the only cache, so a replay never depends on other runs
+        self.config["stage_cache"] = False
+
+        run_name = f"{self.ticker}_{start_date}_{end_date}"
+        backtest_dir = Path(self.config["results_dir"]) / "backtest" / self.ticker
+        self.cassette = Cassette(cassette_path or str(backtest_dir / f"{run_name}.cassette.sqlite"), mode=mode)
+        self.output_path = output_path or str(backtest_dir / f"{run_name}.decisions.jsonl")
+        self.graph: Optional[TradingAgentsGraph] = None
+
+    def _build_graph(self) -> TradingAgentsGraph:
+        deep_llm, quick_llm = create_llms(self.config)
+        cache = self.cassette.llm_cache()
+        for llm in (deep_llm, quick_llm):
+            llm.cache = cache
+        # Fresh collections so reflections from other runs cannot leak into this one
+        suffix = uuid.uuid4().hex[:8]
+        memories = {name: FinancialSituationMemory(f"{name}_bt_{suffix}", self.config) for name in MEMORY_NAMES}
+        return TradingAgentsGraph(
+            self.selected_analysts, config=self.config, llms=(deep_llm, quick_llm), memories=memories
+        )
+
+    async def _prices(self) -> pd.DataFrame:
+        """Daily prices from a year before start (indicators) to past end (exit closes)."""
+        first = (datetime.strptime(self.start_date, "%Y-%m-%d") - timedelta(days=365)).strftime("%Y-%m-%d")
+        # Enough calendar days to cover holding_days trading days after the last decision
+        last = (datetime.strptime(self.end_date, "%Y-%m-%d") + timedelta(days=self.holding_days * 2 + 10)).strftime("%Y-%m-%d")
+        key = f"prices|{self.ticker}|{first}|{last}"
+        csv_text = await self.cassette.data(key, lambda: asyncio.to_thread(get_stock_data, self.ticker, first, last))
+        return parse_price_csv(csv_text)
+
+    async def _snapshot(self, trade_date: str, prices_csv: str) -> Dict[str, Any]:
+        """PrefetchedData as of `trade_date`, recorded per date in the cassette."""
+        snapshot: Dict[str, Any] = {"stock_data": prices_csv, "errors": {}, "timings": {}}
+        for analyst in self.selected_analysts:
+            if analyst not in PREFETCHERS or analyst == "market":
+                continue
+            field, fetcher = PREFETCHERS[analyst]
+            key = f"{field}|{self.ticker}|{trade_date}"
+
+            async def fetch(fetcher=fetcher):
+                return await fetcher(self.ticker, trade_date)
+
+            try:
+                raw = await self.cassette.data(key, fetch)
+            except Exception as e:
+                if self.cassette.mode == "replay":
+                    raise
+                snapshot["errors"][field] = str(e)
+                raw = f"Error fetching {field}: {e}"
+            if field == "fundamentals":
+                snapshot[field] = filter_fundamentals(raw, trade_date, self.reporting_lag_days)
+            else:
+                snapshot[field] = filter_text(raw, trade_date)
+        return snapshot
+
+    @staticmethod
+    def _price_csv_until(prices: pd.DataFrame, trade_date: str) -> str:
+        # Same shape as get_stock_data's output, cut at the trade date
+        window = prices.loc[: pd.Timestamp(trade_date)].tail(260)
+        return f"# Point-in-time prices as of {trade_date}\n" + window.to_csv()
+
+    def _trade_dates(self, prices: pd.DataFrame) -> List[pd.Timestamp]:
+        days = prices.loc[pd.Timestamp(self.start_date): pd.Timestamp(self.end_date)].index
+        return list(days[:: self.step_days])
+
+    async def _reflect(self, pending: List[Dict[str, Any]], as_of: Optional[pd.Timestamp]):
+        """Feed every return realized by `as_of` (None = all) into the memories."""
+        due = [p for p in pending if as_of is None or p["exit_date"] <= as_of]
+        for item in due:
+            pending.remove(item)
+            if self.reflect:
+                returns = f"{item['strategy_return']:+.2%} ({item['decision']} {item['ticker']} {item['trade_date']} -> {item['exit_date'].date()}, price {item['return']:+.2%})"
+                await asyncio.to_thread(self.graph.reflect_and_remember, returns, item["state"])
+
+    async def run(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self.graph = self._build_graph()
+        prices = await self._prices()
+        if prices.empty or "Close" not in prices.columns:
+            raise ValueError(f"No price data for {self.ticker}")
+        closes = prices["Close"]
+        trade_dates = self._trade_dates(prices)
+        print(f"🧪 Backtest {self.ticker}: {len(trade_dates)} decisions, {self.start_date} -> {self.end_date} (cassette: {self.cassette.mode})")
+
+        Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+        open(self.output_path, "w", encoding="utf-8").close()
+
+        pending: List[Dict[str, Any]] = []
+        records: List[Dict[str, Any]] = []
+        equity = 1.0
+        for day in trade_dates:
+            trade_date = day.strftime("%Y-%m-%d")
+            await self._reflect(pending, day)
+
+            snapshot = await self._snapshot(trade_date, self._price_csv_until(prices, trade_date))
+            final_state = await self.graph._run_graph(self.ticker, trade_date, prefetched_data=snapshot)
+            decision = await self.graph.aprocess_signal(final_state["final_trade_decision"])
+
+            position = position_for(decision)
+            index = closes.index.get_loc(day)
+            exit_index = min(index + self.holding_days, len(closes) - 1)
+            entry, exit_ = float(closes.iloc[index]), float(closes.iloc[exit_index])
+            price_return = exit_ / entry - 1 if entry else 0.0
+            strategy_return = position * price_return
+            equity *= 1 + strategy_return
+
+            record = {
+                "ticker": self.ticker,
+                "trade_date": trade_date,
+                "decision": decision,
+                "position": position,
+                "entry_close": entry,
+                "exit_date": closes.index[exit_index].strftime("%Y-%m-%d"),
+                "exit_close": exit_,
+                "return": round(price_return, 6),
+                "strategy_return": round(strategy_return, 6),
+                "equity": round(equity, 6),
+                "final_trade_decision": final_state.get("final_trade_decision"),
+            }
+            records.append(record)
+            with open(self.output_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            print(f"📅 {trade_date}: {decision} -> {strategy_return:+.2%} (equity {equity:.4f})")
+
+            pending.append({**record, "exit_date": closes.index[exit_index], "state": final_state})
+
+        # Returns realized after the last decision still teach the memories
+        await self._reflect(pending, None)
+
+        first_close = float(closes.loc[trade_dates[0]]) if trade_dates else 0.0
+        last_exit = records[-1]["exit_close"] if records else 0.0
+        summary = {
+            "ticker": self.ticker,
+            "decisions": len(records),
+            "strategy_return": round(equity - 1, 6),
+            "buy_and_hold_return": round(last_exit / first_close - 1, 6) if first_close else None,
+            "hit_rate": round(
+                sum(1 for r in records if r["strategy_return"] > 0) / max(1, sum(1 for r in records if r["position"])), 4
+            ),
+            "cassette": dict(self.cassette.stats),
+            "wall_seconds": round(time.perf_counter() - start, 2),
+            "decisions_path": self.output_path,
+        }
+        with open(os.path.splitext(self.output_path)[0] + ".summary.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"📊 Backtest done: {summary}")
+        return summary
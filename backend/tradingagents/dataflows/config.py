@@ -1,3 +1,6 @@
+import contextvars
+from contextlib import contextmanager
+
 import tradingagents.default_config as default_config
 from typing import Dict, Optional
 
@@ -5,6 +8,9 @@ from typing import Dict, Optional
 _config: Optional[Dict] = None
 DATA_DIR: Optional[str] = None
 
+# Config of the run executing in this context (config_scope); None = the process-wide _config
+_run_config: contextvars.ContextVar = contextvars.ContextVar("run_config", default=None)
+
 
 def initialize_config():
     """Initialize the configuration with default values."""
@@ -24,11 +30,35 @@ def set_config(config: Dict):
 
 
 def get_config() -> Dict:
-    """Get the current configuration."""
+    """Get the current configuration (the run's own inside config_scope)."""
+    run_config = _run_config.get()
+    if run_config is not None:
+        return run_config.copy()
     if _config is None:
         initialize_config()
     return _config.copy()
 
 
+@contextmanager
+def config_scope(config: Dict):
+    """
+    Make `config` (over the process-wide config) what get_config() returns for
+    everything run inside this block, including tasks and threads started from
+    it. Concurrent runs (API requests, propagate_many) each get their own
+    config instead of overwriting each other's through set_config.
+    """
+    if _config is None:
+        initialize_config()
+    token = _run_config.set({**_config, **config})
+    try:
+        yield
+    finally:
+        _run_config.reset(token)
+
+
+def in_config_scope() -> bool:
+    return _run_config.get() is not None
+
+
 # Initialize with default config
 initialize_config()
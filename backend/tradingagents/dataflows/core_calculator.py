@@ -1,80 +1,98 @@
-
 import pandas as pd
 import numpy as np
 from io import StringIO
-import pandas_ta as ta
+
+from tradingagents.dataflows import indicator_kernels as kernels
+
+# pandas_ta is no longer needed at runtime (its import alone costs ~1s).
+# It is only loaded lazily by verify_against_pandas_ta() to cross-check the kernels.
+
+
+def _to_series(values: np.ndarray, df: pd.DataFrame) -> pd.Series:
+    return pd.Series(values, index=df.index)
+
+
+def _column(df: pd.DataFrame, column: str) -> np.ndarray:
+    return df[column].to_numpy(dtype=np.float64)
+
 
 def calculate_sma(df: pd.DataFrame, period: int = 50, column: str = "Close") -> pd.Series:
-    # Use pandas_ta.sma
-    return ta.sma(df[column], length=period)
+    # Same contract as pandas_ta: None when there is not enough history
+    if len(df) < period:
+        return None
+    return _to_series(kernels.sma(_column(df, column), period), df)
 
 def calculate_ema(df: pd.DataFrame, period: int = 10, column: str = "Close") -> pd.Series:
-    # Use pandas_ta.ema
-    return ta.ema(df[column], length=period)
+    if len(df) < period:
+        return None
+    return _to_series(kernels.ema(_column(df, column), period), df)
 
 def calculate_rsi(df: pd.DataFrame, period: int = 14, column: str = "Close") -> pd.Series:
-    # Use pandas_ta.rsi
-    return ta.rsi(df[column], length=period)
+    if len(df) < period + 1:
+        return None
+    return _to_series(kernels.rsi(_column(df, column), period), df)
 
 def calculate_macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9, column: str = "Close"):
-    # pandas_ta.macd returns a DataFrame with 3 columns:
-    # MACD_{fast}_{slow}_{signal} (Line)
-    # MACDh_{fast}_{slow}_{signal} (Histogram)
-    # MACDs_{fast}_{slow}_{signal} (Signal)
-    macd_df = ta.macd(df[column], fast=fast, slow=slow, signal=signal)
-    
-    if macd_df is None or macd_df.empty:
-        return pd.Series([np.nan]*len(df)), pd.Series([np.nan]*len(df)), pd.Series([np.nan]*len(df))
-
-    # Identify columns by name pattern or index
-    # We expect columns in order: macd, histogram, signal (or similar, check pandas_ta docs/implementation)
-    # Actually pandas_ta returns: MACD, MACDh (hist), MACDs (signal)
-    
-    # Construct expected column names
-    macd_col = f"MACD_{fast}_{slow}_{signal}"
-    hist_col = f"MACDh_{fast}_{slow}_{signal}"
-    signal_col = f"MACDs_{fast}_{slow}_{signal}"
-    
-    macd_line = macd_df[macd_col]
-    signal_line = macd_df[signal_col]
-    histogram = macd_df[hist_col]
-    
-    return macd_line, signal_line, histogram
+    # Returns (macd_line, signal_line, histogram); all-NaN when history is too short
+    macd_line, signal_line, histogram = kernels.macd(_column(df, column), fast, slow, signal)
+    return _to_series(macd_line, df), _to_series(signal_line, df), _to_series(histogram, df)
 
 def calculate_bollinger_bands(df: pd.DataFrame, period: int = 20, num_std: int = 2, column: str = "Close"):
-    # pandas_ta.bbands returns BBL, BBM, BBU, BBB, BBP
-    bb_df = ta.bbands(df[column], length=period, std=num_std)
-    
-    if bb_df is None or bb_df.empty:
-        return pd.Series([np.nan]*len(df)), pd.Series([np.nan]*len(df))
-        
-    lower_col = f"BBL_{period}_{float(num_std)}"
-    upper_col = f"BBU_{period}_{float(num_std)}"
-    
-    # Handle implicit float formatting in pandas_ta names if needed (e.g. 2.0)
-    # Usually it's 'BBL_20_2.0'
-    
-    # Fallback search if exact name match fails
-    if lower_col not in bb_df.columns:
-        # Try to find columns starting with BBL and BBU
-        lower_vals = bb_df.filter(like="BBL").iloc[:, 0]
-        upper_vals = bb_df.filter(like="BBU").iloc[:, 0]
-        return upper_vals, lower_vals
-    
-    upper_band = bb_df[upper_col]
-    lower_band = bb_df[lower_col]
-    return upper_band, lower_band
+    # Returns (upper, lower); the middle band is their mean
+    upper, _, lower = kernels.bollinger_bands(_column(df, column), period, num_std)
+    return _to_series(upper, df), _to_series(lower, df)
 
 def calculate_atr(df: pd.DataFrame, period: int = 14):
-    # pandas_ta.atr requires High, Low, Close
-    return ta.atr(df["High"], df["Low"], df["Close"], length=period)
+    if len(df) < period + 1:
+        return None
+    atr = kernels.atr(_column(df, "High"), _column(df, "Low"), _column(df, "Close"), period)
+    return _to_series(atr, df)
 
 def calculate_vwma(df: pd.DataFrame, period: int = 20):
-    # pandas_ta.vwma requires Close, Volume
     if 'Volume' not in df.columns or df['Volume'].sum() == 0:
         return calculate_sma(df, period) # Fallback
-        
-    return ta.vwma(df["Close"], df["Volume"], length=period)
+
+    if len(df) < period:
+        return None
+    return _to_series(kernels.vwma(_column(df, "Close"), _column(df, "Volume"), period), df)
+
+def verify_against_pandas_ta(df: pd.DataFrame) -> dict:
+    """
+    Cross-check the NumPy kernels against pandas_ta on the same DataFrame.
+    Returns {indicator: max absolute difference}. Requires pandas_ta to be installed.
+    """
+    try:
+        import pandas_ta as ta
+    except ImportError as e:
+        raise ImportError("pandas_ta is required for verification only: pip install pandas-ta-openbb") from e
+
+    macd_df = ta.macd(df["Close"])
+    bb_df = ta.bbands(df["Close"], length=20, std=2)
+    macd, signal, hist = calculate_macd(df)
+    upper, lower = calculate_bollinger_bands(df)
+
+    pairs = {
+        "close_50_sma": (calculate_sma(df, 50), ta.sma(df["Close"], length=50)),
+        "close_200_sma": (calculate_sma(df, 200), ta.sma(df["Close"], length=200)),
+        "close_10_ema": (calculate_ema(df, 10), ta.ema(df["Close"], length=10)),
+        "rsi": (calculate_rsi(df, 14), ta.rsi(df["Close"], length=14)),
+        "macd": (macd, macd_df.iloc[:, 0] if macd_df is not None else None),
+        "macdh": (hist, macd_df.iloc[:, 1] if macd_df is not None else None),
+        "macds": (signal, macd_df.iloc[:, 2] if macd_df is not None else None),
+        "boll_lb": (lower, bb_df.iloc[:, 0] if bb_df is not None else None),
+        "boll_ub": (upper, bb_df.iloc[:, 2] if bb_df is not None else None),
+        "atr": (calculate_atr(df, 14), ta.atr(df["High"], df["Low"], df["Close"], length=14)),
+        "vwma": (calculate_vwma(df, 20), ta.vwma(df["Close"], df["Volume"], length=20)),
+    }
+
+    diffs = {}
+    for name, (ours, reference) in pairs.items():
+        if ours is None or reference is None:
+            diffs[name] = None
+            continue
+        delta = (ours - reference.reindex(ours.index)).abs()
+        diffs[name] = float(delta.max()) if delta.notna().any() else 0.0
+    return diffs
 
 def process_indicators_from_csv(csv_text: str):
     """
@@ -85,51 +103,50 @@ def process_indicators_from_csv(csv_text: str):
         df = pd.read_csv(StringIO(csv_text), comment='#', index_col="Date", parse_dates=True)
         # Ensure column names are stripped/capitalized properly
         df.columns = [c.strip().capitalize() for c in df.columns]
-        
+
         # Calculate All
         indicators = {}
-        
+
         # SMA
         sma_50 = calculate_sma(df, 50)
         if sma_50 is not None: indicators['close_50_sma'] = sma_50.iloc[-1]
-        
+
         sma_200 = calculate_sma(df, 200)
         if sma_200 is not None: indicators['close_200_sma'] = sma_200.iloc[-1]
-        
+
         # EMA
         ema_10 = calculate_ema(df, 10)
         if ema_10 is not None: indicators['close_10_ema'] = ema_10.iloc[-1]
-        
+
         # RSI
         rsi = calculate_rsi(df, 14)
         if rsi is not None: indicators['rsi'] = rsi.iloc[-1]
-        
+
         # MACD
         macd, signal, hist = calculate_macd(df)
         if macd is not None: indicators['macd'] = macd.iloc[-1]
         if signal is not None: indicators['macds'] = signal.iloc[-1]
         if hist is not None: indicators['macdh'] = hist.iloc[-1]
-        
+
         # BOLL
         ub, lb = calculate_bollinger_bands(df)
         if ub is not None and lb is not None:
             indicators['boll_ub'] = ub.iloc[-1]
             indicators['boll_lb'] = lb.iloc[-1]
             indicators['boll'] = (ub.iloc[-1] + lb.iloc[-1]) / 2 # Middle band
-        
+
         # ATR
         atr = calculate_atr(df)
         if atr is not None: indicators['atr'] = atr.iloc[-1]
-        
+
         # VWMA
-        # Note: pandas_ta requires DataFrame with DatetimeIndex for some operations, df has it.
         vwma = calculate_vwma(df)
         if vwma is not None: indicators['vwma'] = vwma.iloc[-1]
-        
+
         # Replace NaNs with None for JSON serializability if needed, or handle externally
         # The original code didn't seem to explicitly handle NaNs here but usually returned floats or NaNs.
         # We will return as is.
-        
+
         return indicators, df
     except Exception as e:
         return {"error": str(e)}, None
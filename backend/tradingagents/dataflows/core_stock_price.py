@@ -13,6 +13,7 @@ from tradingagents.dataflows.y_finance import get_YFin_data_online
 from tradingagents.dataflows.alpha_vantage_stock import get_alpha_vantage_stock
 from tradingagents.dataflows.trading_view import get_TV_data_online
 from tradingagents.dataflows.twelve_data import get_twelvedata_stock
+from tradingagents.utils.single_flight import coalesce
 
 # ==========================================
 # Helper Functions
@@ -190,6 +191,8 @@ def auto_detect_market(symbol):
     return "US"
 
 # เพิ่ม parameter market="US" เป็นค่าเริ่มต้น
+# 🔀 คำขอเดียวกันที่กำลังดึงอยู่ (อีก session, หุ้น/ช่วงวันเดียวกัน) จะรอผลชุดเดียวกันแทนการยิงซ้ำ
+@coalesce("compare_stock_providers")
 def compare_stock_providers(symbol, start_date, end_date, market=None):
 
     if market is None:
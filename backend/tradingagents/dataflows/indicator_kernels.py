@@ -0,0 +1,146 @@
+"""
+Pure-NumPy indicator kernels.
+
+Every kernel takes 1-D float arrays and returns arrays of the same length,
+padded with NaN where the indicator is still warming up. The formulas follow
+pandas_ta's defaults (SMA-seeded EMA/ATR, Wilder RMA for RSI, population
+stdev for Bollinger Bands) so the numbers the agents see do not change.
+"""
+
+import numpy as np
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def sma(values, period: int) -> np.ndarray:
+    """Simple moving average; NaN until `period` observations are available."""
+    x = _as_float(values)
+    out = np.full(x.shape, np.nan)
+    if period <= 0 or x.size < period:
+        return out
+
+    # Rolling sum via cumsum; windows that contain a NaN stay NaN (min_periods=period)
+    valid = ~np.isnan(x)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, x, 0.0))))
+    ccount = np.concatenate(([0], np.cumsum(valid)))
+    window_sum = csum[period:] - csum[:-period]
+    window_count = ccount[period:] - ccount[:-period]
+    out[period - 1:] = np.where(window_count == period, window_sum / period, np.nan)
+    return out
+
+
+def _recursive_average(x: np.ndarray, alpha: float, start: int, seed: float) -> np.ndarray:
+    """y[start] = seed, then y[t] = y[t-1] + alpha * (x[t] - y[t-1]); NaN inputs carry forward."""
+    out = np.full(x.shape, np.nan)
+    if start >= x.size:
+        return out
+    prev = seed
+    out[start] = prev
+    for i in range(start + 1, x.size):
+        value = x[i]
+        if value == value:  # skip NaN without a function call
+            prev += alpha * (value - prev)
+        out[i] = prev
+    return out
+
+
+def ema(values, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the SMA of the first `period` values."""
+    x = _as_float(values)
+    if period <= 0 or x.size < period:
+        return np.full(x.shape, np.nan)
+    seed = np.nanmean(x[:period])
+    return _recursive_average(x, 2.0 / (period + 1), period - 1, seed)
+
+
+def rma(values, period: int) -> np.ndarray:
+    """Wilder's moving average (ewm alpha=1/period, adjust=False) from the first valid value."""
+    x = _as_float(values)
+    finite = np.flatnonzero(~np.isnan(x))
+    if period <= 0 or finite.size == 0:
+        return np.full(x.shape, np.nan)
+    start = finite[0]
+    return _recursive_average(x, 1.0 / period, start, x[start])
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative Strength Index using Wilder smoothing of gains and losses."""
+    x = _as_float(close)
+    if x.size < period + 1:
+        return np.full(x.shape, np.nan)
+    delta = np.empty_like(x)
+    delta[0] = np.nan
+    delta[1:] = np.diff(x)
+    gains = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+    losses = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+    avg_gain = rma(gains, period)
+    avg_loss = rma(losses, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 * avg_gain / (avg_gain + avg_loss)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9):
+    """Returns (macd_line, signal_line, histogram)."""
+    x = _as_float(close)
+    if slow < fast:
+        fast, slow = slow, fast
+    nan = np.full(x.shape, np.nan)
+    if x.size < slow + signal - 1:
+        return nan, nan.copy(), nan.copy()
+
+    macd_line = ema(x, fast) - ema(x, slow)
+    first_valid = slow - 1
+    signal_line = nan.copy()
+    signal_line[first_valid:] = ema(macd_line[first_valid:], signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_bands(close, period: int = 20, num_std: float = 2.0):
+    """Returns (upper, middle, lower) using a population (ddof=0) rolling stdev."""
+    x = _as_float(close)
+    mid = sma(x, period)
+    # E[x^2] - E[x]^2 loses precision on large prices, so centre the window first
+    std = np.full(x.shape, np.nan)
+    if period > 0 and x.size >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(x, period)
+        std[period - 1:] = windows.std(axis=1)
+    deviation = num_std * std
+    return mid + deviation, mid, mid - deviation
+
+
+def true_range(high, low, close) -> np.ndarray:
+    h, l, c = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = np.empty_like(c)
+    prev_close[0] = np.nan
+    prev_close[1:] = c[:-1]
+    ranges = np.vstack((h - l, np.abs(h - prev_close), np.abs(prev_close - l)))
+    with np.errstate(invalid="ignore"):
+        return np.nanmax(ranges, axis=0)
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range: SMA-seeded Wilder average of the true range."""
+    tr = true_range(high, low, close)
+    if period <= 0 or tr.size < period + 1:
+        return np.full(tr.shape, np.nan)
+    seed = np.nanmean(tr[:period])
+    return _recursive_average(tr, 1.0 / period, period - 1, seed)
+
+
+def vwma(close, volume, period: int = 20) -> np.ndarray:
+    """Volume-weighted moving average: SMA(close * volume) / SMA(volume)."""
+    c, v = _as_float(close), _as_float(volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sma(c * v, period) / sma(v, period)
+
+
+def vwap(high, low, close, volume) -> np.ndarray:
+    """Cumulative VWAP over the given bars (pass a single session for an intraday VWAP)."""
+    h, l, c, v = _as_float(high), _as_float(low), _as_float(close), _as_float(volume)
+    typical = (h + l + c) / 3.0
+    cum_volume = np.cumsum(np.nan_to_num(v))
+    cum_pv = np.cumsum(np.nan_to_num(typical * v))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cum_volume > 0, cum_pv / cum_volume, np.nan)
@@ -19,6 +19,7 @@ from .alpha_vantage_common import AlphaVantageRateLimitError
 
 # Configuration and routing logic
 from .config import get_config
+from tradingagents.utils.single_flight import coalesce
 
 # fix more
 from .local_call import (
@@ -189,8 +190,18 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
+def _vendor_call_key(method: str, *args, **kwargs):
+    # Same method, vendor configuration and arguments -> same data
+    return [method, get_vendor(get_category_for_method(method), method), args, kwargs]
+
+
+@coalesce("route_to_vendor", key=_vendor_call_key)
 def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support."""
+    """Route method calls to appropriate vendor implementation with fallback support.
+
+    Identical calls already in flight (another session, same ticker/date) wait
+    for that call instead of fetching again (see utils/single_flight.py).
+    """
     category = get_category_for_method(method)
     vendor_config = get_vendor(category, method)
 
@@ -4,6 +4,7 @@ from typing import List, Dict, Optional, Iterable, Tuple, Annotated, Any
 import pandas as pd
 import os, time, json, requests, re, asyncio
 from .config import DATA_DIR
+from tradingagents.utils.single_flight import coalesce
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from .reddit_utils import fetch_top_from_category
@@ -2213,6 +2214,7 @@ def decide_single_source(fetched: Dict) -> Dict:
         "timestamp": _now_iso()
     }
 
+@coalesce("pick_fundamental_source")
 async def pick_fundamental_source(symbol: str) -> Dict:
     """
     Main Entry Point:
@@ -0,0 +1,183 @@
+"""
+Cached daily OHLCV store.
+
+Keeps one DataFrame per symbol in memory and on disk (data_cache_dir/price_store)
+and only goes back to yfinance once per trading day, in a single batched download
+for every stale symbol. Used by the screener so 100+ tickers can be scanned
+without 100+ round trips.
+
+A download made while the market is still open holds a partial bar for today;
+such symbols are fetched again every INTRADAY_REFRESH_SECONDS until a download
+after the close makes the day final.
+"""
+
+import os
+import threading
+import time
+import datetime
+from typing import Dict, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from tradingagents.dataflows.config import get_config
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Exchange timezone per market code used by api/stock_data.STOCK_LISTS
+MARKET_TIMEZONES = {
+    "US": "America/New_York",
+    "GOLD": "America/New_York",
+    "TH": "Asia/Bangkok",
+    "CN": "Asia/Shanghai",
+}
+
+# Local time after which the day's bar is final (closing auctions included)
+MARKET_CLOSE = {
+    "US": datetime.time(16, 0),
+    "GOLD": datetime.time(17, 0),
+    "TH": datetime.time(17, 0),
+    "CN": datetime.time(15, 0),
+}
+
+# How long a partial (in-session) bar is served before it is downloaded again
+INTRADAY_REFRESH_SECONDS = 15 * 60
+
+
+def current_trading_day(market: str = "US", now: Optional[datetime.datetime] = None) -> datetime.date:
+    """Today's date in the market's timezone, rolled back to Friday on weekends."""
+    tz = ZoneInfo(MARKET_TIMEZONES.get(market.upper(), "UTC"))
+    now = now.astimezone(tz) if now else datetime.datetime.now(tz)
+    day = now.date()
+    while day.weekday() >= 5:
+        day -= datetime.timedelta(days=1)
+    return day
+
+
+def session_closed(market: str = "US", now: Optional[datetime.datetime] = None) -> bool:
+    """True once current_trading_day's bar can no longer change (after the close, or on weekends)."""
+    tz = ZoneInfo(MARKET_TIMEZONES.get(market.upper(), "UTC"))
+    now = now.astimezone(tz) if now else datetime.datetime.now(tz)
+    if now.date() != current_trading_day(market, now):
+        return True
+    return now.time() >= MARKET_CLOSE.get(market.upper(), datetime.time(16, 0))
+
+
+class PriceStore:
+    """Daily OHLCV cache refreshed once per trading day per symbol (more often while the session is open)."""
+
+    def __init__(self, cache_dir: Optional[str] = None, history_period: str = "2y"):
+        if cache_dir is None:
+            cache_dir = os.path.join(get_config()["data_cache_dir"], "price_store")
+        self.cache_dir = cache_dir
+        self.history_period = history_period
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._refreshed: Dict[str, datetime.date] = {}
+        # symbol -> (time.time() of the download, whether the day's bar was final)
+        self._fetched: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, symbol: str) -> str:
+        safe = symbol.replace("/", "_").replace("=", "_").replace("^", "_")
+        return os.path.join(self.cache_dir, f"{safe}.pkl")
+
+    def _load_from_disk(self, symbol: str) -> None:
+        path = self._path(symbol)
+        if symbol in self._frames or not os.path.exists(path):
+            return
+        try:
+            payload = pd.read_pickle(path)
+            self._frames[symbol] = payload["frame"]
+            self._refreshed[symbol] = payload["refreshed"]
+            # Caches written before partial bars were tracked count as partial
+            self._fetched[symbol] = (payload.get("fetched_at", 0.0), payload.get("final", False))
+        except Exception as e:
+            print(f"⚠️ PriceStore: ignoring unreadable cache for {symbol}: {e}")
+
+    def _save(self, symbol: str) -> None:
+        try:
+            fetched_at, final = self._fetched[symbol]
+            pd.to_pickle(
+                {"frame": self._frames[symbol], "refreshed": self._refreshed[symbol], "fetched_at": fetched_at, "final": final},
+                self._path(symbol),
+            )
+        except Exception as e:
+            print(f"⚠️ PriceStore: failed to persist {symbol}: {e}")
+
+    def _download(self, symbols: list) -> Dict[str, pd.DataFrame]:
+        import yfinance as yf
+
+        raw = yf.download(
+            symbols,
+            period=self.history_period,
+            interval="1d",
+            group_by="ticker",
+            auto_adjust=False,
+            threads=True,
+            progress=False,
+        )
+        frames = {}
+        for symbol in symbols:
+            try:
+                df = raw[symbol] if isinstance(raw.columns, pd.MultiIndex) else raw
+                df = df[OHLCV_COLUMNS].dropna(subset=["Close"])
+                if not df.empty:
+                    df.index = pd.to_datetime(df.index).tz_localize(None)
+                    frames[symbol] = df.astype("float64")
+            except KeyError:
+                continue
+        return frames
+
+    def _is_stale(self, symbol: str, today: datetime.date) -> bool:
+        if self._refreshed.get(symbol) != today:
+            return True
+        fetched_at, final = self._fetched.get(symbol, (0.0, False))
+        return not final and time.time() - fetched_at >= INTRADAY_REFRESH_SECONDS
+
+    def is_final(self, symbol: str, market: str = "US") -> bool:
+        """Whether the cached data for `symbol` includes today's closed bar."""
+        symbol = symbol.upper()
+        return self._refreshed.get(symbol) == current_trading_day(market) and self._fetched.get(symbol, (0.0, False))[1]
+
+    def get_many(self, symbols: Iterable[str], market: str = "US") -> Dict[str, pd.DataFrame]:
+        """Return {symbol: OHLCV DataFrame}; symbols with no data are omitted."""
+        symbols = [s.upper() for s in symbols]
+        today = current_trading_day(market)
+
+        with self._lock:
+            for symbol in symbols:
+                self._load_from_disk(symbol)
+            stale = [s for s in symbols if self._is_stale(s, today)]
+
+            if stale:
+                print(f"📥 PriceStore: refreshing {len(stale)}/{len(symbols)} symbols for {today}")
+                # Decided before the download: a bar fetched just before the close is still partial
+                fetched = (time.time(), session_closed(market))
+                try:
+                    fresh = self._download(stale)
+                except Exception as e:
+                    # Serve yesterday's data rather than nothing
+                    print(f"⚠️ PriceStore: download failed, using cached data: {e}")
+                    fresh = {}
+                for symbol, df in fresh.items():
+                    self._frames[symbol] = df
+                    self._refreshed[symbol] = today
+                    self._fetched[symbol] = fetched
+                    self._save(symbol)
+
+            return {s: self._frames[s] for s in symbols if s in self._frames}
+
+    def get(self, symbol: str, market: str = "US") -> Optional[pd.DataFrame]:
+        return self.get_many([symbol], market).get(symbol.upper())
+
+
+_default_store: Optional[PriceStore] = None
+
+
+def get_price_store() -> PriceStore:
+    """Process-wide store shared by API endpoints."""
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore()
+    return _default_store
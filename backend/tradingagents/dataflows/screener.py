@@ -0,0 +1,124 @@
+"""
+Rule-based technical screener.
+
+screen_chunk() is a plain top-level function over NumPy arrays so it can run
+in a ProcessPoolExecutor; the API layer handles fetching and caching.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from tradingagents.dataflows import indicator_kernels as kernels
+
+# name -> human readable description (shown by /api/screener/rules)
+RULES = {
+    "rsi_oversold": "RSI(14) below 30",
+    "rsi_overbought": "RSI(14) above 70",
+    "golden_cross": "SMA50 crossed above SMA200 in the last 5 sessions",
+    "death_cross": "SMA50 crossed below SMA200 in the last 5 sessions",
+    "macd_bullish_cross": "MACD crossed above its signal line in the last 3 sessions",
+    "macd_bearish_cross": "MACD crossed below its signal line in the last 3 sessions",
+    "above_sma200": "Close above SMA200",
+    "below_sma200": "Close below SMA200",
+    "bollinger_breakout": "Close above the upper Bollinger Band",
+    "bollinger_squeeze": "Bollinger bandwidth in the narrowest 10% of the last 120 sessions",
+    "breakout_20d": "Close above the highest high of the previous 20 sessions",
+    "volume_spike": "Volume more than 2x its 20-day average",
+}
+
+
+def parse_rules(rules: str) -> List[str]:
+    """'rsi_oversold, golden_cross' -> ['rsi_oversold', 'golden_cross']; empty means all rules."""
+    if not rules:
+        return list(RULES)
+    names = [r.strip().lower() for r in rules.split(",") if r.strip()]
+    unknown = [r for r in names if r not in RULES]
+    if unknown:
+        raise ValueError(f"Unknown screener rules: {', '.join(unknown)}")
+    return list(dict.fromkeys(names))
+
+
+def _crossed(a: np.ndarray, b: np.ndarray, lookback: int, up: bool) -> bool:
+    diff = a[-(lookback + 1):] - b[-(lookback + 1):]
+    if diff.size < 2 or np.isnan(diff).any():
+        return False
+    prev, curr = diff[:-1], diff[1:]
+    hits = (prev <= 0) & (curr > 0) if up else (prev >= 0) & (curr < 0)
+    return bool(hits.any())
+
+
+def _last(values: np.ndarray) -> float:
+    return float(values[-1]) if values.size and not np.isnan(values[-1]) else None
+
+
+def screen_symbol(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, rules: List[str]) -> Dict:
+    sma50 = kernels.sma(close, 50)
+    sma200 = kernels.sma(close, 200)
+    rsi = kernels.rsi(close, 14)
+    macd, signal, _ = kernels.macd(close)
+    upper, mid, lower = kernels.bollinger_bands(close, 20, 2.0)
+    atr = kernels.atr(high, low, close, 14)
+    avg_volume = kernels.sma(volume, 20)
+
+    price = float(close[-1])
+    indicators = {
+        "close": price,
+        "change_pct": float((close[-1] / close[-2] - 1) * 100) if close.size > 1 else None,
+        "close_50_sma": _last(sma50),
+        "close_200_sma": _last(sma200),
+        "rsi": _last(rsi),
+        "macd": _last(macd),
+        "macds": _last(signal),
+        "boll_ub": _last(upper),
+        "boll_lb": _last(lower),
+        "atr": _last(atr),
+    }
+
+    def check(rule: str) -> bool:
+        if rule == "rsi_oversold":
+            return indicators["rsi"] is not None and indicators["rsi"] < 30
+        if rule == "rsi_overbought":
+            return indicators["rsi"] is not None and indicators["rsi"] > 70
+        if rule == "golden_cross":
+            return _crossed(sma50, sma200, 5, up=True)
+        if rule == "death_cross":
+            return _crossed(sma50, sma200, 5, up=False)
+        if rule == "macd_bullish_cross":
+            return _crossed(macd, signal, 3, up=True)
+        if rule == "macd_bearish_cross":
+            return _crossed(macd, signal, 3, up=False)
+        if rule == "above_sma200":
+            return indicators["close_200_sma"] is not None and price > indicators["close_200_sma"]
+        if rule == "below_sma200":
+            return indicators["close_200_sma"] is not None and price < indicators["close_200_sma"]
+        if rule == "bollinger_breakout":
+            return indicators["boll_ub"] is not None and price > indicators["boll_ub"]
+        if rule == "bollinger_squeeze":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                width = ((upper - lower) / mid)[-120:]
+            width = width[~np.isnan(width)]
+            return bool(width.size >= 20 and width[-1] <= np.quantile(width, 0.10))
+        if rule == "breakout_20d":
+            return close.size > 20 and price > float(np.max(high[-21:-1]))
+        if rule == "volume_spike":
+            return not np.isnan(avg_volume[-1]) and avg_volume[-1] > 0 and volume[-1] > 2 * avg_volume[-1]
+        return False
+
+    return {
+        "indicators": indicators,
+        "hits": [rule for rule in rules if check(rule)],
+    }
+
+
+def screen_chunk(chunk: List[Tuple[str, np.ndarray, np.ndarray, np.ndarray, np.ndarray]], rules: List[str]) -> List[Dict]:
+    """Process-pool entry point: [(symbol, high, low, close, volume), ...] -> results."""
+    results = []
+    for symbol, high, low, close, volume in chunk:
+        try:
+            result = screen_symbol(high, low, close, volume, rules)
+            result["symbol"] = symbol
+        except Exception as e:
+            result = {"symbol": symbol, "error": str(e), "hits": []}
+        results.append(result)
+    return results
@@ -1,5 +1,45 @@
+import json
 import os
 
+# Per-minute request/token budgets per "provider" or "provider:model".
+# The Gemini entries are the Google AI Studio *free tier* quotas (paid tiers allow far
+# more); deployments on a paid key override them through TRADINGAGENTS_RATE_LIMITS.
+DEFAULT_RATE_LIMITS = {
+    "google:gemini-2.5-flash": {"rpm": 10, "tpm": 250_000},  # free tier
+    "google:gemini-2.5-flash-lite": {"rpm": 15, "tpm": 250_000},  # free tier
+    "typhoon": {"rpm": 240},  # Typhoon API: 5 RPS, 4 for safety margin
+    "openai": {"rpm": 500, "tpm": 200_000},
+    "anthropic": {"rpm": 50, "tpm": 40_000},
+    "deepseek": {"rpm": 300},
+}
+
+
+def _env_rate_limits(defaults):
+    """
+    DEFAULT_RATE_LIMITS with the entries of the TRADINGAGENTS_RATE_LIMITS JSON object
+    on top, e.g. '{"google:gemini-2.5-flash": {"rpm": 1000, "tpm": 1000000}}'.
+    An entry set to null is dropped (that model is no longer limited).
+    """
+    raw = os.getenv("TRADINGAGENTS_RATE_LIMITS", "").strip()
+    if not raw:
+        return dict(defaults)
+    try:
+        overrides = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"TRADINGAGENTS_RATE_LIMITS is not valid JSON: {e}") from e
+    if not isinstance(overrides, dict):
+        raise ValueError("TRADINGAGENTS_RATE_LIMITS must be a JSON object of provider[:model] -> {rpm, tpm}")
+    limits = dict(defaults)
+    for key, spec in overrides.items():
+        if spec is None:
+            limits.pop(key, None)
+        elif isinstance(spec, dict):
+            limits[key] = spec
+        else:
+            raise ValueError(f"TRADINGAGENTS_RATE_LIMITS[{key!r}] must be an object or null")
+    return limits
+
+
 DEFAULT_CONFIG = {
     "project_dir": os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
     "results_dir": os.getenv("TRADINGAGENTS_RESULTS_DIR", "./results"),
@@ -45,6 +85,83 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Run the selected analysts concurrently (fan-out/fan-in) instead of in sequence
+    "parallel_analysts": True,
+    # Latency tier (AnalysisRequest.mode): "quick" = analysts + one Quick Decision node, no
+    # debates / summaries / translation; "standard" = full pipeline; "deep" = standard with
+    # deep_extra_rounds more bull/bear and risk rounds
+    "analysis_mode": os.getenv("TRADINGAGENTS_ANALYSIS_MODE", "standard"),
+    "deep_extra_rounds": 1,
+    # "parallel": all debaters in a round answer the previous round concurrently
+    # (one LLM latency per round); "sequential": classic turn-taking
+    "debate_mode": os.getenv("TRADINGAGENTS_DEBATE_MODE", "sequential"),
+    # Debators end each turn with "STANCE: BUY|SELL|HOLD CONFIDENCE: 1-5"; a debate stops before
+    # its round limit once no stance changed over a round or all speakers agree (debate_stance.py)
+    "debate_early_stop": os.getenv("TRADINGAGENTS_DEBATE_EARLY_STOP", "1") != "0",
+    # Debaters see the last N turns verbatim + a summary of older turns within this budget
+    "debate_compaction": True,
+    "debate_history_budget_tokens": 1500,
+    "debate_keep_last_turns": 2,
+    # Market Analyst price/indicator context: "compact" (adaptive precision, deltas,
+    # weekly + recent daily rows) or "raw" (CSV tail + full-precision table)
+    "market_data_encoding": os.getenv("TRADINGAGENTS_MARKET_ENCODING", "compact"),
+    # Checkpointing: "sqlite" (data_cache_dir/checkpoints.sqlite), "postgres", "memory" or None
+    "checkpoint_backend": os.getenv("TRADINGAGENTS_CHECKPOINT_BACKEND", "sqlite"),
+    "checkpoint_db_path": None,  # sqlite file override
+    "checkpoint_postgres_url": None,  # defaults to DATABASE_URL
+    # Whole-run cache: an identical request replays the stored reports instead of re-running
+    "run_cache": True,
+    "run_cache_max_age_hours": 24,  # None = never expire
+    # Stage cache: reuse individual node outputs (analyst reports, debate turns) whose
+    # inputs, model, prompt and memory are unchanged -> data_cache_dir/stage_cache.sqlite
+    "stage_cache": os.getenv("TRADINGAGENTS_STAGE_CACHE", "1") != "0",
+    "stage_cache_path": None,
+    "stage_cache_max_age_hours": 168,  # entries older than this are not reused (None = never expire)
+    "stage_cache_max_entries": 5000,  # oldest entries beyond this are deleted
+    "stage_cache_refresh": False,  # True = re-run every stage and overwrite its entry (force_refresh)
+    # LLM response cache in front of the chat models and the Typhoon summarizers:
+    # "read_through", "record_only" (always call, refresh entries) or "off"
+    "llm_cache": os.getenv("TRADINGAGENTS_LLM_CACHE", "read_through"),
+    "llm_cache_backend": "sqlite",  # or "disk" (one JSON file per response)
+    "llm_cache_path": None,  # defaults to data_cache_dir/llm_cache.sqlite (or llm_cache/)
+    "llm_cache_max_age_hours": 720,  # responses older than this are not reused (None = never expire)
+    "llm_cache_max_entries": 50_000,  # oldest responses beyond this are deleted
+    # Per-minute request/token budgets shared by every caller of a provider/model
+    # ("provider:model" overrides "provider"); callers queue in order instead of hitting 429
+    "rate_limit": os.getenv("TRADINGAGENTS_RATE_LIMIT", "1") != "0",
+    # Gemini defaults are free-tier quotas, see DEFAULT_RATE_LIMITS / TRADINGAGENTS_RATE_LIMITS
+    "rate_limits": _env_rate_limits(DEFAULT_RATE_LIMITS),
+    # llm_provider "fake": offline models for load tests (utils/fake_llm.py). Per call, time to
+    # first token ~ log-normal(mean, sd) ms and tokens/second ~ normal(mean, sd); time_scale 0 = no delays
+    "fake_llm": {
+        "seed": 42,
+        "ttft_ms": [400.0, 150.0],
+        "tokens_per_second": [60.0, 15.0],
+        "prose_tokens": [150, 400],
+        "time_scale": float(os.getenv("TRADINGAGENTS_FAKE_LLM_TIME_SCALE", "1")),
+    },
+    # One pooled HTTP client per provider base URL (Typhoon summarizers + translation):
+    # keep-alive, HTTP/2 when `h2` is installed; opened at API startup, closed at shutdown
+    "http_pool": {
+        "http2": os.getenv("TRADINGAGENTS_HTTP2", "1") != "0",
+        "max_connections": 20,
+        "max_keepalive_connections": 10,
+        "keepalive_expiry": 60.0,  # seconds an idle connection stays open
+        "timeout": 120.0,
+        "connect_timeout": 10.0,
+    },
+    # Concurrent identical vendor fetches / LLM prompts (e.g. two sessions on the same
+    # ticker and date) share one in-flight call instead of running twice (utils/single_flight.py)
+    "single_flight": os.getenv("TRADINGAGENTS_SINGLE_FLIGHT", "1") != "0",
+    # API: forward the running agents' LLM tokens to the WebSocket as `token` events,
+    # batched every token_flush_ms (api/token_stream.py)
+    "stream_tokens": os.getenv("TRADINGAGENTS_STREAM_TOKENS", "1") != "0",
+    "token_flush_ms": 100,
+    # API: reuse LLM clients, memories and compiled graphs across requests
+    "graph_pool": os.getenv("TRADINGAGENTS_GRAPH_POOL", "1") != "0",
+    "graph_pool_size": 8,  # compiled graphs kept (least recently used evicted)
+    # Build the default graph at startup so the first request does not pay for it
+    "graph_pool_warmup": os.getenv("TRADINGAGENTS_GRAPH_POOL_WARMUP", "0") == "1",
     # Data vendor configuration
     # Category-level configuration (default for all tools in category)
     "data_vendors": {
@@ -1,15 +1,34 @@
 # TradingAgents/graph/conditional_logic.py
 
 from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.agents.utils.debate_stance import debate_converged
+
+INVEST_SPEAKERS = ("Bull", "Bear")
+RISK_SPEAKERS = ("Risky", "Safe", "Neutral")
 
 
 class ConditionalLogic:
     """Handles conditional logic for determining graph flow."""
 
-    def __init__(self, max_debate_rounds=1, max_risk_discuss_rounds=1):
-        """Initialize with configuration parameters."""
+    def __init__(self, max_debate_rounds=1, max_risk_discuss_rounds=1, early_stop=False):
+        """Initialize with configuration parameters.
+
+        early_stop: end a debate at a round boundary once the debators' stances
+        have converged (see agents/utils/debate_stance.py), before the round limit.
+        """
         self.max_debate_rounds = max_debate_rounds
         self.max_risk_discuss_rounds = max_risk_discuss_rounds
+        self.early_stop = early_stop
+
+    def _converged(self, debate_state, speakers) -> bool:
+        """Only checked after a full round, so every speaker had the same number of turns."""
+        count = debate_state["count"]
+        if not self.early_stop or count == 0 or count % len(speakers):
+            return False
+        if debate_converged(debate_state.get("stances") or [], speakers):
+            print(f"🤝 {'/'.join(speakers)} debate converged after {count // len(speakers)} round(s), ending early")
+            return True
+        return False
 
     def should_continue_market(self, state: AgentState):
         """Determine if market analysis should continue."""
@@ -50,16 +69,36 @@ class ConditionalLogic:
             state["investment_debate_state"]["count"] >= 2 * self.max_debate_rounds
         ):  # 3 rounds of back-and-forth between 2 agents
             return "Research Manager"
+        if self._converged(state["investment_debate_state"], INVEST_SPEAKERS):
+            return "Research Manager"
         if state["investment_debate_state"]["current_response"].startswith("Bull"):
             return "Bear Researcher"
         return "Bull Researcher"
 
+    def should_continue_debate_round(self, state: AgentState) -> str:
+        """Parallel debate mode: one node per bull/bear round (2 turns each)."""
+        if state["investment_debate_state"]["count"] >= 2 * self.max_debate_rounds:
+            return "Research Manager"
+        if self._converged(state["investment_debate_state"], INVEST_SPEAKERS):
+            return "Research Manager"
+        return "Investment Debate Round"
+
+    def should_continue_risk_round(self, state: AgentState) -> str:
+        """Parallel debate mode: one node per risky/safe/neutral round (3 turns each)."""
+        if state["risk_debate_state"]["count"] >= 3 * self.max_risk_discuss_rounds:
+            return "Risk Judge"
+        if self._converged(state["risk_debate_state"], RISK_SPEAKERS):
+            return "Risk Judge"
+        return "Risk Debate Round"
+
     def should_continue_risk_analysis(self, state: AgentState) -> str:
         """Determine if risk analysis should continue."""
         if (
             state["risk_debate_state"]["count"] >= 3 * self.max_risk_discuss_rounds
         ):  # 3 rounds of back-and-forth between 3 agents
             return "Risk Judge"
+        if self._converged(state["risk_debate_state"], RISK_SPEAKERS):
+            return "Risk Judge"
         if state["risk_debate_state"]["latest_speaker"].startswith("Risky"):
             return "Safe Analyst"
         if state["risk_debate_state"]["latest_speaker"].startswith("Safe"):
@@ -0,0 +1,151 @@
+# TradingAgents/graph/graph_pool.py
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .trading_graph import MEMORY_NAMES, TradingAgentsGraph, create_llms, create_memories
+
+
+class GraphPool:
+    """
+    Process-wide pool of TradingAgentsGraph templates.
+
+    Building a graph creates two chat model clients, five memories (Chroma
+    collections + the embedding model) and compiles the StateGraph. The pool
+    builds each of those once and hands every request a `fork()` of the
+    matching template: same clients, memories and compiled graph, separate run
+    state and checkpointer. A compiled LangGraph graph is safe to run
+    concurrently on different threads, and the chat model clients are safe to
+    share, so nothing is locked while a run is in progress; only building a
+    new template is.
+
+    - LLM clients are shared per (provider, models, backend_url)
+    - memories are shared process-wide (reflection updates them for every run)
+    - compiled graphs are kept per graph_key(), least recently used evicted
+    """
+
+    def __init__(self, max_graphs: int = 8):
+        self.max_graphs = max_graphs
+        self._graphs: "OrderedDict[Tuple, TradingAgentsGraph]" = OrderedDict()
+        self._build_locks: Dict[Tuple, asyncio.Lock] = {}
+        self._llms: Dict[Tuple, Tuple[Any, Any]] = {}
+        self._memories: Optional[Dict[str, Any]] = None
+        # Builds run in worker threads, so the shared caches get a thread lock
+        self._resource_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def llm_key(config: Dict[str, Any]) -> Tuple:
+        return (
+            config["llm_provider"].lower(),
+            config["deep_think_llm"],
+            config["quick_think_llm"],
+            config.get("backend_url"),
+            # the response cache is attached to the clients
+            config.get("llm_cache"),
+            config.get("llm_cache_backend"),
+            config.get("llm_cache_path"),
+            config.get("llm_cache_max_age_hours"),
+            config.get("llm_cache_max_entries"),
+            config.get("rate_limit", True),
+            # seed / latency of the offline fake models
+            repr(config.get("fake_llm")) if config["llm_provider"].lower() == "fake" else None,
+        )
+
+    @staticmethod
+    def graph_key(selected_analysts: List[str], config: Dict[str, Any]) -> Tuple:
+        """Everything the compiled graph is built from."""
+        parallel = config.get("parallel_analysts", True)
+        # Fan-out graphs do not depend on the order analysts were picked in
+        analysts = tuple(sorted(selected_analysts)) if parallel else tuple(selected_analysts)
+        return GraphPool.llm_key(config) + (
+            analysts,
+            parallel,
+            config.get("debate_mode", "sequential"),
+            config.get("max_debate_rounds", 1),
+            config.get("max_risk_discuss_rounds", 1),
+            config.get("analysis_mode", "standard"),
+            config.get("deep_extra_rounds", 1),
+            bool(config.get("debate_early_stop", False)),
+            bool(config.get("stage_cache")),
+            config.get("stage_cache_path"),
+        )
+
+    def _shared_llms(self, config: Dict[str, Any]) -> Tuple[Any, Any]:
+        key = self.llm_key(config)
+        with self._resource_lock:
+            if key not in self._llms:
+                self._llms[key] = create_llms(config)
+            return self._llms[key]
+
+    def _shared_memories(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        with self._resource_lock:
+            if self._memories is None:
+                self._memories = create_memories(config)
+            return self._memories
+
+    def _build(self, selected_analysts: List[str], config: Dict[str, Any]) -> TradingAgentsGraph:
+        start = time.perf_counter()
+        template = TradingAgentsGraph(
+            list(selected_analysts),
+            config=config,
+            llms=self._shared_llms(config),
+            memories=self._shared_memories(config),
+        )
+        print(f"🏗️ Graph pool: built {','.join(selected_analysts)} graph in {time.perf_counter() - start:.2f}s")
+        return template
+
+    async def acquire(
+        self,
+        selected_analysts: List[str],
+        config: Dict[str, Any],
+        debug: bool = False,
+    ) -> TradingAgentsGraph:
+        """A ready-to-run graph for this request; builds the template on first use."""
+        key = self.graph_key(selected_analysts, config)
+        template = self._graphs.get(key)
+        if template is None:
+            lock = self._build_locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                template = self._graphs.get(key)
+                if template is None:
+                    self.misses += 1
+                    # Loading the embedding model / Chroma blocks, keep the event loop free
+                    template = await asyncio.to_thread(self._build, selected_analysts, config)
+                    self._graphs[key] = template
+                    while len(self._graphs) > self.max_graphs:
+                        evicted, _ = self._graphs.popitem(last=False)
+                        self._build_locks.pop(evicted, None)
+                else:
+                    self.hits += 1
+        else:
+            self.hits += 1
+        if key in self._graphs:
+            self._graphs.move_to_end(key)
+        return template.fork(config, debug=debug)
+
+    async def warm_up(self, selected_analysts: List[str], config: Dict[str, Any]):
+        """Build the template for a common request ahead of the first user."""
+        start = time.perf_counter()
+        await self.acquire(selected_analysts, config)
+        print(f"🔥 Graph pool warmed up in {time.perf_counter() - start:.2f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "graphs": len(self._graphs),
+            "llm_clients": len(self._llms),
+            "memories": list(MEMORY_NAMES) if self._memories is not None else [],
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        self._graphs.clear()
+        self._build_locks.clear()
+        with self._resource_lock:
+            self._llms.clear()
+            self._memories = None
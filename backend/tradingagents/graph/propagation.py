@@ -1,6 +1,10 @@
 # TradingAgents/graph/propagation.py
 
-from typing import Dict, Any
+import uuid
+from typing import Dict, Any, Optional
+
+from langchain_core.messages import HumanMessage, RemoveMessage, convert_to_messages, message_chunk_to_message
+from langgraph.graph.message import REMOVE_ALL_MESSAGES, add_messages
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -20,7 +24,9 @@ class Propagator:
     ) -> Dict[str, Any]:
         """Create the initial state for the agent graph."""
         return {
-            "messages": [("human", f"Analyze the stock for {company_name}. Start by gathering the necessary stock data and technical indicators. Then, provide a detailed market analysis report based on that data.")],
+            # Explicit id so a StateAccumulator seeded with this state agrees with
+            # the graph when a node later removes the message by id
+            "messages": [HumanMessage(content=f"Analyze the stock for {company_name}. Start by gathering the necessary stock data and technical indicators. Then, provide a detailed market analysis report based on that data.", id=str(uuid.uuid4()))],
             "company_of_interest": company_name,
             "trade_date": str(trade_date),
             "investment_debate_state": InvestDebateState(
@@ -41,9 +47,69 @@ class Propagator:
             "news_report": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(
+        self, thread_id: Optional[str] = None, stream_mode: str = "updates"
+    ) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        Args:
+            thread_id: Checkpoint thread to write to / resume from (needs a
+                graph compiled with a checkpointer).
+            stream_mode: "updates" streams each node's delta (fold them with
+                StateAccumulator); "values" streams the whole state per step.
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        if thread_id:
+            config["configurable"] = {"thread_id": thread_id}
         return {
-            "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "stream_mode": stream_mode,
+            "config": config,
         }
+
+
+class StateAccumulator:
+    """
+    Folds stream_mode="updates" chunks ({node: {key: value}}) into one running
+    state, so a consumer keeps a single copy of the state instead of every
+    full-state snapshot. `apply` returns only what a chunk changed.
+    """
+
+    def __init__(self, initial_state: Optional[Dict[str, Any]] = None):
+        self.state: Dict[str, Any] = {}
+        if initial_state:
+            self.apply({"__init__": initial_state})
+
+    def apply(self, chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge one updates chunk. Returns {key: new value} for keys whose
+        value changed; for "messages", the list of newly added messages."""
+        changed: Dict[str, Any] = {}
+        for update in chunk.values():
+            if not isinstance(update, dict):
+                continue  # e.g. nodes that returned nothing, or "__interrupt__"
+            for key, value in update.items():
+                if key == "messages":
+                    # Same reducer as MessagesState; a removal of a message this
+                    # accumulator never saw (e.g. seeded mid-run) is skipped
+                    known = {m.id for m in self.state.get("messages", [])} | {REMOVE_ALL_MESSAGES}
+                    value = [
+                        message_chunk_to_message(m)
+                        for m in convert_to_messages(value if isinstance(value, list) else [value])
+                        if not isinstance(m, RemoveMessage) or m.id in known
+                    ]
+                    # ids up front, so added messages can be found again after the merge
+                    # (one that reuses an existing id replaces it in place, not at the end)
+                    for m in value:
+                        if m.id is None:
+                            m.id = str(uuid.uuid4())
+                    self.state["messages"] = add_messages(self.state.get("messages", []), value)
+                    added = [m.id for m in value if not isinstance(m, RemoveMessage)]
+                    if added:
+                        merged = {m.id: m for m in self.state["messages"]}
+                        changed.setdefault("messages", []).extend(
+                            merged[i] for i in dict.fromkeys(added) if i in merged
+                        )
+                elif self.state.get(key) != value:
+                    self.state[key] = value
+                    changed[key] = value
+        return changed
+
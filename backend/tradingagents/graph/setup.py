@@ -9,6 +9,14 @@ from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
 
 from .conditional_logic import ConditionalLogic
+from tradingagents.agents.utils import debate_compaction, debate_stance, market_encoding
+from tradingagents.utils.llm_cache import track_node
+
+# State every stage output depends on, on top of its own inputs below
+_RUN_INPUTS = ["company_of_interest", "trade_date"]
+_REPORTS = ["market_report", "sentiment_report", "news_report", "fundamentals_report"]
+# Prompt helpers of the debators (their source and config are part of the stage key)
+_DEBATE_HELPERS = (debate_compaction, debate_stance)
 
 
 class GraphSetup:
@@ -25,8 +33,13 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        stage_cache=None,
     ):
-        """Initialize with required components."""
+        """Initialize with required components.
+
+        stage_cache: optional StageCache (see graph/stage_cache.py); when set,
+        every LLM stage reuses stored outputs for identical inputs.
+        """
         self.quick_thinking_llm = quick_thinking_llm
         self.deep_thinking_llm = deep_thinking_llm
         self.tool_nodes = tool_nodes
@@ -36,9 +49,25 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.stage_cache = stage_cache
+
+    def _stage(self, stage, node, factory, llm, inputs, memory=None, helpers=()):
+        """Wrap `node` with the stage cache keyed on `inputs` + model + prompt (+ helpers) + memory
+        (LLM cache hits/misses inside it are counted under `stage`)."""
+        node = track_node(stage, node)
+        if self.stage_cache is None:
+            return node
+        return self.stage_cache.wrap(
+            stage, node, _RUN_INPUTS + inputs, llm=llm, factory=factory, memory=memory, helpers=helpers
+        )
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=True,
+        checkpointer=None,
+        debate_mode="sequential",
+        mode="standard",
     ):
         """Set up and compile the agent workflow graph.
 
@@ -48,6 +77,17 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Fan out to all analysts at once and join at
+                "Analyst Join" before the debate. If False, run them in sequence.
+            checkpointer: Optional LangGraph checkpointer; makes runs resumable
+                per thread_id.
+            debate_mode (str): "sequential" (speakers take turns) or "parallel"
+                (every speaker in a round answers the previous round at once,
+                so a round costs one LLM latency instead of two or three).
+            mode (str): analysis tier. "quick" goes from the analysts straight to
+                one "Quick Decision" node (no debates, research manager or
+                trader); "standard" and "deep" build the full pipeline ("deep"
+                only differs in the round limits, see ConditionalLogic).
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -58,56 +98,108 @@ class GraphSetup:
         tool_nodes = {}
 
         if "market" in selected_analysts:
-            analyst_nodes["market"] = create_market_analyst(
-                self.quick_thinking_llm
+            analyst_nodes["market"] = self._stage(
+                "Market Analyst",
+                create_market_analyst(self.quick_thinking_llm),
+                create_market_analyst,
+                self.quick_thinking_llm,
+                ["messages", "prefetched_data.stock_data"],
+                helpers=(market_encoding,),
             )
-            delete_nodes["market"] = create_msg_delete()
+            delete_nodes["market"] = create_msg_delete(parallel_analysts)
             tool_nodes["market"] = self.tool_nodes["market"]
 
         if "social" in selected_analysts:
-            analyst_nodes["social"] = create_social_media_analyst(
-                self.quick_thinking_llm
+            analyst_nodes["social"] = self._stage(
+                "Social Analyst",
+                create_social_media_analyst(self.quick_thinking_llm),
+                create_social_media_analyst,
+                self.quick_thinking_llm,
+                ["messages", "prefetched_data.social"],
             )
-            delete_nodes["social"] = create_msg_delete()
+            delete_nodes["social"] = create_msg_delete(parallel_analysts)
             tool_nodes["social"] = self.tool_nodes["social"]
 
         if "news" in selected_analysts:
-            analyst_nodes["news"] = create_news_analyst(
-                self.quick_thinking_llm
+            analyst_nodes["news"] = self._stage(
+                "News Analyst",
+                create_news_analyst(self.quick_thinking_llm),
+                create_news_analyst,
+                self.quick_thinking_llm,
+                ["messages", "prefetched_data.news"],
             )
-            delete_nodes["news"] = create_msg_delete()
+            delete_nodes["news"] = create_msg_delete(parallel_analysts)
             tool_nodes["news"] = self.tool_nodes["news"]
 
         if "fundamentals" in selected_analysts:
-            analyst_nodes["fundamentals"] = create_fundamentals_analyst(
-                self.quick_thinking_llm
+            analyst_nodes["fundamentals"] = self._stage(
+                "Fundamentals Analyst",
+                create_fundamentals_analyst(self.quick_thinking_llm),
+                create_fundamentals_analyst,
+                self.quick_thinking_llm,
+                ["messages", "prefetched_data.fundamentals"],
             )
-            delete_nodes["fundamentals"] = create_msg_delete()
+            delete_nodes["fundamentals"] = create_msg_delete(parallel_analysts)
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
         # Create researcher and manager nodes
-        bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+        debate_inputs = _REPORTS + ["investment_debate_state"]
+        bull_researcher_node = self._stage(
+            "Bull Researcher",
+            create_bull_researcher(self.quick_thinking_llm, self.bull_memory),
+            create_bull_researcher, self.quick_thinking_llm, debate_inputs, self.bull_memory, _DEBATE_HELPERS,
         )
-        bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+        bear_researcher_node = self._stage(
+            "Bear Researcher",
+            create_bear_researcher(self.quick_thinking_llm, self.bear_memory),
+            create_bear_researcher, self.quick_thinking_llm, debate_inputs, self.bear_memory, _DEBATE_HELPERS,
+        )
+        research_manager_node = self._stage(
+            "Research Manager",
+            create_research_manager(self.deep_thinking_llm, self.invest_judge_memory),
+            create_research_manager, self.deep_thinking_llm, debate_inputs, self.invest_judge_memory,
         )
-        research_manager_node = create_research_manager(
-            self.deep_thinking_llm, self.invest_judge_memory
+        trader_node = self._stage(
+            "Trader",
+            create_trader(self.quick_thinking_llm, self.trader_memory),
+            create_trader, self.quick_thinking_llm, _REPORTS + ["investment_plan"], self.trader_memory,
         )
-        trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
-        risk_manager_node = create_risk_manager(
-            self.deep_thinking_llm, self.risk_manager_memory
+        risk_inputs = _REPORTS + ["trader_investment_plan", "risk_debate_state"]
+        risky_analyst = self._stage(
+            "Risky Analyst", create_risky_debator(self.quick_thinking_llm),
+            create_risky_debator, self.quick_thinking_llm, risk_inputs, helpers=_DEBATE_HELPERS,
+        )
+        neutral_analyst = self._stage(
+            "Neutral Analyst", create_neutral_debator(self.quick_thinking_llm),
+            create_neutral_debator, self.quick_thinking_llm, risk_inputs, helpers=_DEBATE_HELPERS,
+        )
+        safe_analyst = self._stage(
+            "Safe Analyst", create_safe_debator(self.quick_thinking_llm),
+            create_safe_debator, self.quick_thinking_llm, risk_inputs, helpers=_DEBATE_HELPERS,
+        )
+        risk_manager_node = self._stage(
+            "Risk Judge",
+            create_risk_manager(self.deep_thinking_llm, self.risk_manager_memory),
+            create_risk_manager, self.deep_thinking_llm,
+            risk_inputs + ["investment_plan"], self.risk_manager_memory,
+        )
+
+        quick = mode == "quick"
+        quick_decision_node = self._stage(
+            "Quick Decision",
+            create_quick_decision(self.deep_thinking_llm, self.risk_manager_memory),
+            create_quick_decision, self.deep_thinking_llm, _REPORTS, self.risk_manager_memory,
         )
 
         # Create workflow
         workflow = StateGraph(AgentState)
 
+        # Every vendor fetch starts immediately, before any analyst runs
+        workflow.add_node("Data Prefetch", create_data_prefetcher(selected_analysts))
+        workflow.add_edge(START, "Data Prefetch")
+
         # Add analyst nodes to the graph
         for analyst_type, node in analyst_nodes.items():
             workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
@@ -117,21 +209,34 @@ class GraphSetup:
             workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
-        workflow.add_node("Bull Researcher", bull_researcher_node)
-        workflow.add_node("Bear Researcher", bear_researcher_node)
-        workflow.add_node("Research Manager", research_manager_node)
-        workflow.add_node("Trader", trader_node)
-        workflow.add_node("Risky Analyst", risky_analyst)
-        workflow.add_node("Neutral Analyst", neutral_analyst)
-        workflow.add_node("Safe Analyst", safe_analyst)
-        workflow.add_node("Risk Judge", risk_manager_node)
+        parallel_debate = debate_mode == "parallel"
+        if quick:
+            # Quick screen: the analysts' reports go straight to one decision
+            workflow.add_node("Quick Decision", quick_decision_node)
+            debate_entry = "Quick Decision"
+        elif parallel_debate:
+            workflow.add_node(
+                "Investment Debate Round",
+                create_invest_debate_round(bull_researcher_node, bear_researcher_node),
+            )
+            workflow.add_node(
+                "Risk Debate Round",
+                create_risk_debate_round(risky_analyst, safe_analyst, neutral_analyst),
+            )
+            debate_entry = "Investment Debate Round"
+        else:
+            workflow.add_node("Bull Researcher", bull_researcher_node)
+            workflow.add_node("Bear Researcher", bear_researcher_node)
+            workflow.add_node("Risky Analyst", risky_analyst)
+            workflow.add_node("Neutral Analyst", neutral_analyst)
+            workflow.add_node("Safe Analyst", safe_analyst)
+            debate_entry = "Bull Researcher"
+        if not quick:
+            workflow.add_node("Research Manager", research_manager_node)
+            workflow.add_node("Trader", trader_node)
+            workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
         for i, analyst_type in enumerate(selected_analysts):
             current_analyst = f"{analyst_type.capitalize()} Analyst"
             current_tools = f"tools_{analyst_type}"
@@ -145,12 +250,47 @@ class GraphSetup:
             )
             workflow.add_edge(current_tools, current_analyst)
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
+            if parallel_analysts:
+                # Fan out: every analyst starts as soon as its data is in state
+                workflow.add_edge("Data Prefetch", current_analyst)
+            elif i < len(selected_analysts) - 1:
+                # Sequential: connect to the next analyst
                 next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
                 workflow.add_edge(current_clear, next_analyst)
             else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+                workflow.add_edge(current_clear, debate_entry)
+
+        if not parallel_analysts:
+            workflow.add_edge("Data Prefetch", f"{selected_analysts[0].capitalize()} Analyst")
+        else:
+            # Fan in: the join only runs once every analyst branch has finished,
+            # then clears the shared message list for the debate
+            workflow.add_node("Analyst Join", create_msg_delete())
+            workflow.add_edge(
+                [f"Msg Clear {a.capitalize()}" for a in selected_analysts],
+                "Analyst Join",
+            )
+            workflow.add_edge("Analyst Join", debate_entry)
+
+        if quick:
+            workflow.add_edge("Quick Decision", END)
+            return workflow.compile(checkpointer=checkpointer)
+
+        if parallel_debate:
+            workflow.add_conditional_edges(
+                "Investment Debate Round",
+                self.conditional_logic.should_continue_debate_round,
+                ["Investment Debate Round", "Research Manager"],
+            )
+            workflow.add_edge("Research Manager", "Trader")
+            workflow.add_edge("Trader", "Risk Debate Round")
+            workflow.add_conditional_edges(
+                "Risk Debate Round",
+                self.conditional_logic.should_continue_risk_round,
+                ["Risk Debate Round", "Risk Judge"],
+            )
+            workflow.add_edge("Risk Judge", END)
+            return workflow.compile(checkpointer=checkpointer)
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -199,4 +339,4 @@ class GraphSetup:
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
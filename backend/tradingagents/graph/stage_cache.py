@@ -0,0 +1,266 @@
+# TradingAgents/graph/stage_cache.py
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+
+from tradingagents.dataflows.config import get_config
+
+
+def prompt_version(factory) -> str:
+    """Hash of the module that builds a node (or of a module); editing a prompt invalidates its entries."""
+    try:
+        path = inspect.getsourcefile(factory)
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except (TypeError, OSError):
+        return getattr(factory, "__qualname__", "unknown")
+
+
+def model_identity(llm) -> str:
+    """Provider class + model name (+ endpoint) of a chat model."""
+    if llm is None:
+        return "none"
+    name = getattr(llm, "model_name", None) or getattr(llm, "model", None) or ""
+    base_url = getattr(llm, "openai_api_base", None) or getattr(llm, "base_url", None) or ""
+    return f"{type(llm).__name__}:{name}:{base_url}"
+
+
+def prompt_fingerprint(helpers) -> Dict[str, Any]:
+    """
+    Source hash + active config of the helper modules a node builds its prompt
+    with (market_encoding, debate_compaction, ...). Each helper lists the config
+    entries that change its text in PROMPT_CONFIG_KEYS; they are read per call,
+    so a run with e.g. market_data_encoding "raw" never gets a "compact" entry.
+    """
+    config = get_config()
+    return {
+        module.__name__: {
+            "source": prompt_version(module),
+            "config": {key: config.get(key) for key in getattr(module, "PROMPT_CONFIG_KEYS", ())},
+        }
+        for module in helpers
+    }
+
+
+def memory_fingerprint(memory) -> str:
+    """Memories grow after reflection, which changes what a node retrieves."""
+    if memory is None:
+        return "none"
+    collection = getattr(memory, "situation_collection", None)
+    try:
+        return f"{collection.name}:{collection.count()}"
+    except Exception:
+        return f"{type(memory).__name__}:{id(memory)}"
+
+
+def _lookup(state: Dict[str, Any], path: str):
+    # "prefetched_data.news" -> state["prefetched_data"]["news"]
+    value = state
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _key_value(value):
+    # Message ids are random per run, so only role/content/tool calls go into the key
+    if isinstance(value, BaseMessage):
+        return {"type": value.type, "content": value.content, "tool_calls": getattr(value, "tool_calls", None)}
+    if isinstance(value, (list, tuple)):
+        return [_key_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _key_value(v) for k, v in value.items()}
+    return value
+
+
+def _encode_output(output: Dict[str, Any]) -> Optional[str]:
+    encoded = {}
+    for key, value in output.items():
+        if key == "messages":
+            messages = []
+            for message in value:
+                if getattr(message, "tool_calls", None):
+                    return None  # mid tool loop -> the next step depends on the tool result
+                data = messages_to_dict([message])[0]
+                data["data"]["id"] = None  # let add_messages assign a fresh id
+                messages.append(data)
+            encoded[key] = {"__messages__": messages}
+        else:
+            encoded[key] = value
+    try:
+        return json.dumps(encoded, ensure_ascii=False)
+    except TypeError:
+        return None
+
+
+def _decode_output(payload: str) -> Dict[str, Any]:
+    output = json.loads(payload)
+    for key, value in output.items():
+        if isinstance(value, dict) and "__messages__" in value:
+            output[key] = messages_from_dict(value["__messages__"])
+    return output
+
+
+class StageCache:
+    """
+    Content-addressed store of node outputs in a local SQLite file.
+
+    A stage's key covers everything its output depends on: the state fields it
+    reads, the model it calls, its prompt module, the prompt helpers it uses
+    (with the config they read) and the memory it retrieves from. Re-running a ticker/date with a different research depth or deep-think
+    model therefore reuses the analyst reports (and any debate turns whose
+    inputs are unchanged) and only re-runs the stages downstream of the change.
+
+    Entries older than `max_age_hours` are not served; expired entries and the
+    oldest ones beyond `max_entries` are deleted on open and every
+    PRUNE_EVERY writes. A run with config["stage_cache_refresh"] (force_refresh)
+    skips the reads but still stores its fresh outputs.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, max_age_hours: Optional[float] = 168, max_entries: Optional[int] = 5000):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_age_hours = max_age_hours
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stage_cache ("
+            "key TEXT PRIMARY KEY, stage TEXT, created_at REAL, payload TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_stage_cache_created_at ON stage_cache (created_at)")
+        self._conn.commit()
+        self._writes = 0
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.prune()
+
+    def _cutoff(self) -> float:
+        return time.time() - self.max_age_hours * 3600 if self.max_age_hours is not None else float("-inf")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM stage_cache WHERE key = ? AND created_at >= ?", (key, self._cutoff())
+            ).fetchone()
+        return _decode_output(row[0]) if row else None
+
+    def prune(self) -> int:
+        """Delete expired entries and the oldest beyond max_entries; returns how many went."""
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM stage_cache WHERE created_at < ?", (self._cutoff(),)).rowcount
+            if self.max_entries is not None:
+                deleted += self._conn.execute(
+                    "DELETE FROM stage_cache WHERE key NOT IN "
+                    "(SELECT key FROM stage_cache ORDER BY created_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def put(self, key: str, stage: str, output: Dict[str, Any]) -> bool:
+        payload = _encode_output(output)
+        if payload is None:
+            return False
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stage_cache (key, stage, created_at, payload) VALUES (?, ?, ?, ?)",
+                (key, stage, time.time(), payload),
+            )
+            self._conn.commit()
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM stage_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"hits": dict(self.hits), "misses": dict(self.misses)}
+
+    def make_key(
+        self, stage: str, state: Dict[str, Any], inputs: List[str], llm=None, factory=None, memory=None, helpers=()
+    ) -> str:
+        payload = {
+            "stage": stage,
+            "inputs": {path: _key_value(_lookup(state, path)) for path in inputs},
+            "model": model_identity(llm),
+            "prompt": prompt_version(factory) if factory is not None else None,
+            "helpers": prompt_fingerprint(helpers),
+            "memory": memory_fingerprint(memory),
+        }
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def wrap(
+        self, stage: str, node: Callable, inputs: List[str], llm=None, factory=None, memory=None, helpers=()
+    ) -> Callable:
+        """Return `node` with read-through caching; keeps sync nodes sync and async nodes async
+        (and the node's signature, so a `config` argument is still passed through)."""
+
+        def lookup(state):
+            key = self.make_key(stage, state, inputs, llm, factory, memory, helpers)
+            # Read per call: the compiled graph is pooled, the refresh flag belongs to this run
+            cached = None if get_config().get("stage_cache_refresh") else self.get(key)
+            if cached is not None:
+                self.hits[stage] = self.hits.get(stage, 0) + 1
+                print(f"♻️ Stage cache hit: {stage}")
+            else:
+                self.misses[stage] = self.misses.get(stage, 0) + 1
+            return key, cached
+
+        if asyncio.iscoroutinefunction(node):
+            @functools.wraps(node)
+            async def cached_async_node(state, **kwargs):
+                key, cached = lookup(state)
+                if cached is not None:
+                    return cached
+                output = await node(state, **kwargs)
+                self.put(key, stage, output)
+                return output
+
+            return cached_async_node
+
+        @functools.wraps(node)
+        def cached_node(state, **kwargs):
+            key, cached = lookup(state)
+            if cached is not None:
+                return cached
+            output = node(state, **kwargs)
+            self.put(key, stage, output)
+            return output
+
+        return cached_node
+
+
+def open_stage_cache(config: Dict[str, Any]) -> Optional[StageCache]:
+    """StageCache for config["stage_cache"], or None when disabled."""
+    if not config.get("stage_cache"):
+        return None
+    path = config.get("stage_cache_path") or os.path.join(config["data_cache_dir"], "stage_cache.sqlite")
+    try:
+        return StageCache(
+            path,
+            max_age_hours=config.get("stage_cache_max_age_hours", 168),
+            max_entries=config.get("stage_cache_max_entries", 5000),
+        )
+    except sqlite3.Error as e:
+        print(f"⚠️ Stage cache unavailable ({e}); running without it")
+        return None
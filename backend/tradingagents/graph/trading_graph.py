@@ -1,10 +1,10 @@
 # TradingAgents/graph/trading_graph.py
 
-import os, requests, asyncio
+import os, requests, asyncio, copy, time, functools
 from pathlib import Path
 import json
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, Optional, Iterable, Callable
 from rich.console import Console
 
 console = Console()
@@ -25,7 +25,7 @@ from tradingagents.agents.utils.agent_states import (
     InvestDebateState,
     RiskDebateState,
 )
-from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.config import set_config, config_scope, in_config_scope
 
 # Import the new abstract tool methods from agent_utils
 from tradingagents.agents.utils.agent_utils import (
@@ -44,9 +44,16 @@ from tradingagents.agents.utils.agent_utils import (
 
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
-from .propagation import Propagator
+from .propagation import Propagator, StateAccumulator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .checkpointing import describe_checkpoint
+from .stage_cache import open_stage_cache
+from tradingagents.utils.llm_cache import open_llm_cache, llm_node
+from tradingagents.utils.fake_llm import create_fake_llm
+from tradingagents.utils.rate_limiter import get_rate_limiter
+from tradingagents.utils.single_flight import enable_single_flight
+from tradingagents.utils.telemetry import install_retry_hooks, telemetry_handler
 
 def sent_to_telegram(message: str):
     """Send a message to Telegram if configured."""
@@ -89,6 +96,82 @@ def sent_to_telegram(message: str):
         console.print("[yellow]Telegram not configured. Skipping sending report.[/yellow]")
 
 
+MEMORY_NAMES = (
+    "bull_memory",
+    "bear_memory",
+    "trader_memory",
+    "invest_judge_memory",
+    "risk_manager_memory",
+)
+
+# Latency tiers (config["analysis_mode"] / AnalysisRequest.mode):
+#   quick    - analysts + one Quick Decision node; no debates, summaries or translation
+#   standard - the full pipeline
+#   deep     - the full pipeline with config["deep_extra_rounds"] more debate rounds
+ANALYSIS_MODES = ("quick", "standard", "deep")
+
+
+def _run_in_config_scope(method):
+    """Run an async TradingAgentsGraph method with the graph's own config in effect (config_scope)."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        with config_scope(self.config):
+            return await method(self, *args, **kwargs)
+    return wrapper
+
+
+def create_llms(config: Dict[str, Any]) -> Tuple[Any, Any]:
+    """(deep_thinking_llm, quick_thinking_llm) for config["llm_provider"]."""
+    provider = config["llm_provider"].lower()
+    if provider in ("openai", "ollama", "openrouter"):
+        deep_thinking_llm = ChatOpenAI(model=config["deep_think_llm"], base_url=config["backend_url"])
+        quick_thinking_llm = ChatOpenAI(model=config["quick_think_llm"], base_url=config["backend_url"])
+    elif provider == "anthropic":
+        deep_thinking_llm = ChatAnthropic(model=config["deep_think_llm"], base_url=config["backend_url"])
+        quick_thinking_llm = ChatAnthropic(model=config["quick_think_llm"], base_url=config["backend_url"])
+    elif provider == "google":
+        deep_thinking_llm = ChatGoogleGenerativeAI(model=config["deep_think_llm"])
+        quick_thinking_llm = ChatGoogleGenerativeAI(model=config["quick_think_llm"])
+    elif provider == "typhoon":
+        deep_thinking_llm = ChatOpenAI(model=config["deep_think_llm"], base_url=config["backend_url"], api_key=config["TYPHOON_API_KEY"])
+        quick_thinking_llm = ChatOpenAI(model=config["quick_think_llm"], base_url=config["backend_url"], api_key=config["TYPHOON_API_KEY"])
+    elif provider == "deepseek":
+        deep_thinking_llm = ChatOpenAI(model=config["deep_think_llm"], base_url=config["backend_url"],  api_key=os.getenv("DEEPSEEK_API_KEY"))
+        quick_thinking_llm = ChatOpenAI(model=config["quick_think_llm"], base_url=config["backend_url"],  api_key=os.getenv("DEEPSEEK_API_KEY"))
+    elif provider == "fake":
+        # Offline stand-in with configurable latency (config["fake_llm"], see utils/fake_llm.py)
+        deep_thinking_llm = create_fake_llm(config["deep_think_llm"], config)
+        quick_thinking_llm = create_fake_llm(config["quick_think_llm"], config)
+    else:
+        raise ValueError(f"Unsupported LLM provider: {config['llm_provider']}")
+
+    # Persistent response cache (see utils/llm_cache.py), shared by both models
+    llm_cache = open_llm_cache(config)
+    if llm_cache is not None:
+        deep_thinking_llm.cache = llm_cache
+        quick_thinking_llm.cache = llm_cache
+
+    # Retries inside the provider SDKs count towards the calling node's telemetry
+    install_retry_hooks()
+
+    # Process-wide RPM/TPM limiter per model; cache hits skip it
+    for llm, model in ((deep_thinking_llm, config["deep_think_llm"]), (quick_thinking_llm, config["quick_think_llm"])):
+        limiter = get_rate_limiter(provider, model, config)
+        if limiter is not None:
+            llm.rate_limiter = limiter
+            llm.callbacks = [*(llm.callbacks or []), limiter.usage_handler()]
+        # Tokens / latency per node for the run in telemetry_scope (see utils/telemetry.py)
+        llm.callbacks = [*(llm.callbacks or []), telemetry_handler]
+        # Identical prompts in flight from concurrent sessions -> one provider call (utils/single_flight.py)
+        enable_single_flight(llm)
+    return deep_thinking_llm, quick_thinking_llm
+
+
+def create_memories(config: Dict[str, Any]) -> Dict[str, FinancialSituationMemory]:
+    """One FinancialSituationMemory per MEMORY_NAMES entry."""
+    return {name: FinancialSituationMemory(name, config) for name in MEMORY_NAMES}
+
+
 class TradingAgentsGraph:
     """Main class that orchestrates the trading agents framework."""
 
@@ -97,6 +180,8 @@ class TradingAgentsGraph:
         selected_analysts=["market", "social", "news", "fundamentals"],
         debug=False,
         config: Dict[str, Any] = None,
+        llms: Optional[Tuple[Any, Any]] = None,
+        memories: Optional[Dict[str, FinancialSituationMemory]] = None,
     ):
         """Initialize the trading agents graph and components.
 
@@ -104,12 +189,20 @@ class TradingAgentsGraph:
             selected_analysts: List of analyst types to include
             debug: Whether to run in debug mode
             config: Configuration dictionary. If None, uses default config
+            llms: Optional (deep_thinking_llm, quick_thinking_llm) to reuse
+                instead of creating new clients (see graph/graph_pool.py)
+            memories: Optional dict of MEMORY_NAMES -> FinancialSituationMemory
+                to reuse instead of creating new ones
         """
         self.debug = debug
         self.config = config or DEFAULT_CONFIG
+        self.selected_analysts = selected_analysts
+        self.checkpointer = None
 
-        # Update the interface's config
-        set_config(self.config)
+        # Update the interface's config (a run inside config_scope, e.g. an API request
+        # building a pooled graph, already has its own and leaves the process-wide one alone)
+        if not in_config_scope():
+            set_config(self.config)
 
         # Create necessary directories
         os.makedirs(
@@ -118,36 +211,31 @@ class TradingAgentsGraph:
         )
 
         # Initialize LLMs
-        if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
-        elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
-        elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
-        elif self.config["llm_provider"].lower() == "typhoon":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], api_key=self.config["TYPHOON_API_KEY"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], api_key=self.config["TYPHOON_API_KEY"])
-        elif self.config["llm_provider"].lower() == "deepseek":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"],  api_key=os.getenv("DEEPSEEK_API_KEY"))
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"],  api_key=os.getenv("DEEPSEEK_API_KEY"))
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
-        
+        self.deep_thinking_llm, self.quick_thinking_llm = llms or create_llms(self.config)
+
         # Initialize memories
-        self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
-        self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
-        self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
-        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
-        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
+        memories = memories or create_memories(self.config)
+        self.bull_memory = memories["bull_memory"]
+        self.bear_memory = memories["bear_memory"]
+        self.trader_memory = memories["trader_memory"]
+        self.invest_judge_memory = memories["invest_judge_memory"]
+        self.risk_manager_memory = memories["risk_manager_memory"]
 
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
 
+        self.analysis_mode = self.config.get("analysis_mode", "standard")
+        if self.analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unsupported analysis mode: {self.analysis_mode} (expected one of {ANALYSIS_MODES})")
+        extra_rounds = self.config.get("deep_extra_rounds", 1) if self.analysis_mode == "deep" else 0
+
         # Initialize components
-        self.conditional_logic = ConditionalLogic()
+        self.conditional_logic = ConditionalLogic(
+            max_debate_rounds=self.config.get("max_debate_rounds", 1) + extra_rounds,
+            max_risk_discuss_rounds=self.config.get("max_risk_discuss_rounds", 1) + extra_rounds,
+            early_stop=self.config.get("debate_early_stop", False),
+        )
+        self.stage_cache = open_stage_cache(self.config)
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -158,6 +246,7 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            stage_cache=self.stage_cache,
         )
 
         self.propagator = Propagator()
@@ -169,8 +258,67 @@ class TradingAgentsGraph:
         self.ticker = None
         self.log_states_dict = {}  # date to full state dict
 
-        # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        # Set up the graph (compiled without a checkpointer; attach_checkpointer binds one)
+        self.compiled_graph = self._compile_graph()
+        self.graph = self.compiled_graph
+
+    def fork(self, config: Dict[str, Any] = None, debug: bool = None):
+        """
+        A per-run view of this graph: shares the LLM clients, memories, tool
+        nodes and compiled graph, but has its own run state and checkpointer.
+        `config` may only differ in keys that do not change the graph (see
+        GraphPool.graph_key). It applies to this fork's runs only (config_scope),
+        never to the process-wide config other forks read.
+        """
+        forked = copy.copy(self)
+        if config is not None:
+            forked.config = config
+        if debug is not None:
+            forked.debug = debug
+        forked.checkpointer = None
+        forked.graph = self.compiled_graph
+        forked.curr_state = None
+        forked.ticker = None
+        forked.log_states_dict = {}
+        return forked
+
+    def _compile_graph(self):
+        return self.graph_setup.setup_graph(
+            self.selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", True),
+            debate_mode=self.config.get("debate_mode", "sequential"),
+            mode=self.analysis_mode,
+        )
+
+    def attach_checkpointer(self, checkpointer):
+        """Save every super-step to `checkpointer` (see
+        graph/checkpointing.open_checkpointer). Pass None to detach.
+        Binds the checkpointer to a copy of the compiled graph, so the nodes
+        are not rebuilt and a shared compiled graph is left untouched."""
+        self.checkpointer = checkpointer
+        if checkpointer is None:
+            self.graph = self.compiled_graph
+        else:
+            self.graph = self.compiled_graph.copy(update={"checkpointer": checkpointer})
+
+    async def get_checkpoint(self, thread_id: str):
+        """Latest StateSnapshot for a thread, or None if nothing was saved."""
+        if self.checkpointer is None or not thread_id:
+            return None
+        snapshot = await self.graph.aget_state({"configurable": {"thread_id": thread_id}})
+        if not snapshot or not snapshot.values:
+            return None
+        return snapshot
+
+    async def get_resume_point(self, thread_id: str):
+        """
+        Describe where a previous run on `thread_id` stopped, or None if there
+        is nothing to resume (no checkpoint, or the run already reached END).
+        """
+        snapshot = await self.get_checkpoint(thread_id)
+        if snapshot is None or not snapshot.next:
+            return None
+        return describe_checkpoint(snapshot)
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources using abstract methods."""
@@ -210,34 +358,58 @@ class TradingAgentsGraph:
             ),
         }
 
-    async def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    @_run_in_config_scope
+    async def _run_graph(self, company_name, trade_date, thread_id=None, resume=False, prefetched_data=None):
+        """Run the graph alone (no summaries / output files) and return the final state.
 
+        prefetched_data: vendor data fetched ahead of the run; the Data Prefetch
+        node then skips its own fetch.
+        """
         self.ticker = company_name
 
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
-        args = self.propagator.get_graph_args()
+        if prefetched_data is not None:
+            init_agent_state["prefetched_data"] = prefetched_data
+        args = self.propagator.get_graph_args(thread_id=thread_id)
+
+        state = StateAccumulator(init_agent_state)
+        if resume and await self.get_resume_point(thread_id):
+            # None input tells LangGraph to continue from the saved checkpoint
+            print(f"⏯️ Resuming {thread_id} from checkpoint")
+            state = StateAccumulator((await self.get_checkpoint(thread_id)).values)
+            init_agent_state = None
 
         if self.debug:
-            # Debug mode with tracing
-            trace = []
+            # Debug mode with tracing: print each node's new messages as it finishes
             async for chunk in self.graph.astream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
+                changed = state.apply(chunk)
+                if changed.get("messages"):
+                    changed["messages"][-1].pretty_print()
 
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = await self.graph.ainvoke(init_agent_state, **args)
+            return state.state
+        # Standard mode without tracing
+        return await self.graph.ainvoke(init_agent_state, config=args["config"])
+
+    @_run_in_config_scope
+    async def propagate(self, company_name, trade_date, thread_id=None, resume=False):
+        """Run the trading agents graph for a company on a specific date.
+
+        With a checkpointer attached, `thread_id` saves progress after every
+        node; `resume=True` continues an interrupted thread from its last
+        completed node instead of starting over.
+        """
+        final_state = await self._run_graph(company_name, trade_date, thread_id=thread_id, resume=resume)
 
         # Store current state for reflection
         self.curr_state = final_state
+
+        if self.analysis_mode == "quick":
+            # ⚡ Quick screen: the decision is all that was asked for, no Typhoon summaries
+            self._log_state(trade_date, final_state)
+            return final_state, await self.aprocess_signal(final_state["final_trade_decision"])
         
         print("📝 Summarizing Reports with Typhoon...")
         try:
@@ -509,7 +681,103 @@ class TradingAgentsGraph:
         self._log_state(trade_date, final_state)
 
         # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        return final_state, await self.aprocess_signal(final_state["final_trade_decision"])
+
+    async def propagate_many(
+        self,
+        pairs: Iterable[Tuple[str, str]],
+        max_concurrency: int = 4,
+        prefetch_concurrency: Optional[int] = None,
+        output_path: Optional[str] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Dict[str, Any]:
+        """Analyse many (ticker, trade_date) pairs, e.g. a nightly watchlist sweep.
+
+        Every run is a fork() of this graph, so LLM clients, memories, the
+        compiled graph and the vendor caches are shared. Vendor data is
+        prefetched ahead of the LLM stages (up to `prefetch_concurrency`
+        pairs at a time, identical fetches shared between pairs) while at most
+        `max_concurrency` graphs run. Each finished run is appended to
+        `output_path` (JSONL) and passed to `on_result` (sync or async, e.g. to
+        store it in the database); failures there are counted in the report's
+        `sink_errors`. The Typhoon summaries and output/ files of propagate()
+        are skipped.
+
+        Returns a throughput report.
+        """
+        pairs = [(str(ticker), str(trade_date)) for ticker, trade_date in pairs]
+        prefetch_concurrency = prefetch_concurrency or max_concurrency * 2
+        llm_slots = asyncio.Semaphore(max_concurrency)
+        prefetch_slots = asyncio.Semaphore(prefetch_concurrency)
+        shared_fetches: Dict = {}
+        report = {"runs": len(pairs), "succeeded": 0, "failed": 0, "sink_errors": 0, "run_seconds": []}
+
+        if output_path:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        async def prefetch(ticker, trade_date):
+            async with prefetch_slots:
+                return await prefetch_data(self.selected_analysts, ticker, trade_date, shared=shared_fetches)
+
+        async def run_one(ticker, trade_date):
+            queued = time.perf_counter()
+            result = {"ticker": ticker, "trade_date": trade_date}
+            try:
+                prefetched = await prefetch(ticker, trade_date)
+                async with llm_slots:
+                    started = time.perf_counter()
+                    run = self.fork()
+                    final_state = await run._run_graph(ticker, trade_date, prefetched_data=prefetched)
+                    run._log_state(trade_date, final_state)
+                    decision = await run.aprocess_signal(final_state["final_trade_decision"])
+                result.update(
+                    status="success",
+                    decision=decision,
+                    final_trade_decision=final_state.get("final_trade_decision"),
+                    investment_plan=final_state.get("investment_plan"),
+                    trader_investment_plan=final_state.get("trader_investment_plan"),
+                    prefetch_errors=prefetched.get("errors", {}),
+                    run_seconds=round(time.perf_counter() - started, 2),
+                )
+                report["succeeded"] += 1
+                report["run_seconds"].append(result["run_seconds"])
+            except Exception as e:
+                result.update(status="error", error=str(e))
+                report["failed"] += 1
+                print(f"❌ Batch run {ticker} {trade_date} failed: {e}")
+            result["total_seconds"] = round(time.perf_counter() - queued, 2)
+
+            # A failing sink (disk full, database down) is counted, not raised: it must not
+            # abort the batch report while the other runs carry on unobserved
+            try:
+                if output_path:
+                    with open(output_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+                if on_result is not None:
+                    outcome = on_result(result)
+                    if asyncio.iscoroutine(outcome):
+                        await outcome
+            except Exception as e:
+                report["sink_errors"] += 1
+                print(f"⚠️ Batch result sink failed for {ticker} {trade_date}: {e}")
+            print(f"✅ Batch {report['succeeded'] + report['failed']}/{len(pairs)}: {ticker} {trade_date} -> {result.get('decision', result['status'])}")
+            return result
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run_one(ticker, trade_date) for ticker, trade_date in pairs))
+        wall = time.perf_counter() - start
+
+        run_seconds = report.pop("run_seconds")
+        report.update(
+            wall_seconds=round(wall, 2),
+            runs_per_hour=round(len(pairs) / wall * 3600, 1) if wall > 0 else None,
+            mean_run_seconds=round(sum(run_seconds) / len(run_seconds), 2) if run_seconds else None,
+            # >1 means runs overlapped; ~max_concurrency means the pool was kept busy
+            concurrency_achieved=round(sum(run_seconds) / wall, 2) if wall > 0 else None,
+            shared_fetches=len(shared_fetches),
+        )
+        print(f"📊 Batch done: {report}")
+        return report
 
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
@@ -553,24 +821,38 @@ class TradingAgentsGraph:
         ) as f:
             json.dump(self.log_states_dict, f, indent=4)
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
-        )
+    def reflect_and_remember(self, returns_losses, state=None):
+        """Reflect on decisions and update memory based on returns.
+
+        state: final state of the run being reflected on (defaults to the
+        last propagate() run); the backtest passes older runs' states once
+        their returns are realized.
+        """
+        state = state if state is not None else self.curr_state
+        with llm_node("Reflection"):
+            self.reflector.reflect_bull_researcher(
+                state, returns_losses, self.bull_memory
+            )
+            self.reflector.reflect_bear_researcher(
+                state, returns_losses, self.bear_memory
+            )
+            self.reflector.reflect_trader(
+                state, returns_losses, self.trader_memory
+            )
+            self.reflector.reflect_invest_judge(
+                state, returns_losses, self.invest_judge_memory
+            )
+            self.reflector.reflect_risk_manager(
+                state, returns_losses, self.risk_manager_memory
+            )
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
-        return self.signal_processor.process_signal(full_signal)
\ No newline at end of file
+        with llm_node("Signal Processing"):
+            return self.signal_processor.process_signal(full_signal)
+
+    @_run_in_config_scope
+    async def aprocess_signal(self, full_signal):
+        """Process a signal without blocking the event loop."""
+        with llm_node("Signal Processing"):
+            return await self.signal_processor.aprocess_signal(full_signal)
@@ -0,0 +1,308 @@
+"""
+Offline fake LLM provider (llm_provider = "fake") for load-testing the
+orchestration, streaming and persistence paths without any real service.
+
+FakeChatModel answers like the real agents' models would:
+- prompts carrying a JsonOutputParser schema (every analyst, the trader, the
+  risk manager) get a JSON instance valid for that Pydantic model
+- the signal extraction prompt gets BUY / SELL / HOLD
+- everything else (researchers, debators, managers, reflection) gets prose
+  that starts with a verdict
+
+Latency follows config["fake_llm"]: a log-normal time to first token and a
+normal tokens-per-second rate, both drawn per call from an RNG seeded with the
+prompt, so a run is reproducible and concurrent calls do not disturb each
+other. `time_scale` shrinks every delay (0 = no sleeping at all).
+
+The Typhoon summarizers and the translation service reach the same model
+through `fake_transport()`, an httpx transport that speaks the OpenAI chat
+completions API (see utils/http_clients.py).
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, convert_to_messages
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+DEFAULT_FAKE_LLM = {
+    "seed": 42,
+    "ttft_ms": [400.0, 150.0],  # mean, standard deviation (log-normal)
+    "tokens_per_second": [60.0, 15.0],  # mean, standard deviation (normal, at least 1)
+    "prose_tokens": [150, 400],  # reply length range for free-text prompts
+    "time_scale": 1.0,
+}
+
+_SCHEMA_RE = re.compile(r"Here is the output schema[^\n]*\n```\n(.*?)\n```", re.DOTALL)
+_SIGNAL_PROMPT = "extract the investment decision"
+# Debators asked for a stance line (agents/utils/debate_stance.py)
+_STANCE_PROMPT = "STANCE: <BUY, SELL or HOLD>"
+_VERDICTS = ("BUY", "SELL", "HOLD")
+_WORDS = (
+    "momentum", "support", "resistance", "volume", "earnings", "guidance", "margin", "valuation",
+    "catalyst", "sentiment", "breakout", "pullback", "liquidity", "revenue", "outlook", "risk",
+    "trend", "volatility", "demand", "inflation", "rates", "sector", "growth", "downside",
+    "upside", "consolidation", "buyers", "sellers", "position", "exposure", "signal", "range",
+)
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // _CHARS_PER_TOKEN)
+
+
+def _prose(rng: random.Random, tokens: int, verdict: str) -> str:
+    sentences = [f"{verdict}."]
+    words = 1
+    while words * 1.3 < tokens:
+        n = rng.randint(8, 18)
+        sentence = " ".join(rng.choice(_WORDS) for _ in range(n))
+        sentences.append(sentence[0].upper() + sentence[1:] + ".")
+        words += n
+    return " ".join(sentences)
+
+
+def _string(rng: random.Random, name: str, schema: Dict[str, Any]) -> str:
+    description = schema.get("description", "")
+    # "BUY / SELL / HOLD", "Bullish/Bearish": pick one of the listed options
+    options = [o.strip() for o in re.split(r"\s*/\s*", description.rstrip(".")) if o.strip()]
+    if len(options) > 1 and all(len(o.split()) <= 3 for o in options):
+        return rng.choice(options)
+    if "date" in name:
+        return f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 24))).capitalize() + "."
+
+
+def schema_instance(schema: Dict[str, Any], rng: random.Random, defs: Optional[Dict[str, Any]] = None, name: str = "") -> Any:
+    """A random instance that validates against a (Pydantic-generated) JSON schema."""
+    defs = schema.get("$defs", defs or {})
+    if "$ref" in schema:
+        return schema_instance(defs[schema["$ref"].rsplit("/", 1)[-1]], rng, defs, name)
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return schema_instance(options[0], rng, defs, name)
+    if "allOf" in schema:
+        return schema_instance(schema["allOf"][0], rng, defs, name)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "string")
+    if kind == "object":
+        return {
+            key: schema_instance(prop, rng, defs, key)
+            for key, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        low = schema.get("minItems", 1)
+        count = rng.randint(low, max(low, min(schema.get("maxItems", 3), 3)))
+        return [schema_instance(schema.get("items", {}), rng, defs, name) for _ in range(count)]
+    if kind == "integer":
+        return rng.randint(int(schema.get("minimum", 0)), int(schema.get("maximum", 100)))
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0.0), schema.get("maximum", 100.0)), 2)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return _string(rng, name, schema)
+
+
+def _message_text(messages: List[BaseMessage]) -> str:
+    parts = []
+    for message in messages:
+        content = message.content
+        if isinstance(content, list):
+            content = " ".join(c.get("text", "") if isinstance(c, dict) else str(c) for c in content)
+        parts.append(str(content))
+    return "\n".join(parts)
+
+
+def _chunks(text: str, size: int = 4 * _CHARS_PER_TOKEN) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic chat model with realistic output shapes and latency (see module docstring)."""
+
+    model: str = "fake"
+    seed: int = 42
+    ttft_ms: Tuple[float, float] = (400.0, 150.0)
+    tokens_per_second: Tuple[float, float] = (60.0, 15.0)
+    prose_tokens: Tuple[int, int] = (150, 400)
+    time_scale: float = 1.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "seed": self.seed}
+
+    def plan(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        """The reply to `messages` and how long it takes: text, ttft (s), seconds per token, usage."""
+        prompt = _message_text(messages)
+        digest = hashlib.sha256(f"{self.seed}:{self.model}:{prompt}".encode()).hexdigest()
+        rng = random.Random(digest)
+
+        schema_match = _SCHEMA_RE.search(prompt)
+        if schema_match:
+            text = json.dumps(schema_instance(json.loads(schema_match.group(1)), rng), ensure_ascii=False)
+        elif _SIGNAL_PROMPT in prompt:
+            text = rng.choice(_VERDICTS)
+        else:
+            text = _prose(rng, rng.randint(*self.prose_tokens), rng.choice(_VERDICTS))
+            if _STANCE_PROMPT in prompt:
+                # A debator keeps its position from round to round (seeded by its role prompt)
+                role = _message_text(messages[:1])
+                role_rng = random.Random(f"{self.seed}:{self.model}:{role}")
+                text += f"\nSTANCE: {role_rng.choice(_VERDICTS)} CONFIDENCE: {role_rng.randint(2, 5)}"
+
+        # Log-normal time to first token with the configured mean / standard deviation
+        mean, sd = self.ttft_ms
+        sigma2 = math.log(1 + (sd / mean) ** 2) if mean > 0 else 0.0
+        ttft = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2)) if mean > 0 else 0.0
+        rate = max(1.0, rng.gauss(*self.tokens_per_second))
+        usage = {
+            "input_tokens": estimate_tokens(prompt),
+            "output_tokens": estimate_tokens(text),
+        }
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        return {
+            "text": text,
+            "ttft": ttft / 1000 * self.time_scale,
+            "per_token": self.time_scale / rate,
+            "usage": usage,
+        }
+
+    def _result(self, plan: Dict[str, Any]) -> ChatResult:
+        message = AIMessage(
+            content=plan["text"],
+            usage_metadata=plan["usage"],
+            response_metadata={"model_name": self.model, "finish_reason": "stop"},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        plan = self.plan(messages)
+        time.sleep(plan["ttft"] + plan["per_token"] * plan["usage"]["output_tokens"])
+        return self._result(plan)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        plan = self.plan(messages)
+        await asyncio.sleep(plan["ttft"] + plan["per_token"] * plan["usage"]["output_tokens"])
+        return self._result(plan)
+
+    def _stream_chunks(self, plan: Dict[str, Any]) -> Iterator[Tuple[float, ChatGenerationChunk]]:
+        pieces = _chunks(plan["text"])
+        for i, piece in enumerate(pieces):
+            delay = (plan["ttft"] if i == 0 else 0.0) + plan["per_token"] * estimate_tokens(piece)
+            last = i == len(pieces) - 1
+            message = AIMessageChunk(
+                content=piece,
+                usage_metadata=plan["usage"] if last else None,
+                response_metadata={"model_name": self.model, "finish_reason": "stop"} if last else {},
+            )
+            yield delay, ChatGenerationChunk(message=message)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        for delay, chunk in self._stream_chunks(self.plan(messages)):
+            time.sleep(delay)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        for delay, chunk in self._stream_chunks(self.plan(messages)):
+            await asyncio.sleep(delay)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def fake_llm_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    settings = {**DEFAULT_FAKE_LLM, **(config.get("fake_llm") or {})}
+    return {
+        "seed": int(settings["seed"]),
+        "ttft_ms": tuple(settings["ttft_ms"]),
+        "tokens_per_second": tuple(settings["tokens_per_second"]),
+        "prose_tokens": tuple(settings["prose_tokens"]),
+        "time_scale": float(settings["time_scale"]),
+    }
+
+
+def create_fake_llm(model: str, config: Dict[str, Any]) -> FakeChatModel:
+    return FakeChatModel(model=model, **fake_llm_settings(config))
+
+
+def fake_transport(config: Optional[Dict[str, Any]] = None) -> httpx.MockTransport:
+    """
+    httpx transport answering OpenAI-style /chat/completions with FakeChatModel
+    (Typhoon stand-in). Without `config` the current global config is read per request.
+    """
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/chat/completions"):
+            return httpx.Response(404, json={"error": {"message": f"fake provider: no {request.url.path}"}})
+        if config is None:
+            from tradingagents.dataflows.config import get_config
+
+            settings = get_config()
+        else:
+            settings = config
+        body = json.loads(request.content or b"{}")
+        model = create_fake_llm(body.get("model", "fake"), settings)
+        plan = model.plan(convert_to_messages([(m["role"], m["content"]) for m in body.get("messages", [])]))
+        await asyncio.sleep(plan["ttft"] + plan["per_token"] * plan["usage"]["output_tokens"])
+        return httpx.Response(200, json={
+            "id": f"fake-{hashlib.sha256(plan['text'].encode()).hexdigest()[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model.model,
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": plan["text"]},
+            }],
+            "usage": {
+                "prompt_tokens": plan["usage"]["input_tokens"],
+                "completion_tokens": plan["usage"]["output_tokens"],
+                "total_tokens": plan["usage"]["total_tokens"],
+            },
+        })
+
+    return httpx.MockTransport(handle)
@@ -0,0 +1,197 @@
+"""
+Shared, pooled async HTTP clients per provider base URL.
+
+The Typhoon summarizers and the translation service used to open their own
+connections (one AsyncOpenAI per summarizer module, one httpx.AsyncClient per
+translated string), so most calls paid a fresh TCP + TLS handshake. Here each
+base URL gets one httpx.AsyncClient with keep-alive, HTTP/2 (when `h2` is
+installed) and the limits from config["http_pool"]; `openai_client()` wraps
+the same pool in an AsyncOpenAI.
+
+Clients belong to the event loop that created them (a pooled connection
+cannot move between loops), so a script calling asyncio.run() twice gets a
+new pool per loop; the clients of a loop that has since closed are dropped on
+the next lookup. The API opens them at startup (`open_http_clients`) and
+closes them at shutdown (`close_http_clients`).
+
+With llm_provider "fake" the clients answer from utils/fake_llm.py instead
+of the network, so the summarizers and translation run offline too.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+TYPHOON_BASE_URL = "https://api.opentyphoon.ai/v1"
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Keyed by the loop itself (not id(loop): a new loop can reuse a closed one's id)
+_clients: Dict[Tuple[str, Optional[asyncio.AbstractEventLoop], bool], httpx.AsyncClient] = {}
+_openai_clients: Dict[Tuple[str, str, Optional[asyncio.AbstractEventLoop], bool], Any] = {}
+_lock = threading.Lock()
+
+
+class _PoolStats:
+    """New connections and the time spent opening them, from httpcore's trace events."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.connect_ms = 0.0
+        self.tls_ms = 0.0
+
+    async def on_request(self, request: httpx.Request):
+        self.requests += 1
+        started: Dict[str, float] = {}
+
+        async def trace(event: str, info: Dict[str, Any]):
+            name, _, phase = event.rpartition(".")
+            if phase == "started":
+                started[name] = time.perf_counter()
+            elif phase == "complete" and name in started:
+                elapsed = (time.perf_counter() - started.pop(name)) * 1000
+                if name == "connection.connect_tcp":
+                    self.connections += 1
+                    self.connect_ms += elapsed
+                elif name == "connection.start_tls":
+                    self.tls_ms += elapsed
+
+        # Only requests that open a connection emit the connect/TLS events
+        request.extensions["trace"] = trace
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections,
+            "handshake_ms": round(self.connect_ms + self.tls_ms, 1),
+        }
+
+
+_stats: Dict[str, _PoolStats] = {}
+
+
+def _config(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    if config is None:
+        from tradingagents.dataflows.config import get_config
+
+        config = get_config()
+    return config
+
+
+def _pool_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return _config(config).get("http_pool") or {}
+
+
+def _is_fake(config: Optional[Dict[str, Any]] = None) -> bool:
+    return (_config(config).get("llm_provider") or "").lower() == "fake"
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _drop_closed_loops():
+    """Forget the clients of loops that have closed (caller holds _lock)."""
+    for registry in (_clients, _openai_clients):
+        for key in [k for k in registry if k[-2] is not None and k[-2].is_closed()]:
+            # Its loop is gone, so aclose() can no longer run; the sockets go with the client
+            del registry[key]
+
+
+def new_http_client(base_url: str = "", config: Optional[Dict[str, Any]] = None, **kwargs) -> httpx.AsyncClient:
+    """A pooled httpx.AsyncClient with the configured limits (not registered; caller closes it)."""
+    pool = _pool_config(config)
+    return httpx.AsyncClient(
+        base_url=base_url,
+        http2=HTTP2_AVAILABLE and pool.get("http2", True),
+        limits=httpx.Limits(
+            max_connections=pool.get("max_connections", 20),
+            max_keepalive_connections=pool.get("max_keepalive_connections", 10),
+            keepalive_expiry=pool.get("keepalive_expiry", 60.0),
+        ),
+        timeout=httpx.Timeout(pool.get("timeout", 120.0), connect=pool.get("connect_timeout", 10.0)),
+        **kwargs,
+    )
+
+
+def http_client(base_url: str = TYPHOON_BASE_URL, config: Optional[Dict[str, Any]] = None) -> httpx.AsyncClient:
+    """The shared client for `base_url` on the running event loop."""
+    base_url = base_url.rstrip("/")
+    fake = _is_fake(config)
+    key = (base_url, _running_loop(), fake)
+    with _lock:
+        _drop_closed_loops()
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            stats = _stats.setdefault(base_url, _PoolStats())
+            extra = {}
+            if fake:
+                from .fake_llm import fake_transport
+
+                extra["transport"] = fake_transport(config)
+            client = new_http_client(base_url, config, event_hooks={"request": [stats.on_request]}, **extra)
+            _clients[key] = client
+        return client
+
+
+def openai_client(
+    base_url: str = TYPHOON_BASE_URL,
+    api_key_env: str = "TYPHOON_API_KEY",
+    config: Optional[Dict[str, Any]] = None,
+):
+    """AsyncOpenAI on top of the shared pool for `base_url` (Typhoon by default)."""
+    from openai import AsyncOpenAI
+
+    base_url = base_url.rstrip("/")
+    http = http_client(base_url, config)
+    fake = _is_fake(config)
+    key = (base_url, api_key_env, _running_loop(), fake)
+    api_key = os.getenv(api_key_env) or ("fake" if fake else None)
+    with _lock:
+        cached = _openai_clients.get(key)
+        if cached is None or cached[1] is not http:
+            cached = (AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http), http)
+            _openai_clients[key] = cached
+        return cached[0]
+
+
+def typhoon_client():
+    """Shared AsyncOpenAI for the Typhoon summarizers."""
+    return openai_client(TYPHOON_BASE_URL, "TYPHOON_API_KEY")
+
+
+async def open_http_clients(config: Optional[Dict[str, Any]] = None, base_urls=(TYPHOON_BASE_URL,)):
+    """Create the shared clients on the app's event loop (API startup)."""
+    for base_url in base_urls:
+        http_client(base_url, config)
+    print(f"🔌 Shared HTTP clients ready (HTTP/2 {'on' if HTTP2_AVAILABLE else 'off: h2 not installed'})")
+
+
+async def close_http_clients():
+    """Close the shared clients of the running loop and forget those of every other loop (API shutdown)."""
+    loop = _running_loop()
+    with _lock:
+        # Another loop's client can only be closed on that loop; dropping it releases its sockets
+        clients = [client for (_, client_loop, _), client in _clients.items() if client_loop in (loop, None)]
+        _clients.clear()
+        _openai_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            print(f"⚠️ Failed to close HTTP client {client.base_url}: {e}")
+
+
+def http_client_stats() -> Dict[str, Dict[str, Any]]:
+    return {base_url: stats.to_dict() for base_url, stats in _stats.items()}
@@ -0,0 +1,391 @@
+"""
+Persistent LLM response cache.
+
+One store (SQLite file or a directory of JSON files) in front of every LLM
+call: the graph's chat models use it as their LangChain cache (`llm.cache`),
+and the Typhoon summarizers go through `cached_chat_completion`. Entries are
+keyed by provider/model/parameters + the messages (message ids excluded), so
+replaying, resuming or backtesting a run does not pay for the same call twice.
+Entries older than `llm_cache_max_age_hours` are not served, and expired
+entries plus the oldest beyond `llm_cache_max_entries` are pruned.
+
+Modes:
+    read_through - serve stored responses, call and store on a miss
+    record_only  - always call, store every response (refresh the cache)
+    off          - no cache
+"""
+import asyncio
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from .rate_limiter import rate_limit_llm_call
+from .single_flight import enabled as single_flight_enabled, single_flight
+from .telemetry import record_llm_call, record_node_time
+
+MODES = ("read_through", "record_only", "off")
+
+# Graph node making the current call, for the per-node hit/miss counters
+_current_node: contextvars.ContextVar = contextvars.ContextVar("llm_cache_node", default=None)
+
+
+@contextmanager
+def llm_node(name: str):
+    """Attribute LLM calls made inside this block to node `name`."""
+    token = _current_node.set(name)
+    try:
+        yield
+    finally:
+        _current_node.reset(token)
+
+
+def current_llm_node() -> Optional[str]:
+    return _current_node.get()
+
+
+def track_node(name: str, node):
+    """
+    Wrap a graph node so its LLM calls are counted (and its wall time recorded) under `name`.
+
+    The wrapper keeps the node's signature (functools.wraps), so LangGraph still
+    passes `config` to nodes that take it; it is forwarded with **kwargs.
+    """
+    if asyncio.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def tracked_async_node(state, **kwargs):
+            start = time.perf_counter()
+            try:
+                with llm_node(name):
+                    return await node(state, **kwargs)
+            finally:
+                record_node_time(name, (time.perf_counter() - start) * 1000)
+
+        return tracked_async_node
+
+    @functools.wraps(node)
+    def tracked_node(state, **kwargs):
+        start = time.perf_counter()
+        try:
+            with llm_node(name):
+                return node(state, **kwargs)
+        finally:
+            record_node_time(name, (time.perf_counter() - start) * 1000)
+
+    return tracked_node
+
+
+def _strip_message_ids(obj):
+    # Message ids are random per run (uuid / lc_run-...), so they stay out of the key
+    if isinstance(obj, dict):
+        out = {}
+        for k, v in obj.items():
+            if k == "kwargs" and isinstance(v, dict):
+                v = {kk: vv for kk, vv in v.items() if kk != "id"}
+            out[k] = _strip_message_ids(v)
+        return out
+    if isinstance(obj, list):
+        return [_strip_message_ids(v) for v in obj]
+    return obj
+
+
+def normalize_prompt(prompt: str) -> str:
+    """LangChain's serialized prompt without message ids."""
+    try:
+        return json.dumps(_strip_message_ids(json.loads(prompt)), sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return prompt
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class _Store:
+    """
+    Expiry shared by both backends: entries older than `max_age_hours` are not
+    served; expired entries and the oldest ones beyond `max_entries` are deleted
+    on open and every PRUNE_EVERY writes (same policy as the stage cache).
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, max_age_hours: Optional[float], max_entries: Optional[int]):
+        self.max_age_hours = max_age_hours
+        self.max_entries = max_entries
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    def _cutoff(self) -> float:
+        return time.time() - self.max_age_hours * 3600 if self.max_age_hours is not None else float("-inf")
+
+    def _written(self):
+        with self._writes_lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        raise NotImplementedError
+
+
+class _SqliteStore(_Store):
+    def __init__(self, path: str, max_age_hours: Optional[float] = None, max_entries: Optional[int] = None):
+        super().__init__(max_age_hours, max_entries)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, created_at REAL, payload TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_created_at ON llm_cache (created_at)")
+        self._conn.commit()
+        self.prune()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM llm_cache WHERE key = ? AND created_at >= ?", (key, self._cutoff())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, payload: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, created_at, payload) VALUES (?, ?, ?)",
+                (key, time.time(), payload),
+            )
+            self._conn.commit()
+        self._written()
+
+    def prune(self) -> int:
+        """Delete expired entries and the oldest beyond max_entries; returns how many went."""
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (self._cutoff(),)).rowcount
+            if self.max_entries is not None:
+                deleted += self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key NOT IN "
+                    "(SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+class _DiskStore(_Store):
+    """One JSON file per entry, sharded by the first two hex digits of the key; the file's mtime is its age."""
+
+    def __init__(self, path: str, max_age_hours: Optional[float] = None, max_entries: Optional[int] = None):
+        super().__init__(max_age_hours, max_entries)
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.prune()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as f:
+                if os.fstat(f.fileno()).st_mtime < self._cutoff():
+                    return None
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, payload: str):
+        file = self._file(key)
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        tmp = f"{file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, file)  # readers never see a half-written entry
+        self._written()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if name.endswith(".json"):
+                    yield os.path.join(root, name)
+
+    def prune(self) -> int:
+        """Delete expired entries and the oldest beyond max_entries; returns how many went."""
+        entries = []
+        for file in self._entries():
+            try:
+                entries.append((os.path.getmtime(file), file))
+            except FileNotFoundError:
+                pass  # removed by another process
+        cutoff = self._cutoff()
+        entries.sort(reverse=True)
+        keep = self.max_entries if self.max_entries is not None else len(entries)
+        deleted = 0
+        for i, (mtime, file) in enumerate(entries):
+            if mtime < cutoff or i >= keep:
+                try:
+                    os.remove(file)
+                    deleted += 1
+                except FileNotFoundError:
+                    pass
+        return deleted
+
+    def clear(self):
+        for file in list(self._entries()):
+            os.remove(file)
+
+
+class LLMResponseCache(BaseCache):
+    """LangChain cache (set as `llm.cache`) with raw helpers for non-LangChain clients."""
+
+    def __init__(
+        self,
+        path: str,
+        backend: str = "sqlite",
+        mode: str = "read_through",
+        max_age_hours: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode} (expected one of {MODES})")
+        self.mode = mode
+        self.backend = backend
+        store = _DiskStore if backend == "disk" else _SqliteStore
+        self._store = store(path, max_age_hours=max_age_hours, max_entries=max_entries)
+        self._stats_lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def _count(self, hit: bool):
+        node = _current_node.get() or "unknown"
+        with self._stats_lock:
+            counter = self.hits if hit else self.misses
+            counter[node] = counter.get(node, 0) + 1
+
+    def get_raw(self, key: str) -> Optional[str]:
+        payload = self._store.get(key) if self.mode == "read_through" else None
+        self._count(payload is not None)
+        return payload
+
+    def put_raw(self, key: str, payload: str):
+        self._store.put(key, payload)
+
+    # --- LangChain BaseCache ---
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        payload = self.get_raw(_digest(normalize_prompt(prompt), llm_string))
+        return loads(payload, allowed_objects="core") if payload is not None else None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        self.put_raw(_digest(normalize_prompt(prompt), llm_string), dumps(list(return_val)))
+
+    # Local IO is fast; staying on the calling task keeps the node context for the counters
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        return self.lookup(prompt, llm_string)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        self.update(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self._store.clear()
+
+    def prune(self) -> int:
+        """Delete expired entries and the oldest beyond max_entries."""
+        return self._store.prune()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._stats_lock:
+            return {"mode": self.mode, "hits": dict(self.hits), "misses": dict(self.misses)}
+
+
+_CACHES: Dict[tuple, LLMResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def open_llm_cache(config: Dict[str, Any]) -> Optional[LLMResponseCache]:
+    """Process-wide LLMResponseCache for config["llm_cache"], or None when off."""
+    mode = config.get("llm_cache") or "off"
+    if mode == "off":
+        return None
+    backend = config.get("llm_cache_backend", "sqlite")
+    default_name = "llm_cache" if backend == "disk" else "llm_cache.sqlite"
+    path = config.get("llm_cache_path") or os.path.join(config["data_cache_dir"], default_name)
+    max_age_hours = config.get("llm_cache_max_age_hours", 720)
+    max_entries = config.get("llm_cache_max_entries", 50_000)
+    key = (backend, os.path.abspath(path), mode, max_age_hours, max_entries)
+    with _CACHES_LOCK:
+        if key not in _CACHES:
+            try:
+                _CACHES[key] = LLMResponseCache(
+                    path, backend=backend, mode=mode, max_age_hours=max_age_hours, max_entries=max_entries
+                )
+            except (sqlite3.Error, OSError, ValueError) as e:
+                print(f"⚠️ LLM cache unavailable ({e}); calling the models directly")
+                return None
+        return _CACHES[key]
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """LLMResponseCache for the active config (see dataflows.config.set_config)."""
+    from tradingagents.dataflows.config import get_config
+
+    return open_llm_cache(get_config())
+
+
+_SUMMARY_CALLS = single_flight("openai_compatible")
+
+
+async def cached_chat_completion(client, node: str, provider: str = "typhoon", **kwargs):
+    """`await client.chat.completions.create(**kwargs)` through single-flight, the LLM cache and the rate limiter."""
+    create = rate_limit_llm_call(provider)(client.chat.completions.create)
+    cache = get_llm_cache()
+    start = time.perf_counter()
+
+    def record(response, cached=False):
+        usage = getattr(response, "usage", None)
+        record_llm_call(
+            node,
+            kwargs.get("model"),
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) if usage and not cached else 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) if usage and not cached else 0,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            cached=cached,
+        )
+        return response
+
+    async def fetch():
+        if cache is None:
+            return await create(**kwargs), False
+        with llm_node(node):
+            payload = cache.get_raw(key)
+        if payload is not None:
+            return ChatCompletion.model_validate_json(payload), True
+        response = await create(**kwargs)
+        cache.put_raw(key, response.model_dump_json())
+        return response, False
+
+    from openai.types.chat import ChatCompletion
+
+    key = _digest(
+        "openai-compatible",
+        str(getattr(client, "base_url", "")),
+        json.dumps(kwargs, sort_keys=True, ensure_ascii=False, default=str),
+    )
+    if not single_flight_enabled():
+        return record(*await fetch())
+    # Same request already in flight (another session): wait for it, billed as a cache hit
+    (response, cached), leader = await _SUMMARY_CALLS.ajoin(key, fetch)
+    return record(response, cached=cached or not leader)
@@ -1,53 +1,318 @@
 """
-Rate limiter utility for LLM API calls to prevent ResourceExhausted errors.
+Rate limiter for LLM API calls to prevent ResourceExhausted / 429 errors.
+
+One LLMRateLimiter per (provider, model) is shared by every caller in the
+process: the graph's chat models (as their LangChain `rate_limiter`), the
+Typhoon summarizers and the translation service. Each limiter has a
+requests-per-minute and a tokens-per-minute bucket.
+
+Callers are served in arrival order: a call reserves its request and its
+estimated tokens up front (the buckets may go into debt) and then sleeps
+until the reservation is covered, so nobody overtakes a waiting caller and
+nobody has to fail with a 429 and retry. Once the response arrives the
+token estimate is replaced by the real usage (reconcile), so the next
+callers wait for what was actually spent.
 """
-import time
 import asyncio
-from typing import Callable, Any
-from functools import wraps
+import contextvars
+import functools
 import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+
+# run_id of the chat model call starting in this context: LangChain fires
+# on_chat_model_start before the model's rate_limiter.acquire(), so the
+# reservation can be booked under the call it belongs to
+_llm_run_id: contextvars.ContextVar = contextvars.ContextVar("llm_run_id", default=None)
+
+
+class _Bucket:
+    """Token bucket holding up to one minute of budget; the level may go negative (queued debt)."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float, now: float) -> float:
+        self._refill(now)
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
 
 
-class RateLimiter:
-    """Rate limiter to throttle API calls."""
-    
-    def __init__(self, min_interval: float = 1.0, max_concurrent: int = 2):
+class LLMRateLimiter(BaseRateLimiter):
+    """
+    RPM + TPM limiter for one provider/model with FIFO waiting.
+
+    Usable as a LangChain `rate_limiter` (acquire / aacquire) together with
+    `usage_handler()` in the model's callbacks, or directly through
+    `limit(tokens)` around any API call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        estimated_tokens: int = 2000,
+    ):
+        self.name = name
+        self._requests = _Bucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute) if tokens_per_minute else None
+        # Running estimate of tokens per call for callers that cannot count their prompt
+        self.estimated_tokens = float(estimated_tokens)
+        self._lock = threading.Lock()
+        # run_id -> tokens reserved by acquire() for that call, settled by the usage handler
+        self._outstanding: Dict[Any, float] = {}
+        self.requests = 0
+        self.waited_seconds = 0.0
+        self.max_wait = 0.0
+        self.tokens_used = 0
+
+    def reserve(self, tokens: Optional[float] = None, blocking: bool = True) -> Optional[float]:
+        """Book one request + `tokens`; returns the seconds to wait (None if not blocking and busy)."""
+        tokens = self.estimated_tokens if tokens is None else float(tokens)
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self._requests.wait_for(1, now) if self._requests else 0.0,
+                self._tokens.wait_for(tokens, now) if self._tokens else 0.0,
+            )
+            if wait > 0 and not blocking:
+                return None
+            if self._requests:
+                self._requests.take(1)
+            if self._tokens:
+                self._tokens.take(tokens)
+            self.requests += 1
+            self.waited_seconds += wait
+            self.max_wait = max(self.max_wait, wait)
+        if wait >= 1:
+            print(f"⏳ Rate limit {self.name}: queued for {wait:.1f}s")
+        return wait
+
+    def reconcile(self, reserved_tokens: float, actual_tokens: Optional[float]):
+        """Replace a reservation's estimate with the usage the API reported."""
+        if actual_tokens is None:
+            return
+        with self._lock:
+            self.tokens_used += int(actual_tokens)
+            # Smooth the estimate used by acquire() towards real usage
+            self.estimated_tokens = 0.8 * self.estimated_tokens + 0.2 * actual_tokens
+            if self._tokens:
+                extra = actual_tokens - reserved_tokens
+                if extra > 0:
+                    self._tokens.take(extra)
+                else:
+                    self._tokens.give_back(-extra)
+
+    # --- LangChain BaseRateLimiter ---
+    def _book(self, blocking: bool) -> Optional[float]:
+        tokens = self.estimated_tokens
+        wait = self.reserve(tokens, blocking=blocking)
+        run_id = _llm_run_id.get()
+        if wait is not None and run_id is not None:
+            with self._lock:
+                self._outstanding[run_id] = tokens
+        return wait
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        wait = self._book(blocking)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        wait = self._book(blocking)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def settle(self, run_id: Any, actual_tokens: Optional[float]):
+        """Reconcile the acquire() reservation of call `run_id` (called by the usage handler)."""
+        with self._lock:
+            reserved = self._outstanding.pop(run_id, None)
+        if reserved is not None:
+            self.reconcile(reserved, actual_tokens)
+
+    def release(self, run_id: Any):
+        """Give back the reservation of a call that spent no tokens (e.g. a coalesced follower)."""
+        with self._lock:
+            reserved = self._outstanding.pop(run_id, None)
+            if reserved is not None and self._tokens:
+                self._tokens.give_back(reserved)
+
+    def usage_handler(self) -> "RateLimitUsageHandler":
+        return RateLimitUsageHandler(self)
+
+    @asynccontextmanager
+    async def limit(self, tokens: Optional[float] = None):
         """
-        Initialize rate limiter.
-        
-        Args:
-            min_interval: Minimum seconds between API calls
-            max_concurrent: Maximum concurrent API calls
+        `async with limiter.limit(estimate) as usage: ...; usage["tokens"] = n`
+
+        Waits for its turn, then reconciles the estimate with usage["tokens"]
+        if the caller filled it in.
         """
-        self.min_interval = min_interval
-        self.last_call_time = 0
-        self.semaphore = threading.Semaphore(max_concurrent)
-        self.lock = threading.Lock()
-    
-    def wait_if_needed(self):
-        """Wait if needed to respect rate limits."""
-        with self.lock:
-            current_time = time.time()
-            time_since_last = current_time - self.last_call_time
-            if time_since_last < self.min_interval:
-                sleep_time = self.min_interval - time_since_last
-                time.sleep(sleep_time)
-            self.last_call_time = time.time()
-    
-    def acquire(self):
-        """Acquire semaphore for concurrent request limiting."""
-        return self.semaphore.acquire(blocking=True)
-    
-    def release(self):
-        """Release semaphore."""
-        self.semaphore.release()
-
-
-def rate_limit_llm_call(func: Callable) -> Callable:
-    """Decorator to rate limit LLM calls."""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
-    
-    return wrapper
+        reserved = self.estimated_tokens if tokens is None else float(tokens)
+        wait = self.reserve(reserved)
+        if wait:
+            await asyncio.sleep(wait)
+        usage: Dict[str, Any] = {"tokens": None}
+        try:
+            yield usage
+        finally:
+            self.reconcile(reserved, usage["tokens"])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "tokens_used": self.tokens_used,
+                "waited_seconds": round(self.waited_seconds, 2),
+                "max_wait_seconds": round(self.max_wait, 2),
+                "estimated_tokens_per_call": int(self.estimated_tokens),
+            }
+
+
+class RateLimitUsageHandler(BaseCallbackHandler):
+    """
+    Reports each LLM response's token usage back to its limiter, matched to the
+    call's own reservation by run_id (concurrent calls never settle each other's).
+
+    Runs inline, in the calling task's context: on_chat_model_start marks the
+    call whose acquire() comes next.
+    """
+
+    run_inline = True
+
+    def __init__(self, limiter: LLMRateLimiter):
+        self.limiter = limiter
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs: Any) -> None:
+        _llm_run_id.set(run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs: Any) -> None:
+        _llm_run_id.set(run_id)
+
+    def on_llm_end(self, response, *, run_id, **kwargs: Any) -> None:
+        total = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                # Zero cost: served without calling the API (a single-flight follower; cache
+                # hits never went through acquire() and have no reservation at all)
+                if usage.get("total_cost") == 0:
+                    self.limiter.release(run_id)
+                    return
+                total += usage.get("total_tokens", 0)
+        if not total:
+            total = ((response.llm_output or {}).get("token_usage") or {}).get("total_tokens")
+        self.limiter.settle(run_id, total or None)
+
+    def on_llm_error(self, error: BaseException, *, run_id, **kwargs: Any) -> None:
+        # Keep the estimate charged; a failed call usually still counted upstream
+        self.limiter.settle(run_id, None)
+
+
+_LIMITERS: Dict[tuple, LLMRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(provider: str, model: str, config: Optional[Dict[str, Any]] = None) -> Optional[LLMRateLimiter]:
+    """
+    Process-wide limiter for `provider`/`model`, or None when unlimited.
+
+    Limits come from config["rate_limits"], looked up as "provider:model"
+    first, then "provider".
+    """
+    if config is None:
+        from tradingagents.dataflows.config import get_config
+
+        config = get_config()
+    if not config.get("rate_limit", True):
+        return None
+    provider = (provider or "").lower()
+    limits = config.get("rate_limits") or {}
+    spec = limits.get(f"{provider}:{model}") or limits.get(provider)
+    if not spec or not (spec.get("rpm") or spec.get("tpm")):
+        return None
+    key = (provider, model, spec.get("rpm"), spec.get("tpm"))
+    with _LIMITERS_LOCK:
+        if key not in _LIMITERS:
+            _LIMITERS[key] = LLMRateLimiter(
+                f"{provider}:{model}",
+                requests_per_minute=spec.get("rpm"),
+                tokens_per_minute=spec.get("tpm"),
+                estimated_tokens=spec.get("estimated_tokens", 2000),
+            )
+        return _LIMITERS[key]
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    with _LIMITERS_LOCK:
+        return {limiter.name: limiter.stats() for limiter in _LIMITERS.values()}
+
+
+def estimate_tokens(messages, max_tokens: Optional[int] = None) -> int:
+    """Rough token count of chat messages (~4 characters per token) plus the reply budget."""
+    chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return chars // 4 + (max_tokens or 0)
+
+
+def _usage_tokens(result: Any) -> Optional[int]:
+    # openai ChatCompletion, raw JSON dict, HTTP response or LangChain message
+    if callable(getattr(result, "json", None)) and getattr(result, "status_code", None) == 200:
+        try:
+            result = result.json()
+        except ValueError:
+            return None
+    usage = getattr(result, "usage", None)
+    if usage is not None and getattr(usage, "total_tokens", None) is not None:
+        return usage.total_tokens
+    if isinstance(result, dict):
+        return (result.get("usage") or {}).get("total_tokens")
+    metadata = getattr(result, "usage_metadata", None)
+    return metadata.get("total_tokens") if metadata else None
+
+
+def rate_limit_llm_call(provider: str, model: Optional[str] = None) -> Callable:
+    """
+    Decorator: run an async API call through the limiter for `provider` and
+    `model` (default: the call's `model=` keyword), estimating tokens from
+    its `messages=` / `max_tokens=` and reconciling with the returned usage.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            limiter = get_rate_limiter(provider, model or kwargs.get("model"))
+            if limiter is None:
+                return await func(*args, **kwargs)
+            messages = kwargs.get("messages")
+            tokens = estimate_tokens(messages, kwargs.get("max_tokens")) if messages else None
+            async with limiter.limit(tokens) as usage:
+                result = await func(*args, **kwargs)
+                usage["tokens"] = _usage_tokens(result)
+            return result
+
+        return wrapper
 
+    return decorator
@@ -0,0 +1,295 @@
+"""
+Single-flight: concurrent identical calls share one execution.
+
+When two sessions analyse the same ticker on the same date at the same time,
+every vendor fetch and every identical LLM prompt would otherwise run twice.
+A SingleFlight group keys each call by a fingerprint of its arguments; the
+first caller (the leader) runs it, callers arriving while it is in flight
+wait for the leader's result instead of running their own. Nothing is kept
+after the call finishes (that is the caches' job), so only truly concurrent
+duplicates are merged.
+
+Covered (see `coalesce` and SingleFlightChatModel):
+- dataflows.interface.route_to_vendor
+- dataflows.core_stock_price.compare_stock_providers
+- dataflows.local.pick_fundamental_source
+- the graph's chat models (create_llms) and the Typhoon summarizers
+  (llm_cache.cached_chat_completion)
+
+Sync functions coalesce across threads, async ones within an event loop; a
+sync function returning a coroutine (route_to_vendor with an async vendor)
+hands every caller an awaitable of one shared task. Followers get their own
+copy of mutable results. config["single_flight"]
+(env TRADINGAGENTS_SINGLE_FLIGHT) turns it off.
+"""
+import asyncio
+import concurrent.futures
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+_IMMUTABLE = (str, bytes, int, float, bool, type(None))
+
+
+def _private_copy(result: Any) -> Any:
+    """Followers must not share a mutable result (dict, DataFrame, ...) with the leader."""
+    if isinstance(result, _IMMUTABLE):
+        return result
+    if isinstance(result, tuple) and all(isinstance(r, _IMMUTABLE) for r in result):
+        return result
+    return copy.deepcopy(result)
+
+
+class _SharedAwaitable:
+    """A coroutine returned by a coalesced sync call: awaited once, by whichever caller comes first."""
+
+    def __init__(self, awaitable):
+        self._awaitable = awaitable
+        self._task: Optional[asyncio.Future] = None
+        self._lock = threading.Lock()
+
+    async def wait(self, private: bool):
+        with self._lock:
+            if self._task is None:
+                self._task = asyncio.ensure_future(self._awaitable)
+        result = await asyncio.shield(self._task)
+        return _private_copy(result) if private else result
+
+
+def _share(result: Any, private: bool) -> Any:
+    if isinstance(result, _SharedAwaitable):
+        return result.wait(private)
+    return _private_copy(result) if private else result
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable key for call arguments (non-JSON values by repr)."""
+    text = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def enabled() -> bool:
+    from tradingagents.dataflows.config import get_config
+
+    return bool(get_config().get("single_flight", True))
+
+
+class SingleFlight:
+    """One group of coalesced calls with its counters."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._sync: Dict[str, concurrent.futures.Future] = {}
+        self._async: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run `fn` unless an identical call is in flight in another thread; then wait for it."""
+        return self.join(key, fn, *args, **kwargs)[0]
+
+    def join(self, key: str, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """Like do(), also telling whether this caller ran the call (leader) or waited."""
+        with self._lock:
+            self.calls += 1
+            future = self._sync.get(key)
+            leader = future is None
+            if leader:
+                future = self._sync[key] = concurrent.futures.Future()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return _share(future.result(), private=True), False
+        try:
+            result = fn(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = _SharedAwaitable(result)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return _share(result, private=False), True
+        finally:
+            with self._lock:
+                self._sync.pop(key, None)
+
+    async def ado(self, key: str, coro_fn: Callable, *args, **kwargs) -> Any:
+        """Async do(): identical coroutines in flight on this event loop share one task."""
+        return (await self.ajoin(key, coro_fn, *args, **kwargs))[0]
+
+    async def ajoin(self, key: str, coro_fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        loop = asyncio.get_running_loop()
+        loop_key = (key, id(loop))
+        with self._lock:
+            self.calls += 1
+            call = self._async.get(loop_key)
+            leader = call is None
+            if leader:
+                # The task runs in the leader's context (telemetry scope, node name)
+                task = loop.create_task(coro_fn(*args, **kwargs))
+                call = self._async[loop_key] = {"task": task, "waiters": 0}
+                task.add_done_callback(functools.partial(self._forget, loop_key))
+                self.executed += 1
+            else:
+                self.coalesced += 1
+            call["waiters"] += 1
+        task = call["task"]
+        try:
+            # shield: one waiter being cancelled must not cancel the others' call
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            with self._lock:
+                call["waiters"] -= 1
+                abandoned = call["waiters"] == 0
+            if abandoned and not task.done():
+                task.cancel()
+            raise
+        with self._lock:
+            call["waiters"] -= 1
+        return (result, True) if leader else (_private_copy(result), False)
+
+    def _forget(self, loop_key, task: asyncio.Task):
+        with self._lock:
+            if self._async.get(loop_key, {}).get("task") is task:
+                del self._async[loop_key]
+        # Nobody may be left to retrieve the error (all waiters cancelled)
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._sync) + len(self._async),
+            }
+
+
+_GROUPS: Dict[str, SingleFlight] = {}
+_GROUPS_LOCK = threading.Lock()
+
+
+def single_flight(name: str) -> SingleFlight:
+    """The process-wide group `name`."""
+    with _GROUPS_LOCK:
+        if name not in _GROUPS:
+            _GROUPS[name] = SingleFlight(name)
+        return _GROUPS[name]
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    with _GROUPS_LOCK:
+        groups = list(_GROUPS.values())
+    return {group.name: group.stats() for group in groups}
+
+
+def coalesce(name: str, key: Optional[Callable[..., Any]] = None) -> Callable:
+    """
+    Decorator: coalesce concurrent identical calls of a sync or async function.
+    `key(*args, **kwargs)` returns what identifies a call (default: all arguments).
+    """
+
+    def decorator(func: Callable) -> Callable:
+        group = single_flight(name)
+
+        def call_key(args, kwargs) -> str:
+            return fingerprint(key(*args, **kwargs) if key else [args, kwargs])
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not enabled():
+                    return await func(*args, **kwargs)
+                return await group.ado(call_key(args, kwargs), func, *args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return func(*args, **kwargs)
+            return group.do(call_key(args, kwargs), func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _zero_cost(result: ChatResult) -> ChatResult:
+    # Marked like a cache hit: nothing billed for this caller (telemetry, rate limiter)
+    generations = []
+    for generation in result.generations:
+        message = getattr(generation, "message", None)
+        if message is not None and hasattr(message, "usage_metadata"):
+            message = message.model_copy(update={
+                "usage_metadata": {**(message.usage_metadata or {}), "total_cost": 0}
+            })
+            generation = ChatGeneration(message=message, generation_info=generation.generation_info)
+        generations.append(generation)
+    return ChatResult(generations=generations, llm_output=result.llm_output)
+
+
+class SingleFlightChatModel(BaseChatModel):
+    """
+    Mixin for a LangChain chat model: identical concurrent requests (same model,
+    parameters and messages, ids excluded) make one provider call. Sits in front
+    of the response cache and the rate limiter, so a follower uses neither.
+    """
+
+    def _single_flight_key(self, messages, stop, kwargs) -> str:
+        from langchain_core.load import dumps
+
+        from .llm_cache import normalize_prompt
+
+        return fingerprint(self._get_llm_string(stop=stop, **kwargs), normalize_prompt(dumps(messages)))
+
+    def _generate_with_cache(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if not enabled():
+            return super()._generate_with_cache(messages, stop=stop, run_manager=run_manager, **kwargs)
+        result, leader = _LLM_CALLS.join(
+            self._single_flight_key(messages, stop, kwargs),
+            super()._generate_with_cache, messages, stop=stop, run_manager=run_manager, **kwargs,
+        )
+        return result if leader else _zero_cost(result)
+
+    async def _agenerate_with_cache(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if not enabled():
+            return await super()._agenerate_with_cache(messages, stop=stop, run_manager=run_manager, **kwargs)
+        result, leader = await _LLM_CALLS.ajoin(
+            self._single_flight_key(messages, stop, kwargs),
+            super()._agenerate_with_cache, messages, stop=stop, run_manager=run_manager, **kwargs,
+        )
+        return result if leader else _zero_cost(result)
+
+
+_LLM_CALLS = single_flight("llm")
+_CLASSES: Dict[type, type] = {}
+
+
+def enable_single_flight(llm: BaseChatModel) -> BaseChatModel:
+    """
+    Give an existing chat model the SingleFlightChatModel behaviour (in place).
+
+    The subclass keeps the provider class' name and module, so serialized
+    model strings (and therefore LLM cache keys) do not change.
+    """
+    cls = type(llm)
+    if isinstance(llm, SingleFlightChatModel):
+        return llm
+    with _GROUPS_LOCK:
+        if cls not in _CLASSES:
+            _CLASSES[cls] = type(cls.__name__, (SingleFlightChatModel, cls), {"__module__": cls.__module__})
+    llm.__class__ = _CLASSES[cls]
+    return llm
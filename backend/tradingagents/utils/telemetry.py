@@ -0,0 +1,315 @@
+"""
+Per-run LLM telemetry: tokens, latency, time to first token and retries
+for every node and every LLM call.
+
+A RunTelemetry is made current for one analysis (`telemetry_scope`);
+everything running inside it reports to it:
+- the graph's chat models through TelemetryCallbackHandler (attached in
+  create_llms), attributed to the node that made the call
+- graph nodes wrapped with llm_cache.track_node (wall time per node)
+- the Typhoon summarizers (cached_chat_completion) and the translation
+  service via `record_llm_call`
+- the debators' history size before/after compaction via `record_prompt_history`
+- retries made inside the provider SDKs (openai, anthropic, google-genai),
+  counted by `install_retry_hooks` and added to the call they belong to
+
+Time to first token is measured from the first streamed token; for a call
+that does not stream it is the full response time, when the caller gets
+its first token (`streamed` tells which).
+"""
+import contextvars
+import functools
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+_current: contextvars.ContextVar = contextvars.ContextVar("run_telemetry", default=None)
+# Retry counter ([n]) of the chat model call running in this context (TelemetryCallbackHandler)
+_call_retries: contextvars.ContextVar = contextvars.ContextVar("llm_call_retries", default=None)
+
+
+class RunTelemetry:
+    """Collects the LLM calls and node timings of one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: List[Dict[str, Any]] = []
+        self.node_wall_ms: Dict[str, float] = {}
+        self.node_runs: Dict[str, int] = {}
+        self.node_retries: Dict[str, int] = {}
+        # node -> [debate history tokens, tokens of it that went into the prompt], summed over turns
+        self.node_history: Dict[str, List[int]] = {}
+
+    def record_call(
+        self,
+        node: str,
+        model: Optional[str],
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        latency_ms: float = 0.0,
+        ttft_ms: Optional[float] = None,
+        retries: int = 0,
+        cached: bool = False,
+        error: Optional[str] = None,
+        streamed: Optional[bool] = None,
+    ):
+        with self._lock:
+            self.calls.append({
+                "node": node,
+                "model": model,
+                "prompt_tokens": int(prompt_tokens or 0),
+                "completion_tokens": int(completion_tokens or 0),
+                "latency_ms": round(latency_ms, 1),
+                "ttft_ms": round(ttft_ms, 1) if ttft_ms is not None else None,
+                "retries": retries,
+                "cached": cached,
+                "error": error,
+                "streamed": streamed,
+            })
+
+    def record_node(self, node: str, wall_ms: float):
+        with self._lock:
+            self.node_wall_ms[node] = self.node_wall_ms.get(node, 0.0) + wall_ms
+            self.node_runs[node] = self.node_runs.get(node, 0) + 1
+
+    def record_history(self, node: str, history_tokens: int, prompt_tokens: int):
+        with self._lock:
+            totals = self.node_history.setdefault(node, [0, 0])
+            totals[0] += history_tokens
+            totals[1] += prompt_tokens
+
+    def record_retry(self, node: str):
+        with self._lock:
+            self.node_retries[node] = self.node_retries.get(node, 0) + 1
+
+    def per_node(self) -> List[Dict[str, Any]]:
+        """One aggregate per node, slowest first."""
+        with self._lock:
+            calls = list(self.calls)
+            nodes = set(self.node_wall_ms) | set(self.node_retries) | set(self.node_history) | {c["node"] for c in calls}
+            rows = []
+            for node in nodes:
+                node_calls = [c for c in calls if c["node"] == node]
+                ttfts = [c["ttft_ms"] for c in node_calls if c["ttft_ms"] is not None]
+                history_tokens, history_prompt_tokens = self.node_history.get(node, (0, 0))
+                rows.append({
+                    "node": node,
+                    "runs": self.node_runs.get(node, 0),
+                    "wall_ms": round(self.node_wall_ms.get(node, 0.0), 1),
+                    "llm_calls": len(node_calls),
+                    "cached_calls": sum(1 for c in node_calls if c["cached"]),
+                    "prompt_tokens": sum(c["prompt_tokens"] for c in node_calls),
+                    "completion_tokens": sum(c["completion_tokens"] for c in node_calls),
+                    "llm_latency_ms": round(sum(c["latency_ms"] for c in node_calls), 1),
+                    "ttft_ms": round(sum(ttfts) / len(ttfts), 1) if ttfts else None,
+                    "retries": self.node_retries.get(node, 0) + sum(c["retries"] for c in node_calls),
+                    "errors": sum(1 for c in node_calls if c["error"]),
+                    "history_tokens": history_tokens,
+                    "history_prompt_tokens": history_prompt_tokens,
+                    "calls": node_calls,
+                })
+        return sorted(rows, key=lambda r: max(r["wall_ms"], r["llm_latency_ms"]), reverse=True)
+
+
+@contextmanager
+def telemetry_scope(telemetry: RunTelemetry):
+    """Make `telemetry` the collector for everything run inside this block."""
+    token = _current.set(telemetry)
+    try:
+        yield telemetry
+    finally:
+        _current.reset(token)
+
+
+def current_telemetry() -> Optional[RunTelemetry]:
+    return _current.get()
+
+
+def record_llm_call(node: str, model: Optional[str], **fields):
+    """Report a non-LangChain LLM call (summarizers, translation) to the current run, if any."""
+    telemetry = _current.get()
+    if telemetry is not None:
+        if fields.get("ttft_ms") is None and not fields.get("error"):
+            # Non-streamed request: the first token arrives with the whole response
+            fields.update(ttft_ms=fields.get("latency_ms"), streamed=False)
+        telemetry.record_call(node, model, **fields)
+
+
+def record_prompt_history(node: str, history_tokens: int, prompt_tokens: int):
+    """Report a debate turn's history size: full transcript vs. what went into the prompt."""
+    telemetry = _current.get()
+    if telemetry is not None:
+        telemetry.record_history(node, history_tokens, prompt_tokens)
+
+
+def record_node_time(node: str, wall_ms: float):
+    telemetry = _current.get()
+    if telemetry is not None:
+        telemetry.record_node(node, wall_ms)
+
+
+def _node_name(metadata: Optional[Dict[str, Any]]) -> str:
+    from .llm_cache import current_llm_node
+
+    return current_llm_node() or (metadata or {}).get("langgraph_node") or "unknown"
+
+
+def _count_retry():
+    """One provider SDK retry: added to the running chat model call, else to the current node."""
+    counter = _call_retries.get()
+    if counter is not None:
+        counter[0] += 1
+        return
+    telemetry = _current.get()
+    if telemetry is not None:
+        telemetry.record_retry(_node_name(None))
+
+
+_retry_hooks_installed = False
+
+
+def install_retry_hooks():
+    """
+    Count the retries the provider SDKs make internally (they never reach
+    LangChain's on_retry): openai / anthropic compute a backoff in
+    BaseClient._calculate_retry_timeout only before retrying, google-genai
+    retries through tenacity with the options built by retry_args. Safe to
+    call more than once; SDKs that are not installed are skipped.
+    """
+    global _retry_hooks_installed
+    if _retry_hooks_installed:
+        return
+    _retry_hooks_installed = True
+
+    for module_name in ("openai._base_client", "anthropic._base_client"):
+        try:
+            base_client = importlib.import_module(module_name).BaseClient
+            original = base_client._calculate_retry_timeout
+        except (ImportError, AttributeError):
+            continue
+
+        @functools.wraps(original)
+        def counted_retry_timeout(self, *args, _original=original, **kwargs):
+            _count_retry()
+            return _original(self, *args, **kwargs)
+
+        base_client._calculate_retry_timeout = counted_retry_timeout
+
+    try:
+        genai_client = importlib.import_module("google.genai._api_client")
+        original_retry_args = genai_client.retry_args
+    except (ImportError, AttributeError):
+        return
+
+    @functools.wraps(original_retry_args)
+    def counted_retry_args(*args, **kwargs):
+        retry_kwargs = original_retry_args(*args, **kwargs)
+        before_sleep = retry_kwargs.get("before_sleep")
+
+        def count_then_sleep(retry_state):
+            _count_retry()
+            if before_sleep is not None:
+                before_sleep(retry_state)
+
+        return {**retry_kwargs, "before_sleep": count_then_sleep}
+
+    genai_client.retry_args = counted_retry_args
+
+
+class TelemetryCallbackHandler(BaseCallbackHandler):
+    """
+    Chat model callbacks -> the current RunTelemetry.
+
+    Runs inline (in the caller's context), so the run and node in effect
+    when the call starts are the ones it is attributed to.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs: Dict[Any, Dict[str, Any]] = {}
+
+    def _start(self, run_id, metadata, serialized):
+        telemetry = _current.get()
+        if telemetry is None:
+            return
+        metadata = metadata or {}
+        model = metadata.get("ls_model_name") or ((serialized or {}).get("kwargs") or {}).get("model")
+        # The SDK call runs in this context, so its retries land on this call's counter
+        retries = [0]
+        _call_retries.set(retries)
+        with self._lock:
+            self._runs[run_id] = {
+                "telemetry": telemetry,
+                "node": _node_name(metadata),
+                "model": model,
+                "start": time.perf_counter(),
+                "first_token": None,
+                "retries": retries,
+            }
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata, serialized)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata, serialized)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        run = self._runs.get(run_id)
+        if run is not None and run["first_token"] is None:
+            run["first_token"] = time.perf_counter()
+
+    def _finish(self, run_id, **fields):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        if _call_retries.get() is run["retries"]:
+            _call_retries.set(None)
+        latency_ms = (time.perf_counter() - run["start"]) * 1000
+        streamed = run["first_token"] is not None
+        if streamed:
+            ttft = (run["first_token"] - run["start"]) * 1000
+        else:
+            # Not streamed: the first token reaches the caller with the whole response
+            ttft = None if fields.get("error") else latency_ms
+        run["telemetry"].record_call(
+            run["node"], run["model"], latency_ms=latency_ms, ttft_ms=ttft,
+            retries=run["retries"][0], streamed=streamed, **fields
+        )
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        prompt_tokens = completion_tokens = 0
+        cached = False
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                # LangChain zeroes the cost of cache hits
+                cached = cached or usage.get("total_cost") == 0
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+        if not (prompt_tokens or completion_tokens):
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt_tokens = token_usage.get("prompt_tokens", 0)
+            completion_tokens = token_usage.get("completion_tokens", 0)
+        if cached:
+            # Served from the response cache: nothing was billed
+            prompt_tokens = completion_tokens = 0
+        self._finish(run_id, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cached=cached)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=f"{type(error).__name__}: {error}")
+
+    def on_retry(self, retry_state, *, run_id, **kwargs):
+        telemetry = _current.get()
+        if telemetry is not None:
+            telemetry.record_retry(_node_name(kwargs.get("metadata")))
+
+
+# One handler serves every model; it looks up the current run per call
+telemetry_handler = TelemetryCallbackHandler()
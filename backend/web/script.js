@@ -554,6 +554,8 @@
       
       // Store report sections
       const reportSections = [];
+      // Streamed text of agents still running (token events), keyed by agent name
+      const liveSections = {};
       
       ws.onopen = () => {
         console.log("WebSocket connected");
@@ -594,9 +596,23 @@
                   const [teamKey, frontendName] = mapping;
                   updateAgentStatus(teamKey, frontendName, status);
                 }
+                // Finished agents are covered by their report section
+                if (status === "completed" && liveSections[agentName]) {
+                  delete liveSections[agentName];
+                  renderReportSections([...reportSections, ...Object.values(liveSections)]);
+                }
               });
             }
             break;
+
+          case "token":
+            // Live output of a running agent, batched by the server
+            if (!liveSections[data.agent]) {
+              liveSections[data.agent] = { key: `live_${data.node}`, label: `${data.agent} (live)`, text: "" };
+            }
+            liveSections[data.agent].text += data.content;
+            renderReportSections([...reportSections, ...Object.values(liveSections)]);
+            break;
             
           case "message":
             // Could add to a messages log if needed
@@ -624,7 +640,7 @@
             }
             
             // Render all reports
-            renderReportSections(reportSections);
+            renderReportSections([...reportSections, ...Object.values(liveSections)]);
             break;
             
           case "complete":
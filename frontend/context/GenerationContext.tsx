@@ -404,6 +404,10 @@ export function GenerationProvider({ children }: { children: ReactNode }) {
                             // Handle intermediate reports if needed
                             break;
 
+                        case "token":
+                            // Live agent output (batched by the server); the final state is used instead
+                            break;
+
                         case "thai_report":
                             // Handle Thai translation reports from backend
                             if (data && data.content) {